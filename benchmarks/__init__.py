@@ -0,0 +1,10 @@
+"""
+Performance benchmarks for Obsidian FastMCP.
+
+Run a benchmark from the project root with ``src`` on the import path, e.g.::
+
+    PYTHONPATH=src python -m benchmarks.bench_frontmatter
+
+``benchmarks.bench_suite`` times the note tools on generated vaults of
+1k-100k notes, writes JSON results and checks them against a baseline.
+"""
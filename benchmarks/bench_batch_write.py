@@ -0,0 +1,72 @@
+"""
+Compare one write_notes_batch_tool call with N update_note_tool calls.
+
+Both go through an in-memory MCP client, so the per-call protocol overhead
+of the single-note path is included.
+
+    PYTHONPATH=src python -m benchmarks.bench_batch_write --notes 10 100 500
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from fastmcp import Client, FastMCP
+
+from handlers import register_note_tools
+from vault import close_metadata_indexes, reset_note_cache
+
+
+def _note(number: int, round_: int) -> dict:
+    return {
+        "title": f"Note {number:04d}",
+        "folder": f"folder_{number % 10}",
+        "content": f"Revision {round_} of note {number}. " * 20,
+        "tags": ["bench"],
+    }
+
+
+async def _run(note_count: int) -> tuple[float, float]:
+    mcp = FastMCP(name="bench")
+    register_note_tools(mcp)
+    async with Client(mcp) as client:
+        for number in range(note_count):
+            await client.call_tool("create_note_tool", {"note": _note(number, 0)})
+
+        start = time.perf_counter()
+        for number in range(note_count):
+            await client.call_tool("update_note_tool", {"note": _note(number, 1)})
+        single = time.perf_counter() - start
+
+        writes = [
+            {"action": "update", "note": _note(number, 2)}
+            for number in range(note_count)
+        ]
+        start = time.perf_counter()
+        await client.call_tool("write_notes_batch_tool", {"writes": writes})
+        batch = time.perf_counter() - start
+    return single, batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, nargs="+", default=[10, 100, 500])
+    args = parser.parse_args()
+
+    print(f"{'notes':>6} {'single s':>10} {'notes/s':>9} {'batch s':>9} {'notes/s':>9}")
+    for note_count in args.notes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.environ["OBSIDIAN_VAULT_PATH"] = temp_dir
+            single, batch = asyncio.run(_run(note_count))
+            close_metadata_indexes()
+            reset_note_cache()
+        print(
+            f"{note_count:>6} {single:>10.3f} {note_count / single:>9.0f} "
+            f"{batch:>9.3f} {note_count / batch:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
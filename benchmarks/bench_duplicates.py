@@ -0,0 +1,121 @@
+"""
+Measure near-duplicate detection across vault sizes.
+
+Each synthetic vault gets 1% extra notes that are copies of existing note
+bodies with three words changed. Reports the time to sign every note from
+scratch, to find the duplicate clusters, to refresh with nothing changed
+and to refresh after editing 1% of the notes, the process's peak resident
+memory, and recall: the share of planted copies whose exact shingle
+Jaccard similarity to their original reaches the threshold (``planted``;
+in short notes three changed words can be most of the shingles) that are
+found in the same cluster as the original.
+
+    PYTHONPATH=src python -m benchmarks.bench_duplicates --notes 10000 100000
+"""
+
+import argparse
+import random
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic_vault import WORDS, generate_vault
+from search.duplicates import DuplicateIndex, shingle_hashes
+from utils.frontmatter import split_frontmatter
+
+
+def _timed(function) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def _jaccard(first: str, second: str) -> float:
+    first, second = np.unique(shingle_hashes(first)), np.unique(shingle_hashes(second))
+    return len(np.intersect1d(first, second)) / len(np.union1d(first, second))
+
+
+def _plant_copies(
+    vault_path: Path, paths: list[Path], rng: random.Random, threshold: float
+) -> dict:
+    """
+    Copy 1% of the note bodies with three words changed.
+
+    Returns the copies that are duplicates at the threshold, mapped to their
+    originals.
+    """
+    copies = {}
+    for number, path in enumerate(rng.sample(paths, max(len(paths) // 100, 1))):
+        data = path.read_bytes()
+        body = data[split_frontmatter(data).body_offset :].decode("utf-8")
+        words = body.split(" ")
+        for _ in range(3):
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+        copy = vault_path / "copies" / f"Copy {number:06d}.md"
+        copy.parent.mkdir(exist_ok=True)
+        copy.write_text(" ".join(words))
+        if _jaccard(body, " ".join(words)) >= threshold:
+            copies[copy.relative_to(vault_path).as_posix()] = path.relative_to(
+                vault_path
+            ).as_posix()
+    return copies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+
+    print(
+        f"{'notes':>8} {'build_s':>8} {'find_s':>7} {'warm_s':>7} {'edit1%_s':>9} "
+        f"{'planted':>8} {'recall':>7} {'clusters':>9} {'peak_MiB':>9}"
+    )
+    for note_count in args.notes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vault_path = Path(temp_dir) / "vault"
+            paths = generate_vault(
+                vault_path,
+                note_count,
+                body_bytes=2000,
+                folder_depth=2,
+                body_distribution="lognormal",
+                frontmatter="mixed",
+            )
+            rng = random.Random(0)
+            copies = _plant_copies(vault_path, paths, rng, args.threshold)
+
+            index = DuplicateIndex(vault_path, Path(temp_dir) / "duplicates.sqlite")
+            build_s, _ = _timed(index.refresh)
+            find_s, clusters = _timed(lambda: index.find(args.threshold))
+            warm_s, _ = _timed(index.refresh)
+            for path in rng.sample(paths, max(note_count // 100, 1)):
+                with open(path, "a") as note:
+                    note.write(f"\n{' '.join(rng.choice(WORDS) for _ in range(40))}\n")
+            edit_s, _ = _timed(index.refresh)
+
+            cluster_of = {
+                rel_path: number
+                for number, cluster in enumerate(clusters)
+                for rel_path, _ in cluster
+            }
+            found = sum(
+                1
+                for copy, original in copies.items()
+                if copy in cluster_of and cluster_of[copy] == cluster_of.get(original)
+            )
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+            print(
+                f"{note_count:>8} {build_s:>8.2f} {find_s:>7.2f} {warm_s:>7.2f} "
+                f"{edit_s:>9.2f} {len(copies):>8} {found / max(len(copies), 1):>7.3f} "
+                f"{len(clusters):>9} "
+                f"{peak_rss:>9.1f}"
+            )
+            index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Micro-benchmark of frontmatter parsing for a header written by this server.
+
+    PYTHONPATH=src python -m benchmarks.bench_frontmatter_parser --iterations 20000
+"""
+
+import argparse
+import time
+
+import yaml
+
+from utils.frontmatter import YamlSafeLoader, parse_frontmatter
+
+HEADER = """title: Attention Is All You Need
+created: 2025-06-25T10:00:00.123456
+modified: 2025-06-26T11:30:00.654321
+tags: transformers, attention, deep learning
+aliases: Transformer paper, Vaswani 2017
+related: Self-attention, Sequence models
+category: machine learning
+type: paper # one of note, paper, concept, etc.
+summary: Introduces the Transformer, built entirely on attention"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    parsers = [
+        ("yaml.safe_load", yaml.safe_load),
+        (YamlSafeLoader.__name__, lambda text: yaml.load(text, Loader=YamlSafeLoader)),
+        ("parse_frontmatter", parse_frontmatter),
+    ]
+
+    print(f"{'parser':<20} {'us/header':>10}")
+    for name, parse in parsers:
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            parse(HEADER)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<20} {elapsed / args.iterations * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Micro-benchmark of building the new text of a note on update.
+
+Compares the previous fixed template (which re-read the file for ``created``
+and dropped every other key), a full parse-and-dump with PyYAML, and the
+ordered frontmatter model that re-emits only the changed keys.
+
+    PYTHONPATH=src python -m benchmarks.bench_frontmatter_save --iterations 5000
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+from models import ObsidianNote
+from tools.update_note import format_updated_note
+from utils.frontmatter import YamlSafeLoader, split_frontmatter
+from utils.utils import get_file_creation_time
+
+HEADERS = {
+    "server": """title: Attention Is All You Need
+created: 2025-06-25T10:00:00.123456
+modified: 2025-06-26T11:30:00.654321
+tags: transformers, attention, deep learning
+aliases: Transformer paper, Vaswani 2017
+related: Self-attention, Sequence models
+category: machine learning
+type: paper # one of note, paper, concept, etc.
+summary: Introduces the Transformer, built entirely on attention
+""",
+    "dataview": """title: Attention Is All You Need
+created: 2025-06-25T10:00:00.123456
+tags:
+  - transformers
+  - attention
+aliases:
+  - Transformer paper
+status: reading
+rating: 5
+authors: ["[[Ashish Vaswani]]", "[[Noam Shazeer]]"]
+zotero:
+  key: ABCD1234
+  collections:
+    - Thesis
+abstract: |
+  The dominant sequence transduction models are based on complex recurrent
+  or convolutional neural networks.
+""",
+}
+
+
+def _legacy(note: ObsidianNote, file_path: Path, data: bytes) -> str:
+    created_date = get_file_creation_time(str(file_path))
+    return f"""---
+title: {note.title}
+created: {created_date}
+modified: {datetime.now().isoformat()}
+tags: {", ".join(note.tags)}
+aliases: {", ".join(note.aliases)}
+related: {", ".join(note.related)}
+category: {note.category}
+type: {note.type}
+summary: {note.summary}
+---
+
+{note.content}
+"""
+
+
+def _yaml_dump(note: ObsidianNote, file_path: Path, data: bytes) -> str:
+    block = split_frontmatter(data)
+    values = yaml.load(block.text, Loader=YamlSafeLoader)
+    values.update(
+        title=note.title,
+        modified=datetime.now().isoformat(),
+        tags=note.tags,
+        aliases=note.aliases,
+    )
+    header = yaml.safe_dump(values, sort_keys=False, allow_unicode=True)
+    return f"---\n{header}---\n\n{note.content}\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    savers = [
+        ("fixed template", _legacy),
+        ("yaml dump", _yaml_dump),
+        ("ordered model", format_updated_note),
+    ]
+    note = ObsidianNote(
+        title="Attention Is All You Need",
+        content="Body " * 200,
+        tags=["transformers", "attention", "deep learning"],
+        aliases=["Transformer paper"],
+        type="paper",
+    )
+
+    print(f"{'header':<10} {'saver':<16} {'us/save':>8}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, header in HEADERS.items():
+            file_path = Path(temp_dir) / f"{name}.md"
+            data = f"---\n{header}---\n\n{note.content}\n".encode("utf-8")
+            file_path.write_bytes(data)
+            for saver_name, save in savers:
+                start = time.perf_counter()
+                for _ in range(args.iterations):
+                    save(note, file_path, data)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{name:<10} {saver_name:<16} "
+                    f"{elapsed / args.iterations * 1e6:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Measure building the name index and resolving notes by title.
+
+Reports the time and memory to build the index from a populated metadata
+index, the cost of a lookup by file name, by alias and for a missing name,
+the cost of a fuzzy lookup of a misspelled title, and for comparison the
+full metadata listing a caller needed before to find a note's folder.
+
+    PYTHONPATH=src python -m benchmarks.bench_name_index --notes 10000 100000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic_vault import generate_vault, note_title
+from vault.metadata_index import close_metadata_indexes, get_metadata_index
+from vault.name_index import NameIndex
+
+
+def _per_call_us(function, calls: int) -> float:
+    return min(timeit.repeat(function, number=calls, repeat=3)) / calls * 1e6
+
+
+def _misspell(name: str, rng: random.Random) -> str:
+    """Swap two neighbouring characters, the most common typo."""
+    position = rng.randrange(len(name) - 1)
+    return name[:position] + name[position + 1] + name[position] + name[position + 2 :]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'notes':>8} {'build_s':>8} {'MiB':>7} {'name_us':>8} {'alias_us':>9} "
+        f"{'miss_us':>8} {'trgm_s':>7} {'find_ms':>8} {'listing_ms':>11}"
+    )
+    for note_count in args.notes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vault_path = Path(temp_dir) / "vault"
+            generate_vault(
+                vault_path,
+                note_count,
+                body_bytes=200,
+                folder_depth=2,
+                frontmatter="mixed",
+            )
+            metadata = get_metadata_index(vault_path)
+            metadata.refresh("rebuild")
+            # Keep the build from walking the vault again, as under a watcher
+            metadata.watched = True
+
+            index = NameIndex(vault_path)
+            start = time.perf_counter()
+            index.refresh()
+            build_s = time.perf_counter() - start
+
+            # Memory is measured on a second build, tracing slows it down
+            tracemalloc.start()
+            traced = NameIndex(vault_path)
+            traced.refresh()
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del traced
+
+            rng = random.Random(0)
+            names = [note_title(rng.randrange(note_count)) for _ in range(1000)]
+            aliases = [
+                alias
+                for _, _, entry in metadata.entries()
+                for alias in entry["aliases"]
+            ][:1000]
+            name_us = _per_call_us(
+                lambda: [index.resolve(name) for name in names], args.calls // 1000
+            ) / len(names)
+            alias_us = _per_call_us(
+                lambda: [index.resolve(alias) for alias in aliases],
+                args.calls // 1000,
+            ) / max(len(aliases), 1)
+            miss_us = _per_call_us(lambda: index.resolve("No Such Note"), args.calls)
+            typos = [_misspell(name, rng) for name in names[:100]]
+            start = time.perf_counter()
+            index.find(typos[0])
+            trigram_s = time.perf_counter() - start
+            find_ms = (
+                _per_call_us(lambda: [index.find(typo, limit=10) for typo in typos], 1)
+                / len(typos)
+                / 1e3
+            )
+
+            start = time.perf_counter()
+            metadata.notes()
+            listing_ms = (time.perf_counter() - start) * 1e3
+
+            print(
+                f"{note_count:>8} {build_s:>8.2f} {size / 2**20:>7.1f} "
+                f"{name_us:>8.1f} {alias_us:>9.1f} {miss_us:>8.1f} {trigram_s:>7.2f} {find_ms:>8.2f} "
+                f"{listing_ms:>11.1f}"
+            )
+            close_metadata_indexes()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Measure how a full metadata index rebuild scales with scan workers.
+
+    PYTHONPATH=src python -m benchmarks.bench_parallel_scan --notes 10000 50000 --threads 1 2 4 8
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_vault import generate_vault
+from vault.metadata_index import MetadataIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--processes", type=int, nargs="+", default=[0, 2, 4])
+    args = parser.parse_args()
+
+    print(f"{'notes':>8} {'threads':>8} {'procs':>6} {'seconds':>10} {'notes/s':>10}")
+    for note_count in args.notes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vault_path = Path(temp_dir) / "vault"
+            generate_vault(vault_path, note_count, body_bytes=4000)
+            index = MetadataIndex(vault_path, Path(temp_dir) / "index.sqlite")
+            # Warm the page cache so the first configuration is not penalized
+            index.refresh("rebuild", threads=max(args.threads), processes=0)
+
+            for processes in args.processes:
+                for threads in args.threads:
+                    start = time.perf_counter()
+                    index.refresh("rebuild", threads=threads, processes=processes)
+                    elapsed = time.perf_counter() - start
+                    print(
+                        f"{note_count:>8} {threads:>8} {processes:>6} "
+                        f"{elapsed:>10.2f} {note_count / elapsed:>10.0f}"
+                    )
+            index.close()
+
+
+if __name__ == "__main__":
+    main()
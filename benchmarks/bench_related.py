@@ -0,0 +1,88 @@
+"""
+Measure related-note recommendations across vault sizes and memory caps.
+
+The vault is embedded first (not timed; see ``bench_semantic``). Reports
+the time to average chunk vectors into note vectors, and for each memory
+cap the block height, the time to find every note's top 5 neighbours, the
+peak memory traced while scoring, and the process's peak resident memory.
+The traced peak is the note matrix, one block of scores and the returned
+neighbour lists, which grow with notes times neighbours and are not under
+the cap.
+
+    PYTHONPATH=src python -m benchmarks.bench_related --notes 1000 10000 50000
+"""
+
+import argparse
+import resource
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic_vault import generate_vault
+from search.encoders import HashingEncoder
+from search.related import block_rows, top_similar
+from search.semantic import SemanticIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--memory-mb", type=int, nargs="+", default=[128, 256])
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'notes':>8} {'vectors_s':>10} {'cap_MiB':>8} {'block':>6} "
+        f"{'score_s':>8} {'traced_MiB':>11} {'peak_rss_MiB':>13}"
+    )
+    for note_count in args.notes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vault_path = Path(temp_dir) / "vault"
+            generate_vault(
+                vault_path,
+                note_count,
+                body_bytes=2000,
+                folder_depth=2,
+                body_distribution="lognormal",
+            )
+            index = SemanticIndex(
+                vault_path, Path(temp_dir), HashingEncoder(args.dim), "float32"
+            )
+            index.refresh()
+
+            start = time.perf_counter()
+            rel_paths, matrix = index.note_vectors()
+            vectors_s = time.perf_counter() - start
+            sources = np.arange(len(rel_paths))
+
+            for memory_mb in args.memory_mb:
+                max_bytes = memory_mb * 2**20
+                try:
+                    step = block_rows(len(rel_paths), matrix.shape[1], max_bytes)
+                except ValueError:
+                    print(
+                        f"{note_count:>8} {vectors_s:>10.2f} {memory_mb:>8} too small"
+                    )
+                    continue
+                tracemalloc.start()
+                start = time.perf_counter()
+                top_similar(matrix, sources, args.limit, 0.0, max_bytes)
+                score_s = time.perf_counter() - start
+                _, traced = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+                # The note matrix is allocated before tracing starts
+                traced += matrix.nbytes
+                print(
+                    f"{note_count:>8} {vectors_s:>10.2f} {memory_mb:>8} {step:>6} "
+                    f"{score_s:>8.2f} {traced / 2**20:>11.1f} {peak_rss:>13.1f}"
+                )
+            index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Measure full-text index build time, size on disk and query latency.
+
+Query latency is reported on its own and as search_notes pays it without a
+watcher: a warm refresh that is skipped within ``--revalidate-ms`` of the
+last walk of the vault, then the query. With ``--revalidate-ms 0`` every call
+walks the vault first.
+
+    PYTHONPATH=src python -m benchmarks.bench_search --notes 50000 --queries 500
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_vault import WORDS, generate_vault
+from search.inverted_index import SearchIndex
+
+
+def _queries(rng: random.Random, count: int) -> list[tuple[str, dict]]:
+    shapes = [
+        lambda: (rng.choice(WORDS), {}),
+        lambda: (f"{rng.choice(WORDS)} {rng.choice(WORDS)}", {}),
+        lambda: (f'"{rng.choice(WORDS)} {rng.choice(WORDS)}"', {}),
+        lambda: (f"{rng.choice(WORDS)[:3]}*", {}),
+        lambda: (f"{rng.choice(WORDS)} OR {rng.choice(WORDS)}", {}),
+        lambda: (f"{rng.choice(WORDS)} -{rng.choice(WORDS)}", {}),
+        lambda: (f"title:{rng.randrange(1000):03d}*", {}),
+        lambda: (rng.choice(WORDS), {"folder": "folder_007"}),
+        lambda: (rng.choice(WORDS), {"tag": rng.choice(WORDS)}),
+    ]
+    return [rng.choice(shapes)() for _ in range(count)]
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=50_000)
+    parser.add_argument("--body-bytes", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--revalidate-ms", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        vault_path = Path(temp_dir) / "vault"
+        db_path = Path(temp_dir) / "search.sqlite"
+        generate_vault(vault_path, args.notes, body_bytes=args.body_bytes)
+
+        index = SearchIndex(vault_path, db_path)
+        start = time.perf_counter()
+        index.refresh()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.refresh()
+        warm = time.perf_counter() - start
+
+        queries = _queries(random.Random(0), args.queries)
+        samples = []
+        refreshes = []
+        calls = []
+        for query, filters in queries:
+            start = time.perf_counter()
+            index.refresh(max_age=args.revalidate_ms / 1000)
+            refreshed = time.perf_counter()
+            index.search(query, limit=args.limit, **filters)
+            end = time.perf_counter()
+            refreshes.append(refreshed - start)
+            samples.append(end - refreshed)
+            calls.append(end - start)
+
+        size = db_path.stat().st_size
+        index.close()
+
+    print(f"notes:            {args.notes}")
+    print(f"cold build:       {build:.2f} s ({args.notes / build:.0f} notes/s)")
+    print(f"warm refresh:     {warm:.3f} s")
+    print(f"index size:       {size / 2**20:.1f} MiB")
+    print(f"queries:          {len(samples)}")
+    print(f"p50 latency:      {_percentile(samples, 0.50) * 1000:.2f} ms")
+    print(f"p99 latency:      {_percentile(samples, 0.99) * 1000:.2f} ms")
+    print(f"mean latency:     {statistics.mean(samples) * 1000:.2f} ms")
+    print(f"revalidate:       {args.revalidate_ms} ms")
+    print(f"refresh per call: {statistics.mean(refreshes) * 1000:.2f} ms mean")
+    print(f"call p50:         {_percentile(calls, 0.50) * 1000:.2f} ms")
+    print(f"call p99:         {_percentile(calls, 0.99) * 1000:.2f} ms")
+    print(f"call mean:        {statistics.mean(calls) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Measure building and querying the semantic index.
+
+Reports the time to embed a synthetic vault from scratch, the size of the
+vector matrix on disk and the process's peak memory while building, the
+median latency of a query, and the time to bring the index up to date after
+editing 1% of the notes.
+
+    PYTHONPATH=src python -m benchmarks.bench_semantic --notes 1000 10000 100000
+"""
+
+import argparse
+import random
+import resource
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_vault import WORDS, generate_vault
+from search.encoders import HashingEncoder
+from search.semantic import SemanticIndex
+
+
+def _rss_mib() -> float:
+    """Current resident memory, which unlike the peak can shrink again."""
+    with open("/proc/self/statm") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * resource.getpagesize() / 2**20
+
+
+def _peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'notes':>8} {'chunks':>8} {'build_s':>8} {'matrix_MiB':>11} "
+        f"{'rss_MiB':>8} {'peak_MiB':>9} {'query_ms':>9} {'edit1%_s':>9}"
+    )
+    for note_count in args.notes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vault_path = Path(temp_dir) / "vault"
+            paths = generate_vault(
+                vault_path,
+                note_count,
+                body_bytes=2000,
+                folder_depth=2,
+                body_distribution="lognormal",
+                frontmatter="mixed",
+            )
+            index = SemanticIndex(
+                vault_path,
+                Path(temp_dir),
+                HashingEncoder(args.dim),
+                args.dtype,
+            )
+            start = time.perf_counter()
+            index.refresh()
+            build_s = time.perf_counter() - start
+            stats = index.stats()
+
+            rng = random.Random(0)
+            queries = [
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+                for _ in range(args.queries)
+            ]
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                index.search(query)
+                latencies.append(time.perf_counter() - start)
+
+            for path in rng.sample(paths, max(note_count // 100, 1)):
+                with open(path, "a") as note:
+                    note.write(f"\n{' '.join(rng.choice(WORDS) for _ in range(40))}\n")
+            start = time.perf_counter()
+            index.refresh()
+            edit_s = time.perf_counter() - start
+
+            print(
+                f"{note_count:>8} {stats['chunks']:>8} {build_s:>8.2f} "
+                f"{stats['bytes'] / 2**20:>11.1f} {_rss_mib():>8.1f} "
+                f"{_peak_rss_mib():>9.1f} "
+                f"{statistics.median(latencies) * 1e3:>9.2f} {edit_s:>9.2f}"
+            )
+            index.close()
+
+
+if __name__ == "__main__":
+    main()
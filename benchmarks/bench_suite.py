@@ -0,0 +1,315 @@
+"""
+Vault-scale benchmarks of the note tools, with JSON results and a
+regression check against a stored baseline.
+
+For each vault size a synthetic vault is generated and ``create_note``,
+``read_note``, ``update_note``, ``load_all_notes_metadata`` (cold and warm)
+and ``insert_wikilinks_in_note`` are timed through the tool functions.
+
+    PYTHONPATH=src python -m benchmarks.bench_suite --notes 1000 10000 100000 \\
+        --output results.json
+    PYTHONPATH=src python -m benchmarks.bench_suite --notes 1000 \\
+        --baseline baseline.json
+
+With ``--baseline`` the run is compared with the baseline results and the
+command exits with status 1 if any benchmark got slower than the threshold.
+``--current`` compares an existing results file instead of running.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.synthetic_vault import WORDS, generate_vault, note_title
+from models import ObsidianNote
+from search import close_search_indexes
+from tools.create_note import create_note
+from tools.insert_wikilinks_note import insert_wikilinks_in_note
+from tools.load_metadata import load_all_notes_metadata
+from tools.read_note import read_note
+from tools.update_note import update_note
+from vault import (
+    close_metadata_indexes,
+    reset_link_graphs,
+    reset_note_cache,
+    reset_outline_cache,
+)
+
+DEFAULT_THRESHOLD = 0.25
+
+# Differences below this are timer noise, whatever the ratio
+MIN_REGRESSION_MS = 0.05
+
+
+def summarize(name: str, notes: int, samples: list[float]) -> dict:
+    """Summarize per-call timings (in seconds) of one benchmark."""
+    ordered = sorted(samples)
+
+    def percentile(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+    total = sum(samples)
+    return {
+        "name": name,
+        "notes": notes,
+        "calls": len(samples),
+        "total_s": round(total, 6),
+        "mean_ms": round(statistics.mean(samples) * 1000, 4),
+        "p50_ms": round(percentile(0.50), 4),
+        "p95_ms": round(percentile(0.95), 4),
+        "ops_per_s": round(len(samples) / total, 2) if total else None,
+    }
+
+
+async def _timed_calls(calls) -> list[float]:
+    samples = []
+    for call in calls:
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _reset_caches():
+    close_metadata_indexes()
+    close_search_indexes()
+    reset_link_graphs()
+    reset_note_cache()
+    reset_outline_cache()
+
+
+async def _run_size(vault_path: Path, paths: list[Path], samples: int) -> dict:
+    rng = random.Random(1)
+    sample = rng.sample(range(len(paths)), min(samples, len(paths)))
+    notes = [
+        (note_title(number), str(paths[number].parent.relative_to(vault_path)))
+        for number in sample
+    ]
+    timings = {}
+
+    start = time.perf_counter()
+    await load_all_notes_metadata()
+    timings["load_all_notes_metadata_cold"] = [time.perf_counter() - start]
+    timings["load_all_notes_metadata_warm"] = await _timed_calls(
+        [load_all_notes_metadata] * 3
+    )
+
+    reset_note_cache()
+    timings["read_note"] = await _timed_calls(
+        [lambda t=title, f=folder: read_note(t, f) for title, folder in notes]
+    )
+
+    edited = [await read_note(title, folder) for title, folder in notes]
+    for note in edited:
+        note.content += "\n\nEdited by the benchmark."
+    timings["update_note"] = await _timed_calls(
+        [lambda n=note: update_note(n) for note in edited]
+    )
+
+    new_notes = [
+        ObsidianNote(
+            title=f"Bench {number:06d}",
+            folder="bench/created",
+            content=" ".join(rng.choice(WORDS) for _ in range(300)),
+            tags=rng.sample(WORDS, 3),
+        )
+        for number in range(len(sample))
+    ]
+    timings["create_note"] = await _timed_calls(
+        [lambda n=note: create_note(n) for note in new_notes]
+    )
+
+    phrases = rng.sample(WORDS, 10)
+    timings["insert_wikilinks"] = await _timed_calls(
+        [
+            lambda t=title, f=folder: insert_wikilinks_in_note(t, phrases, f)
+            for title, folder in notes
+        ]
+    )
+    return timings
+
+
+def run_suite(args) -> dict:
+    """Run every benchmark at every vault size and return the results."""
+    results = []
+    for note_count in args.notes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vault_path = Path(temp_dir) / "vault"
+            start = time.perf_counter()
+            paths = generate_vault(
+                vault_path,
+                note_count,
+                body_bytes=args.body_bytes,
+                folder_count=args.folders,
+                seed=args.seed,
+                folder_depth=args.depth,
+                body_distribution=args.distribution,
+                frontmatter=args.frontmatter,
+                link_density=args.link_density,
+            )
+            generated = time.perf_counter() - start
+            print(f"{note_count} notes generated in {generated:.1f} s", file=sys.stderr)
+
+            previous_vault = os.environ.get("OBSIDIAN_VAULT_PATH")
+            os.environ["OBSIDIAN_VAULT_PATH"] = str(vault_path)
+            _reset_caches()
+            try:
+                timings = asyncio.run(_run_size(vault_path, paths, args.samples))
+            finally:
+                _reset_caches()
+                if previous_vault is None:
+                    os.environ.pop("OBSIDIAN_VAULT_PATH", None)
+                else:
+                    os.environ["OBSIDIAN_VAULT_PATH"] = previous_vault
+
+        for name, samples in timings.items():
+            results.append(summarize(name, note_count, samples))
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {
+            "body_bytes": args.body_bytes,
+            "folders": args.folders,
+            "depth": args.depth,
+            "distribution": args.distribution,
+            "frontmatter": args.frontmatter,
+            "link_density": args.link_density,
+            "samples": args.samples,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "p50_ms",
+) -> list[dict]:
+    """
+    Compare two result sets benchmark by benchmark.
+
+    Args:
+        baseline (dict): Stored results to compare against
+        current (dict): Results of the run being checked
+        threshold (float, optional): Relative slowdown that counts as a
+            regression, e.g. 0.25 for 25%. Defaults to 0.25.
+        metric (str, optional): The timing to compare. Defaults to "p50_ms".
+
+    Returns:
+        list[dict]: One entry per benchmark present in both result sets, with
+        the ``baseline`` and ``current`` values, their ``ratio`` and whether
+        it is a ``regression``
+    """
+    stored = {
+        (result["name"], result["notes"]): result for result in baseline["results"]
+    }
+    comparison = []
+    for result in current["results"]:
+        before = stored.get((result["name"], result["notes"]))
+        if before is None:
+            continue
+        old, new = before[metric], result[metric]
+        ratio = new / old if old else None
+        comparison.append(
+            {
+                "name": result["name"],
+                "notes": result["notes"],
+                "baseline": old,
+                "current": new,
+                "ratio": round(ratio, 3) if ratio is not None else None,
+                "regression": ratio is not None
+                and ratio > 1 + threshold
+                and new - old > MIN_REGRESSION_MS,
+            }
+        )
+    return comparison
+
+
+def _print_results(results: dict):
+    print(
+        f"{'benchmark':<30} {'notes':>7} {'calls':>6} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'ops/s':>9}"
+    )
+    for result in results["results"]:
+        print(
+            f"{result['name']:<30} {result['notes']:>7} {result['calls']:>6} "
+            f"{result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} "
+            f"{result['ops_per_s'] or 0:>9.1f}"
+        )
+
+
+def _print_comparison(comparison: list[dict], metric: str):
+    print(
+        f"\n{'benchmark':<30} {'notes':>7} {'base ' + metric:>12} "
+        f"{metric:>9} {'ratio':>7}"
+    )
+    for entry in comparison:
+        flag = "  REGRESSION" if entry["regression"] else ""
+        print(
+            f"{entry['name']:<30} {entry['notes']:>7} {entry['baseline']:>12.3f} "
+            f"{entry['current']:>9.3f} {entry['ratio'] or 0:>7.2f}{flag}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--notes", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--body-bytes", type=int, default=2000)
+    parser.add_argument("--folders", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "lognormal", "pareto"],
+        default="lognormal",
+    )
+    parser.add_argument("--frontmatter", choices=["server", "mixed"], default="mixed")
+    parser.add_argument("--link-density", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Results to compare against")
+    parser.add_argument(
+        "--current", type=Path, help="Compare this results file instead of running"
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--metric", choices=["p50_ms", "p95_ms", "mean_ms"], default="p50_ms"
+    )
+    args = parser.parse_args()
+
+    if args.current is not None:
+        results = json.loads(args.current.read_text(encoding="utf-8"))
+    else:
+        results = run_suite(args)
+        if args.output is not None:
+            args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    _print_results(results)
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        comparison = compare_results(baseline, results, args.threshold, args.metric)
+        _print_comparison(comparison, args.metric)
+        regressions = [entry for entry in comparison if entry["regression"]]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Measure the per-call cost of looking up the vault path.
+
+Compares the previous behaviour (read the environment, expand ``~``, then
+``exists()`` and ``is_dir()`` on every call) with the cached vault context.
+
+    PYTHONPATH=src python -m benchmarks.bench_vault_context --calls 200000
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+from pathlib import Path
+
+from config.settings import get_vault_path
+
+
+def _uncached_vault_path() -> Path:
+    vault_path = os.getenv("OBSIDIAN_VAULT_PATH")
+    if not vault_path:
+        raise Exception("OBSIDIAN_VAULT_PATH environment variable is not set.")
+    path = Path(os.path.expanduser(vault_path))
+    if not path.exists():
+        raise Exception(f"Obsidian vault path does not exist: {vault_path}")
+    if not path.is_dir():
+        raise Exception(f"Obsidian vault path is not a directory: {vault_path}")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ["OBSIDIAN_VAULT_PATH"] = temp_dir
+        for name, function in (
+            ("uncached", _uncached_vault_path),
+            ("cached", get_vault_path),
+        ):
+            seconds = min(timeit.repeat(function, number=args.calls, repeat=3))
+            print(f"{name:>9}: {seconds / args.calls * 1e9:8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare the single-pass WikilinkLinker with one regex pass per phrase.
+
+The glossary is made of generated multi-word titles, a fraction of which are
+sprinkled through the document. The regex implementation is skipped for
+configurations where phrases x document size exceeds --regex-limit.
+
+    PYTHONPATH=src python -m benchmarks.bench_wikilinks --phrases 10 100 1000 --sizes 10000 100000
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.synthetic_vault import WORDS
+from utils.insert_wikilinks import WikilinkLinker, insert_wikilinks_regex
+
+
+def make_glossary(rng: random.Random, count: int) -> list[str]:
+    phrases = set()
+    while len(phrases) < count:
+        phrases.add(" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))))
+    return sorted(phrases)
+
+
+def make_document(rng: random.Random, glossary: list[str], size: int) -> str:
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(glossary) if rng.random() < 0.05 else rng.choice(WORDS)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--phrases", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--regex-limit", type=int, default=20_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(
+        f"{'phrases':>8} {'doc bytes':>10} {'compile s':>10} "
+        f"{'linker s':>10} {'regex s':>10}"
+    )
+    for phrase_count in args.phrases:
+        glossary = make_glossary(rng, phrase_count)
+        compile_time, linker = timed(WikilinkLinker, glossary)
+        for size in args.sizes:
+            document = make_document(rng, glossary, size)
+            link_time, linked = timed(linker.link, document)
+            regex_column = "skipped"
+            if phrase_count * size <= args.regex_limit:
+                regex_time, expected = timed(insert_wikilinks_regex, document, glossary)
+                assert linked == expected
+                regex_column = f"{regex_time:.3f}"
+            print(
+                f"{phrase_count:>8} {size:>10} {compile_time:>10.3f} "
+                f"{link_time:>10.3f} {regex_column:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
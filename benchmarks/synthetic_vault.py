@@ -0,0 +1,202 @@
+"""
+Deterministic synthetic vault generator used by the benchmarks.
+"""
+
+import math
+import random
+from pathlib import Path
+from typing import Literal
+
+WORDS = (
+    "neuron synapse transformer attention gradient protein enzyme genome "
+    "cortex dopamine memory learning network model inference bayesian prior "
+    "sample dataset experiment method result analysis theory evidence signal"
+).split()
+
+TYPES = ["note", "concept", "tool", "person", "framework", "paper", "project"]
+
+STATUSES = ["draft", "reading", "done", "archived"]
+
+BodyDistribution = Literal["fixed", "lognormal", "pareto"]
+FrontmatterStyle = Literal["server", "mixed"]
+
+# Sub-folders per folder at each extra level of nesting
+FOLDER_FANOUT = 4
+
+# Largest body relative to body_bytes for the skewed distributions
+MAX_BODY_FACTOR = 50
+
+
+def _sentence(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + "."
+
+
+def _body(rng: random.Random, size: int) -> str:
+    parts = []
+    written = 0
+    while written < size:
+        paragraph = " ".join(_sentence(rng, rng.randint(6, 16)) for _ in range(5))
+        parts.append(paragraph)
+        written += len(paragraph) + 2
+    return "\n\n".join(parts)[:size]
+
+
+def note_title(number: int) -> str:
+    """Title of the note with the given number in a generated vault."""
+    return f"Note {number:06d}"
+
+
+def _folder(number: int, folder_count: int, folder_depth: int) -> str:
+    parts = [f"folder_{number % folder_count:03d}"]
+    spread = number // folder_count
+    for level in range(1, folder_depth):
+        parts.append(f"level{level}_{spread % FOLDER_FANOUT}")
+        spread //= FOLDER_FANOUT
+    return "/".join(parts)
+
+
+def _body_size(rng: random.Random, body_bytes: int, distribution: str) -> int:
+    if distribution == "fixed":
+        return body_bytes
+    if distribution == "lognormal":
+        # Median body_bytes, with a long tail of big notes
+        size = body_bytes * math.exp(rng.gauss(0, 1))
+    elif distribution == "pareto":
+        # Mostly short notes and a few very long ones, mean about body_bytes
+        size = body_bytes / 3 * rng.paretovariate(1.5)
+    else:
+        raise ValueError(f"Unknown body distribution: {distribution}")
+    return max(1, min(int(size), body_bytes * MAX_BODY_FACTOR))
+
+
+def _add_links(
+    rng: random.Random, body: str, number: int, note_count: int, link_density: float
+) -> str:
+    link_count = int(len(body) / 1000 * link_density + rng.random())
+    if not link_count or note_count < 2:
+        return body
+    words = body.split(" ")
+    for _ in range(link_count):
+        target = rng.randrange(note_count - 1)
+        target += target >= number
+        words.insert(rng.randrange(len(words) + 1), f"[[{note_title(target)}]]")
+    return " ".join(words)
+
+
+def _server_frontmatter(rng: random.Random, title: str, number: int) -> str:
+    return f"""---
+title: {title}
+created: 2024-01-01T00:00:00
+modified: 2024-01-02T00:00:00
+tags: {", ".join(rng.sample(WORDS, 3))}
+aliases: {rng.choice(WORDS)} {number}
+related:
+category: {rng.choice(WORDS)}
+type: {rng.choice(TYPES)} # one of note, paper, concept, etc.
+summary: {_sentence(rng, 8)}
+---
+"""
+
+
+def _properties_frontmatter(rng: random.Random, title: str, number: int) -> str:
+    tags = "".join(f"  - {tag}\n" for tag in rng.sample(WORDS, 3))
+    return f"""---
+tags:
+{tags}aliases:
+  - {rng.choice(WORDS)} {number}
+created: 2024-01-01
+status: {rng.choice(STATUSES)}
+---
+"""
+
+
+def _dataview_frontmatter(rng: random.Random, title: str, number: int) -> str:
+    return f"""---
+title: "{title}"
+tags: [{", ".join(rng.sample(WORDS, 2))}]
+rating: {rng.randint(1, 5)}
+source:
+  kind: {rng.choice(TYPES)}
+  year: {rng.randint(1990, 2024)}
+abstract: |
+  {_sentence(rng, 10)}
+  {_sentence(rng, 10)}
+---
+"""
+
+
+def _no_frontmatter(rng: random.Random, title: str, number: int) -> str:
+    return ""
+
+
+_MIXED_STYLES = [
+    _server_frontmatter,
+    _properties_frontmatter,
+    _dataview_frontmatter,
+    _no_frontmatter,
+]
+
+
+def generate_vault(
+    vault_path: Path,
+    note_count: int,
+    body_bytes: int = 2000,
+    folder_count: int = 20,
+    seed: int = 0,
+    folder_depth: int = 1,
+    body_distribution: BodyDistribution = "fixed",
+    frontmatter: FrontmatterStyle = "server",
+    link_density: float = 0.0,
+) -> list[Path]:
+    """
+    Write ``note_count`` notes into ``vault_path``.
+
+    Notes are titled ``Note 000000``, ``Note 000001`` and so on (see
+    ``note_title``), so benchmarks can address any note by number.
+
+    Args:
+        vault_path (Path): Directory to populate
+        note_count (int): Number of notes to create
+        body_bytes (int, optional): Size of each note body, or the median
+            (``lognormal``) or approximate mean (``pareto``) size. Defaults
+            to 2000.
+        folder_count (int, optional): Number of top-level folders notes are
+            spread across. Defaults to 20.
+        seed (int, optional): Random seed; the same arguments and seed yield
+            the same vault. Defaults to 0.
+        folder_depth (int, optional): Levels of folders below the vault root;
+            each extra level splits every folder into 4. Defaults to 1.
+        body_distribution (str, optional): ``fixed``, ``lognormal`` or
+            ``pareto`` body sizes. Defaults to "fixed".
+        frontmatter (str, optional): ``server`` writes the frontmatter this
+            server creates; ``mixed`` rotates through the server format,
+            Obsidian properties with block lists, Dataview-style headers with
+            nested maps and block scalars, and notes without frontmatter.
+            Defaults to "server".
+        link_density (float, optional): Wikilinks to other notes per 1000
+            bytes of body. Defaults to 0.
+
+    Returns:
+        list[Path]: The paths of the generated notes
+    """
+    if folder_depth < 1:
+        raise ValueError("folder_depth must be at least 1")
+    rng = random.Random(seed)
+    paths = []
+    for i in range(note_count):
+        folder = vault_path / _folder(i, folder_count, folder_depth)
+        folder.mkdir(parents=True, exist_ok=True)
+        title = note_title(i)
+        if frontmatter == "server":
+            header = _server_frontmatter(rng, title, i)
+        elif frontmatter == "mixed":
+            header = _MIXED_STYLES[i % len(_MIXED_STYLES)](rng, title, i)
+        else:
+            raise ValueError(f"Unknown frontmatter style: {frontmatter}")
+        body = _body(rng, _body_size(rng, body_bytes, body_distribution))
+        if link_density:
+            body = _add_links(rng, body, i, note_count, link_density)
+        path = folder / f"{title}.md"
+        path.write_text(f"{header}\n{body}\n", encoding="utf-8")
+        paths.append(path)
+    return paths
@@ -1,3 +1,47 @@
-from config.settings import get_vault_path
+from config.settings import (
+    VaultContext,
+    get_vault_path,
+    get_vault_context,
+    reload_vault_context,
+    get_cache_dir,
+    get_max_frontmatter_bytes,
+    get_scan_threads,
+    get_scan_processes,
+    get_io_threads,
+    get_note_cache_bytes,
+    get_watch_mode,
+    get_watch_debounce_ms,
+    get_watch_poll_interval_ms,
+    get_revalidate_ms,
+    get_metrics_file,
+    get_metrics_interval_ms,
+    get_profile_slow_ms,
+    get_semantic_encoder,
+    get_semantic_dim,
+    get_semantic_dtype,
+    get_related_memory_mb,
+)
 
-__all__ = ["get_vault_path"]
+__all__ = [
+    "VaultContext",
+    "get_vault_path",
+    "get_vault_context",
+    "reload_vault_context",
+    "get_cache_dir",
+    "get_max_frontmatter_bytes",
+    "get_scan_threads",
+    "get_scan_processes",
+    "get_io_threads",
+    "get_note_cache_bytes",
+    "get_watch_mode",
+    "get_watch_debounce_ms",
+    "get_watch_poll_interval_ms",
+    "get_revalidate_ms",
+    "get_metrics_file",
+    "get_metrics_interval_ms",
+    "get_profile_slow_ms",
+    "get_semantic_encoder",
+    "get_semantic_dim",
+    "get_semantic_dtype",
+    "get_related_memory_mb",
+]
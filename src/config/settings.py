@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
@@ -10,15 +12,33 @@ from typing import Optional
 load_dotenv()
 
 
-def get_vault_path() -> Path:
-    vault_path = os.getenv("OBSIDIAN_VAULT_PATH")
-    if not vault_path:
+class VaultContext:
+    """
+    The vault location, resolved once and shared by every tool call.
+
+    ``path`` is the vault path as configured (with ``~`` expanded) and is
+    what tools build note paths from; ``real_path`` has every symlink
+    resolved.
+    """
+
+    def __init__(self, configured: str, path: Path):
+        self.configured = configured
+        self.path = path
+        self.real_path = path.resolve()
+
+
+_vault_context: Optional[VaultContext] = None
+_vault_context_lock = threading.Lock()
+
+
+def _resolve_vault_context(configured: Optional[str]) -> VaultContext:
+    if not configured:
         raise Exception(
             "OBSIDIAN_VAULT_PATH environment variable is not set. Please set it in your .env file."
         )
 
     # Expand the home directory if using ~
-    vault_path = os.path.expanduser(vault_path)
+    vault_path = os.path.expanduser(configured)
     path = Path(vault_path)
 
     if not path.exists():
@@ -27,9 +47,208 @@ def get_vault_path() -> Path:
     if not path.is_dir():
         raise Exception(f"Obsidian vault path is not a directory: {vault_path}")
 
+    return VaultContext(configured, path)
+
+
+def get_vault_context() -> VaultContext:
+    """
+    Get the resolved vault, validating OBSIDIAN_VAULT_PATH only when it changes.
+
+    The check on every call is a single environment lookup; the path is
+    expanded and validated once per configured value.
+    """
+    global _vault_context
+    configured = os.getenv("OBSIDIAN_VAULT_PATH")
+    context = _vault_context
+    if context is not None and context.configured == configured:
+        return context
+
+    with _vault_context_lock:
+        if _vault_context is None or _vault_context.configured != configured:
+            _vault_context = _resolve_vault_context(configured)
+        return _vault_context
+
+
+def reload_vault_context(reload_env: bool = False) -> VaultContext:
+    """
+    Resolve the vault again, e.g. after it was moved or re-created.
+
+    Args:
+        reload_env (bool, optional): Re-read the .env file first, letting its
+            values override the current environment. Defaults to False.
+
+    Returns:
+        VaultContext: The newly resolved vault
+    """
+    global _vault_context
+    if reload_env:
+        load_dotenv(override=True)
+    with _vault_context_lock:
+        _vault_context = _resolve_vault_context(os.getenv("OBSIDIAN_VAULT_PATH"))
+        return _vault_context
+
+
+def get_vault_path() -> Path:
+    return get_vault_context().path
+
+
+def get_cache_dir(vault_path: Path) -> Path:
+    """
+    Get the directory used for this server's on-disk caches and indexes.
+
+    Defaults to a hidden ``.obsidian_fastmcp`` folder inside the vault. When
+    OBSIDIAN_CACHE_DIR is set, each vault gets its own subdirectory there so a
+    single cache dir can be shared between vaults.
+    """
+    cache_dir = os.getenv("OBSIDIAN_CACHE_DIR")
+    if cache_dir:
+        vault_key = hashlib.sha1(str(vault_path.resolve()).encode("utf-8")).hexdigest()
+        path = Path(os.path.expanduser(cache_dir)) / vault_key[:16]
+    else:
+        path = vault_path / ".obsidian_fastmcp"
+
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        raise Exception(f"Cannot create cache directory at {path}: {str(e)}")
+
     return path
 
 
+def _get_int_setting(name: str, default: int, minimum: int) -> int:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise Exception(f"{name} must be an integer: {value}")
+
+    if number < minimum:
+        raise Exception(f"{name} must be at least {minimum}: {value}")
+
+    return number
+
+
+def get_max_frontmatter_bytes() -> int:
+    """Get the largest frontmatter header, in bytes, that the server will read."""
+    return _get_int_setting("OBSIDIAN_MAX_FRONTMATTER_BYTES", 65536, 1)
+
+
+def get_scan_threads() -> int:
+    """Get the number of threads used to read notes during a vault scan."""
+    return _get_int_setting(
+        "OBSIDIAN_SCAN_THREADS", min(32, (os.cpu_count() or 1) + 4), 1
+    )
+
+
+def get_scan_processes() -> int:
+    """Get the number of processes used to parse YAML during a vault scan (0 disables)."""
+    return _get_int_setting("OBSIDIAN_SCAN_PROCESSES", 0, 0)
+
+
+def get_io_threads() -> int:
+    """Get the number of threads that run the tools' blocking file I/O."""
+    return _get_int_setting(
+        "OBSIDIAN_IO_THREADS", min(32, (os.cpu_count() or 1) + 4), 1
+    )
+
+
+def get_note_cache_bytes() -> int:
+    """Get the memory budget, in bytes, of the parsed-note cache (0 disables)."""
+    return _get_int_setting("OBSIDIAN_NOTE_CACHE_BYTES", 64 * 1024 * 1024, 0)
+
+
+WATCH_MODES = ("off", "auto", "inotify", "poll")
+
+
+def get_watch_mode() -> str:
+    """
+    Get how the server watches the vault for outside edits.
+
+    ``off`` (the default) disables the watcher, ``inotify`` and ``poll`` pick a
+    backend, and ``auto`` uses inotify where available and polls otherwise.
+    """
+    mode = (os.getenv("OBSIDIAN_WATCH") or "off").strip().lower()
+    if mode not in WATCH_MODES:
+        raise Exception(
+            f"OBSIDIAN_WATCH must be one of {', '.join(WATCH_MODES)}: {mode}"
+        )
+    return mode
+
+
+def get_watch_debounce_ms() -> int:
+    """Get how long a note must stay quiet before the watcher re-parses it."""
+    return _get_int_setting("OBSIDIAN_WATCH_DEBOUNCE_MS", 250, 0)
+
+
+def get_watch_poll_interval_ms() -> int:
+    """Get how often the polling watcher re-scans the vault."""
+    return _get_int_setting("OBSIDIAN_WATCH_POLL_INTERVAL_MS", 2000, 10)
+
+
+def get_revalidate_ms() -> int:
+    """
+    Get how long the link graph and search index trust change notifications.
+
+    Without a watcher, writes made through the server are still reported to
+    the indexes, and only edits made outside it need a walk of the vault to
+    be found. Within this time of the last walk, queries skip the walk.
+    """
+    return _get_int_setting("OBSIDIAN_REVALIDATE_MS", 5000, 0)
+
+
+def get_metrics_file() -> Optional[Path]:
+    """Get the file the tool metrics are dumped to in Prometheus text format, if any."""
+    path = os.getenv("OBSIDIAN_METRICS_FILE")
+    return Path(os.path.expanduser(path)) if path else None
+
+
+def get_metrics_interval_ms() -> int:
+    """Get the minimum time between two dumps of the metrics file."""
+    return _get_int_setting("OBSIDIAN_METRICS_INTERVAL_MS", 10000, 0)
+
+
+def get_profile_slow_ms() -> int:
+    """Get the tool latency above which a call's profile is kept (0 disables profiling)."""
+    return _get_int_setting("OBSIDIAN_PROFILE_SLOW_MS", 0, 0)
+
+
+def get_semantic_encoder() -> str:
+    """
+    Get the encoder used to embed notes for semantic search.
+
+    ``hashing`` (the default) is the built-in offline encoder; anything else
+    is a ``module:factory`` path to a callable returning an encoder.
+    """
+    return (os.getenv("OBSIDIAN_SEMANTIC_ENCODER") or "hashing").strip()
+
+
+def get_semantic_dim() -> int:
+    """Get the vector size of the built-in hashing encoder."""
+    return _get_int_setting("OBSIDIAN_SEMANTIC_DIM", 512, 16)
+
+
+SEMANTIC_DTYPES = ("float32", "float16")
+
+
+def get_semantic_dtype() -> str:
+    """Get the element type of the stored embedding matrix."""
+    dtype = (os.getenv("OBSIDIAN_SEMANTIC_DTYPE") or "float32").strip().lower()
+    if dtype not in SEMANTIC_DTYPES:
+        raise Exception(
+            f"OBSIDIAN_SEMANTIC_DTYPE must be one of {', '.join(SEMANTIC_DTYPES)}: "
+            f"{dtype}"
+        )
+    return dtype
+
+
+def get_related_memory_mb() -> int:
+    """Get the working-set cap, in MiB, for computing related notes."""
+    return _get_int_setting("OBSIDIAN_RELATED_MEMORY_MB", 256, 1)
+
+
 class AnkiConfig(BaseModel):
     files_path: Path
     default_deck_name: str = Field(default="Obsidian Notes")
@@ -1,3 +1,5 @@
 from handlers.note_registrations import register_note_tools
+from handlers.search_registrations import register_search_tools
+from handlers.link_registrations import register_link_tools
 
-__all__ = ["register_note_tools"]
+__all__ = ["register_note_tools", "register_search_tools", "register_link_tools"]
@@ -0,0 +1,84 @@
+"""
+Link-graph FastMCP registrations.
+These registrations wrap the link-graph queries from tools.links, which
+answer from an in-memory graph. Without OBSIDIAN_WATCH, edits made outside
+the server show up within OBSIDIAN_REVALIDATE_MS.
+"""
+
+from typing import Literal
+from fastmcp import FastMCP
+from tools import (
+    find_backlinks,
+    get_outgoing_links,
+    find_orphan_notes,
+    find_unresolved_links,
+    get_note_neighborhood,
+)
+from utils.instrumentation import instrument_tool
+
+
+def register_link_tools(mcp: FastMCP):
+    """Register all link-graph tools with the FastMCP instance."""
+
+    @mcp.tool
+    @instrument_tool
+    async def find_backlinks_tool(title: str, folder: str = ""):
+        """List the notes that link to or embed a note."""
+        try:
+            return await find_backlinks(title, folder)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def get_outgoing_links_tool(title: str, folder: str = ""):
+        """List the links in a note and the notes they resolve to."""
+        try:
+            return await get_outgoing_links(title, folder)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def find_orphan_notes_tool(
+        folder: str = "", include_linking: bool = True, limit: int = 200
+    ):
+        """List notes that no other note links to."""
+        try:
+            return await find_orphan_notes(folder, include_linking, limit)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def find_unresolved_links_tool(limit: int = 200):
+        """List link targets that do not match any note, most-linked first."""
+        try:
+            return await find_unresolved_links(limit)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def get_note_neighborhood_tool(
+        title: str,
+        folder: str = "",
+        depth: int = 1,
+        direction: Literal["out", "in", "both"] = "both",
+        max_nodes: int = 200,
+    ):
+        """Collect the notes within `depth` link hops of a note, with the links between them."""
+        try:
+            return await get_note_neighborhood(
+                title, folder, depth, direction, max_nodes
+            )
+        except Exception:
+            raise
+
+    return [
+        find_backlinks_tool,
+        get_outgoing_links_tool,
+        find_orphan_notes_tool,
+        find_unresolved_links_tool,
+        get_note_neighborhood_tool,
+    ]
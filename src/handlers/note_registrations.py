@@ -3,21 +3,36 @@ Note-related FastMCP registrations.
 These registrations wrap the core note operations from tools.note_tools.
 """
 
+from typing import Literal, Optional
 from fastmcp import FastMCP
-from models import ObsidianNote
+from models import ObsidianNote, NoteRef, NoteWrite, NotePatch
 from tools import (
     create_note,
     read_note,
+    read_notes_batch,
+    get_note_outline,
+    read_note_section,
+    read_note_lines,
+    read_note_bytes,
     update_note,
-    load_all_notes_metadata,
+    patch_note,
+    append_to_note,
+    write_notes_batch,
+    query_notes_metadata,
     insert_wikilinks_in_note,
+    autolink_vault,
+    recommend_related,
+    get_cache_stats,
+    get_tool_stats,
 )
+from utils.instrumentation import instrument_tool
 
 
 def register_note_tools(mcp: FastMCP):
     """Register all note-related tools and resources with the FastMCP instance."""
 
     @mcp.tool
+    @instrument_tool
     async def create_note_tool(note: ObsidianNote):
         """Create a new note in Obsidian."""
         try:
@@ -26,14 +41,98 @@ def register_note_tools(mcp: FastMCP):
             raise
 
     @mcp.tool
-    async def read_note_tool(title: str, folder: str = ""):
-        """Read an existing note from Obsidian."""
+    @instrument_tool
+    async def read_note_tool(title: str, folder: str = "", suggest: bool = True):
+        """Read an existing note from Obsidian.
+
+        Without a folder, the note is found anywhere in the vault by title,
+        file name or alias. If no note matches, the error suggests the
+        closest titles (turn off with suggest=false).
+        """
         try:
-            return await read_note(title, folder)
+            return await read_note(title, folder, suggest)
         except Exception:
             raise
 
     @mcp.tool
+    @instrument_tool
+    async def read_notes_batch_tool(
+        notes: Optional[list[NoteRef]] = None,
+        folder: str = "",
+        pattern: Optional[str] = None,
+        max_body_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+    ):
+        """Read many notes in one call.
+
+        List notes as title/folder pairs, or select them with a glob pattern
+        relative to folder (e.g. "*.md", "**/*.md"). Notes that cannot be read
+        get a per-note error. Bodies can be truncated per note
+        (max_body_bytes) and across the batch (max_total_bytes).
+        """
+        try:
+            return await read_notes_batch(
+                notes=notes,
+                folder=folder,
+                pattern=pattern,
+                max_body_bytes=max_body_bytes,
+                max_total_bytes=max_total_bytes,
+            )
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def get_note_outline_tool(title: str, folder: str = ""):
+        """Get a note's heading tree with line numbers and byte offsets.
+
+        Use it to find the part of a long note to read with
+        read_note_section_tool, read_note_lines_tool or read_note_bytes_tool.
+        """
+        try:
+            return await get_note_outline(title, folder)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def read_note_section_tool(
+        title: str, heading: str, folder: str = "", include_subsections: bool = True
+    ):
+        """Read the section of a note under one heading.
+
+        Headings match case-insensitively; use "Parent#Child" for a nested
+        heading.
+        """
+        try:
+            return await read_note_section(title, heading, folder, include_subsections)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def read_note_lines_tool(
+        title: str, start_line: int, end_line: Optional[int] = None, folder: str = ""
+    ):
+        """Read a range of lines (1-based, inclusive) of a note file."""
+        try:
+            return await read_note_lines(title, start_line, end_line, folder)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def read_note_bytes_tool(
+        title: str, start: int, end: Optional[int] = None, folder: str = ""
+    ):
+        """Read a byte range of a note file, e.g. a section from its outline."""
+        try:
+            return await read_note_bytes(title, start, end, folder)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
     async def update_note_tool(note: ObsidianNote):
         """Update an existing note in Obsidian."""
         try:
@@ -42,14 +141,100 @@ def register_note_tools(mcp: FastMCP):
             raise
 
     @mcp.tool
-    async def load_notes_metadata_tool():
-        """Load metadata from all notes in the Obsidian vault."""
+    @instrument_tool
+    async def patch_note_tool(
+        title: str,
+        patches: list[NotePatch],
+        folder: str = "",
+        expected_mtime_ns: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+    ):
+        """Edit part of a note without sending its whole body.
+
+        Patch ops: append (text), insert_under_heading (heading, text,
+        position "start" or "end"), replace (find text or start/end byte
+        span, text) and set_frontmatter (values; null removes a key).
+        Pass expected_mtime_ns or expected_sha256 to only edit the note if
+        it has not changed since it was read.
+        """
+        try:
+            return await patch_note(
+                title, patches, folder, expected_mtime_ns, expected_sha256
+            )
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def append_to_note_tool(
+        title: str,
+        text: str,
+        folder: str = "",
+        expected_mtime_ns: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+    ):
+        """Append text to the end of a note without rewriting it."""
+        try:
+            return await append_to_note(
+                title, text, folder, expected_mtime_ns, expected_sha256
+            )
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def write_notes_batch_tool(writes: list[NoteWrite]):
+        """Create and update many notes in one all-or-nothing call.
+
+        Each entry is {"action": "create" | "update", "note": {...}}. Notes
+        are replaced atomically; if any note fails, none are changed.
+        """
         try:
-            return await load_all_notes_metadata()
+            return await write_notes_batch(writes)
         except Exception:
             raise
 
     @mcp.tool
+    @instrument_tool
+    async def load_notes_metadata_tool(
+        folder: str = "",
+        tag: Optional[str] = None,
+        type: Optional[str] = None,
+        category: Optional[str] = None,
+        modified_since: Optional[str] = None,
+        fields: Optional[list[str]] = None,
+        sort_by: Literal["path", "title", "created", "modified", "mtime"] = "path",
+        descending: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        rebuild: bool = False,
+    ):
+        """Load metadata from notes in the Obsidian vault, one page at a time.
+
+        Filter by folder prefix, tag, type, category or file modification time
+        (modified_since, ISO datetime), return only the requested fields and
+        pass next_cursor back as cursor to fetch the following page. Set
+        rebuild to discard the metadata index and re-parse the notes.
+        """
+        try:
+            return await query_notes_metadata(
+                folder=folder,
+                tag=tag,
+                type=type,
+                category=category,
+                modified_since=modified_since,
+                fields=fields,
+                sort_by=sort_by,
+                descending=descending,
+                limit=limit,
+                cursor=cursor,
+                rebuild=rebuild,
+            )
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
     async def insert_wikilinks_tool(title: str, phrases: list[str], folder: str = ""):
         """Insert wikilinks for specified phrases in an existing note."""
         try:
@@ -57,6 +242,86 @@ def register_note_tools(mcp: FastMCP):
         except Exception:
             raise
 
+    @mcp.tool
+    @instrument_tool
+    async def autolink_vault_tool(
+        folder: str = "",
+        dry_run: bool = True,
+        include_aliases: bool = True,
+        min_phrase_length: int = 3,
+        max_results: int = 200,
+    ):
+        """Link mentions of note titles and aliases across the whole vault.
+
+        Dry run (the default) reports per-note link counts and diffs without
+        writing anything.
+        """
+        try:
+            return await autolink_vault(
+                folder=folder,
+                dry_run=dry_run,
+                include_aliases=include_aliases,
+                min_phrase_length=min_phrase_length,
+                max_results=max_results,
+            )
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def recommend_related_tool(
+        folder: str = "",
+        limit: int = 5,
+        min_score: float = 0.2,
+        dry_run: bool = True,
+        replace: bool = False,
+        max_results: int = 200,
+    ):
+        """Recommend each note's most similar notes and fill their related field.
+
+        Notes are compared by topic using the semantic search embeddings.
+        Dry run (the default) reports the recommendations without writing;
+        otherwise new titles are added to each note's related frontmatter
+        (or replace it with replace=true).
+        """
+        try:
+            return await recommend_related(
+                folder=folder,
+                limit=limit,
+                min_score=min_score,
+                dry_run=dry_run,
+                replace=replace,
+                max_results=max_results,
+            )
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def cache_stats_tool():
+        """Show note cache hit/miss/eviction counters and vault watcher lag."""
+        try:
+            return await get_cache_stats()
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def tool_stats_tool():
+        """Show per-tool call counts, latency percentiles, file I/O and errors."""
+        try:
+            return await get_tool_stats()
+        except Exception:
+            raise
+
+    @mcp.resource("obsidian://stats")
+    async def tool_stats_resource() -> dict:
+        """Per-tool call counts, latency percentiles, file I/O and errors."""
+        try:
+            return await get_tool_stats()
+        except Exception:
+            raise
+
     @mcp.resource("file://obsidian/notes/{folder}/{title}")
     async def read_note_resource(title: str, folder: str = "") -> str:
         """Read a note's content as a resource."""
@@ -66,11 +331,43 @@ def register_note_tools(mcp: FastMCP):
         except Exception:
             raise
 
+    @mcp.resource("file://obsidian/outline/{folder}/{title}")
+    async def note_outline_resource(title: str, folder: str = "") -> dict:
+        """Read a note's heading tree as a resource."""
+        try:
+            return await get_note_outline(title, folder)
+        except Exception:
+            raise
+
+    @mcp.resource("file://obsidian/sections/{folder}/{title}/{heading}")
+    async def note_section_resource(title: str, heading: str, folder: str = "") -> str:
+        """Read one heading section of a note as a resource."""
+        try:
+            section = await read_note_section(title, heading, folder)
+            return section["content"]
+        except Exception:
+            raise
+
     return [
         create_note_tool,
         read_note_tool,
+        read_notes_batch_tool,
+        get_note_outline_tool,
+        read_note_section_tool,
+        read_note_lines_tool,
+        read_note_bytes_tool,
         update_note_tool,
+        patch_note_tool,
+        append_to_note_tool,
+        write_notes_batch_tool,
         insert_wikilinks_tool,
+        autolink_vault_tool,
+        recommend_related_tool,
+        cache_stats_tool,
+        tool_stats_tool,
+        tool_stats_resource,
         read_note_resource,
+        note_outline_resource,
+        note_section_resource,
         load_notes_metadata_tool,
     ]
@@ -0,0 +1,105 @@
+"""
+Search-related FastMCP registrations.
+These registrations wrap the search operations from tools.search_notes.
+"""
+
+from typing import Optional
+from fastmcp import FastMCP
+from tools import find_duplicates, find_note, search_notes, semantic_search
+from utils.instrumentation import instrument_tool
+
+
+def register_search_tools(mcp: FastMCP):
+    """Register all search-related tools with the FastMCP instance."""
+
+    @mcp.tool
+    @instrument_tool
+    async def search_notes_tool(
+        query: str,
+        folder: str = "",
+        tag: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        rebuild: bool = False,
+    ):
+        """Full-text search across the vault, ranked by relevance (BM25).
+
+        Supports words, "exact phrases", prefix*, OR / AND / NOT (or -word),
+        parentheses and field filters like title:word or tags:word. Returns
+        snippets with highlight offsets. Set rebuild to re-index every note
+        first.
+        """
+        try:
+            return await search_notes(
+                query,
+                folder=folder,
+                tag=tag,
+                limit=limit,
+                offset=offset,
+                rebuild=rebuild,
+            )
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def find_note_tool(
+        query: str, folder: str = "", limit: int = 10, min_score: float = 0.3
+    ):
+        """Find notes by approximate title, tolerating typos.
+
+        Matches note file names, titles and aliases by character-trigram
+        similarity and returns ranked candidates with their folder, path and
+        score (0 to 1).
+        """
+        try:
+            return await find_note(
+                query, folder=folder, limit=limit, min_score=min_score
+            )
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def semantic_search_tool(query: str, folder: str = "", limit: int = 10):
+        """Find the notes closest in topic to a free-text query.
+
+        Runs fully offline: note chunks are embedded locally and ranked by
+        cosine similarity to the query. Returns each note's best-matching
+        chunk (line, heading and preview).
+        """
+        try:
+            return await semantic_search(query, folder=folder, limit=limit)
+        except Exception:
+            raise
+
+    @mcp.tool
+    @instrument_tool
+    async def find_duplicates_tool(
+        folder: str = "",
+        threshold: float = 0.8,
+        min_words: int = 20,
+        max_clusters: int = 100,
+    ):
+        """Find groups of near-duplicate notes, e.g. repeated imports.
+
+        Note bodies are compared by estimated Jaccard similarity of their
+        word shingles (MinHash with locality-sensitive hashing). Returns
+        clusters of notes at or above the threshold, largest first.
+        """
+        try:
+            return await find_duplicates(
+                folder=folder,
+                threshold=threshold,
+                min_words=min_words,
+                max_clusters=max_clusters,
+            )
+        except Exception:
+            raise
+
+    return [
+        search_notes_tool,
+        find_note_tool,
+        semantic_search_tool,
+        find_duplicates_tool,
+    ]
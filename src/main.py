@@ -1,15 +1,18 @@
 from fastmcp import FastMCP
-from dotenv import load_dotenv
 import sys
 import signal
-from handlers import register_note_tools
-
-# Load environment variables
-load_dotenv()
+from handlers import (
+    register_note_tools,
+    register_search_tools,
+    register_link_tools,
+)
+from config.settings import get_vault_context, get_watch_mode
+from vault import start_watcher, stop_watcher
 
 
 def handle_shutdown(signum, frame):
     """Handle shutdown signals gracefully."""
+    stop_watcher()
     sys.exit(0)
 
 
@@ -22,8 +25,24 @@ try:
 
     # Register tools
     register_note_tools(mcp)
+    register_search_tools(mcp)
+    register_link_tools(mcp)
 
     if __name__ == "__main__":
+        # Resolve the vault once up front; tools report the error if it fails
+        try:
+            vault_path = get_vault_context().path
+        except Exception as e:
+            vault_path = None
+            print(f"Vault not available: {str(e)}", file=sys.stderr)
+
+        # Optionally keep caches and indexes in step with edits made in Obsidian
+        if vault_path is not None and get_watch_mode() != "off":
+            try:
+                start_watcher(vault_path)
+            except Exception as e:
+                print(f"Vault watcher disabled: {str(e)}", file=sys.stderr)
+
         try:
             mcp.run()
         except KeyboardInterrupt:
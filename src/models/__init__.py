@@ -1,3 +1,3 @@
-from models.note_models import ObsidianNote
+from models.note_models import ObsidianNote, NoteRef, NoteWrite, NotePatch
 
-__all__ = ["ObsidianNote"]
+__all__ = ["ObsidianNote", "NoteRef", "NoteWrite", "NotePatch"]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Literal
+from typing import Any, Literal, Optional
 
 
 class ObsidianNote(BaseModel):
@@ -14,3 +14,30 @@ class ObsidianNote(BaseModel):
         "note", "concept", "tool", "person", "framework", "paper", "project"
     ] = "note"
     summary: str = ""
+
+
+class NoteRef(BaseModel):
+    title: str
+    folder: str = ""
+
+
+class NoteWrite(BaseModel):
+    action: Literal["create", "update"] = "update"
+    note: ObsidianNote
+
+
+class NotePatch(BaseModel):
+    op: Literal["append", "insert_under_heading", "replace", "set_frontmatter"]
+    # append / insert_under_heading: the text to add; replace: the new text
+    text: str = ""
+    # insert_under_heading: the heading ("Parent#Child" for nested ones) and
+    # whether to insert right below it or at the end of its section
+    heading: Optional[str] = None
+    position: Literal["start", "end"] = "end"
+    # replace: the exact text to replace, or a byte span of the file
+    find: Optional[str] = None
+    replace_all: bool = False
+    start: Optional[int] = None
+    end: Optional[int] = None
+    # set_frontmatter: keys to set; a null value removes the key
+    values: dict[str, Any] = {}
@@ -0,0 +1,27 @@
+from search.duplicates import (
+    DuplicateIndex,
+    close_duplicate_indexes,
+    get_duplicate_index,
+)
+from search.inverted_index import SearchIndex, close_search_indexes, get_search_index
+from search.query import to_fts_query
+from search.related import top_similar
+from search.semantic import (
+    SemanticIndex,
+    close_semantic_indexes,
+    get_semantic_index,
+)
+
+__all__ = [
+    "SearchIndex",
+    "close_search_indexes",
+    "get_search_index",
+    "to_fts_query",
+    "top_similar",
+    "SemanticIndex",
+    "close_semantic_indexes",
+    "get_semantic_index",
+    "DuplicateIndex",
+    "close_duplicate_indexes",
+    "get_duplicate_index",
+]
@@ -0,0 +1,520 @@
+"""
+Near-duplicate detection with MinHash signatures and banded LSH.
+
+Each note body is cut into shingles of ``SHINGLE_WORDS`` consecutive words,
+and its MinHash signature keeps, for each of ``NUM_PERM`` random hash
+functions, the smallest hash of any shingle. The share of positions where
+two signatures agree estimates the Jaccard similarity of the notes' shingle
+sets. Signatures are split into bands, and only notes that agree on every
+row of some band are compared, so finding duplicates grows with the number
+of notes rather than with the number of pairs.
+
+Signatures are stored in SQLite by the hash of the note body, and notes
+by ``(mtime_ns, size, inode)`` fingerprint like the other indexes. A note
+is only read again when its fingerprint changes, and only shingled again
+when its body changed. Copies of the same body share one signature.
+
+Writes made through the server only mark their notes dirty; the next
+refresh re-signs them, so a write never waits for the index.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from config.settings import get_cache_dir
+from utils.frontmatter import split_frontmatter
+from utils.instrumentation import record_io
+from vault.changes import add_change_listener, forward_changes
+from vault.file_index import FileIndex
+from vault.metadata_index import Fingerprint, in_folder, normalize_folder
+
+SCHEMA_VERSION = "1"
+DB_FILENAME = "duplicates.sqlite"
+
+NUM_PERM = 128
+SHINGLE_WORDS = 5
+SEED = 1
+# Shingles hashed at a time, bounding the (NUM_PERM, shingles) work array
+SHINGLE_BLOCK = 16384
+# Word hashes remembered across notes; the cache is emptied when full
+WORD_CACHE_SIZE = 1 << 20
+# Signature pairs compared at a time
+PAIR_BLOCK = 65536
+# How much worse a missed duplicate is than a candidate pair that turns out
+# not to be one, which only costs a signature comparison
+FALSE_NEGATIVE_WEIGHT = 0.95
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_word_hashes: dict[str, int] = {}
+_SHIFT = np.uint64(32)
+# Odd multipliers combining word hashes into shingle hashes, and a band's
+# rows into one bucket key
+_MIXERS = np.random.default_rng(SEED).integers(
+    1, 1 << 63, size=max(SHINGLE_WORDS, NUM_PERM), dtype=np.uint64
+) | np.uint64(1)
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.casefold())
+
+
+def _shingles(words: list[str]) -> np.ndarray:
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    if len(_word_hashes) > WORD_CACHE_SIZE:
+        _word_hashes.clear()
+    hashes = []
+    for word in words:
+        hashed = _word_hashes.get(word)
+        if hashed is None:
+            hashed = _word_hashes[word] = zlib.crc32(word.encode("utf-8"))
+        hashes.append(hashed)
+    hashes = np.array(hashes, dtype=np.uint64)
+
+    width = min(SHINGLE_WORDS, len(words))
+    count = len(words) - width + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        # Wraps around modulo 2**64, which is what we want
+        shingles += hashes[offset : offset + count] * _MIXERS[offset]
+    # The high bits are the best mixed
+    shingles >>= _SHIFT
+    return shingles
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """
+    Hash the word shingles of a text.
+
+    Args:
+        text (str): The note body
+
+    Returns:
+        np.ndarray: One 32-bit hash per shingle, as uint64. A text with
+        fewer than ``SHINGLE_WORDS`` words is a single shingle; a text
+        without words has none.
+    """
+    return _shingles(_words(text))
+
+
+def _permutations(num_perm: int) -> tuple[np.ndarray, np.ndarray]:
+    # Multiply-shift hashing: the high 32 bits of ``a * x + b`` modulo 2**64
+    rng = np.random.default_rng(SEED)
+    a = rng.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def minhash_signatures(
+    shingle_sets: list[np.ndarray], num_perm: int = NUM_PERM
+) -> np.ndarray:
+    """
+    Compute the MinHash signatures of non-empty shingle sets.
+
+    Args:
+        shingle_sets (list[np.ndarray]): Shingle hashes per note, as returned
+            by ``shingle_hashes``; none may be empty
+        num_perm (int, optional): Signature length. Defaults to NUM_PERM.
+
+    Returns:
+        np.ndarray: A ``(notes, num_perm)`` uint32 matrix
+    """
+    a, b = _permutations(num_perm)
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint32)
+    start = 0
+    while start < len(shingle_sets):
+        # Take notes until the block is full, but always at least one
+        stop = start + 1
+        total = len(shingle_sets[start])
+        while (
+            stop < len(shingle_sets)
+            and total + len(shingle_sets[stop]) <= SHINGLE_BLOCK
+        ):
+            total += len(shingle_sets[stop])
+            stop += 1
+        shingles = np.concatenate(shingle_sets[start:stop])
+        offsets = np.cumsum([0] + [len(s) for s in shingle_sets[start : stop - 1]])
+        # In place, the cost of hashing is mostly the memory traffic
+        hashed = a * shingles
+        hashed += b
+        hashed >>= _SHIFT
+        signatures[start:stop] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = stop
+    return signatures
+
+
+@lru_cache(maxsize=None)
+def lsh_bands(threshold: float, num_perm: int = NUM_PERM) -> tuple[int, int]:
+    """
+    Choose how to split signatures into bands for a similarity threshold.
+
+    Two notes of similarity ``s`` share a bucket in at least one of ``b``
+    bands of ``r`` rows with probability ``1 - (1 - s**r)**b``. The split
+    minimizes the area of that curve below the threshold (candidates that
+    are then rejected) plus the area above it that is missed (duplicates
+    that are never compared), weighted by ``FALSE_NEGATIVE_WEIGHT``.
+
+    Args:
+        threshold (float): The Jaccard similarity that makes a duplicate
+        num_perm (int, optional): Signature length. Defaults to NUM_PERM.
+
+    Returns:
+        tuple[int, int]: The number of bands and rows per band
+    """
+    similarity = np.linspace(0, 1, 201)
+    below = similarity <= threshold
+    weights = np.where(below, 1 - FALSE_NEGATIVE_WEIGHT, FALSE_NEGATIVE_WEIGHT)
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            candidate = 1 - (1 - similarity**rows) ** bands
+            error = np.trapezoid(
+                np.where(below, candidate, 1 - candidate) * weights, similarity
+            )
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def _candidate_pairs(signatures: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """Pairs of rows that agree on every row of at least one band."""
+    count = len(signatures)
+    codes = []
+    for band in range(bands):
+        block = signatures[:, band * rows : (band + 1) * rows].astype(np.uint64)
+        keys = block @ _MIXERS[:rows]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        # Boundaries of runs of equal keys, i.e. of buckets
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        sizes = np.diff(np.r_[starts, count])
+        for start, size in zip(starts[sizes > 1].tolist(), sizes[sizes > 1].tolist()):
+            members = np.sort(order[start : start + size])
+            left, right = np.triu_indices(size, 1)
+            codes.append(members[left].astype(np.int64) * count + members[right])
+    if not codes:
+        return np.zeros((0, 2), dtype=np.int64)
+    codes = np.unique(np.concatenate(codes))
+    return np.stack([codes // count, codes % count], axis=1)
+
+
+def similar_pairs(
+    signatures: np.ndarray, threshold: float
+) -> list[tuple[int, int, float]]:
+    """
+    Find the pairs of signatures whose estimated similarity is high enough.
+
+    Args:
+        signatures (np.ndarray): A ``(notes, NUM_PERM)`` signature matrix
+        threshold (float): Lowest estimated Jaccard similarity to report
+
+    Returns:
+        list[tuple[int, int, float]]: ``(row, row, similarity)`` with the
+        lower row first. Rows with identical signatures are only paired with
+        the first of them, which is enough to group them.
+    """
+    if len(signatures) < 2:
+        return []
+    # Identical signatures are bucketed together once instead of per band
+    unique, inverse = np.unique(signatures, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    pairs = []
+    order = np.argsort(inverse, kind="stable")
+    groups = np.split(order, np.flatnonzero(np.diff(inverse[order])) + 1)
+    for group in groups:
+        pairs.extend(
+            (int(row), int(other), 1.0) for row in group[:1] for other in group[1:]
+        )
+    representatives = [int(group[0]) for group in groups]
+
+    bands, rows = lsh_bands(threshold, signatures.shape[1])
+    candidates = _candidate_pairs(unique, bands, rows)
+    for start in range(0, len(candidates), PAIR_BLOCK):
+        block = candidates[start : start + PAIR_BLOCK]
+        similarity = np.mean(unique[block[:, 0]] == unique[block[:, 1]], axis=1)
+        for (left, right), score in zip(block.tolist(), similarity.tolist()):
+            if score >= threshold:
+                pairs.append((representatives[left], representatives[right], score))
+    return [(min(a, b), max(a, b), score) for a, b, score in pairs]
+
+
+def _read_note(file_path: Path) -> tuple[str, int, np.ndarray]:
+    """Return the hash of a note's body, its word count and its shingles."""
+    data = file_path.read_bytes()
+    record_io(file_path, read=len(data))
+    body = data[split_frontmatter(data).body_offset :]
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    words = _words(body.decode("utf-8", errors="replace"))
+    return digest, len(words), _shingles(words)
+
+
+class DuplicateIndex(FileIndex):
+    """
+    MinHash signatures of a vault's note bodies.
+
+    The ``notes`` table holds each note's fingerprint, body hash and word
+    count, and ``signatures`` one signature per distinct body hash.
+    """
+
+    def __init__(self, vault_path: Path, db_path: Path):
+        super().__init__(vault_path)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        # rel_path -> (fingerprint, body hash, word count)
+        self._notes: dict[str, tuple[Fingerprint, str, int]] = {}
+        # body hash -> signature bytes, and the number of notes with that body
+        self._signatures: dict[str, bytes] = {}
+        self._references: Counter = Counter()
+        self._setup()
+        self._load()
+
+    def _setup(self) -> None:
+        expected = {
+            "schema_version": SCHEMA_VERSION,
+            "num_perm": str(NUM_PERM),
+            "shingle_words": str(SHINGLE_WORDS),
+            "seed": str(SEED),
+        }
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            info = dict(self._conn.execute("SELECT key, value FROM info"))
+            if any(info.get(key) != value for key, value in expected.items()):
+                # Signatures made with other parameters cannot be compared
+                self._conn.execute("DROP TABLE IF EXISTS notes")
+                self._conn.execute("DROP TABLE IF EXISTS signatures")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)",
+                    expected.items(),
+                )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS notes (
+                    rel_path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    words INTEGER NOT NULL
+                )
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS signatures (
+                    content_hash TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL
+                )
+                """)
+
+    def _load(self) -> None:
+        notes = self._conn.execute(
+            "SELECT rel_path, mtime_ns, size, inode, content_hash, words FROM notes"
+        )
+        for rel_path, mtime_ns, size, inode, content_hash, words in notes:
+            self._notes[rel_path] = ((mtime_ns, size, inode), content_hash, words)
+            self._references[content_hash] += 1
+        self._signatures = dict(
+            self._conn.execute("SELECT content_hash, signature FROM signatures")
+        )
+
+    def _store(self, updates: dict, deletions: list[str]) -> None:
+        """
+        Apply re-read notes and removed notes.
+
+        ``updates`` maps a note to ``(fingerprint, body hash, word count,
+        shingles)``; shingles are None when the body hash already has a
+        signature.
+        """
+        pending = {
+            content_hash: shingles
+            for _, content_hash, _, shingles in updates.values()
+            if shingles is not None
+            and len(shingles)
+            and content_hash not in self._signatures
+        }
+        signatures = {}
+        if pending:
+            matrix = minhash_signatures(list(pending.values()))
+            signatures = {
+                content_hash: row.tobytes()
+                for content_hash, row in zip(pending, matrix)
+            }
+
+        released = []
+        for rel_path in deletions:
+            entry = self._notes.pop(rel_path, None)
+            if entry is not None:
+                released.append(entry[1])
+        for rel_path, (fingerprint, content_hash, words, _) in updates.items():
+            entry = self._notes.get(rel_path)
+            if entry is not None:
+                released.append(entry[1])
+            self._notes[rel_path] = (fingerprint, content_hash, words)
+            self._references[content_hash] += 1
+        self._signatures.update(signatures)
+        # Signatures of bodies no note has any more
+        unused = []
+        for content_hash in released:
+            self._references[content_hash] -= 1
+            if not self._references[content_hash]:
+                del self._references[content_hash]
+                if self._signatures.pop(content_hash, None) is not None:
+                    unused.append(content_hash)
+
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM notes WHERE rel_path = ?",
+                [(rel_path,) for rel_path in deletions],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO notes (rel_path, mtime_ns, size, inode, "
+                "content_hash, words) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (rel_path, *fingerprint, content_hash, words)
+                    for rel_path, (
+                        fingerprint,
+                        content_hash,
+                        words,
+                        _,
+                    ) in updates.items()
+                ],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO signatures (content_hash, signature) "
+                "VALUES (?, ?)",
+                signatures.items(),
+            )
+            self._conn.executemany(
+                "DELETE FROM signatures WHERE content_hash = ?",
+                [(content_hash,) for content_hash in unused],
+            )
+
+    def _read(self, file_path: Path, rel_path: str, fingerprint: Fingerprint):
+        content_hash, words, shingles = _read_note(file_path)
+        if content_hash in self._signatures:
+            return fingerprint, content_hash, words, None
+        return fingerprint, content_hash, words, shingles
+
+    def _unreadable(self, fingerprint: Fingerprint):
+        return fingerprint, "", 0, None
+
+    def find(
+        self, threshold: float = 0.8, folder: str = "", min_words: int = 0
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Group notes whose bodies are near-duplicates of each other.
+
+        Notes are linked when their estimated Jaccard similarity reaches the
+        threshold, and each group is every note linked to another, directly
+        or through other notes.
+
+        Args:
+            threshold (float): Lowest estimated Jaccard similarity (0 to 1)
+            folder (str): Only compare notes in this folder or its subfolders
+            min_words (int): Ignore notes with fewer words than this
+
+        Returns:
+            list[list[tuple[str, float]]]: Per group, largest first, the
+            notes' vault-relative paths in path order with their estimated
+            similarity to the group's first note
+        """
+        folder = normalize_folder(folder)
+        with self._lock:
+            rel_paths = sorted(
+                rel_path
+                for rel_path, (_, content_hash, words) in self._notes.items()
+                if content_hash in self._signatures
+                and words >= min_words
+                and in_folder(rel_path, folder)
+            )
+            signatures = np.frombuffer(
+                b"".join(
+                    self._signatures[self._notes[rel_path][1]] for rel_path in rel_paths
+                ),
+                dtype=np.uint32,
+            ).reshape(len(rel_paths), NUM_PERM)
+
+        parents = list(range(len(rel_paths)))
+
+        def root(row: int) -> int:
+            while parents[row] != row:
+                parents[row] = parents[parents[row]]
+                row = parents[row]
+            return row
+
+        for left, right, _ in similar_pairs(signatures, threshold):
+            left, right = root(left), root(right)
+            if left != right:
+                parents[max(left, right)] = min(left, right)
+
+        groups: dict[int, list[int]] = {}
+        for row in range(len(rel_paths)):
+            groups.setdefault(root(row), []).append(row)
+        clusters = []
+        for rows in groups.values():
+            if len(rows) < 2:
+                continue
+            similarity = np.mean(signatures[rows] == signatures[rows[0]], axis=1)
+            clusters.append(
+                [
+                    (rel_paths[row], round(float(score), 3))
+                    for row, score in zip(rows, similarity)
+                ]
+            )
+        clusters.sort(key=lambda cluster: (-len(cluster), cluster[0][0]))
+        return clusters
+
+    def stats(self) -> dict:
+        """Return note and signature counts."""
+        with self._lock:
+            return {"notes": len(self._notes), "signatures": len(self._signatures)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: dict[Path, DuplicateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_duplicate_index(vault_path: Path) -> DuplicateIndex:
+    """Get the process-wide duplicate index for a vault, opening it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+        if index is not None and not index.db_path.exists():
+            # The cache directory was removed underneath us; start over
+            index.close()
+            index = None
+        if index is None:
+            index = DuplicateIndex(vault_path, get_cache_dir(vault_path) / DB_FILENAME)
+            _indexes[vault_path] = index
+        return index
+
+
+def close_duplicate_indexes() -> None:
+    """Close every open duplicate index, e.g. when the vault path changes."""
+    with _indexes_lock:
+        for index in _indexes.values():
+            index.close()
+        _indexes.clear()
+
+
+def _apply_changes(
+    vault_path: Path, notes: list[Path], removed_folders: list[Path], rescan: bool
+) -> None:
+    # Indexes that are not open yet catch up on their first refresh
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+    if index is not None:
+        forward_changes(index, vault_path, notes, removed_folders, rescan)
+
+
+add_change_listener(_apply_changes)
@@ -0,0 +1,125 @@
+"""
+Text encoders for semantic search.
+
+An encoder turns texts into fixed-size float32 vectors of unit length, so
+the dot product of two vectors is their cosine similarity. Encoders must
+run offline. The built-in ``HashingEncoder`` needs no model or corpus
+statistics, so a note's vector never changes unless its text does. Other
+encoders (e.g. a local sentence-transformer) can be plugged in with the
+OBSIDIAN_SEMANTIC_ENCODER setting.
+"""
+
+import importlib
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Protocol
+
+import numpy as np
+
+from config.settings import get_semantic_dim, get_semantic_encoder
+
+_TOKEN = re.compile(r"\w[\w'-]*\w|\w", re.UNICODE)
+
+# Words too common to say anything about a text's topic
+STOPWORDS = frozenset(
+    (
+        "a an and are as at be been but by can do does for from had has have he "
+        "her his how i if in into is it its me my no not of on or our she so "
+        "than that the their them then there these they this to too was we were "
+        "what when where which who why will with would you your"
+    ).split()
+)
+
+
+class Encoder(Protocol):
+    """What the semantic index needs from an encoder."""
+
+    # Identifies the encoder and its parameters; vectors made by a different
+    # encoder are discarded
+    name: str
+    dim: int
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Return a ``(len(texts), dim)`` float32 array of unit-length rows."""
+        ...
+
+
+class HashingEncoder:
+    """
+    Bag-of-words encoder using the hashing trick.
+
+    Each word and each pair of adjacent words is hashed to one of ``dim``
+    dimensions with a random sign, weighted by ``1 + log(count)``. Texts
+    that share vocabulary get similar vectors, with no model to download
+    and no fitting step.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+
+    def _features(self, text: str) -> Counter:
+        words = [
+            word
+            for word in _TOKEN.findall(text.casefold())
+            if word not in STOPWORDS and not word.isdigit()
+        ]
+        features = Counter(words)
+        features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        return features
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            indices = []
+            weights = []
+            for feature, count in features.items():
+                hashed = zlib.crc32(feature.encode("utf-8"))
+                weight = 1.0 + math.log(count)
+                # The top bit picks the sign, so collisions tend to cancel
+                weights.append(-weight if hashed & 0x80000000 else weight)
+                indices.append(hashed % self.dim)
+            vectors[row] = np.bincount(indices, weights, minlength=self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+def load_encoder(spec: str = "") -> Encoder:
+    """
+    Create the encoder named by a setting value.
+
+    Args:
+        spec (str, optional): ``hashing`` or a ``module:factory`` path whose
+            factory returns an encoder. Defaults to the
+            OBSIDIAN_SEMANTIC_ENCODER setting.
+
+    Returns:
+        Encoder: The encoder
+
+    Raises:
+        Exception: If the encoder cannot be loaded
+    """
+    spec = spec or get_semantic_encoder()
+    if spec == "hashing":
+        return HashingEncoder(get_semantic_dim())
+
+    module_name, _, factory_name = spec.partition(":")
+    if not module_name or not factory_name:
+        raise Exception(
+            f"OBSIDIAN_SEMANTIC_ENCODER must be 'hashing' or 'module:factory': {spec}"
+        )
+    try:
+        factory = getattr(importlib.import_module(module_name), factory_name)
+        encoder = factory()
+    except Exception as e:
+        raise Exception(f"Cannot load semantic encoder {spec}: {str(e)}")
+    for attribute in ("name", "dim", "encode"):
+        if not hasattr(encoder, attribute):
+            raise Exception(f"Semantic encoder {spec} has no {attribute}")
+    return encoder
@@ -0,0 +1,477 @@
+"""
+Persistent full-text index of the vault, stored as an SQLite FTS5 table.
+
+FTS5 keeps a positional inverted index per column, which gives phrase and
+prefix queries, boolean operators and BM25 ranking without loading any note
+bodies at query time. Like the metadata index, notes are tracked by
+``(mtime_ns, size, inode)`` fingerprint so a warm refresh only re-indexes what
+changed, and writes made through the server are applied incrementally.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from config.settings import get_cache_dir, get_scan_threads
+from search.query import to_fts_query
+from utils.frontmatter import parse_frontmatter, read_note_file
+from utils.instrumentation import in_call_context
+from vault.changes import add_change_listener, forward_changes, watch_generation
+from vault.metadata_index import (
+    Fingerprint,
+    RefreshMode,
+    build_note_metadata,
+    fingerprint_from_stat,
+    in_folder,
+    iter_markdown_files,
+    normalize_folder,
+)
+
+SCHEMA_VERSION = "1"
+INDEX_FILENAME = "search.sqlite"
+
+# BM25 column weights: title, aliases, tags, summary, body
+COLUMN_WEIGHTS = (10.0, 6.0, 4.0, 2.0, 1.0)
+
+# Highlight markers used inside FTS5 snippets; never present in note text
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+_ELLIPSIS = "…"
+_MARKERS = re.compile(f"([{_MARK_START}{_MARK_END}])")
+
+_BM25 = f"bm25(fts, {', '.join(str(weight) for weight in COLUMN_WEIGHTS)})"
+
+
+def parse_search_document(file_path: Path, rel_path: Path) -> dict:
+    """
+    Read a note and extract the fields that are indexed for search.
+
+    Args:
+        file_path (Path): Absolute path to the note
+        rel_path (Path): Path of the note relative to the vault root
+
+    Returns:
+        dict: The note's title, aliases, tags, summary and body
+
+    Raises:
+        Exception: If the note cannot be read
+    """
+    header, body = read_note_file(file_path)
+    frontmatter = {}
+    if header is not None:
+        try:
+            frontmatter = parse_frontmatter(header)
+        except Exception:
+            # Index the body even when the header is broken
+            pass
+    if not isinstance(frontmatter, dict):
+        frontmatter = {}
+    metadata = build_note_metadata(frontmatter, file_path, rel_path)
+    return {
+        "title": str(metadata["title"]),
+        "aliases": [str(alias) for alias in metadata["aliases"]],
+        "tags": [str(tag) for tag in metadata["tags"]],
+        "summary": str(metadata["summary"] or ""),
+        "body": body,
+    }
+
+
+def _split_snippet(snippet: str) -> dict:
+    """Strip the highlight markers from a snippet, recording their offsets."""
+    text = []
+    highlights = []
+    length = 0
+    start = 0
+    for piece in _MARKERS.split(snippet):
+        if piece == _MARK_START:
+            start = length
+        elif piece == _MARK_END:
+            highlights.append([start, length])
+        else:
+            text.append(piece)
+            length += len(piece)
+    return {"text": "".join(text), "highlights": highlights}
+
+
+class SearchIndex:
+    """
+    Full-text index of a vault's notes.
+
+    The ``docs`` table maps each note to a row id and its fingerprint, and
+    ``doc_tags`` holds its tags for filtering; the ``fts`` table holds the
+    indexed text under the same row id.
+    """
+
+    def __init__(self, vault_path: Path, db_path: Path):
+        self.vault_path = vault_path
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        # rel_path -> (fingerprint, row id)
+        self._docs: dict[str, tuple[Fingerprint, int]] = {}
+        # Watch generation during which the vault was last walked
+        self._scanned_generation: Optional[int] = None
+        # When the whole vault was last walked, or None if a walk is due
+        self._walked_at: Optional[float] = None
+        self._setup()
+        self._load()
+
+    def _setup(self) -> None:
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            row = self._conn.execute(
+                "SELECT value FROM info WHERE key = 'schema_version'"
+            ).fetchone()
+            if row is None or row[0] != SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS docs")
+                self._conn.execute("DROP TABLE IF EXISTS doc_tags")
+                self._conn.execute("DROP TABLE IF EXISTS fts")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO info (key, value) VALUES ('schema_version', ?)",
+                    (SCHEMA_VERSION,),
+                )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    id INTEGER PRIMARY KEY,
+                    rel_path TEXT NOT NULL UNIQUE,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    title TEXT
+                )
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS doc_tags (
+                    doc_id INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (doc_id, tag)
+                ) WITHOUT ROWID
+                """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS doc_tags_by_tag ON doc_tags (tag, doc_id)"
+            )
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5(
+                    title, aliases, tags, summary, body,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )
+                """)
+
+    def _load(self) -> None:
+        rows = self._conn.execute(
+            "SELECT rel_path, mtime_ns, size, inode, id FROM docs"
+        )
+        for rel_path, mtime_ns, size, inode, doc_id in rows:
+            self._docs[rel_path] = ((mtime_ns, size, inode), doc_id)
+
+    def _parse(self, file_path: Path, rel_path: Path) -> Optional[dict]:
+        try:
+            return parse_search_document(file_path, rel_path)
+        except Exception:
+            # Stored without a document, so it is not parsed until it changes
+            return None
+
+    def _parse_many(self, changed: list, threads: int) -> list:
+        if threads > 1 and len(changed) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                return list(
+                    pool.map(in_call_context(lambda item: self._parse(*item)), changed)
+                )
+        return [self._parse(file_path, rel_path) for file_path, rel_path in changed]
+
+    def _delete_rows(self, doc_ids: list[int]) -> None:
+        params = [(doc_id,) for doc_id in doc_ids]
+        self._conn.executemany("DELETE FROM fts WHERE rowid = ?", params)
+        self._conn.executemany("DELETE FROM doc_tags WHERE doc_id = ?", params)
+
+    def _store(self, updates: dict, deletions: list[str]) -> None:
+        with self._conn:
+            removed = [self._docs[key][1] for key in deletions if key in self._docs]
+            self._delete_rows(removed)
+            self._conn.executemany(
+                "DELETE FROM docs WHERE id = ?", [(doc_id,) for doc_id in removed]
+            )
+            for key in deletions:
+                self._docs.pop(key, None)
+
+            replaced = [self._docs[key][1] for key in updates if key in self._docs]
+            self._delete_rows(replaced)
+            for key, (fingerprint, document) in updates.items():
+                title = document["title"] if document is not None else None
+                existing = self._docs.get(key)
+                if existing is not None:
+                    doc_id = existing[1]
+                    self._conn.execute(
+                        "UPDATE docs SET mtime_ns = ?, size = ?, inode = ?, title = ? "
+                        "WHERE id = ?",
+                        (*fingerprint, title, doc_id),
+                    )
+                else:
+                    doc_id = self._conn.execute(
+                        "INSERT INTO docs (rel_path, mtime_ns, size, inode, title) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, *fingerprint, title),
+                    ).lastrowid
+                self._docs[key] = (fingerprint, doc_id)
+                if document is None:
+                    continue
+                self._conn.execute(
+                    "INSERT INTO fts (rowid, title, aliases, tags, summary, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        doc_id,
+                        document["title"],
+                        "\n".join(document["aliases"]),
+                        "\n".join(document["tags"]),
+                        document["summary"],
+                        document["body"],
+                    ),
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO doc_tags (doc_id, tag) VALUES (?, ?)",
+                    [(doc_id, tag) for tag in document["tags"]],
+                )
+
+    def refresh(
+        self,
+        mode: RefreshMode = "warm",
+        threads: Optional[int] = None,
+        folder: str = "",
+        max_age: float = 0,
+    ) -> None:
+        """
+        Bring the index up to date with the vault.
+
+        While the vault is watched and has been walked once since the watcher
+        started, a warm refresh is a no-op.
+
+        Args:
+            mode (RefreshMode): ``"warm"`` re-indexes only notes whose
+                fingerprint changed; ``"rebuild"`` re-indexes every note.
+            threads (Optional[int]): Reader threads. Defaults to the
+                OBSIDIAN_SCAN_THREADS setting.
+            folder (str): Only walk and refresh this folder (relative to the
+                vault root).
+            max_age (float): Without a watcher, skip a warm refresh that comes
+                within this many seconds of the last walk of the whole vault;
+                writes made through the server are applied from their change
+                notifications anyway.
+        """
+        generation = watch_generation(self.vault_path)
+        if mode == "warm":
+            if generation is not None and generation == self._scanned_generation:
+                return
+            walked_at = self._walked_at
+            if walked_at is not None and time.monotonic() - walked_at < max_age:
+                return
+        if threads is None:
+            threads = get_scan_threads()
+
+        folder = normalize_folder(folder)
+        with self._lock:
+            started = time.monotonic()
+            if mode == "rebuild":
+                self._store({}, [key for key in self._docs if in_folder(key, folder)])
+
+            seen = set()
+            changed = []
+            fingerprints = []
+            for file_path, stat in iter_markdown_files(self.vault_path / folder):
+                rel_path = file_path.relative_to(self.vault_path)
+                key = rel_path.as_posix()
+                seen.add(key)
+                fingerprint = fingerprint_from_stat(stat)
+                entry = self._docs.get(key)
+                if entry is not None and entry[0] == fingerprint:
+                    continue
+                changed.append((file_path, rel_path))
+                fingerprints.append((key, fingerprint))
+
+            parsed = self._parse_many(changed, threads)
+            updates = {
+                key: (fingerprint, document)
+                for (key, fingerprint), document in zip(fingerprints, parsed)
+            }
+            deletions = [
+                key for key in self._docs if key not in seen and in_folder(key, folder)
+            ]
+            self._store(updates, deletions)
+            if not folder:
+                self._scanned_generation = generation
+                self._walked_at = started
+
+    def record_changes(self, file_paths: list[Path]) -> None:
+        """Re-index notes known to have changed; missing notes are removed."""
+        with self._lock:
+            changed = []
+            fingerprints = []
+            deletions = []
+            for file_path in file_paths:
+                rel_path = file_path.relative_to(self.vault_path)
+                key = rel_path.as_posix()
+                try:
+                    stat = file_path.stat()
+                except FileNotFoundError:
+                    deletions.append(key)
+                    continue
+                changed.append((file_path, rel_path))
+                fingerprints.append((key, fingerprint_from_stat(stat)))
+
+            parsed = self._parse_many(changed, get_scan_threads())
+            updates = {
+                key: (fingerprint, document)
+                for (key, fingerprint), document in zip(fingerprints, parsed)
+            }
+            self._store(updates, deletions)
+
+    def forget_folder(self, folder: str) -> None:
+        """Remove every note under a folder that was deleted or moved away."""
+        folder = normalize_folder(folder)
+        with self._lock:
+            self._store({}, [key for key in self._docs if in_folder(key, folder)])
+
+    def mark_stale(self) -> None:
+        """Make the next warm refresh walk the vault again."""
+        self._scanned_generation = None
+        self._walked_at = None
+
+    def search(
+        self,
+        query: str,
+        folder: str = "",
+        tag: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        snippet_tokens: int = 16,
+    ) -> tuple[list[dict], int]:
+        """
+        Run a search query against the index.
+
+        Args:
+            query (str): Query in the syntax described in ``search.query``
+            folder (str): Only return notes in this folder or its subfolders
+            tag (Optional[str]): Only return notes with this tag
+            limit (int): Maximum number of results
+            offset (int): Number of top results to skip
+            snippet_tokens (int): Approximate snippet length in tokens
+
+        Returns:
+            tuple[list[dict], int]: The ranked results and the total number of
+            matching notes
+
+        Raises:
+            ValueError: If the query is invalid
+        """
+        fts_query = to_fts_query(query)
+        folder = normalize_folder(folder)
+
+        conditions = ["fts MATCH ?"]
+        params: list = [fts_query]
+        if folder:
+            conditions.append("docs.rel_path >= ? AND docs.rel_path < ?")
+            # All paths with the "folder/" prefix sort between these bounds
+            params += [folder + "/", folder + "0"]
+        if tag is not None:
+            conditions.append("docs.id IN (SELECT doc_id FROM doc_tags WHERE tag = ?)")
+            params.append(tag)
+        where = " AND ".join(conditions)
+
+        with self._lock:
+            try:
+                total = self._conn.execute(
+                    f"SELECT count(*) FROM fts JOIN docs ON docs.id = fts.rowid "
+                    f"WHERE {where}",
+                    params,
+                ).fetchone()[0]
+                rows = self._conn.execute(
+                    f"SELECT docs.rel_path, docs.title, {_BM25}, "
+                    f"snippet(fts, -1, ?, ?, ?, ?) "
+                    f"FROM fts JOIN docs ON docs.id = fts.rowid "
+                    f"WHERE {where} ORDER BY {_BM25}, docs.rel_path LIMIT ? OFFSET ?",
+                    [
+                        _MARK_START,
+                        _MARK_END,
+                        _ELLIPSIS,
+                        snippet_tokens,
+                        *params,
+                        limit,
+                        offset,
+                    ],
+                ).fetchall()
+            except sqlite3.OperationalError as e:
+                if "fts5" in str(e):
+                    raise ValueError(f"Invalid search query: {query}")
+                raise
+
+        results = []
+        for rel_path, title, rank, snippet in rows:
+            parent = Path(rel_path).parent
+            results.append(
+                {
+                    "path": str(self.vault_path / rel_path),
+                    "title": title,
+                    "folder": str(parent) if parent != Path(".") else "",
+                    # FTS5's bm25() is negative; larger scores are better here
+                    "score": -rank,
+                    "snippet": _split_snippet(snippet),
+                }
+            )
+        return results, total
+
+    def stats(self) -> dict:
+        """Return the number of indexed notes and the index size on disk."""
+        with self._lock:
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+            return {"notes": len(self._docs), "bytes": page_count * page_size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: dict[Path, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(vault_path: Path) -> SearchIndex:
+    """Get the process-wide search index for a vault, opening it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+        if index is not None and not index.db_path.exists():
+            # The cache directory was removed underneath us; start over
+            index.close()
+            index = None
+        if index is None:
+            db_path = get_cache_dir(vault_path) / INDEX_FILENAME
+            index = SearchIndex(vault_path, db_path)
+            _indexes[vault_path] = index
+        return index
+
+
+def close_search_indexes() -> None:
+    """Close every open search index, e.g. when the vault path changes."""
+    with _indexes_lock:
+        for index in _indexes.values():
+            index.close()
+        _indexes.clear()
+
+
+def _apply_changes(
+    vault_path: Path, notes: list[Path], removed_folders: list[Path], rescan: bool
+) -> None:
+    # Indexes that are not open yet catch up on their first refresh
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+    if index is not None:
+        forward_changes(index, vault_path, notes, removed_folders, rescan)
+
+
+add_change_listener(_apply_changes)
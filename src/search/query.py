@@ -0,0 +1,147 @@
+"""
+Translation of user search queries into SQLite FTS5 query syntax.
+
+Supported syntax:
+
+- ``word``: notes containing the word (all words must match by default)
+- ``"exact phrase"``: the words in this order
+- ``prefix*``: words starting with ``prefix``
+- ``a OR b``, ``a AND b``, ``a NOT b`` / ``a -b``, and parentheses
+- ``title:word``: match only in one field (title, aliases, tags, summary,
+  body); works with phrases and prefixes too. Any other ``name:`` prefix is
+  searched as part of the word.
+
+Every word and phrase is quoted before it reaches FTS5, so punctuation in the
+query (``self-attention``, ``C++``) never turns into FTS5 operators.
+"""
+
+import re
+
+FIELDS = ("title", "aliases", "tags", "summary", "body")
+
+OPERATORS = ("AND", "OR", "NOT")
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<open>\()
+      | (?P<close>\))
+      | (?P<negate>-)?(?:(?P<field>[a-z]+):)?
+        (?:"(?P<phrase>[^"]*)"|(?P<word>[^\s()"]+))(?P<prefix>\*)?
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _operand(match: re.Match) -> str:
+    text = match.group("phrase")
+    prefix = match.group("prefix") is not None
+    if text is None:
+        text = match.group("word")
+        if text.endswith("*"):
+            text = text.rstrip("*")
+            prefix = True
+    if not text.strip():
+        raise ValueError("Empty search term")
+
+    field = match.group("field")
+    if field is not None and field not in FIELDS:
+        # Not a field filter after all, e.g. a URL scheme
+        text = f"{field}:{text}"
+        field = None
+
+    operand = _quote(text) + ("*" if prefix else "")
+    if field is not None:
+        operand = f"{field} : {operand}"
+    return operand
+
+
+def _tokenize(query: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        if match is None:
+            raise ValueError(f"Cannot parse search query near: {query[position:]}")
+        position = match.end()
+        if match.group("open"):
+            tokens.append(("open", "("))
+        elif match.group("close"):
+            tokens.append(("close", ")"))
+        elif (
+            match.group("word") in OPERATORS
+            and not match.group("negate")
+            and match.group("field") is None
+            and match.group("prefix") is None
+        ):
+            tokens.append(("operator", match.group("word")))
+        elif match.group("negate"):
+            tokens.append(("negated", _operand(match)))
+        else:
+            tokens.append(("term", _operand(match)))
+    return tokens
+
+
+def _group(tokens: list[tuple[str, str]], position: int) -> tuple[str, int]:
+    items: list[tuple[str, str]] = []
+    while position < len(tokens):
+        kind, text = tokens[position]
+        position += 1
+        if kind == "open":
+            text, position = _group(tokens, position)
+            items.append(("term", f"({text})"))
+        elif kind == "close":
+            return _render(items), position
+        else:
+            items.append((kind, text))
+    return _render(items), position
+
+
+def _render(items: list[tuple[str, str]]) -> str:
+    positives = [text for kind, text in items if kind == "term"]
+    negated = [text for kind, text in items if kind == "negated"]
+    if not positives:
+        raise ValueError("A search query needs at least one term that is not negated")
+
+    operators = {text for kind, text in items if kind == "operator"}
+    if not negated or operators - {"AND"}:
+        # Leave explicit boolean structure as written; ``-x`` becomes ``NOT x``
+        return " ".join(
+            f"NOT {text}" if kind == "negated" else text for kind, text in items
+        )
+    # FTS5's NOT is binary (``a NOT b``), so negations go after the terms
+    return " ".join(positives + [f"NOT {text}" for text in negated])
+
+
+def to_fts_query(query: str) -> str:
+    """
+    Translate a search query into an FTS5 MATCH expression.
+
+    Args:
+        query (str): The user's query
+
+    Returns:
+        str: The equivalent FTS5 query
+
+    Raises:
+        ValueError: If the query is empty or malformed
+    """
+    tokens = _tokenize(query)
+    if not tokens:
+        raise ValueError("Search query cannot be empty")
+
+    depth = 0
+    for kind, _ in tokens:
+        depth += {"open": 1, "close": -1}.get(kind, 0)
+        if depth < 0:
+            raise ValueError("Unbalanced ')' in search query")
+    if depth:
+        raise ValueError("Unbalanced '(' in search query")
+
+    return _group(tokens, 0)[0]
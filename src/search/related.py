@@ -0,0 +1,91 @@
+"""
+Top-k nearest notes by blocked all-pairs cosine similarity.
+
+The similarity of every note to every other note is never held at once:
+a block of source rows is multiplied with the whole note matrix, the best
+``k`` columns of each row are taken with a partial sort, and the block is
+dropped before the next one. The block height is chosen so the note matrix
+and one block of scores stay under a memory cap.
+"""
+
+import numpy as np
+
+# Bytes per score in a block: the float32 score and the int64 index
+# ``argpartition`` returns for it
+BYTES_PER_SCORE = 12
+
+
+def block_rows(count: int, dim: int, max_bytes: int) -> int:
+    """
+    Get the number of source rows to score at a time.
+
+    Args:
+        count (int): Number of notes in the matrix
+        dim (int): Vector size
+        max_bytes (int): Cap on the note matrix plus one block of scores
+
+    Returns:
+        int: Rows per block, at least 1
+
+    Raises:
+        ValueError: If not even one row fits under the cap
+    """
+    matrix_bytes = count * dim * 4
+    row_bytes = max(count, 1) * BYTES_PER_SCORE + dim * 4
+    rows = (max_bytes - matrix_bytes) // row_bytes
+    if rows < 1:
+        needed = -(-(matrix_bytes + row_bytes) // 2**20)
+        raise ValueError(
+            f"{count} notes need a memory cap of at least {needed} MiB, "
+            f"not {max_bytes // 2**20} MiB"
+        )
+    return rows
+
+
+def top_similar(
+    matrix: np.ndarray,
+    sources: np.ndarray,
+    limit: int,
+    min_score: float,
+    max_bytes: int,
+) -> list[list[tuple[int, float]]]:
+    """
+    Find each source row's most similar other rows.
+
+    Args:
+        matrix (np.ndarray): ``(notes, dim)`` float32 matrix of unit vectors
+        sources (np.ndarray): Indices of the rows to find neighbours for
+        limit (int): Maximum neighbours per source
+        min_score (float): Lowest cosine similarity to keep
+        max_bytes (int): Cap on the note matrix plus one block of scores
+
+    Returns:
+        list[list[tuple[int, float]]]: Per source, ``(row, score)`` pairs,
+        best first. A row is never its own neighbour.
+    """
+    count = len(matrix)
+    limit = min(limit, count - 1)
+    if limit < 1:
+        return [[] for _ in sources]
+
+    step = block_rows(count, matrix.shape[1], max_bytes)
+    neighbours = []
+    for start in range(0, len(sources), step):
+        block = sources[start : start + step]
+        scores = matrix[block] @ matrix.T
+        scores[np.arange(len(block)), block] = -np.inf
+        top = np.argpartition(scores, count - limit, axis=1)[:, count - limit :]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        del scores
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for rows, row_scores in zip(top.tolist(), top_scores.tolist()):
+            neighbours.append(
+                [
+                    (row, score)
+                    for row, score in zip(rows, row_scores)
+                    if score >= min_score
+                ]
+            )
+    return neighbours
@@ -0,0 +1,547 @@
+"""
+Offline semantic search over note chunks.
+
+Notes are split into chunks at their headings (long sections also at line
+breaks) and each chunk is embedded by an encoder from ``search.encoders``.
+The vectors are the rows of a single ``.npy`` matrix opened with
+``np.memmap``, so the OS pages the matrix in rather than the server loading
+it, and a query is a blocked matrix-vector product followed by a partial
+sort. A small SQLite database next to the matrix maps rows to notes.
+
+Notes are tracked by ``(mtime_ns, size, inode)`` fingerprint like the other
+indexes, and a note whose fingerprint changed is only re-embedded if the
+hash of its body changed too, so editing frontmatter never re-embeds a
+note. Chunk lines are stored relative to the body for the same reason.
+Rows freed by removed chunks are reused; the matrix grows by half when it
+is full.
+
+Writes made through the server only mark their notes dirty; the next
+refresh (every search starts with one) re-embeds them, so a write never
+waits for the encoder.
+"""
+
+import hashlib
+import heapq
+import os
+import sqlite3
+import threading
+from bisect import bisect_right
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config.settings import get_cache_dir, get_semantic_dtype
+from search.encoders import Encoder, load_encoder
+from utils.frontmatter import split_frontmatter
+from utils.instrumentation import record_io
+from vault.changes import add_change_listener, forward_changes
+from vault.file_index import NOTE_BATCH, FileIndex
+from vault.metadata_index import Fingerprint, in_folder, normalize_folder
+from vault.outline import parse_outline
+
+SCHEMA_VERSION = "2"
+INDEX_DIRNAME = "semantic"
+DB_FILENAME = "chunks.sqlite"
+VECTORS_FILENAME = "vectors.npy"
+
+# Chunks are split at line breaks beyond this size
+CHUNK_BYTES = 1500
+PREVIEW_CHARS = 200
+MIN_CAPACITY = 1024
+# Rows scored at a time, so a float16 matrix is converted in slices
+QUERY_BLOCK_ROWS = 65536
+# Notes read, embedded and committed together during a refresh
+NOTE_BATCH = 256
+
+
+def chunk_note(data: bytes) -> list[tuple[int, str, str]]:
+    """
+    Split a note into the chunks that are embedded.
+
+    Args:
+        data (bytes): The raw note file contents
+
+    Returns:
+        list[tuple[int, str, str]]: ``(line, heading, text)`` per non-empty
+        chunk, where ``line`` is the 1-based line the chunk starts on and
+        ``heading`` the title of the section it belongs to
+    """
+    outline = parse_outline(data)
+    starts = [outline.body_offset]
+    titles = [""]
+    for heading in outline.headings:
+        if heading.offset > starts[-1]:
+            starts.append(heading.offset)
+            titles.append(heading.title)
+        else:
+            titles[-1] = heading.title
+    starts.append(len(data))
+
+    line_starts = outline.line_starts
+    chunks = []
+    for (start, end), title in zip(zip(starts, starts[1:]), titles):
+        while start < end:
+            stop = end
+            if stop - start > CHUNK_BYTES:
+                # Cut at the last line break that keeps the chunk small enough
+                index = bisect_right(line_starts, start + CHUNK_BYTES) - 1
+                if line_starts[index] > start:
+                    stop = line_starts[index]
+                else:
+                    stop = start + CHUNK_BYTES
+            text = data[start:stop].decode("utf-8", errors="replace").strip()
+            if text:
+                line = bisect_right(line_starts, start)
+                chunks.append((line, title, text))
+            start = stop
+    return chunks
+
+
+def _read_note(file_path: Path) -> tuple[str, int, list[tuple[int, str, str]]]:
+    """Return the hash of a note's body, its first line and its chunks."""
+    data = file_path.read_bytes()
+    record_io(file_path, read=len(data))
+    body_offset = split_frontmatter(data).body_offset
+    body_line = data.count(b"\n", 0, body_offset) + 1
+    digest = hashlib.blake2b(data[body_offset:], digest_size=16).hexdigest()
+    chunks = [
+        (line - body_line, heading, text) for line, heading, text in chunk_note(data)
+    ]
+    return digest, body_line, chunks
+
+
+class SemanticIndex(FileIndex):
+    """
+    Embeddings of a vault's note chunks.
+
+    The ``notes`` table holds each note's fingerprint, body hash and the
+    line its body starts on, and ``chunks`` the note, start line within the
+    body, heading and a preview of each matrix row in use.
+    """
+
+    def __init__(self, vault_path: Path, directory: Path, encoder: Encoder, dtype: str):
+        super().__init__(vault_path)
+        self.directory = directory
+        self.db_path = directory / DB_FILENAME
+        self.vectors_path = directory / VECTORS_FILENAME
+        self.encoder = encoder
+        self.dtype = np.dtype(dtype)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # rel_path -> (fingerprint, content hash, matrix rows)
+        self._notes: dict[str, tuple[Fingerprint, str, tuple[int, ...]]] = {}
+        self._vectors: Optional[np.memmap] = None
+        # Rows holding a chunk's vector; the others are free
+        self._live = np.zeros(0, dtype=bool)
+        self._row_paths: list[Optional[str]] = []
+        self._free_rows: list[int] = []
+        self._setup()
+        self._load()
+
+    def _setup(self) -> None:
+        expected = {
+            "schema_version": SCHEMA_VERSION,
+            "encoder": self.encoder.name,
+            "dim": str(self.encoder.dim),
+            "dtype": self.dtype.name,
+        }
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            info = dict(self._conn.execute("SELECT key, value FROM info"))
+            if any(info.get(key) != value for key, value in expected.items()):
+                # Vectors from another encoder or layout cannot be mixed in
+                self._conn.execute("DROP TABLE IF EXISTS notes")
+                self._conn.execute("DROP TABLE IF EXISTS chunks")
+                self.vectors_path.unlink(missing_ok=True)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)",
+                    expected.items(),
+                )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS notes (
+                    rel_path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    body_line INTEGER NOT NULL
+                )
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    row INTEGER PRIMARY KEY,
+                    rel_path TEXT NOT NULL,
+                    line INTEGER NOT NULL,
+                    heading TEXT NOT NULL,
+                    preview TEXT NOT NULL
+                )
+                """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS chunks_by_note ON chunks (rel_path)"
+            )
+
+    def _load(self) -> None:
+        rows: dict[str, list[int]] = {}
+        for row, rel_path in self._conn.execute("SELECT row, rel_path FROM chunks"):
+            rows.setdefault(rel_path, []).append(row)
+        notes = self._conn.execute(
+            "SELECT rel_path, mtime_ns, size, inode, content_hash FROM notes"
+        )
+        for rel_path, mtime_ns, size, inode, content_hash in notes:
+            self._notes[rel_path] = (
+                (mtime_ns, size, inode),
+                content_hash,
+                tuple(sorted(rows.get(rel_path, ()))),
+            )
+
+        if self.vectors_path.exists():
+            try:
+                vectors = np.load(self.vectors_path, mmap_mode="r+")
+                usable = vectors.ndim == 2 and vectors.dtype == self.dtype
+                usable = usable and vectors.shape[1] == self.encoder.dim
+                usable = usable and all(
+                    row < vectors.shape[0]
+                    for _, _, note_rows in self._notes.values()
+                    for row in note_rows
+                )
+            except Exception:
+                usable = False
+            if usable:
+                self._open(vectors)
+                return
+        if self._notes:
+            # Without a usable matrix every note has to be embedded again
+            with self._conn:
+                self._conn.execute("DELETE FROM chunks")
+                self._conn.execute("DELETE FROM notes")
+            self._notes.clear()
+
+    def _open(self, vectors: np.memmap) -> None:
+        capacity = vectors.shape[0]
+        self._vectors = vectors
+        self._live = np.zeros(capacity, dtype=bool)
+        self._row_paths = [None] * capacity
+        for rel_path, (_, _, rows) in self._notes.items():
+            for row in rows:
+                self._live[row] = True
+                self._row_paths[row] = rel_path
+        self._free_rows = np.flatnonzero(~self._live).tolist()
+
+    def _grow(self, needed: int) -> None:
+        """Make room for ``needed`` more rows, copying the matrix to a larger file."""
+        capacity = len(self._row_paths)
+        new_capacity = max(MIN_CAPACITY, capacity + capacity // 2)
+        new_capacity = max(new_capacity, capacity - len(self._free_rows) + needed)
+        temp_path = self.vectors_path.with_suffix(".tmp.npy")
+        vectors = np.lib.format.open_memmap(
+            temp_path,
+            mode="w+",
+            dtype=self.dtype,
+            shape=(new_capacity, self.encoder.dim),
+        )
+        for start in range(0, capacity, QUERY_BLOCK_ROWS):
+            end = min(start + QUERY_BLOCK_ROWS, capacity)
+            vectors[start:end] = self._vectors[start:end]
+        vectors.flush()
+        del vectors
+        self._vectors = None
+        os.replace(temp_path, self.vectors_path)
+
+        self._vectors = np.load(self.vectors_path, mmap_mode="r+")
+        self._live = np.concatenate(
+            [self._live, np.zeros(new_capacity - capacity, dtype=bool)]
+        )
+        self._row_paths.extend([None] * (new_capacity - capacity))
+        self._free_rows.extend(range(capacity, new_capacity))
+        heapq.heapify(self._free_rows)
+
+    def _allocate(self, count: int) -> list[int]:
+        if count > len(self._free_rows):
+            self._grow(count)
+        # Free rows are a heap, so the lowest rows are reused first
+        return [heapq.heappop(self._free_rows) for _ in range(count)]
+
+    def _release(self, rows: tuple[int, ...]) -> None:
+        for row in rows:
+            self._live[row] = False
+            self._row_paths[row] = None
+            heapq.heappush(self._free_rows, row)
+
+    def _store(self, updates: dict, deletions: list[str]) -> None:
+        """
+        Apply re-read notes and removed notes.
+
+        ``updates`` maps a note to ``(fingerprint, content hash, body line,
+        chunks)``; chunks are None when the content hash is unchanged, so the
+        note keeps its vectors.
+        """
+        # Embed new chunks into rows that are free in the committed state,
+        # so a crash before the commit leaves the index consistent
+        embedded: dict[str, tuple[int, ...]] = {}
+        pending = [
+            (rel_path, chunk)
+            for rel_path, (_, _, _, chunks) in updates.items()
+            if chunks
+            for chunk in chunks
+        ]
+        rows = self._allocate(len(pending))
+        if pending:
+            texts = [
+                f"{Path(rel_path).stem}\n{text}" for rel_path, (_, _, text) in pending
+            ]
+            vectors = self.encoder.encode(texts)
+            self._vectors[rows] = vectors.astype(self.dtype, copy=False)
+            self._vectors.flush()
+        for row, (rel_path, _) in zip(rows, pending):
+            embedded[rel_path] = embedded.get(rel_path, ()) + (row,)
+
+        replaced = [
+            rel_path
+            for rel_path, (_, _, _, chunks) in updates.items()
+            if chunks is not None and rel_path in self._notes
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM chunks WHERE rel_path = ?",
+                [(rel_path,) for rel_path in deletions + replaced],
+            )
+            self._conn.executemany(
+                "DELETE FROM notes WHERE rel_path = ?",
+                [(rel_path,) for rel_path in deletions],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO notes (rel_path, mtime_ns, size, inode, "
+                "content_hash, body_line) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (rel_path, *fingerprint, content_hash, body_line)
+                    for rel_path, (
+                        fingerprint,
+                        content_hash,
+                        body_line,
+                        _,
+                    ) in updates.items()
+                ],
+            )
+            self._conn.executemany(
+                "INSERT INTO chunks (row, rel_path, line, heading, preview) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (row, rel_path, line, heading, text[:PREVIEW_CHARS])
+                    for row, (rel_path, (line, heading, text)) in zip(rows, pending)
+                ],
+            )
+
+        for rel_path in deletions:
+            entry = self._notes.pop(rel_path, None)
+            if entry is not None:
+                self._release(entry[2])
+        for rel_path, (fingerprint, content_hash, _, chunks) in updates.items():
+            previous = self._notes.get(rel_path)
+            if chunks is None and previous is not None:
+                note_rows = previous[2]
+            else:
+                if previous is not None:
+                    self._release(previous[2])
+                note_rows = embedded.get(rel_path, ())
+            for row in note_rows:
+                self._live[row] = True
+                self._row_paths[row] = rel_path
+            self._notes[rel_path] = (fingerprint, content_hash, note_rows)
+
+    def _read(self, file_path: Path, rel_path: str, fingerprint: Fingerprint):
+        content_hash, body_line, chunks = _read_note(file_path)
+        previous = self._notes.get(rel_path)
+        if previous is not None and previous[1] == content_hash:
+            return fingerprint, content_hash, body_line, None
+        return fingerprint, content_hash, body_line, chunks
+
+    def _unreadable(self, fingerprint: Fingerprint):
+        return fingerprint, "", 1, []
+
+    def _scores(self, vector: np.ndarray) -> np.ndarray:
+        capacity = len(self._row_paths)
+        scores = np.empty(capacity, dtype=np.float32)
+        for start in range(0, capacity, QUERY_BLOCK_ROWS):
+            block = self._vectors[start : start + QUERY_BLOCK_ROWS]
+            scores[start : start + len(block)] = (
+                np.asarray(block, dtype=np.float32) @ vector
+            )
+        return scores
+
+    def note_vectors(self) -> tuple[list[str], np.ndarray]:
+        """
+        Return one unit vector per note, the normalized mean of its chunks.
+
+        Returns:
+            tuple[list[str], np.ndarray]: The notes' vault-relative paths in
+            path order and a ``(notes, dim)`` float32 matrix of their vectors.
+            Notes without any text are left out.
+        """
+        with self._lock:
+            rel_paths = sorted(
+                rel_path for rel_path, (_, _, rows) in self._notes.items() if rows
+            )
+            matrix = np.empty((len(rel_paths), self.encoder.dim), dtype=np.float32)
+            # Chunk rows are gathered a batch of notes at a time, so a float16
+            # matrix is converted in slices
+            for start in range(0, len(rel_paths), NOTE_BATCH):
+                batch = [
+                    self._notes[rel_path][2]
+                    for rel_path in rel_paths[start : start + NOTE_BATCH]
+                ]
+                rows = [row for note_rows in batch for row in note_rows]
+                offsets = np.cumsum([0] + [len(note_rows) for note_rows in batch[:-1]])
+                chunks = np.asarray(self._vectors[rows], dtype=np.float32)
+                matrix[start : start + len(batch)] = np.add.reduceat(
+                    chunks, offsets, axis=0
+                )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return rel_paths, matrix
+
+    def search(self, query: str, folder: str = "", limit: int = 10) -> list[dict]:
+        """
+        Find the notes whose chunks are closest in meaning to a query.
+
+        Args:
+            query (str): Free text describing what to look for
+            folder (str): Only return notes in this folder or its subfolders
+            limit (int): Maximum number of notes
+
+        Returns:
+            list[dict]: Per note, best first: ``path``, ``title``, ``folder``,
+            the cosine ``score`` of its best chunk, and that ``chunk``'s
+            start ``line``, ``heading`` and a ``preview`` of its text
+        """
+        vector = self.encoder.encode([query])[0].astype(np.float32, copy=False)
+        folder = normalize_folder(folder)
+        with self._lock:
+            if self._vectors is None or not vector.any():
+                return []
+            scores = self._scores(vector)
+            allowed = self._live
+            if folder:
+                allowed = allowed & np.fromiter(
+                    (
+                        path is not None and in_folder(path, folder)
+                        for path in self._row_paths
+                    ),
+                    dtype=bool,
+                    count=len(self._row_paths),
+                )
+            scores[~allowed] = -np.inf
+            candidates = int(np.count_nonzero(allowed))
+
+            # Take the best chunks, widening until enough distinct notes are in
+            best: dict[str, tuple[float, int]] = {}
+            count = min(candidates, limit * 4)
+            while count:
+                top = np.argpartition(-scores, count - 1)[:count]
+                top = top[np.argsort(-scores[top], kind="stable")]
+                best = {}
+                exhausted = count == candidates
+                for row in top.tolist():
+                    score = float(scores[row])
+                    if score <= 0:
+                        # Unrelated chunks are never results
+                        exhausted = True
+                        break
+                    rel_path = self._row_paths[row]
+                    if rel_path not in best:
+                        best[rel_path] = (score, row)
+                        if len(best) == limit:
+                            break
+                if len(best) == limit or exhausted:
+                    break
+                count = min(candidates, count * 4)
+
+            ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))
+            rows = [row for _, (_, row) in ranked]
+            details = {
+                row: (line, heading, preview)
+                for row, line, heading, preview in self._conn.execute(
+                    f"SELECT row, line + body_line, heading, preview "
+                    f"FROM chunks JOIN notes USING (rel_path) "
+                    f"WHERE row IN ({', '.join('?' * len(rows))})",
+                    rows,
+                )
+            }
+
+        results = []
+        for rel_path, (score, row) in ranked:
+            parent = Path(rel_path).parent
+            line, heading, preview = details[row]
+            results.append(
+                {
+                    "path": str(self.vault_path / rel_path),
+                    "title": Path(rel_path).stem,
+                    "folder": str(parent) if parent != Path(".") else "",
+                    "score": round(score, 4),
+                    "chunk": {"line": line, "heading": heading, "preview": preview},
+                }
+            )
+        return results
+
+    def stats(self) -> dict:
+        """Return note and chunk counts and the size of the matrix."""
+        with self._lock:
+            return {
+                "notes": len(self._notes),
+                "chunks": int(np.count_nonzero(self._live)),
+                "capacity": len(self._row_paths),
+                "bytes": (
+                    self.vectors_path.stat().st_size if self._vectors is not None else 0
+                ),
+                "encoder": self.encoder.name,
+                "dtype": self.dtype.name,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            self._vectors = None
+
+
+_indexes: dict[Path, SemanticIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_semantic_index(vault_path: Path) -> SemanticIndex:
+    """Get the process-wide semantic index for a vault, opening it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+        if index is not None and not index.db_path.exists():
+            # The cache directory was removed underneath us; start over
+            index.close()
+            index = None
+        if index is None:
+            directory = get_cache_dir(vault_path) / INDEX_DIRNAME
+            directory.mkdir(exist_ok=True)
+            index = SemanticIndex(
+                vault_path, directory, load_encoder(), get_semantic_dtype()
+            )
+            _indexes[vault_path] = index
+        return index
+
+
+def close_semantic_indexes() -> None:
+    """Close every open semantic index, e.g. when the vault path changes."""
+    with _indexes_lock:
+        for index in _indexes.values():
+            index.close()
+        _indexes.clear()
+
+
+def _apply_changes(
+    vault_path: Path, notes: list[Path], removed_folders: list[Path], rescan: bool
+) -> None:
+    # Indexes that are not open yet catch up on their first refresh
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+    if index is not None:
+        forward_changes(index, vault_path, notes, removed_folders, rescan)
+
+
+add_change_listener(_apply_changes)
@@ -1,13 +1,59 @@
 from tools.create_note import create_note
 from tools.read_note import read_note
+from tools.read_notes_batch import read_notes_batch
+from tools.read_note_parts import (
+    get_note_outline,
+    read_note_section,
+    read_note_lines,
+    read_note_bytes,
+)
 from tools.update_note import update_note
-from tools.load_metadata import load_all_notes_metadata
+from tools.patch_note import patch_note, append_to_note
+from tools.write_notes_batch import write_notes_batch
+from tools.load_metadata import load_all_notes_metadata, query_notes_metadata
 from tools.insert_wikilinks_note import insert_wikilinks_in_note
+from tools.autolink_vault import autolink_vault
+from tools.cache_stats import get_cache_stats
+from tools.tool_stats import get_tool_stats
+from tools.search_notes import search_notes
+from tools.find_note import find_note
+from tools.semantic_search import semantic_search
+from tools.recommend_related import recommend_related
+from tools.find_duplicates import find_duplicates
+from tools.links import (
+    find_backlinks,
+    get_outgoing_links,
+    find_orphan_notes,
+    find_unresolved_links,
+    get_note_neighborhood,
+)
 
 __all__ = [
     "create_note",
     "read_note",
+    "read_notes_batch",
+    "get_note_outline",
+    "read_note_section",
+    "read_note_lines",
+    "read_note_bytes",
     "update_note",
+    "patch_note",
+    "append_to_note",
+    "write_notes_batch",
     "load_all_notes_metadata",
+    "query_notes_metadata",
     "insert_wikilinks_in_note",
+    "autolink_vault",
+    "get_cache_stats",
+    "get_tool_stats",
+    "search_notes",
+    "find_note",
+    "semantic_search",
+    "recommend_related",
+    "find_duplicates",
+    "find_backlinks",
+    "get_outgoing_links",
+    "find_orphan_notes",
+    "find_unresolved_links",
+    "get_note_neighborhood",
 ]
@@ -0,0 +1,186 @@
+import difflib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from config.settings import get_scan_threads, get_vault_path
+from utils.atomic_write import atomic_write, fsync_directory
+from utils.async_io import locked_paths, run_blocking
+from utils.frontmatter import split_frontmatter
+from utils.insert_wikilinks import WikilinkLinker
+from utils.instrumentation import in_call_context, record_io
+from vault.changes import notify_changes
+from vault.metadata_index import get_metadata_index
+from vault.note_cache import get_note_cache
+
+
+def _build_dictionary(
+    entries: list, include_aliases: bool, min_phrase_length: int
+) -> tuple[dict[str, str], dict[str, set[str]]]:
+    """Map every title/alias phrase to the note it links to."""
+    targets: dict[str, str] = {}
+    own_phrases: dict[str, set[str]] = {}
+    # Entries are in path order, so duplicate titles resolve deterministically
+    for rel_path, _, metadata in entries:
+        target = Path(rel_path).stem
+        phrases = {target, str(metadata["title"])}
+        if include_aliases:
+            phrases.update(str(alias) for alias in metadata["aliases"])
+        # Square brackets and pipes would break the generated link syntax
+        phrases = {
+            phrase.strip()
+            for phrase in phrases
+            if len(phrase.strip()) >= min_phrase_length
+            and not any(ch in phrase for ch in "[]|")
+        }
+        own_phrases[rel_path] = phrases
+        for phrase in phrases:
+            targets.setdefault(phrase, target)
+    return targets, own_phrases
+
+
+def _unified_diff(original: str, modified: str, path: str, max_lines: int) -> str:
+    lines = list(
+        difflib.unified_diff(
+            original.splitlines(),
+            modified.splitlines(),
+            fromfile=path,
+            tofile=path,
+            lineterm="",
+        )
+    )
+    if len(lines) > max_lines:
+        lines = lines[:max_lines] + [f"... {len(lines) - max_lines} more diff lines"]
+    return "\n".join(lines)
+
+
+async def autolink_vault(
+    folder: str = "",
+    dry_run: bool = True,
+    include_aliases: bool = True,
+    min_phrase_length: int = 3,
+    max_results: int = 200,
+    max_diff_lines: int = 40,
+) -> dict:
+    """
+    Insert wikilinks to every note's title and aliases across the vault.
+
+    The phrase dictionary is built from the metadata index and compiled once;
+    notes are then linked over a thread pool and only notes that actually
+    change are written. A note never links to itself, and aliases are linked
+    as ``[[Note|alias]]``. Frontmatter is left byte-for-byte untouched.
+
+    Args:
+        folder (str, optional): Only link notes in this folder. The phrase
+            dictionary always covers the whole vault. Defaults to "".
+        dry_run (bool, optional): Report what would change without writing.
+            Defaults to True.
+        include_aliases (bool, optional): Also link frontmatter aliases.
+            Defaults to True.
+        min_phrase_length (int, optional): Ignore titles and aliases shorter
+            than this. Defaults to 3.
+        max_results (int, optional): Maximum per-note entries to return.
+            Defaults to 200.
+        max_diff_lines (int, optional): Maximum diff lines per note in dry-run
+            mode. Defaults to 40.
+
+    Returns:
+        dict: Counts, throughput and per-note changes (with diffs in dry-run
+        mode)
+
+    Raises:
+        Exception: If the vault cannot be scanned
+    """
+    try:
+        vault_path = get_vault_path()
+
+        def run():
+            start = time.perf_counter()
+            index = get_metadata_index(vault_path)
+            note_cache = get_note_cache()
+            index.refresh()
+            entries = index.entries()
+            targets, own_phrases = _build_dictionary(
+                entries, include_aliases, min_phrase_length
+            )
+            linker = WikilinkLinker(targets, targets)
+            folder_entries = index.entries(folder) if folder else entries
+
+            def link_note(rel_path: str):
+                file_path = vault_path / rel_path
+                # Notes are rewritten under their lock, like single-note edits
+                lock = nullcontext() if dry_run else locked_paths(file_path)
+                try:
+                    with lock:
+                        data = file_path.read_bytes()
+                        record_io(file_path, read=len(data))
+                        body_offset = split_frontmatter(data).body_offset
+                        body = data[body_offset:].decode("utf-8")
+                        linked, count = linker.link_with_count(
+                            body, exclude=own_phrases[rel_path]
+                        )
+                        if count and not dry_run:
+                            atomic_write(
+                                file_path,
+                                data[:body_offset] + linked.encode("utf-8"),
+                                sync_directory=False,
+                            )
+                            note_cache.invalidate(file_path)
+                except Exception as e:
+                    return rel_path, 0, 0, None, str(e)
+                diff = None
+                if count and dry_run:
+                    diff = _unified_diff(body, linked, rel_path, max_diff_lines)
+                return rel_path, len(data), count, diff, None
+
+            with ThreadPoolExecutor(max_workers=get_scan_threads()) as pool:
+                results = list(
+                    pool.map(
+                        in_call_context(link_note),
+                        [rel_path for rel_path, _, _ in folder_entries],
+                    )
+                )
+
+            if not dry_run:
+                rewritten = [vault_path / result[0] for result in results if result[2]]
+                # One directory flush per folder instead of one per note
+                for directory in {file_path.parent for file_path in rewritten}:
+                    fsync_directory(directory)
+                # Re-index every rewritten note in one batch
+                notify_changes(vault_path, rewritten)
+
+            elapsed = time.perf_counter() - start
+            changes = []
+            errors = []
+            for rel_path, _, count, diff, error in results:
+                if error is not None:
+                    errors.append({"path": str(vault_path / rel_path), "error": error})
+                if not count:
+                    continue
+                change = {"path": str(vault_path / rel_path), "links_added": count}
+                if diff is not None:
+                    change["diff"] = diff
+                changes.append(change)
+
+            bytes_scanned = sum(result[1] for result in results)
+            return {
+                "dry_run": dry_run,
+                "phrases": len(targets),
+                "notes_scanned": len(results),
+                "notes_changed": len(changes),
+                "links_added": sum(change["links_added"] for change in changes),
+                "bytes_scanned": bytes_scanned,
+                "elapsed_seconds": round(elapsed, 3),
+                "notes_per_second": (
+                    round(len(results) / elapsed, 1) if elapsed else None
+                ),
+                "bytes_per_second": round(bytes_scanned / elapsed) if elapsed else None,
+                "changes": changes[:max_results],
+                "changes_truncated": len(changes) > max_results,
+                "errors": errors[:max_results],
+            }
+
+        return await run_blocking(run)
+
+    except Exception as e:
+        raise Exception(f"Failed to auto-link vault: {str(e)}")
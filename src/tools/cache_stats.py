@@ -0,0 +1,27 @@
+from vault.note_cache import get_note_cache
+from vault.outline import get_outline_cache
+from vault.watcher import get_watcher
+
+
+async def get_cache_stats() -> dict:
+    """
+    Report the size and effectiveness of the server's in-memory caches.
+
+    Returns:
+        dict: Per-cache entry counts, memory use and hit/miss/eviction
+        counters, plus the vault watcher's event and lag counters (None when
+        the watcher is not running)
+
+    Raises:
+        Exception: If the statistics cannot be collected
+    """
+    try:
+        watcher = get_watcher()
+        return {
+            "note_cache": get_note_cache().stats(),
+            "outline_cache": get_outline_cache().stats(),
+            "watcher": watcher.stats() if watcher is not None else None,
+        }
+
+    except Exception as e:
+        raise Exception(f"Failed to get cache stats: {str(e)}")
@@ -1,22 +1,15 @@
 from datetime import datetime
 from models.note_models import ObsidianNote
 from config.settings import get_vault_path
+from vault.changes import notify_changes
+from tools.read_note import cache_written_note
+from utils.atomic_write import atomic_write
+from utils.async_io import locked_paths, run_blocking
 
 
-async def create_note(note: ObsidianNote):
-    try:
-        vault_path = get_vault_path()
-
-        # Create folder if it doesn't exist
-        if note.folder:
-            folder_path = vault_path / note.folder
-            folder_path.mkdir(parents=True, exist_ok=True)
-            file_path = folder_path / f"{note.title}.md"
-        else:
-            file_path = vault_path / f"{note.title}.md"
-
-        # Format the note content with metadata
-        formatted_content = f"""---
+def format_new_note(note: ObsidianNote) -> str:
+    """Format a new note's frontmatter and body as it is written to disk."""
+    return f"""---
 title: {note.title}
 created: {datetime.now().isoformat()}
 modified: {datetime.now().isoformat()}
@@ -31,9 +24,36 @@ summary: {note.summary}
 {note.content}
 """
 
-        # Write the note to file
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(formatted_content)
+
+async def create_note(note: ObsidianNote):
+    try:
+        vault_path = get_vault_path()
+
+        if note.folder:
+            folder_path = vault_path / note.folder
+            file_path = folder_path / f"{note.title}.md"
+        else:
+            folder_path = None
+            file_path = vault_path / f"{note.title}.md"
+
+        formatted_content = format_new_note(note)
+
+        def write():
+            # Create folder if it doesn't exist
+            if folder_path is not None:
+                folder_path.mkdir(parents=True, exist_ok=True)
+
+            with locked_paths(file_path):
+                # Write the note to file without ever exposing a half-written note
+                atomic_write(file_path, formatted_content.encode("utf-8"))
+
+                # Keep the indexes in step with writes made through this server
+                notify_changes(vault_path, [file_path])
+                cache_written_note(
+                    file_path, note.title, note.folder, formatted_content
+                )
+
+        await run_blocking(write)
 
         return {
             "message": "Note created successfully",
@@ -0,0 +1,97 @@
+import time
+from pathlib import PurePosixPath
+from config.settings import get_revalidate_ms, get_vault_path
+from search.duplicates import get_duplicate_index
+from utils.async_io import run_blocking
+
+MAX_DUPLICATE_CLUSTERS = 1000
+
+
+async def find_duplicates(
+    folder: str = "",
+    threshold: float = 0.8,
+    min_words: int = 20,
+    max_clusters: int = 100,
+    rebuild: bool = False,
+) -> dict:
+    """
+    Find groups of notes whose bodies are near-duplicates.
+
+    Bodies are compared by the Jaccard similarity of their five-word
+    shingles, estimated from MinHash signatures. Locality-sensitive hashing
+    only compares notes that are likely to be similar, so the cost grows
+    roughly linearly with the vault. Signatures are cached on disk by the
+    hash of each body, so a re-run only reads notes that changed and only
+    re-signs bodies it has not seen. Frontmatter is ignored.
+
+    Args:
+        folder (str, optional): Only compare notes in this folder or its
+            subfolders. Defaults to "".
+        threshold (float, optional): Lowest estimated similarity (0 to 1) for
+            two notes to count as duplicates. Defaults to 0.8.
+        min_words (int, optional): Ignore notes with fewer words, so short
+            stubs and empty templates are not reported. Defaults to 20.
+        max_clusters (int, optional): Maximum groups to return. Defaults to
+            100.
+        rebuild (bool, optional): Recompute every signature first. Defaults
+            to False.
+
+    Returns:
+        dict: The duplicate ``clusters``, largest first, each listing its
+        notes (title, folder, path and estimated similarity to the first
+        note), with counts, the time spent bringing the index up to date
+        (``refresh_ms``) and the time spent finding clusters (``elapsed_ms``)
+
+    Raises:
+        Exception: If the arguments are invalid or the vault cannot be read
+    """
+    try:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be greater than 0 and at most 1")
+        if min_words < 0:
+            raise ValueError("min_words cannot be negative")
+        if not 1 <= max_clusters <= MAX_DUPLICATE_CLUSTERS:
+            raise ValueError(
+                f"max_clusters must be between 1 and {MAX_DUPLICATE_CLUSTERS}"
+            )
+
+        vault_path = get_vault_path()
+        max_age = get_revalidate_ms() / 1000
+
+        def run():
+            start = time.perf_counter()
+            index = get_duplicate_index(vault_path)
+            index.refresh("rebuild" if rebuild else "warm", max_age=max_age)
+            refreshed = time.perf_counter()
+            clusters = index.find(threshold, folder, min_words)
+            found = time.perf_counter()
+
+            results = []
+            for cluster in clusters[:max_clusters]:
+                notes = []
+                for rel_path, similarity in cluster:
+                    parts = PurePosixPath(rel_path)
+                    parent = parts.parent.as_posix()
+                    notes.append(
+                        {
+                            "title": parts.stem,
+                            "folder": "" if parent == "." else parent,
+                            "path": str(vault_path / rel_path),
+                            "similarity": similarity,
+                        }
+                    )
+                results.append({"size": len(notes), "notes": notes})
+
+            return {
+                "clusters": results,
+                "clusters_found": len(clusters),
+                "duplicate_notes": sum(len(cluster) for cluster in clusters),
+                "notes_indexed": index.stats()["notes"],
+                "refresh_ms": round((refreshed - start) * 1000, 2),
+                "elapsed_ms": round((found - refreshed) * 1000, 2),
+            }
+
+        return await run_blocking(run)
+
+    except Exception as e:
+        raise Exception(f"Failed to find duplicates: {str(e)}")
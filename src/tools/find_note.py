@@ -0,0 +1,99 @@
+import time
+from pathlib import Path, PurePosixPath
+from config.settings import get_vault_path
+from utils.async_io import run_blocking
+from vault.name_index import get_name_index
+
+MAX_FIND_RESULTS = 100
+
+
+def find_notes(
+    vault_path: Path,
+    query: str,
+    folder: str = "",
+    limit: int = 10,
+    min_score: float = 0.3,
+) -> list[dict]:
+    """
+    Rank notes by how closely their file name, title or aliases match a query.
+
+    This is the blocking core of ``find_note``, shared with the "did you
+    mean" suggestions of ``read_note``.
+
+    Args:
+        vault_path (Path): The vault root
+        query (str): The note name to look up, possibly misspelled
+        folder (str, optional): Only return notes in this folder or its
+            subfolders. Defaults to "".
+        limit (int, optional): Maximum number of results. Defaults to 10.
+        min_score (float, optional): Lowest similarity (0 to 1) to return.
+            Defaults to 0.3.
+
+    Returns:
+        list[dict]: Per note, best match first: ``title``, ``folder``,
+        ``path``, the ``score`` and the name that ``matched``
+    """
+    results = []
+    for rel_path, score, name in get_name_index(vault_path).find(
+        query, folder, min_score, limit
+    ):
+        parts = PurePosixPath(rel_path)
+        parent = parts.parent.as_posix()
+        results.append(
+            {
+                "title": parts.stem,
+                "folder": "" if parent == "." else parent,
+                "path": str(vault_path / rel_path),
+                "score": round(score, 3),
+                "matched": name,
+            }
+        )
+    return results
+
+
+async def find_note(
+    query: str, folder: str = "", limit: int = 10, min_score: float = 0.3
+) -> dict:
+    """
+    Find notes by approximate title, tolerating typos.
+
+    Note file names, frontmatter titles and aliases are compared with the
+    query by character-trigram similarity, case- and accent-insensitively.
+
+    Args:
+        query (str): The note name to look up, possibly misspelled
+        folder (str, optional): Only return notes in this folder or its
+            subfolders. Defaults to "".
+        limit (int, optional): Maximum number of results. Defaults to 10.
+        min_score (float, optional): Lowest similarity (0 to 1) to return.
+            Defaults to 0.3.
+
+    Returns:
+        dict: Ranked ``results`` (title, folder, path, score and the name
+        that matched) and the query time
+
+    Raises:
+        Exception: If the arguments are invalid or the vault cannot be read
+    """
+    try:
+        if not query.strip():
+            raise ValueError("Query cannot be empty")
+        if not 1 <= limit <= MAX_FIND_RESULTS:
+            raise ValueError(f"limit must be between 1 and {MAX_FIND_RESULTS}")
+        if not 0 < min_score <= 1:
+            raise ValueError("min_score must be greater than 0 and at most 1")
+
+        vault_path = get_vault_path()
+
+        def run():
+            start = time.perf_counter()
+            results = find_notes(vault_path, query, folder, limit, min_score)
+            return {
+                "results": results,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
+
+        return await run_blocking(run)
+
+    except Exception as e:
+        raise Exception(f"Failed to find note: {str(e)}")
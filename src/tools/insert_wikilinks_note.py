@@ -1,5 +1,7 @@
-from tools.read_note import read_note
-from tools.update_note import update_note
+from config.settings import get_vault_path
+from tools.read_note import load_note, locate_note
+from tools.update_note import write_updated_note
+from utils.async_io import locked_paths, run_blocking
 from utils.insert_wikilinks import insert_wikilinks
 
 
@@ -19,15 +21,25 @@ async def insert_wikilinks_in_note(title: str, phrases: list[str], folder: str =
         Exception: If the note cannot be found, read, or updated
     """
     try:
-        # Read the existing note
-        note = await read_note(title, folder)
-
-        # Apply wikilinks to the content
-        original_content = note.content
-        modified_content = insert_wikilinks(original_content, phrases)
+        vault_path = get_vault_path()
+
+        def link():
+            # Hold the note's lock from the read to the write, so a
+            # concurrent edit is not overwritten with stale content
+            file_path, note_title, note_folder = locate_note(vault_path, title, folder)
+            with locked_paths(file_path):
+                note = load_note(vault_path, note_title, note_folder)
+                original_content = note.content
+                note.content = insert_wikilinks(original_content, phrases)
+                if note.content == original_content:
+                    return original_content, note, None
+                return original_content, note, write_updated_note(vault_path, note)
+
+        original_content, note, file_path = await run_blocking(link)
+        modified_content = note.content
 
         # Check if any changes were made
-        if original_content == modified_content:
+        if file_path is None:
             return {
                 "message": "No changes made - phrases not found or already linked",
                 "title": title,
@@ -35,16 +47,12 @@ async def insert_wikilinks_in_note(title: str, phrases: list[str], folder: str =
                 "changes_made": False,
             }
 
-        # Update the note with modified content
-        note.content = modified_content
-        update_result = await update_note(note)
-
         return {
             "message": "Wikilinks inserted successfully",
             "title": title,
             "phrases_processed": phrases,
             "changes_made": True,
-            "path": update_result["path"],
+            "path": str(file_path),
             "original_length": len(original_content),
             "modified_length": len(modified_content),
         }
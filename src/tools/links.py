@@ -0,0 +1,243 @@
+import time
+from pathlib import Path
+from typing import Literal
+from config.settings import get_revalidate_ms, get_vault_path
+from utils.async_io import run_blocking
+from vault.link_graph import LinkGraph, get_link_graph
+from vault.metadata_index import normalize_folder
+
+MAX_NEIGHBORHOOD_DEPTH = 5
+
+
+def _locate(graph: LinkGraph, title: str, folder: str) -> str:
+    """Find a note the way read_note addresses it, or by link text."""
+    cleaned_title = title.strip()
+    if not cleaned_title:
+        raise ValueError("Note title cannot be empty or whitespace only")
+
+    folder = normalize_folder(folder)
+    rel_path = f"{folder}/{cleaned_title}.md" if folder else f"{cleaned_title}.md"
+    if rel_path in graph:
+        return rel_path
+    if not folder:
+        # Fall back to resolving the title like a [[wikilink]]
+        resolved = graph.resolve(cleaned_title)
+        if resolved is not None:
+            return resolved
+    raise FileNotFoundError(f"Note not found: {rel_path}")
+
+
+async def _with_graph(query):
+    """
+    Run a query against the vault's link graph off the event loop.
+
+    Writes made through the server update the graph as they happen. Edits
+    made outside it are found by walking the vault, which a watcher
+    (OBSIDIAN_WATCH) makes unnecessary and which otherwise happens at most
+    once per OBSIDIAN_REVALIDATE_MS. The result gets the time spent bringing
+    the graph up to date (``refresh_ms``) and answering (``elapsed_ms``).
+    """
+    vault_path = get_vault_path()
+    max_age = get_revalidate_ms() / 1000
+
+    def run():
+        start = time.perf_counter()
+        graph = get_link_graph(vault_path)
+        graph.refresh(max_age=max_age)
+        refreshed = time.perf_counter()
+        result = query(graph, vault_path)
+        result["refresh_ms"] = round((refreshed - start) * 1000, 2)
+        result["elapsed_ms"] = round((time.perf_counter() - refreshed) * 1000, 2)
+        return result
+
+    return await run_blocking(run)
+
+
+def _absolute(vault_path: Path, rel_path: str) -> str:
+    return str(vault_path / rel_path)
+
+
+async def find_backlinks(title: str, folder: str = "") -> dict:
+    """
+    Find the notes that link to (or embed) a note.
+
+    Links are resolved like Obsidian resolves them: by path, by note name and
+    by frontmatter alias.
+
+    Args:
+        title (str): The title of the note. Without a folder, the title is
+            also resolved like a wikilink, so notes in subfolders and aliases
+            are found too.
+        folder (str, optional): The folder containing the note. Defaults to "".
+
+    Returns:
+        dict: The note's ``path`` and its ``backlinks``, each with the number
+        of ``links`` and ``embeds`` pointing at the note, and the timings
+
+    Raises:
+        Exception: If the note cannot be found
+    """
+    try:
+
+        def query(graph: LinkGraph, vault_path: Path) -> dict:
+            rel_path = _locate(graph, title, folder)
+            backlinks = graph.backlinks(rel_path)
+            for backlink in backlinks:
+                backlink["path"] = _absolute(vault_path, backlink["path"])
+            return {"path": _absolute(vault_path, rel_path), "backlinks": backlinks}
+
+        return await _with_graph(query)
+
+    except Exception as e:
+        raise Exception(f"Failed to find backlinks: {str(e)}")
+
+
+async def get_outgoing_links(title: str, folder: str = "") -> dict:
+    """
+    List the links and embeds in a note and the notes they resolve to.
+
+    Args:
+        title (str): The title of the note
+        folder (str, optional): The folder containing the note. Defaults to "".
+
+    Returns:
+        dict: The note's ``path`` and its ``links`` in document order, each
+        with the ``target`` as written, the resolved ``path`` (None when the
+        target does not exist) and whether it is an ``embed``, and the
+        timings
+
+    Raises:
+        Exception: If the note cannot be found
+    """
+    try:
+
+        def query(graph: LinkGraph, vault_path: Path) -> dict:
+            rel_path = _locate(graph, title, folder)
+            links = graph.outgoing(rel_path)
+            for link in links:
+                if link["path"] is not None:
+                    link["path"] = _absolute(vault_path, link["path"])
+            return {"path": _absolute(vault_path, rel_path), "links": links}
+
+        return await _with_graph(query)
+
+    except Exception as e:
+        raise Exception(f"Failed to get outgoing links: {str(e)}")
+
+
+async def find_orphan_notes(
+    folder: str = "", include_linking: bool = True, limit: int = 200
+) -> dict:
+    """
+    Find notes that no other note links to.
+
+    Args:
+        folder (str, optional): Only report orphans in this folder. Defaults
+            to "".
+        include_linking (bool, optional): Also report orphans that link to
+            other notes; when False only fully unconnected notes are
+            reported. Defaults to True.
+        limit (int, optional): Maximum number of paths to return. Defaults
+            to 200.
+
+    Returns:
+        dict: The orphan ``paths``, their ``total`` count and the timings
+
+    Raises:
+        Exception: If the vault cannot be read
+    """
+    try:
+        folder = normalize_folder(folder)
+
+        def query(graph: LinkGraph, vault_path: Path) -> dict:
+            orphans = [
+                rel_path
+                for rel_path in graph.orphans(include_linking)
+                if not folder or rel_path.startswith(folder + "/")
+            ]
+            return {
+                "paths": [_absolute(vault_path, path) for path in orphans[:limit]],
+                "total": len(orphans),
+            }
+
+        return await _with_graph(query)
+
+    except Exception as e:
+        raise Exception(f"Failed to find orphan notes: {str(e)}")
+
+
+async def find_unresolved_links(limit: int = 200) -> dict:
+    """
+    Find link targets that do not match any note, most-linked first.
+
+    Args:
+        limit (int, optional): Maximum number of targets to return. Defaults
+            to 200.
+
+    Returns:
+        dict: The ``unresolved`` targets with the notes linking to each,
+        their ``total`` count and the timings
+
+    Raises:
+        Exception: If the vault cannot be read
+    """
+    try:
+
+        def query(graph: LinkGraph, vault_path: Path) -> dict:
+            unresolved = graph.unresolved()
+            for entry in unresolved[:limit]:
+                entry["sources"] = [
+                    _absolute(vault_path, source) for source in entry["sources"]
+                ]
+            return {"unresolved": unresolved[:limit], "total": len(unresolved)}
+
+        return await _with_graph(query)
+
+    except Exception as e:
+        raise Exception(f"Failed to find unresolved links: {str(e)}")
+
+
+async def get_note_neighborhood(
+    title: str,
+    folder: str = "",
+    depth: int = 1,
+    direction: Literal["out", "in", "both"] = "both",
+    max_nodes: int = 200,
+) -> dict:
+    """
+    Collect the notes within a number of link hops of a note.
+
+    Args:
+        title (str): The title of the starting note
+        folder (str, optional): The folder containing the note. Defaults to "".
+        depth (int, optional): Maximum number of hops. Defaults to 1.
+        direction (Literal["out", "in", "both"], optional): Follow outgoing
+            links, backlinks or both. Defaults to "both".
+        max_nodes (int, optional): Maximum number of notes to collect.
+            Defaults to 200.
+
+    Returns:
+        dict: ``nodes`` (path and hop ``distance``, nearest first), ``edges``
+        as ``[source, target]`` indexes into ``nodes``, and whether the result
+        was ``truncated`` at ``max_nodes``, and the timings
+
+    Raises:
+        Exception: If the note cannot be found or the arguments are invalid
+    """
+    try:
+        if not 1 <= depth <= MAX_NEIGHBORHOOD_DEPTH:
+            raise ValueError(f"depth must be between 1 and {MAX_NEIGHBORHOOD_DEPTH}")
+        if max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1")
+
+        def query(graph: LinkGraph, vault_path: Path) -> dict:
+            rel_path = _locate(graph, title, folder)
+            result = graph.neighborhood(rel_path, depth, direction, max_nodes)
+            for node in result["nodes"]:
+                node["path"] = _absolute(vault_path, node["path"])
+            return result
+
+        return await _with_graph(query)
+
+    except Exception as e:
+        raise Exception(f"Failed to get note neighborhood: {str(e)}")
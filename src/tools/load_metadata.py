@@ -1,13 +1,44 @@
-from pathlib import Path
-from typing import List
-import yaml
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import List, Literal, Optional
 from config.settings import get_vault_path
+from utils.async_io import run_blocking
+from vault.metadata_index import get_metadata_index
 
+METADATA_FIELDS = (
+    "title",
+    "folder",
+    "tags",
+    "category",
+    "summary",
+    "type",
+    "aliases",
+    "related",
+    "created",
+    "modified",
+    "path",
+)
 
-async def load_all_notes_metadata() -> List[dict]:
+SortField = Literal["path", "title", "created", "modified", "mtime"]
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+async def load_all_notes_metadata(rebuild: bool = False) -> List[dict]:
     """
     Load metadata from all notes in the Obsidian vault.
 
+    Metadata is served from the persistent metadata index; only notes whose
+    mtime, size or inode changed since the last call are re-parsed. The scan
+    runs in a worker thread so other requests are served while it runs.
+
+    Args:
+        rebuild (bool, optional): Discard the index and re-parse every note.
+            Defaults to False.
+
     Returns:
         List[dict]: A list of dictionaries containing metadata for each note
 
@@ -16,60 +47,153 @@ async def load_all_notes_metadata() -> List[dict]:
     """
     try:
         vault_path = get_vault_path()
-        notes = []
 
-        # Recursively find all .md files
-        for file_path in vault_path.rglob("*.md"):
-            try:
-                # Get relative folder path from vault root
-                rel_path = file_path.relative_to(vault_path)
-                folder = str(rel_path.parent) if rel_path.parent != Path(".") else ""
-
-                # Read file content
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Parse frontmatter
-                frontmatter = {}
-                if content.startswith("---"):
-                    try:
-                        _, fm, _ = content.split("---", 2)
-                        frontmatter = yaml.safe_load(fm.strip())
-                    except Exception:
-                        # Skip files with invalid frontmatter
-                        pass
-
-                # Extract title from filename if not in frontmatter
-                title = frontmatter.get("title", file_path.stem)
-
-                # Build metadata dict
-                metadata = {
-                    "title": title,
-                    "folder": folder,
-                    "tags": frontmatter.get("tags", "").split(", ")
-                    if frontmatter.get("tags")
-                    else [],
-                    "category": frontmatter.get("category", ""),
-                    "summary": frontmatter.get("summary", ""),
-                    "type": frontmatter.get("type", "note"),
-                    "aliases": frontmatter.get("aliases", "").split(", ")
-                    if frontmatter.get("aliases")
-                    else [],
-                    "related": frontmatter.get("related", "").split(", ")
-                    if frontmatter.get("related")
-                    else [],
-                    "created": frontmatter.get("created", ""),
-                    "modified": frontmatter.get("modified", ""),
-                    "path": str(file_path),
-                }
-
-                notes.append(metadata)
-
-            except Exception:
-                # Skip files that can't be processed
+        def load():
+            index = get_metadata_index(vault_path)
+            index.refresh("rebuild" if rebuild else "warm")
+            return index.notes()
+
+        return await run_blocking(load)
+
+    except Exception as e:
+        raise Exception(f"Failed to load notes metadata: {str(e)}")
+
+
+def _sort_value(sort_by: SortField, rel_path: str, fingerprint, metadata: dict):
+    if sort_by == "path":
+        return rel_path
+    if sort_by == "mtime":
+        return fingerprint[0]
+    value = metadata.get(sort_by)
+    return "" if value is None else str(value)
+
+
+def _query_signature(*params) -> str:
+    return hashlib.sha1(json.dumps(params, default=str).encode("utf-8")).hexdigest()[
+        :12
+    ]
+
+
+def _encode_cursor(signature: str, last_key: tuple) -> str:
+    payload = json.dumps([signature, list(last_key)]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_cursor(cursor: str, signature: str) -> tuple:
+    try:
+        cursor_signature, last_key = json.loads(base64.urlsafe_b64decode(cursor))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_signature != signature:
+        raise ValueError("Cursor does not belong to this query")
+    return tuple(last_key)
+
+
+async def query_notes_metadata(
+    folder: str = "",
+    tag: Optional[str] = None,
+    type: Optional[str] = None,
+    category: Optional[str] = None,
+    modified_since: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+    sort_by: SortField = "path",
+    descending: bool = False,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    rebuild: bool = False,
+) -> dict:
+    """
+    Load one page of filtered, projected note metadata.
+
+    A folder filter restricts the index refresh to that folder, so the rest of
+    the vault is not walked. All other filters are answered from the index.
+
+    Args:
+        folder (str, optional): Only include notes in this folder or its
+            subfolders. Defaults to "".
+        tag (Optional[str], optional): Only include notes with this tag.
+        type (Optional[str], optional): Only include notes of this type.
+        category (Optional[str], optional): Only include notes in this category.
+        modified_since (Optional[str], optional): ISO datetime; only include
+            notes whose file was modified at or after this time.
+        fields (Optional[list[str]], optional): Metadata keys to return.
+            Defaults to all keys.
+        sort_by (SortField, optional): Sort key; "mtime" sorts by file
+            modification time. Defaults to "path".
+        descending (bool, optional): Reverse the sort order. Defaults to False.
+        limit (int, optional): Maximum notes per page. Defaults to 100.
+        cursor (Optional[str], optional): ``next_cursor`` from the previous
+            page of the same query.
+        rebuild (bool, optional): Discard and re-parse the indexed notes in
+            scope first. Defaults to False.
+
+    Returns:
+        dict: ``notes`` for this page, ``total`` notes matching the filters and
+        ``next_cursor`` (None on the last page)
+
+    Raises:
+        Exception: If the arguments are invalid or the vault cannot be read
+    """
+    try:
+        if fields is not None:
+            unknown = [field for field in fields if field not in METADATA_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown metadata fields: {', '.join(unknown)}")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        since_ns = None
+        if modified_since:
+            since_ns = int(datetime.fromisoformat(modified_since).timestamp() * 1e9)
+
+        signature = _query_signature(
+            folder, tag, type, category, modified_since, sort_by, descending
+        )
+        after = _decode_cursor(cursor, signature) if cursor else None
+
+        vault_path = get_vault_path()
+
+        def load():
+            index = get_metadata_index(vault_path)
+            index.refresh("rebuild" if rebuild else "warm", folder=folder)
+            return index.entries(folder)
+
+        entries = await run_blocking(load)
+
+        matches = []
+        for rel_path, fingerprint, metadata in entries:
+            if tag is not None and tag not in metadata["tags"]:
+                continue
+            if type is not None and metadata["type"] != type:
+                continue
+            if category is not None and metadata["category"] != category:
                 continue
+            if since_ns is not None and fingerprint[0] < since_ns:
+                continue
+            sort_key = (_sort_value(sort_by, rel_path, fingerprint, metadata), rel_path)
+            matches.append((sort_key, rel_path, metadata))
+
+        matches.sort(key=lambda match: match[0], reverse=descending)
+        total = len(matches)
+        if after is not None:
+            # Keyset pagination: resume strictly after the last key returned
+            if descending:
+                matches = [match for match in matches if match[0] < after]
+            else:
+                matches = [match for match in matches if match[0] > after]
+
+        page = matches[:limit]
+        notes = []
+        for _, rel_path, metadata in page:
+            note = {**metadata, "path": str(vault_path / rel_path)}
+            if fields is not None:
+                note = {field: note[field] for field in fields}
+            notes.append(note)
+
+        next_cursor = None
+        if len(matches) > limit:
+            next_cursor = _encode_cursor(signature, page[-1][0])
 
-        return notes
+        return {"notes": notes, "total": total, "next_cursor": next_cursor}
 
     except Exception as e:
         raise Exception(f"Failed to load notes metadata: {str(e)}")
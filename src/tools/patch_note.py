@@ -0,0 +1,328 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+from config.settings import get_vault_path
+from models.note_models import NotePatch
+from tools.read_note import cache_written_note, locate_note
+from utils.atomic_write import atomic_write
+from utils.async_io import locked_paths, run_blocking
+from utils.frontmatter import set_frontmatter_keys, split_frontmatter
+from utils.instrumentation import record_io
+from vault.changes import notify_changes
+from vault.note_cache import get_note_cache
+from vault.outline import parse_outline
+
+
+def _ensure_newline(text: bytes) -> bytes:
+    return text if not text or text.endswith(b"\n") else text + b"\n"
+
+
+def _is_char_boundary(data: bytes, offset: int) -> bool:
+    # UTF-8 continuation bytes look like 0b10xxxxxx
+    return offset >= len(data) or data[offset] & 0xC0 != 0x80
+
+
+def _append(data: bytes, patch: NotePatch) -> bytes:
+    separator = b"\n" if data and not data.endswith(b"\n") else b""
+    return data + separator + _ensure_newline(patch.text.encode("utf-8"))
+
+
+def _insert_under_heading(data: bytes, patch: NotePatch) -> bytes:
+    if not patch.heading:
+        raise ValueError("insert_under_heading needs a heading")
+    outline = parse_outline(data)
+    heading = outline.find(patch.heading)
+    if heading is None:
+        raise ValueError(f"Heading not found: {patch.heading}")
+
+    if heading.line < outline.line_count:
+        content_start = outline.line_starts[heading.line]
+    else:
+        content_start = len(data)
+    if patch.position == "start":
+        at = content_start
+    else:
+        # Keep the blank lines that separate the section from the next one
+        at = heading.end
+        while at - 1 > content_start and data[at - 2 : at] == b"\n\n":
+            at -= 1
+
+    text = _ensure_newline(patch.text.encode("utf-8"))
+    if at and data[at - 1 : at] != b"\n":
+        text = b"\n" + text
+    return data[:at] + text + data[at:]
+
+
+def _replace(data: bytes, patch: NotePatch) -> bytes:
+    body_offset = split_frontmatter(data).body_offset
+    new_text = patch.text.encode("utf-8")
+
+    if patch.find is not None:
+        if patch.start is not None or patch.end is not None:
+            raise ValueError("replace takes either find or a start/end span")
+        old_text = patch.find.encode("utf-8")
+        if not old_text:
+            raise ValueError("replace needs non-empty find text")
+        body = data[body_offset:]
+        count = body.count(old_text)
+        if count == 0:
+            raise ValueError(f"Text not found in note body: {patch.find}")
+        if count > 1 and not patch.replace_all:
+            raise ValueError(
+                f"Text occurs {count} times in the note body; set replace_all "
+                "or give a start/end span"
+            )
+        return data[:body_offset] + body.replace(old_text, new_text)
+
+    if patch.start is None or patch.end is None:
+        raise ValueError("replace needs find text or a start/end span")
+    if not body_offset <= patch.start <= patch.end <= len(data):
+        raise ValueError(
+            f"Span must lie within the note body (bytes {body_offset} to "
+            f"{len(data)}): {patch.start}-{patch.end}"
+        )
+    if not (
+        _is_char_boundary(data, patch.start) and _is_char_boundary(data, patch.end)
+    ):
+        raise ValueError("Span must not split a character")
+    return data[: patch.start] + new_text + data[patch.end :]
+
+
+def _set_frontmatter(data: bytes, patch: NotePatch) -> bytes:
+    if not patch.values:
+        raise ValueError("set_frontmatter needs values to set")
+    return set_frontmatter_keys(data, patch.values)
+
+
+_OPERATIONS = {
+    "append": _append,
+    "insert_under_heading": _insert_under_heading,
+    "replace": _replace,
+    "set_frontmatter": _set_frontmatter,
+}
+
+
+def apply_patches(data: bytes, patches: list[NotePatch]) -> bytes:
+    """
+    Apply edits to a note's raw contents, one after the other.
+
+    Args:
+        data (bytes): The raw note file contents
+        patches (list[NotePatch]): The edits to apply
+
+    Returns:
+        bytes: The new note file contents
+
+    Raises:
+        ValueError: If an edit cannot be applied
+    """
+    for number, patch in enumerate(patches, start=1):
+        try:
+            data = _OPERATIONS[patch.op](data, patch)
+        except ValueError as e:
+            raise ValueError(f"Patch {number} ({patch.op}): {str(e)}")
+    return data
+
+
+def _check_preconditions(
+    file_path: Path,
+    mtime_ns: int,
+    data: Optional[bytes],
+    expected_mtime_ns: Optional[int],
+    expected_sha256: Optional[str],
+):
+    if expected_mtime_ns is not None and mtime_ns != expected_mtime_ns:
+        raise RuntimeError(
+            f"Note changed since it was read (mtime {mtime_ns}, expected "
+            f"{expected_mtime_ns}): {file_path}"
+        )
+    if expected_sha256 is not None:
+        if hashlib.sha256(data).hexdigest() != expected_sha256.lower():
+            raise RuntimeError(
+                f"Note changed since it was read (content hash differs): {file_path}"
+            )
+
+
+def _append_in_place(
+    file_path: Path,
+    patches: list[NotePatch],
+    expected_mtime_ns: Optional[int],
+    expected_sha256: Optional[str],
+) -> dict:
+    """Append to the end of the file without rewriting what is already there."""
+    digest = None
+    fd = os.open(file_path, os.O_RDWR | os.O_APPEND)
+    with os.fdopen(fd, "r+b", buffering=0) as f:
+        stat = os.fstat(f.fileno())
+        data = f.read() if expected_sha256 is not None else None
+        _check_preconditions(
+            file_path, stat.st_mtime_ns, data, expected_mtime_ns, expected_sha256
+        )
+
+        last = b""
+        if stat.st_size:
+            f.seek(stat.st_size - 1)
+            last = f.read(1)
+        added = apply_patches(last, patches)[len(last) :]
+        f.write(added)
+        os.fsync(f.fileno())
+        record_io(file_path, read=len(data or b"") + len(last), written=len(added))
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+
+    if data is not None:
+        digest = hashlib.sha256(data + added).hexdigest()
+    return {
+        "mode": "append",
+        "bytes_written": len(added),
+        "mtime_ns": mtime_ns,
+        "sha256": digest,
+    }
+
+
+def _rewrite(
+    file_path: Path,
+    patches: list[NotePatch],
+    expected_mtime_ns: Optional[int],
+    expected_sha256: Optional[str],
+) -> tuple[dict, bytes]:
+    """Apply the edits in memory and replace the note atomically."""
+    with open(file_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    record_io(file_path, read=len(data))
+    _check_preconditions(
+        file_path, stat.st_mtime_ns, data, expected_mtime_ns, expected_sha256
+    )
+
+    new_data = apply_patches(data, patches)
+    if new_data != data:
+        atomic_write(file_path, new_data)
+    return {
+        "mode": "rewrite" if new_data != data else "unchanged",
+        "bytes_written": len(new_data) if new_data != data else 0,
+        "mtime_ns": file_path.stat().st_mtime_ns,
+        "sha256": hashlib.sha256(new_data).hexdigest(),
+    }, new_data
+
+
+async def patch_note(
+    title: str,
+    patches: list[NotePatch],
+    folder: str = "",
+    expected_mtime_ns: Optional[int] = None,
+    expected_sha256: Optional[str] = None,
+) -> dict:
+    """
+    Edit a note in place without sending or rewriting its whole body.
+
+    Supported edits, applied in order:
+
+    - ``append``: add ``text`` at the end of the note
+    - ``insert_under_heading``: add ``text`` right below ``heading`` or at the
+      end of its section (``position``)
+    - ``replace``: replace the ``find`` text in the body (it must occur once
+      unless ``replace_all`` is set), or the byte span ``start``-``end``
+    - ``set_frontmatter``: set or (with null) remove individual keys; other
+      keys are kept byte for byte
+
+    A batch made only of appends is written with ``O_APPEND`` and never
+    rewrites the existing text; anything else replaces the note atomically.
+
+    Args:
+        title (str): The title of the note
+        patches (list[NotePatch]): The edits to apply
+        folder (str, optional): The folder containing the note. Defaults to "".
+        expected_mtime_ns (Optional[int], optional): Only edit the note if its
+            modification time (in nanoseconds) still has this value.
+        expected_sha256 (Optional[str], optional): Only edit the note if its
+            content still has this SHA-256 hash.
+
+    Returns:
+        dict: The note's ``path`` and ``title``, the write ``mode``
+        (``append``, ``rewrite`` or ``unchanged``), ``bytes_written``, and the
+        new ``mtime_ns`` and ``sha256`` to use as the next precondition
+        (``sha256`` is None after an append without a hash precondition)
+
+    Raises:
+        Exception: If the note cannot be found, a precondition fails or an
+        edit cannot be applied
+    """
+    try:
+        if not patches:
+            raise ValueError("Provide at least one patch to apply")
+
+        vault_path = get_vault_path()
+
+        def patch(file_path: Path, note_title: str, note_folder: str):
+            if not file_path.exists():
+                raise FileNotFoundError(f"Note not found: {file_path}")
+
+            if all(patch.op == "append" for patch in patches):
+                result = _append_in_place(
+                    file_path, patches, expected_mtime_ns, expected_sha256
+                )
+                get_note_cache().invalidate(file_path)
+            else:
+                result, new_data = _rewrite(
+                    file_path, patches, expected_mtime_ns, expected_sha256
+                )
+                if result["mode"] == "unchanged":
+                    return result
+                cache_written_note(
+                    file_path, note_title, note_folder, new_data.decode("utf-8")
+                )
+
+            # Keep the indexes in step with writes made through this server
+            notify_changes(vault_path, [file_path])
+            return result
+
+        def run():
+            file_path, note_title, note_folder = locate_note(vault_path, title, folder)
+            with locked_paths(file_path):
+                return patch(file_path, note_title, note_folder), file_path, note_title
+
+        result, file_path, note_title = await run_blocking(run)
+        return {
+            "message": "Note patched successfully",
+            "path": str(file_path),
+            "title": note_title,
+            **result,
+        }
+
+    except Exception as e:
+        raise Exception(f"Failed to patch note: {str(e)}")
+
+
+async def append_to_note(
+    title: str,
+    text: str,
+    folder: str = "",
+    expected_mtime_ns: Optional[int] = None,
+    expected_sha256: Optional[str] = None,
+) -> dict:
+    """
+    Append text to the end of a note without rewriting it.
+
+    Args:
+        title (str): The title of the note
+        text (str): The text to append; a line break is added if needed
+        folder (str, optional): The folder containing the note. Defaults to "".
+        expected_mtime_ns (Optional[int], optional): Only append if the note's
+            modification time (in nanoseconds) still has this value.
+        expected_sha256 (Optional[str], optional): Only append if the note's
+            content still has this SHA-256 hash.
+
+    Returns:
+        dict: The same result as ``patch_note``
+
+    Raises:
+        Exception: If the note cannot be found or a precondition fails
+    """
+    return await patch_note(
+        title,
+        [NotePatch(op="append", text=text)],
+        folder,
+        expected_mtime_ns,
+        expected_sha256,
+    )
@@ -1,13 +1,166 @@
-import yaml
+from pathlib import Path, PurePosixPath
+from typing import Optional
 from models.note_models import ObsidianNote
 from config.settings import get_vault_path
+from tools.find_note import find_notes
+from utils.async_io import run_blocking
+from utils.frontmatter import (
+    frontmatter_list,
+    parse_frontmatter,
+    read_note_file,
+    split_frontmatter,
+)
+from vault.name_index import get_name_index
+from vault.note_cache import get_note_cache
 
+# Closest notes named when a note cannot be found
+MAX_SUGGESTIONS = 3
 
-async def read_note(title: str, folder: str = "") -> ObsidianNote:
+
+def build_note(
+    title: str, folder: str, frontmatter_text: Optional[str], content: str
+) -> ObsidianNote:
     """
-    Read an Obsidian note from the vault.
+    Build the note object for a note's frontmatter text and body.
+
+    Args:
+        title (str): The note title
+        folder (str): The folder containing the note
+        frontmatter_text (Optional[str]): The YAML header, if the note has one
+        content (str): The note body
+
+    Returns:
+        ObsidianNote: The parsed note object
+    """
+    if frontmatter_text is not None:
+        frontmatter = parse_frontmatter(frontmatter_text.strip()) or {}
+    else:
+        frontmatter = {}
+
+    return ObsidianNote(
+        title=title,
+        content=content.strip(),
+        folder=folder.strip() if folder else "",
+        tags=frontmatter_list(frontmatter.get("tags")),
+        aliases=frontmatter_list(frontmatter.get("aliases")),
+        related=frontmatter_list(frontmatter.get("related")),
+        category=frontmatter.get("category") or "",
+        type=frontmatter.get("type", "note"),
+        summary=frontmatter.get("summary") or "",
+    )
+
+
+def cache_written_note(
+    file_path: Path, title: str, folder: str, formatted_content: str
+):
+    """
+    Put a note this server just wrote into the note cache.
+
+    The note is parsed from the text that was written, exactly as
+    ``read_note`` would parse it from disk, so the next read is a cache hit.
+
+    Args:
+        file_path (Path): Path the note was written to
+        title (str): The note title
+        folder (str): The folder containing the note
+        formatted_content (str): The full text that was written
+    """
+    data = formatted_content.encode("utf-8")
+    block = split_frontmatter(data)
+    body = data[block.body_offset :].decode("utf-8")
+    body = body.replace("\r\n", "\n").replace("\r", "\n")
+    note = build_note(title, folder, block.text, body)
+    get_note_cache().put(file_path, file_path.stat(), note)
+
+
+def note_file_path(vault_path: Path, title: str, folder: str = "") -> Path:
+    """
+    Build the path of a note from its title and folder.
 
     Args:
+        vault_path (Path): The vault root
+        title (str): The title of the note
+        folder (str, optional): The folder containing the note. Defaults to "".
+
+    Returns:
+        Path: The note's file path
+
+    Raises:
+        ValueError: If the title is empty
+        FileNotFoundError: If the folder does not exist
+    """
+    # Clean the title by stripping whitespace but preserving internal spaces
+    cleaned_title = title.strip()
+    if not cleaned_title:
+        raise ValueError("Note title cannot be empty or whitespace only")
+
+    # Construct the file path
+    if folder:
+        folder_path = vault_path / folder.strip()
+        if not folder_path.exists():
+            raise FileNotFoundError(f"Folder not found: {folder_path}")
+        return folder_path / f"{cleaned_title}.md"
+    return vault_path / f"{cleaned_title}.md"
+
+
+def resolve_note_name(vault_path: Path, name: str) -> Optional[tuple[Path, str, str]]:
+    """
+    Find a note anywhere in the vault by name.
+
+    Args:
+        vault_path (Path): The vault root
+        name (str): A note title, file name, alias or vault-relative path
+
+    Returns:
+        Optional[tuple[Path, str, str]]: The note's file path, title and
+        folder, or None if no note has that name
+    """
+    rel_path = get_name_index(vault_path).resolve(name)
+    if rel_path is None:
+        return None
+    parts = PurePosixPath(rel_path)
+    folder = parts.parent.as_posix()
+    return vault_path / rel_path, parts.stem, "" if folder == "." else folder
+
+
+def locate_note(
+    vault_path: Path, title: str, folder: str = ""
+) -> tuple[Path, str, str]:
+    """
+    Find the file of an existing note.
+
+    Without a folder, a note that is not at the vault root is looked up by
+    name, so a title, file name or alias is enough to find it.
+
+    Args:
+        vault_path (Path): The vault root
+        title (str): The title of the note
+        folder (str, optional): The folder containing the note. Defaults to "".
+
+    Returns:
+        tuple[Path, str, str]: The note's file path, title and folder. When
+        no note matches, the path the note would have at the given location.
+
+    Raises:
+        ValueError: If the title is empty
+        FileNotFoundError: If the folder does not exist
+    """
+    file_path = note_file_path(vault_path, title, folder)
+    if not folder and not file_path.exists():
+        found = resolve_note_name(vault_path, title.strip())
+        if found is not None:
+            return found
+    return file_path, title.strip(), folder.strip() if folder else ""
+
+
+def load_note(vault_path: Path, title: str, folder: str = "") -> ObsidianNote:
+    """
+    Load a note from the vault, going through the note cache.
+
+    This is the blocking core of ``read_note``, shared with the batch reader.
+
+    Args:
+        vault_path (Path): The vault root
         title (str): The title of the note to read
         folder (str, optional): The folder containing the note. Defaults to "".
 
@@ -15,59 +168,81 @@ async def read_note(title: str, folder: str = "") -> ObsidianNote:
         ObsidianNote: The parsed note object
 
     Raises:
-        Exception: If the note cannot be found or read
+        ValueError: If the title is empty
+        FileNotFoundError: If the folder or the note does not exist
     """
-    try:
-        vault_path = get_vault_path()
+    cleaned_title = title.strip()
+    file_path = note_file_path(vault_path, title, folder)
 
-        # Clean the title by stripping whitespace but preserving internal spaces
-        cleaned_title = title.strip()
-        if not cleaned_title:
-            raise ValueError("Note title cannot be empty or whitespace only")
-
-        # Construct the file path
-        if folder:
-            folder_path = vault_path / folder.strip()
-            if not folder_path.exists():
-                raise FileNotFoundError(f"Folder not found: {folder_path}")
-            file_path = folder_path / f"{cleaned_title}.md"
-        else:
-            file_path = vault_path / f"{cleaned_title}.md"
-
-        if not file_path.exists():
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        # Without a folder, the title may name a note elsewhere in the vault
+        found = None if folder else resolve_note_name(vault_path, cleaned_title)
+        if found is None:
+            raise FileNotFoundError(f"Note not found: {file_path}")
+        file_path, cleaned_title, folder = found
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Note not found: {file_path}")
 
-        # Read the file content
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Split frontmatter and content
-        if content.startswith("---"):
-            _, frontmatter_text, content = content.split("---", 2)
-            frontmatter = yaml.safe_load(frontmatter_text.strip()) or {}
-        else:
-            frontmatter = {}
-
-        # Create ObsidianNote object
-        note = ObsidianNote(
-            title=cleaned_title,
-            content=content.strip(),
-            folder=folder.strip() if folder else "",
-            tags=frontmatter.get("tags", "").split(", ")
-            if frontmatter.get("tags")
-            else [],
-            aliases=frontmatter.get("aliases", "").split(", ")
-            if frontmatter.get("aliases")
-            else [],
-            related=frontmatter.get("related", "").split(", ")
-            if frontmatter.get("related")
-            else [],
-            category=frontmatter.get("category") or "",
-            type=frontmatter.get("type", "note"),
-            summary=frontmatter.get("summary") or "",
-        )
-
+    note_cache = get_note_cache()
+    note = note_cache.get(file_path, stat)
+    if note is not None:
+        # The same file may have been reached through a differently
+        # spelled folder, so report it the way it was asked for
+        note.title = cleaned_title
+        note.folder = folder.strip() if folder else ""
         return note
 
+    # Read the frontmatter and body
+    frontmatter_text, content = read_note_file(file_path)
+    note = build_note(cleaned_title, folder, frontmatter_text, content)
+
+    # Only cache what matches the stat taken before the read; a write that
+    # raced with it shows up as a changed validator on the next lookup
+    note_cache.put(file_path, stat, note)
+
+    return note
+
+
+async def read_note(title: str, folder: str = "", suggest: bool = True) -> ObsidianNote:
+    """
+    Read an Obsidian note from the vault.
+
+    Args:
+        title (str): The title of the note to read. Without a folder, a note
+            that is not at the vault root is found by title, file name or
+            alias.
+        folder (str, optional): The folder containing the note. Defaults to "".
+        suggest (bool, optional): When the note cannot be found, name the
+            closest matching notes in the error. Defaults to True.
+
+    Returns:
+        ObsidianNote: The parsed note object
+
+    Raises:
+        Exception: If the note cannot be found or read
+    """
+    try:
+        vault_path = get_vault_path()
+        try:
+            return await run_blocking(load_note, vault_path, title, folder)
+        except FileNotFoundError as e:
+            if not suggest or not title.strip():
+                raise
+            suggestions = await run_blocking(
+                find_notes, vault_path, title, limit=MAX_SUGGESTIONS
+            )
+            if not suggestions:
+                raise
+            names = ", ".join(
+                f'"{match["title"]}"'
+                + (f' in folder "{match["folder"]}"' if match["folder"] else "")
+                for match in suggestions
+            )
+            raise FileNotFoundError(f"{str(e)}. Did you mean: {names}?")
+
     except Exception as e:
         raise Exception(f"Failed to read note: {str(e)}")
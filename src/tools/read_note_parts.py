@@ -0,0 +1,199 @@
+import os
+from typing import Callable, Optional
+from config.settings import get_vault_path
+from tools.read_note import locate_note
+from utils.async_io import run_blocking
+from vault.outline import Outline, load_outline, read_span
+
+MAX_LISTED_HEADINGS = 20
+
+
+async def _with_outline(title: str, folder: str, read: Callable) -> dict:
+    """Open a note, get its cached outline and let ``read`` pick out a part."""
+    vault_path = get_vault_path()
+
+    def run():
+        file_path = locate_note(vault_path, title, folder)[0]
+        try:
+            f = open(file_path, "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Note not found: {file_path}")
+        with f:
+            outline = load_outline(f, file_path)
+            return {"path": str(file_path), **read(f, outline)}
+
+    return await run_blocking(run)
+
+
+async def get_note_outline(title: str, folder: str = "") -> dict:
+    """
+    Get the heading tree of a note without its text.
+
+    Args:
+        title (str): The title of the note
+        folder (str, optional): The folder containing the note. Defaults to "".
+
+    Returns:
+        dict: The note's ``path``, its ``size`` in bytes, ``mtime_ns`` (for
+        use as a ``patch_note`` precondition), ``line_count`` and
+        ``body_offset`` (where the text after the frontmatter starts), and its
+        ``headings``: nested ``level``, ``title``, 1-based ``line``, and the
+        byte ``offset`` and ``end`` of each section in the file
+
+    Raises:
+        Exception: If the note cannot be found or read
+    """
+    try:
+
+        def read(f, outline: Outline) -> dict:
+            return {
+                "size": outline.size,
+                "mtime_ns": os.fstat(f.fileno()).st_mtime_ns,
+                "line_count": outline.line_count,
+                "body_offset": outline.body_offset,
+                "headings": outline.tree(),
+            }
+
+        return await _with_outline(title, folder, read)
+
+    except Exception as e:
+        raise Exception(f"Failed to get note outline: {str(e)}")
+
+
+async def read_note_section(
+    title: str, heading: str, folder: str = "", include_subsections: bool = True
+) -> dict:
+    """
+    Read the section of a note under one heading.
+
+    Args:
+        title (str): The title of the note
+        heading (str): The heading text, matched case-insensitively. Use
+            ``Parent#Child`` to pick a heading nested under another one.
+        folder (str, optional): The folder containing the note. Defaults to "".
+        include_subsections (bool, optional): Include the subsections under
+            the heading; when False the section stops at the first
+            subheading. Defaults to True.
+
+    Returns:
+        dict: The note's ``path``, the matched ``heading`` with its ``level``
+        and ``line``, and the section ``content`` (starting with the heading
+        line)
+
+    Raises:
+        Exception: If the note or the heading cannot be found
+    """
+    try:
+
+        def read(f, outline: Outline) -> dict:
+            section = outline.find(heading)
+            if section is None:
+                titles = [entry.title for entry in outline.headings]
+                listed = ", ".join(titles[:MAX_LISTED_HEADINGS])
+                if len(titles) > MAX_LISTED_HEADINGS:
+                    listed += ", ..."
+                raise ValueError(
+                    f"Heading not found: {heading}. "
+                    f"Available headings: {listed or 'none'}"
+                )
+            end = section.end if include_subsections else section.own_end
+            return {
+                "heading": section.title,
+                "level": section.level,
+                "line": section.line,
+                "content": read_span(f, section.offset, end),
+            }
+
+        return await _with_outline(title, folder, read)
+
+    except Exception as e:
+        raise Exception(f"Failed to read note section: {str(e)}")
+
+
+async def read_note_lines(
+    title: str, start_line: int, end_line: Optional[int] = None, folder: str = ""
+) -> dict:
+    """
+    Read a range of lines of a note file.
+
+    Lines are counted from 1 at the top of the file, frontmatter included,
+    matching the line numbers in the note outline.
+
+    Args:
+        title (str): The title of the note
+        start_line (int): First line to read
+        end_line (Optional[int], optional): Last line to read (inclusive).
+            Defaults to the end of the note.
+        folder (str, optional): The folder containing the note. Defaults to "".
+
+    Returns:
+        dict: The note's ``path``, the ``start_line`` and ``end_line`` actually
+        read, the note's ``line_count`` and the ``content`` of the lines
+
+    Raises:
+        Exception: If the note cannot be found or the range is invalid
+    """
+    try:
+        if start_line < 1:
+            raise ValueError("start_line must be at least 1")
+        if end_line is not None and end_line < start_line:
+            raise ValueError("end_line cannot be before start_line")
+
+        def read(f, outline: Outline) -> dict:
+            last = outline.line_count if end_line is None else end_line
+            last = min(last, outline.line_count)
+            start, end = outline.line_span(start_line, last)
+            return {
+                "start_line": start_line,
+                "end_line": max(last, start_line - 1),
+                "line_count": outline.line_count,
+                "content": read_span(f, start, end),
+            }
+
+        return await _with_outline(title, folder, read)
+
+    except Exception as e:
+        raise Exception(f"Failed to read note lines: {str(e)}")
+
+
+async def read_note_bytes(
+    title: str, start: int, end: Optional[int] = None, folder: str = ""
+) -> dict:
+    """
+    Read a byte range of a note file, e.g. a section from the note outline.
+
+    Args:
+        title (str): The title of the note
+        start (int): Byte offset to start reading at
+        end (Optional[int], optional): Byte offset to stop reading at
+            (exclusive). Defaults to the end of the note.
+        folder (str, optional): The folder containing the note. Defaults to "".
+
+    Returns:
+        dict: The note's ``path``, the ``start`` and ``end`` offsets actually
+        read, the note's ``size`` and the ``content``. Characters cut in half
+        at either end of the range are left out.
+
+    Raises:
+        Exception: If the note cannot be found or the range is invalid
+    """
+    try:
+        if start < 0:
+            raise ValueError("start cannot be negative")
+        if end is not None and end < start:
+            raise ValueError("end cannot be before start")
+
+        def read(f, outline: Outline) -> dict:
+            stop = outline.size if end is None else min(end, outline.size)
+            first = min(start, stop)
+            return {
+                "start": first,
+                "end": stop,
+                "size": outline.size,
+                "content": read_span(f, first, stop),
+            }
+
+        return await _with_outline(title, folder, read)
+
+    except Exception as e:
+        raise Exception(f"Failed to read note bytes: {str(e)}")
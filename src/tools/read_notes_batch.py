@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from config.settings import get_scan_threads, get_vault_path
+from models.note_models import NoteRef
+from tools.read_note import load_note
+from utils.async_io import run_blocking
+from utils.instrumentation import in_call_context
+from vault.metadata_index import normalize_folder
+
+MAX_BATCH_NOTES = 500
+
+
+def _select_notes(vault_path: Path, folder: str, pattern: str) -> list[NoteRef]:
+    """Expand a folder and glob pattern into note references, sorted by path."""
+    folder = normalize_folder(folder)
+    root = vault_path / folder if folder else vault_path
+    if not root.is_dir():
+        raise FileNotFoundError(f"Folder not found: {root}")
+
+    refs = []
+    for path in sorted(root.glob(pattern)):
+        rel_path = path.relative_to(vault_path)
+        if path.suffix != ".md" or not path.is_file():
+            continue
+        if any(part.startswith(".") for part in rel_path.parts):
+            continue
+        refs.append(NoteRef(title=path.stem, folder=rel_path.parent.as_posix()))
+    return refs
+
+
+def _truncate(text: str, max_bytes: int) -> tuple[str, bool]:
+    """Cut text to at most max_bytes of UTF-8 without splitting a character."""
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text, False
+    return data[:max_bytes].decode("utf-8", errors="ignore"), True
+
+
+async def read_notes_batch(
+    notes: Optional[list[NoteRef]] = None,
+    folder: str = "",
+    pattern: Optional[str] = None,
+    max_body_bytes: Optional[int] = None,
+    max_total_bytes: Optional[int] = None,
+) -> dict:
+    """
+    Read many notes in one call.
+
+    Notes are either listed explicitly, or selected with a folder and a glob
+    pattern relative to it (``*.md`` for the folder itself, ``**/*.md`` to
+    include subfolders). They are read concurrently; a note that cannot be
+    read is reported in its own result without failing the batch.
+
+    Args:
+        notes (Optional[list[NoteRef]], optional): The notes to read, as
+            title and folder pairs.
+        folder (str, optional): The folder to select notes from when
+            ``pattern`` is given. Defaults to "".
+        pattern (Optional[str], optional): Glob pattern selecting notes in
+            ``folder``. Selected notes are read after the listed ones.
+        max_body_bytes (Optional[int], optional): Truncate each note body to
+            this many bytes.
+        max_total_bytes (Optional[int], optional): Budget for all bodies
+            together; bodies are truncated, in result order, once it is spent.
+
+    Returns:
+        dict: ``results`` in request order, each with the ``title`` and
+        ``folder`` asked for and either the ``note`` (plus whether its body
+        was ``truncated``) or an ``error``; and the ``read``, ``failed`` and
+        ``total_bytes`` counts
+
+    Raises:
+        Exception: If the selection is invalid
+    """
+    try:
+        refs = list(notes or [])
+        if not refs and pattern is None:
+            raise ValueError("Provide notes to read or a pattern to select them")
+        for budget in (max_body_bytes, max_total_bytes):
+            if budget is not None and budget < 0:
+                raise ValueError("Byte budgets cannot be negative")
+
+        vault_path = get_vault_path()
+
+        def run():
+            if pattern is not None:
+                refs.extend(_select_notes(vault_path, folder, pattern))
+            if len(refs) > MAX_BATCH_NOTES:
+                raise ValueError(
+                    f"A batch can read at most {MAX_BATCH_NOTES} notes, "
+                    f"got {len(refs)}"
+                )
+
+            def load(ref: NoteRef):
+                try:
+                    return load_note(vault_path, ref.title, ref.folder)
+                except Exception as e:
+                    return e
+
+            workers = max(1, min(get_scan_threads(), len(refs)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                loaded = list(pool.map(in_call_context(load), refs))
+
+            results = []
+            remaining = max_total_bytes
+            total_bytes = 0
+            failed = 0
+            for ref, note in zip(refs, loaded):
+                result = {"title": ref.title, "folder": ref.folder}
+                if isinstance(note, Exception):
+                    failed += 1
+                    result["error"] = str(note)
+                    results.append(result)
+                    continue
+
+                limit = max_body_bytes
+                if remaining is not None:
+                    limit = remaining if limit is None else min(limit, remaining)
+                truncated = False
+                if limit is not None:
+                    note.content, truncated = _truncate(note.content, limit)
+                size = len(note.content.encode("utf-8"))
+                total_bytes += size
+                if remaining is not None:
+                    remaining -= size
+
+                result["note"] = note.model_dump()
+                result["truncated"] = truncated
+                results.append(result)
+
+            return {
+                "results": results,
+                "read": len(results) - failed,
+                "failed": failed,
+                "total_bytes": total_bytes,
+            }
+
+        return await run_blocking(run)
+
+    except Exception as e:
+        raise Exception(f"Failed to read notes: {str(e)}")
@@ -0,0 +1,191 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+from typing import Optional
+import numpy as np
+from config.settings import get_related_memory_mb, get_scan_threads, get_vault_path
+from search.related import block_rows, top_similar
+from search.semantic import get_semantic_index
+from utils.atomic_write import atomic_write, fsync_directory
+from utils.async_io import locked_paths, run_blocking
+from utils.frontmatter import Frontmatter, frontmatter_list
+from utils.instrumentation import in_call_context, record_io
+from vault.changes import notify_changes
+from vault.metadata_index import in_folder, normalize_folder
+from vault.note_cache import get_note_cache
+
+MAX_RELATED = 50
+
+
+def _related_entry(rel_path: str, score: float) -> dict:
+    parts = PurePosixPath(rel_path)
+    parent = parts.parent.as_posix()
+    return {
+        "title": parts.stem,
+        "folder": "" if parent == "." else parent,
+        "score": round(score, 4),
+    }
+
+
+def _merged(current: list[str], titles: list[str], replace: bool) -> list[str]:
+    """The ``related`` list to write: hand-written entries are kept unless replaced."""
+    if replace:
+        return titles
+    return current + [title for title in titles if title not in current]
+
+
+async def recommend_related(
+    folder: str = "",
+    limit: int = 5,
+    min_score: float = 0.2,
+    dry_run: bool = True,
+    replace: bool = False,
+    max_memory_mb: Optional[int] = None,
+    max_results: int = 200,
+) -> dict:
+    """
+    Find every note's most similar notes and fill their ``related`` field.
+
+    Each note's vector is the mean of its chunk vectors in the semantic
+    index, so notes are compared by topic rather than by shared links. All
+    pairs are scored in blocks of notes, keeping only the top ``limit`` per
+    note, so the working set stays under a memory cap however large the
+    vault. Written notes only have their ``related`` frontmatter line
+    rewritten; the rest of the file is kept byte for byte.
+
+    Args:
+        folder (str, optional): Only recommend for notes in this folder or its
+            subfolders. Recommendations can come from the whole vault.
+            Defaults to "".
+        limit (int, optional): Maximum related notes per note. Defaults to 5.
+        min_score (float, optional): Lowest cosine similarity (0 to 1) to
+            recommend. Defaults to 0.2.
+        dry_run (bool, optional): Report the recommendations without writing.
+            Defaults to True.
+        replace (bool, optional): Replace each note's ``related`` list instead
+            of adding to it. Defaults to False.
+        max_memory_mb (Optional[int], optional): Cap on the note vectors plus
+            one block of scores, in MiB. Defaults to the
+            OBSIDIAN_RELATED_MEMORY_MB setting.
+        max_results (int, optional): Maximum per-note entries to return.
+            Defaults to 200.
+
+    Returns:
+        dict: Counts, timings, the block size used and per-note
+        recommendations (with the ``related`` list written or to be written)
+
+    Raises:
+        Exception: If the arguments are invalid or the vault cannot be read
+    """
+    try:
+        if not 1 <= limit <= MAX_RELATED:
+            raise ValueError(f"limit must be between 1 and {MAX_RELATED}")
+        if not 0 < min_score <= 1:
+            raise ValueError("min_score must be greater than 0 and at most 1")
+        if max_memory_mb is None:
+            max_memory_mb = get_related_memory_mb()
+        if max_memory_mb < 1:
+            raise ValueError("max_memory_mb must be at least 1")
+
+        vault_path = get_vault_path()
+        note_folder = normalize_folder(folder)
+
+        def run():
+            start = time.perf_counter()
+            index = get_semantic_index(vault_path)
+            index.refresh()
+            rel_paths, matrix = index.note_vectors()
+            sources = np.array(
+                [
+                    number
+                    for number, rel_path in enumerate(rel_paths)
+                    if in_folder(rel_path, note_folder)
+                ],
+                dtype=np.intp,
+            )
+            max_bytes = max_memory_mb * 2**20
+            step = block_rows(len(rel_paths), matrix.shape[1], max_bytes)
+            scored = time.perf_counter()
+            neighbours = top_similar(matrix, sources, limit, min_score, max_bytes)
+            scoring_seconds = time.perf_counter() - scored
+            del matrix
+
+            note_cache = get_note_cache()
+
+            def apply(item):
+                source, related = item
+                rel_path = rel_paths[source]
+                file_path = vault_path / rel_path
+                titles = [PurePosixPath(rel_paths[row]).stem for row, _ in related]
+                try:
+                    with locked_paths(file_path):
+                        data = file_path.read_bytes()
+                        record_io(file_path, read=len(data))
+                        frontmatter = Frontmatter.parse(data)
+                        current = frontmatter_list(frontmatter.get("related"))
+                        values = _merged(current, titles, replace)
+                        changed = values != current
+                        if changed and not dry_run:
+                            frontmatter.set("related", values)
+                            atomic_write(
+                                file_path,
+                                frontmatter.render() + data[frontmatter.body_offset :],
+                                sync_directory=False,
+                            )
+                            note_cache.invalidate(file_path)
+                except Exception as e:
+                    return rel_path, related, None, False, str(e)
+                return rel_path, related, values, changed, None
+
+            items = [
+                (source, related)
+                for source, related in zip(sources.tolist(), neighbours)
+                if related or replace
+            ]
+            with ThreadPoolExecutor(max_workers=get_scan_threads()) as pool:
+                results = list(pool.map(in_call_context(apply), items))
+
+            if not dry_run:
+                rewritten = [vault_path / result[0] for result in results if result[3]]
+                # One directory flush per folder instead of one per note
+                for directory in {file_path.parent for file_path in rewritten}:
+                    fsync_directory(directory)
+                notify_changes(vault_path, rewritten)
+
+            notes = []
+            errors = []
+            for rel_path, related, values, changed, error in results:
+                if error is not None:
+                    errors.append({"path": str(vault_path / rel_path), "error": error})
+                    continue
+                notes.append(
+                    {
+                        "path": str(vault_path / rel_path),
+                        "recommended": [
+                            _related_entry(rel_paths[row], score)
+                            for row, score in related
+                        ],
+                        "related": values,
+                        "changed": changed,
+                    }
+                )
+
+            return {
+                "dry_run": dry_run,
+                "notes_scored": len(sources),
+                "notes_with_recommendations": sum(
+                    1 for note in notes if note["recommended"]
+                ),
+                "notes_changed": sum(1 for note in notes if note["changed"]),
+                "block_rows": step,
+                "scoring_seconds": round(scoring_seconds, 3),
+                "elapsed_seconds": round(time.perf_counter() - start, 3),
+                "notes": notes[:max_results],
+                "notes_truncated": len(notes) > max_results,
+                "errors": errors[:max_results],
+            }
+
+        return await run_blocking(run)
+
+    except Exception as e:
+        raise Exception(f"Failed to recommend related notes: {str(e)}")
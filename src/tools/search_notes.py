@@ -0,0 +1,78 @@
+import time
+from typing import Optional
+from config.settings import get_revalidate_ms, get_vault_path
+from search.inverted_index import get_search_index
+from utils.async_io import run_blocking
+
+MAX_SEARCH_RESULTS = 100
+
+
+async def search_notes(
+    query: str,
+    folder: str = "",
+    tag: Optional[str] = None,
+    limit: int = 10,
+    offset: int = 0,
+    rebuild: bool = False,
+) -> dict:
+    """
+    Full-text search over note titles, aliases, tags, summaries and bodies.
+
+    Results are ranked with BM25, weighting title matches above alias, tag,
+    summary and body matches. The search index is persistent. Writes made
+    through the server update it as they happen; edits made outside it are
+    found by walking the vault, which a watcher (OBSIDIAN_WATCH) makes
+    unnecessary and which otherwise happens at most once per
+    OBSIDIAN_REVALIDATE_MS.
+
+    Query syntax: words (all must match), ``"exact phrases"``, ``prefix*``,
+    ``OR``, ``AND``, ``NOT`` / ``-word``, parentheses, and field filters such
+    as ``title:word`` or ``tags:word``.
+
+    Args:
+        query (str): The search query
+        folder (str, optional): Only search notes in this folder or its
+            subfolders. Defaults to "".
+        tag (Optional[str], optional): Only search notes with this tag.
+        limit (int, optional): Maximum number of results. Defaults to 10.
+        offset (int, optional): Number of top results to skip, for paging.
+            Defaults to 0.
+        rebuild (bool, optional): Re-index every note first. Defaults to False.
+
+    Returns:
+        dict: ``results`` (path, title, folder, score and a snippet with
+        highlight offsets), the ``total`` number of matches, the time spent
+        bringing the index up to date (``refresh_ms``) and the query time
+        (``elapsed_ms``)
+
+    Raises:
+        Exception: If the query is invalid or the vault cannot be searched
+    """
+    try:
+        if not 1 <= limit <= MAX_SEARCH_RESULTS:
+            raise ValueError(f"limit must be between 1 and {MAX_SEARCH_RESULTS}")
+        if offset < 0:
+            raise ValueError("offset cannot be negative")
+
+        vault_path = get_vault_path()
+        max_age = get_revalidate_ms() / 1000
+
+        def run():
+            start = time.perf_counter()
+            index = get_search_index(vault_path)
+            index.refresh("rebuild" if rebuild else "warm", max_age=max_age)
+            refreshed = time.perf_counter()
+            results, total = index.search(
+                query, folder=folder, tag=tag, limit=limit, offset=offset
+            )
+            return {
+                "results": results,
+                "total": total,
+                "refresh_ms": round((refreshed - start) * 1000, 2),
+                "elapsed_ms": round((time.perf_counter() - refreshed) * 1000, 2),
+            }
+
+        return await run_blocking(run)
+
+    except Exception as e:
+        raise Exception(f"Failed to search notes: {str(e)}")
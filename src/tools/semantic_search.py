@@ -0,0 +1,60 @@
+import time
+from config.settings import get_revalidate_ms, get_vault_path
+from search.semantic import get_semantic_index
+from utils.async_io import run_blocking
+
+MAX_SEMANTIC_RESULTS = 100
+
+
+async def semantic_search(
+    query: str, folder: str = "", limit: int = 10, rebuild: bool = False
+) -> dict:
+    """
+    Find notes that are about the same thing as a query, offline.
+
+    Notes are split into chunks at their headings and each chunk is embedded
+    by the configured encoder (by default a hashing encoder that needs no
+    model, network or GPU). Notes are ranked by the cosine similarity of
+    their best chunk to the query. Embeddings are stored on disk and only
+    recomputed for notes whose content changed.
+
+    Args:
+        query (str): Free text describing what to look for
+        folder (str, optional): Only search notes in this folder or its
+            subfolders. Defaults to "".
+        limit (int, optional): Maximum number of results. Defaults to 10.
+        rebuild (bool, optional): Re-embed every note first. Defaults to False.
+
+    Returns:
+        dict: ``results`` (path, title, folder, score, and the best chunk's
+        line, heading and preview), the time spent bringing the index up to
+        date (``refresh_ms``) and the query time (``elapsed_ms``)
+
+    Raises:
+        Exception: If the query is invalid or the vault cannot be searched
+    """
+    try:
+        if not query.strip():
+            raise ValueError("Query cannot be empty")
+        if not 1 <= limit <= MAX_SEMANTIC_RESULTS:
+            raise ValueError(f"limit must be between 1 and {MAX_SEMANTIC_RESULTS}")
+
+        vault_path = get_vault_path()
+        max_age = get_revalidate_ms() / 1000
+
+        def run():
+            start = time.perf_counter()
+            index = get_semantic_index(vault_path)
+            index.refresh("rebuild" if rebuild else "warm", max_age=max_age)
+            refreshed = time.perf_counter()
+            results = index.search(query, folder=folder, limit=limit)
+            return {
+                "results": results,
+                "refresh_ms": round((refreshed - start) * 1000, 2),
+                "elapsed_ms": round((time.perf_counter() - refreshed) * 1000, 2),
+            }
+
+        return await run_blocking(run)
+
+    except Exception as e:
+        raise Exception(f"Failed to run semantic search: {str(e)}")
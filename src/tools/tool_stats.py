@@ -0,0 +1,30 @@
+from config.settings import get_metrics_file
+from utils.async_io import run_blocking
+from utils.instrumentation import dump_prometheus, get_tool_metrics
+
+
+async def get_tool_stats() -> dict:
+    """
+    Report per-tool call counts, latency percentiles and file I/O.
+
+    Returns:
+        dict: When collection started (``since``), per-tool ``calls``,
+        ``errors``, ``p50_ms``/``p95_ms``/``p99_ms`` over recent calls,
+        ``bytes_read``/``bytes_written`` and ``files_read``/``files_written``,
+        the ``slow_call_profiles`` kept by the profiler, and the Prometheus
+        ``metrics_file`` (None when not configured), which is refreshed
+        by this call
+
+    Raises:
+        Exception: If the statistics cannot be collected
+    """
+    try:
+        stats = get_tool_metrics().stats()
+        metrics_file = get_metrics_file()
+        if metrics_file is not None:
+            await run_blocking(dump_prometheus, metrics_file)
+        stats["metrics_file"] = str(metrics_file) if metrics_file else None
+        return stats
+
+    except Exception as e:
+        raise Exception(f"Failed to get tool stats: {str(e)}")
@@ -1,7 +1,113 @@
 from datetime import datetime
+from pathlib import Path
 from models.note_models import ObsidianNote
 from config.settings import get_vault_path
-from utils.utils import get_file_creation_time
+from vault.changes import notify_changes
+from tools.read_note import cache_written_note, locate_note
+from utils.atomic_write import atomic_write
+from utils.async_io import locked_paths, run_blocking
+from utils.frontmatter import Frontmatter, frontmatter_list
+from utils.instrumentation import record_io
+from utils.utils import get_creation_time_from_stats
+
+LIST_FIELDS = ("tags", "aliases", "related")
+
+
+def _current_value(frontmatter: Frontmatter, key: str, file_path: Path):
+    """The value ``read_note`` reports for a field of the existing note."""
+    value = frontmatter.get(key)
+    if key == "title":
+        return file_path.stem if value is None else str(value)
+    if key in LIST_FIELDS:
+        return frontmatter_list(value)
+    if key == "type":
+        return "note" if key not in frontmatter else value
+    return "" if value is None else str(value)
+
+
+def format_updated_note(note: ObsidianNote, file_path: Path, data: bytes) -> str:
+    """
+    Format an updated note from the note object and the file's current text.
+
+    Only the frontmatter keys whose values change are re-emitted, plus
+    ``modified`` (and ``created`` when the note has none). Every other line of
+    the header, including keys this server does not know about, YAML lists,
+    comments and formatting, is copied byte for byte.
+
+    Args:
+        note (ObsidianNote): The note object containing updated information
+        file_path (Path): Path of the note being updated
+        data (bytes): The note file's current contents
+
+    Returns:
+        str: The full text to write
+    """
+    frontmatter = Frontmatter.parse(data)
+    fields = {
+        "title": note.title,
+        "created": None,
+        "modified": datetime.now().isoformat(),
+        "tags": note.tags,
+        "aliases": note.aliases,
+        "related": note.related,
+        "category": note.category,
+        "type": note.type,
+        "summary": note.summary,
+    }
+    # Set in the order of a new note's header, so keys a note lacks are added
+    # in the usual order
+    for key, value in fields.items():
+        if key == "created":
+            if key not in frontmatter:
+                frontmatter.set(key, get_creation_time_from_stats(str(file_path)))
+        elif key == "modified":
+            frontmatter.set(key, value)
+        elif _current_value(frontmatter, key, file_path) != value:
+            frontmatter.set(key, value)
+
+    return frontmatter.render().decode("utf-8") + f"\n{note.content}\n"
+
+
+def write_updated_note(vault_path: Path, note: ObsidianNote) -> Path:
+    """
+    Rewrite an existing note with the note's fields and content.
+
+    This is the blocking core of ``update_note``. The note's write lock is
+    held from reading the current file to replacing it. Without a folder, a
+    note that is not at the vault root is found by name, and the note's
+    ``title`` and ``folder`` are set to those of the note found.
+
+    Args:
+        vault_path (Path): The vault root
+        note (ObsidianNote): The note object containing updated information
+
+    Returns:
+        Path: The path of the rewritten note
+
+    Raises:
+        FileNotFoundError: If the note does not exist
+    """
+    # Without a folder, the note may be found by name anywhere in the vault
+    file_path, note.title, note.folder = locate_note(
+        vault_path, note.title, note.folder
+    )
+
+    with locked_paths(file_path):
+        if not file_path.exists():
+            raise FileNotFoundError(f"Note not found: {file_path}")
+
+        data = file_path.read_bytes()
+        record_io(file_path, read=len(data))
+        formatted_content = format_updated_note(note, file_path, data)
+
+        # Write the updated content without ever exposing a half-written note
+        atomic_write(file_path, formatted_content.encode("utf-8"))
+
+        # Keep the indexes in step with writes made through this server
+        notify_changes(vault_path, [file_path])
+        cache_written_note(file_path, note.title, note.folder, formatted_content)
+
+    return file_path
 
 
 async def update_note(note: ObsidianNote):
@@ -19,38 +125,7 @@ async def update_note(note: ObsidianNote):
     """
     try:
         vault_path = get_vault_path()
-
-        # Construct the file path
-        if note.folder:
-            file_path = vault_path / note.folder / f"{note.title}.md"
-        else:
-            file_path = vault_path / f"{note.title}.md"
-
-        if not file_path.exists():
-            raise FileNotFoundError(f"Note not found: {file_path}")
-
-        # Get creation date using utility function
-        created_date = get_file_creation_time(str(file_path))
-
-        # Format the note content with metadata
-        formatted_content = f"""---
-title: {note.title}
-created: {created_date}
-modified: {datetime.now().isoformat()}
-tags: {", ".join(note.tags)}
-aliases: {", ".join(note.aliases)}
-related: {", ".join(note.related)}
-category: {note.category}
-type: {note.type}
-summary: {note.summary}
----
-
-{note.content}
-"""
-
-        # Write the updated content to file
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(formatted_content)
+        file_path = await run_blocking(write_updated_note, vault_path, note)
 
         return {
             "message": "Note updated successfully",
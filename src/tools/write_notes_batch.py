@@ -0,0 +1,237 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+from config.settings import get_vault_path
+from models.note_models import NoteWrite
+from tools.create_note import format_new_note
+from tools.read_note import cache_written_note, resolve_note_name
+from tools.update_note import format_updated_note
+from utils.atomic_write import fsync_directory, stage_file
+from utils.async_io import locked_paths, run_blocking
+from utils.instrumentation import record_io
+from vault.changes import notify_changes
+from vault.metadata_index import normalize_folder
+
+MAX_BATCH_WRITES = 500
+
+NOT_APPLIED = "Not applied: another note in the batch failed"
+
+
+class _Write:
+    """One note of a batch on its way to disk."""
+
+    def __init__(self, index: int, request: NoteWrite, file_path: Path, text: str):
+        self.index = index
+        self.request = request
+        self.file_path = file_path
+        self.text = text
+        self.temp_path = None
+        self.backup_path = None
+        self.existed = False
+        self.applied = False
+
+
+def _note_path(vault_path: Path, request: NoteWrite) -> Path:
+    """Resolve the path a note of the batch is written to."""
+    note = request.note
+    if not note.title.strip():
+        raise ValueError("Note title cannot be empty or whitespace only")
+    folder = normalize_folder(note.folder)
+    folder_path = vault_path / folder if folder else vault_path
+    file_path = folder_path / f"{note.title}.md"
+    if request.action == "update" and not folder and not file_path.exists():
+        # An update without a folder may name a note anywhere in the vault
+        found = resolve_note_name(vault_path, note.title.strip())
+        if found is not None:
+            file_path, note.title, note.folder = found
+    return file_path
+
+
+def _prepare(file_path: Path, index: int, request: NoteWrite) -> _Write:
+    """Format a note's new text."""
+    note = request.note
+    if request.action == "update":
+        if not file_path.exists():
+            raise FileNotFoundError(f"Note not found: {file_path}")
+        data = file_path.read_bytes()
+        record_io(file_path, read=len(data))
+        text = format_updated_note(note, file_path, data)
+    else:
+        text = format_new_note(note)
+    return _Write(index, request, file_path, text)
+
+
+def _make_folder(folder: Path, created: list[Path]) -> None:
+    """Create a missing note folder, recording each new directory."""
+    missing = []
+    while not folder.exists():
+        missing.append(folder)
+        folder = folder.parent
+    for directory in reversed(missing):
+        directory.mkdir()
+        created.append(directory)
+
+
+def _backup(file_path: Path) -> Path:
+    """Keep the current version of a note reachable under a hidden name."""
+    backup_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.bak")
+    try:
+        os.link(file_path, backup_path)
+    except OSError:
+        # Filesystems without hard links get a copy instead
+        shutil.copy2(file_path, backup_path)
+    return backup_path
+
+
+def _roll_back(writes: list[_Write], created_folders: list[Path]) -> None:
+    """Undo a partially applied batch, restoring every note it replaced."""
+    for write in reversed(writes):
+        if write.applied:
+            if write.existed:
+                os.replace(write.backup_path, write.file_path)
+                write.backup_path = None
+            else:
+                write.file_path.unlink(missing_ok=True)
+        for path in (write.temp_path, write.backup_path):
+            if path is not None:
+                path.unlink(missing_ok=True)
+    for folder in reversed(created_folders):
+        try:
+            folder.rmdir()
+        except OSError:
+            pass
+
+
+def _failed(results: list[dict], index: int, error: Exception) -> dict:
+    """Report a batch that was not applied because one note failed."""
+    for number, result in enumerate(results):
+        result["error"] = str(error) if number == index else NOT_APPLIED
+    return {"committed": False, "written": 0, "results": results}
+
+
+def _apply(vault_path: Path, requests: list[NoteWrite]) -> dict:
+    results = [
+        {
+            "action": request.action,
+            "title": request.note.title,
+            "folder": request.note.folder,
+        }
+        for request in requests
+    ]
+
+    paths = []
+    seen = {}
+    for index, request in enumerate(requests):
+        try:
+            file_path = _note_path(vault_path, request)
+            key = os.path.normcase(str(file_path))
+            if key in seen:
+                raise ValueError(f"Note is written twice in this batch: {file_path}")
+            seen[key] = index
+        except Exception as e:
+            return _failed(results, index, e)
+        paths.append(file_path)
+
+    # Hold every note's lock until the batch is committed or rolled back
+    with locked_paths(*paths):
+        return _apply_locked(vault_path, requests, paths, results)
+
+
+def _apply_locked(
+    vault_path: Path, requests: list[NoteWrite], paths: list[Path], results: list[dict]
+) -> dict:
+    # Validate and format everything before touching the disk
+    writes = []
+    for index, (request, file_path) in enumerate(zip(requests, paths)):
+        try:
+            write = _prepare(file_path, index, request)
+        except Exception as e:
+            return _failed(results, index, e)
+        writes.append(write)
+
+    created_folders = []
+    current = None
+    try:
+        # Stage every note next to its target, flushed to disk
+        for current in writes:
+            _make_folder(current.file_path.parent, created_folders)
+            current.temp_path = stage_file(
+                current.file_path, current.text.encode("utf-8")
+            )
+
+        # Swap the staged notes in, keeping the replaced versions until the
+        # whole batch is in place
+        for current in writes:
+            current.existed = current.file_path.exists()
+            if current.existed:
+                current.backup_path = _backup(current.file_path)
+            os.replace(current.temp_path, current.file_path)
+            current.temp_path = None
+            current.applied = True
+    except Exception as e:
+        _roll_back(writes, created_folders)
+        for directory in {write.file_path.parent for write in writes}:
+            if directory.exists():
+                fsync_directory(directory)
+        return _failed(results, current.index, e)
+
+    for write in writes:
+        if write.backup_path is not None:
+            write.backup_path.unlink(missing_ok=True)
+
+    # One directory flush per folder, plus the parents of new folders
+    directories = {write.file_path.parent for write in writes}
+    directories.update(folder.parent for folder in created_folders)
+    for directory in directories:
+        fsync_directory(directory)
+
+    # Keep the indexes in step with writes made through this server
+    notify_changes(vault_path, [write.file_path for write in writes])
+    for write in writes:
+        note = write.request.note
+        cache_written_note(write.file_path, note.title, note.folder, write.text)
+        results[write.index]["path"] = str(write.file_path)
+        results[write.index]["status"] = "updated" if write.existed else "created"
+
+    return {"committed": True, "written": len(writes), "results": results}
+
+
+async def write_notes_batch(writes: list[NoteWrite]) -> dict:
+    """
+    Create and update many notes in one all-or-nothing call.
+
+    Every note is first written to a temporary file next to it and flushed
+    to disk; the temporary files are then renamed over the notes. If any
+    note fails, notes already replaced are restored and no note in the batch
+    is changed. Directory entries are flushed once per folder.
+
+    Args:
+        writes (list[NoteWrite]): The notes to write. ``create`` writes the
+            note whether or not it exists, like ``create_note``; ``update``
+            requires the note to exist and keeps its creation date, like
+            ``update_note``.
+
+    Returns:
+        dict: Whether the batch was ``committed``, the number of notes
+        ``written``, and per-note ``results`` in request order, each with the
+        note's ``path`` and ``status`` (``created`` or ``updated``), or the
+        ``error`` that stopped the batch
+
+    Raises:
+        Exception: If the batch is empty or too large
+    """
+    try:
+        if not writes:
+            raise ValueError("Provide at least one note to write")
+        if len(writes) > MAX_BATCH_WRITES:
+            raise ValueError(
+                f"A batch can write at most {MAX_BATCH_WRITES} notes, "
+                f"got {len(writes)}"
+            )
+
+        vault_path = get_vault_path()
+        return await run_blocking(_apply, vault_path, writes)
+
+    except Exception as e:
+        raise Exception(f"Failed to write notes: {str(e)}")
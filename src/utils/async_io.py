@@ -0,0 +1,128 @@
+"""
+Blocking file I/O for the async tools.
+
+Every tool is a coroutine, but reading and writing notes blocks. Tools hand
+their file work to ``run_blocking``, which runs it on a shared thread pool of
+OBSIDIAN_IO_THREADS workers, so a slow disk or a network-mounted vault never
+stalls the event loop and independent requests are served in parallel.
+
+Writes to a note hold that note's lock (``locked_paths``), so concurrent
+read-modify-write cycles on the same note run one after the other while
+operations on other notes carry on. The locks are taken in the worker
+threads, so bulk writers running on their own thread pools use the same
+locks as the single-note tools.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+from config.settings import get_io_threads
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool that runs the tools' blocking work."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_io_threads(), thread_name_prefix="obsidian-io"
+            )
+        return _executor
+
+
+def reset_io_executor():
+    """Shut the I/O thread pool down; the next use re-reads the settings."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run_blocking(fn: Callable, /, *args, **kwargs) -> Any:
+    """
+    Run a blocking function on the I/O thread pool and wait for its result.
+
+    Like ``asyncio.to_thread``, the function sees the caller's context
+    variables, but the number of functions running at once is bounded by
+    the OBSIDIAN_IO_THREADS setting; further calls queue up. Its I/O counts
+    towards the tool call being served, which may also profile it.
+
+    Args:
+        fn (Callable): The blocking function
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        Any: What fn returned
+    """
+    # instrumentation runs its own work here, so it cannot be imported at the top
+    from utils.instrumentation import in_call_context
+
+    loop = asyncio.get_running_loop()
+    call = functools.partial(
+        contextvars.copy_context().run, in_call_context(fn), *args, **kwargs
+    )
+    return await loop.run_in_executor(get_io_executor(), call)
+
+
+class _PathLock:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.users = 0
+
+
+_path_locks: dict[str, _PathLock] = {}
+_path_locks_lock = threading.Lock()
+
+
+def _lock_key(path: Union[str, Path]) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+@contextmanager
+def locked_paths(*paths: Union[str, Path]) -> Iterator[None]:
+    """
+    Hold the write locks of one or more files.
+
+    Locks are taken in a fixed order, so writers locking overlapping sets of
+    notes cannot deadlock, and are re-entrant within a thread. A lock only
+    exists while someone holds or waits for it.
+
+    Args:
+        *paths (Union[str, Path]): The files about to be read and rewritten
+    """
+    keys = sorted({_lock_key(path) for path in paths})
+    with _path_locks_lock:
+        entries = []
+        for key in keys:
+            entry = _path_locks.get(key)
+            if entry is None:
+                entry = _path_locks[key] = _PathLock()
+            entry.users += 1
+            entries.append((key, entry))
+
+    acquired = []
+    try:
+        for _, entry in entries:
+            entry.lock.acquire()
+            acquired.append(entry)
+        yield
+    finally:
+        for entry in reversed(acquired):
+            entry.lock.release()
+        with _path_locks_lock:
+            for key, entry in entries:
+                entry.users -= 1
+                if not entry.users:
+                    del _path_locks[key]
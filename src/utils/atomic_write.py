@@ -0,0 +1,89 @@
+"""
+Crash-safe file replacement.
+
+A note is never truncated in place: the new text goes to a temporary file in
+the same directory, is flushed to disk, and is then renamed over the note.
+Readers (Obsidian, sync clients, the vault watcher) see either the old note
+or the new one, never a half-written file.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from utils.instrumentation import record_io
+
+# mkstemp creates files as 0600; new notes get the usual umask-based mode.
+# Read once, since changing the umask is not thread-safe.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def fsync_directory(directory: Path) -> None:
+    """Flush a directory entry change (create, rename) to disk, where supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        # Windows cannot open directories; renames there are already durable
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def stage_file(file_path: Path, data: bytes) -> Path:
+    """
+    Write data to a synced temporary file next to file_path.
+
+    The temporary file is hidden and does not end in ``.md``, so it is never
+    mistaken for a note. It takes over the permissions of the file it will
+    replace.
+
+    Args:
+        file_path (Path): The file the data is meant for
+        data (bytes): The new file contents
+
+    Returns:
+        Path: The temporary file, ready to be renamed over file_path
+    """
+    fd, temp_name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, file_path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o666 & ~_UMASK)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    record_io(file_path, written=len(data))
+    return temp_path
+
+
+def atomic_write(file_path: Path, data: bytes, sync_directory: bool = True) -> None:
+    """
+    Replace a file's contents atomically.
+
+    Args:
+        file_path (Path): The file to write
+        data (bytes): The new file contents
+        sync_directory (bool, optional): Also flush the rename to disk.
+            Defaults to True.
+    """
+    temp_path = stage_file(file_path, data)
+    try:
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    if sync_directory:
+        fsync_directory(file_path.parent)
@@ -0,0 +1,525 @@
+import datetime
+import io
+import json
+import re
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+import yaml
+
+from config.settings import get_max_frontmatter_bytes
+from utils.instrumentation import record_io
+
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlSafeLoader
+
+FENCE = b"---"
+
+# A flat ``key: value`` line that the fast path can take apart by itself
+_FLAT_LINE = re.compile(r"([A-Za-z_][A-Za-z0-9_-]{0,127}):(?: (.*))?")
+
+# Characters that cannot start a plain scalar, or that need a closer look
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+
+# Anything YAML would treat as a line break or reject outright
+_UNSUPPORTED = re.compile(r"[\t\r\x85\u2028\u2029\ufeff]")
+
+_resolver = yaml.resolver.Resolver()
+_constructor = yaml.constructor.SafeConstructor()
+
+
+class FrontmatterBlock(NamedTuple):
+    """The raw YAML header of a note and where the note body starts."""
+
+    # Header text between the fences, or None when the note has no frontmatter
+    text: Optional[str]
+    # Byte offset of the first byte after the closing fence line
+    body_offset: int
+
+
+def _normalize_newlines(text: str) -> str:
+    # Match what a text-mode read would have produced
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _is_fence(line: bytes) -> bool:
+    return line.rstrip(b" \t\r\n") == FENCE
+
+
+def _read_block(f, max_header_bytes: int) -> FrontmatterBlock:
+    first_line = f.readline(max_header_bytes + 1)
+    if not first_line.startswith(FENCE) or not _is_fence(first_line):
+        return FrontmatterBlock(None, 0)
+
+    lines = []
+    consumed = len(first_line)
+    while True:
+        line = f.readline(max_header_bytes + 1)
+        if not line:
+            # Unterminated header: treat the whole file as body
+            return FrontmatterBlock(None, 0)
+        consumed += len(line)
+        if _is_fence(line):
+            break
+        if consumed > max_header_bytes:
+            raise ValueError(
+                f"Frontmatter exceeds the maximum header size of {max_header_bytes} bytes"
+            )
+        lines.append(line)
+
+    text = _normalize_newlines(b"".join(lines).decode("utf-8"))
+    return FrontmatterBlock(text, consumed)
+
+
+def read_frontmatter(
+    file_path: Union[str, Path], max_header_bytes: Optional[int] = None
+) -> FrontmatterBlock:
+    """
+    Read only the YAML frontmatter of a note, without loading its body.
+
+    The file is streamed line by line and reading stops at the closing ``---``
+    fence, so the cost is proportional to the header size rather than the
+    note size.
+
+    Args:
+        file_path (Union[str, Path]): Path to the note
+        max_header_bytes (Optional[int], optional): Upper bound on the header
+            size. Defaults to the OBSIDIAN_MAX_FRONTMATTER_BYTES setting.
+
+    Returns:
+        FrontmatterBlock: The header text (None if the note has no
+        frontmatter) and the byte offset at which the body begins
+
+    Raises:
+        ValueError: If the header is larger than ``max_header_bytes``
+    """
+    if max_header_bytes is None:
+        max_header_bytes = get_max_frontmatter_bytes()
+
+    with open(file_path, "rb") as f:
+        block = _read_block(f, max_header_bytes)
+        record_io(file_path, read=f.tell())
+        return block
+
+
+def split_frontmatter(
+    data: bytes, max_header_bytes: Optional[int] = None
+) -> FrontmatterBlock:
+    """
+    Locate the frontmatter of a note that is already in memory.
+
+    Args:
+        data (bytes): The raw note file contents
+        max_header_bytes (Optional[int], optional): Upper bound on the header
+            size. Defaults to the OBSIDIAN_MAX_FRONTMATTER_BYTES setting.
+
+    Returns:
+        FrontmatterBlock: The header text and the body's byte offset in ``data``
+    """
+    if max_header_bytes is None:
+        max_header_bytes = get_max_frontmatter_bytes()
+
+    return _read_block(io.BytesIO(data), max_header_bytes)
+
+
+def read_note_file(
+    file_path: Union[str, Path], max_header_bytes: Optional[int] = None
+) -> tuple[Optional[str], str]:
+    """
+    Read a note's frontmatter text and body in a single pass.
+
+    Args:
+        file_path (Union[str, Path]): Path to the note
+        max_header_bytes (Optional[int], optional): Upper bound on the header
+            size. Defaults to the OBSIDIAN_MAX_FRONTMATTER_BYTES setting.
+
+    Returns:
+        tuple[Optional[str], str]: The header text (None if absent) and the
+        unstripped body text
+    """
+    if max_header_bytes is None:
+        max_header_bytes = get_max_frontmatter_bytes()
+
+    with open(file_path, "rb") as f:
+        block = _read_block(f, max_header_bytes)
+        f.seek(block.body_offset)
+        body = _normalize_newlines(f.read().decode("utf-8"))
+        record_io(file_path, read=f.tell())
+
+    return block.text, body
+
+
+class _NotFlat(Exception):
+    """Raised when a header needs the full YAML loader."""
+
+
+def _scalar(text: str) -> Any:
+    # Resolve and construct a plain scalar exactly like SafeLoader would
+    tag = _resolver.resolve(yaml.ScalarNode, text, (True, False))
+    construct = _constructor.yaml_constructors.get(tag)
+    if construct is None:
+        raise _NotFlat
+    return construct(_constructor, yaml.ScalarNode(tag, text))
+
+
+def _plain_value(raw: str) -> str:
+    comment = raw.find(" #")
+    if comment != -1:
+        raw = raw[:comment]
+    value = raw.strip(" ")
+    if not value:
+        return value
+    first = value[0]
+    if first in _INDICATORS and (
+        first not in "-?:" or len(value) == 1 or value[1] == " "
+    ):
+        raise _NotFlat
+    if ": " in value or value.endswith(":"):
+        raise _NotFlat
+    return value
+
+
+def _parse_flat(text: str) -> Any:
+    if _UNSUPPORTED.search(text) or yaml.reader.Reader.NON_PRINTABLE.search(text):
+        raise _NotFlat
+
+    # Check every line before constructing anything: a later line can turn an
+    # earlier value into something else entirely (e.g. a continuation line).
+    entries = []
+    for line in text.split("\n"):
+        if not line or line[0] == "#":
+            # Blank lines and top-level comments carry no data
+            continue
+        match = _FLAT_LINE.fullmatch(line)
+        if match is None:
+            raise _NotFlat
+        key = match.group(1)
+        if (
+            _resolver.resolve(yaml.ScalarNode, key, (True, False))
+            != "tag:yaml.org,2002:str"
+        ):
+            raise _NotFlat
+        entries.append((key, _plain_value(match.group(2) or "")))
+
+    if not entries:
+        return None
+    return {key: _scalar(value) for key, value in entries}
+
+
+def parse_frontmatter(text: str) -> Any:
+    """
+    Parse frontmatter text, producing exactly what ``yaml.safe_load`` would.
+
+    Headers made only of flat ``key: value`` lines with plain scalar values,
+    which is everything this server writes, are parsed directly without
+    running the YAML scanner. Anything else goes to the libyaml
+    ``CSafeLoader`` when it is available, or to the pure-Python loader.
+
+    Args:
+        text (str): The YAML header text
+
+    Returns:
+        Any: The parsed header
+
+    Raises:
+        yaml.YAMLError: If the header is not valid YAML
+    """
+    try:
+        return _parse_flat(text)
+    except _NotFlat:
+        return yaml.load(text, Loader=YamlSafeLoader)
+
+
+def format_frontmatter_value(value: Any) -> str:
+    """
+    Format a value for a ``key: value`` frontmatter line.
+
+    Lists are written comma-separated, the way this server writes tags and
+    aliases. Strings stay plain when they read back unchanged and are
+    double-quoted otherwise; other values are written as JSON, which YAML
+    reads as flow style.
+
+    Args:
+        value (Any): The value to format
+
+    Returns:
+        str: The text to put after ``key: ``
+    """
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(item) for item in value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, str):
+        if "\n" not in value:
+            try:
+                if parse_frontmatter(f"key: {value}") == {"key": value}:
+                    return value
+            except yaml.YAMLError:
+                pass
+        return json.dumps(value, ensure_ascii=False)
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def frontmatter_list(value: Any) -> list[str]:
+    """
+    Read a list-valued frontmatter field such as ``tags`` or ``aliases``.
+
+    Accepts both the comma-separated strings this server writes and YAML
+    lists (block or flow style) written by Obsidian and its plugins.
+    """
+    if value is None or value == "":
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value if item is not None]
+    return str(value).split(", ")
+
+
+def _key_of(line: bytes) -> Optional[str]:
+    # Top-level keys start in the first column; indented lines, list items
+    # and comments continue or annotate the key above them
+    if not line.strip() or line[:1] in (b" ", b"\t", b"-", b"#"):
+        return None
+    key, separator, _ = line.partition(b":")
+    if not separator:
+        return None
+    key = key.decode("utf-8").strip()
+    if len(key) >= 2 and key[0] == key[-1] and key[0] in "'\"":
+        key = key[1:-1]
+    return key
+
+
+_BLOCK_ITEM = re.compile(rb"([ \t]*- )")
+
+
+def _flow_item(value: Any) -> str:
+    text = format_frontmatter_value(value)
+    if any(character in text for character in ",[]{}"):
+        return json.dumps(str(value), ensure_ascii=False)
+    return text
+
+
+class _Entry:
+    """One top-level key of a header with its lines, or a run of other lines."""
+
+    __slots__ = ("key", "lines")
+
+    def __init__(self, key: Optional[str], lines: list[bytes]):
+        self.key = key
+        self.lines = lines
+
+
+class Frontmatter:
+    """
+    A note's YAML header as an ordered sequence of key blocks.
+
+    Parsing splits the header into one block per top-level key (the key line
+    plus its indented, list-item or block-scalar continuation lines), keeping
+    comments and blank lines in place. Every block keeps its original bytes;
+    ``render`` re-emits only the keys that were set or removed and copies
+    everything else byte for byte, so unknown keys, YAML list formatting and
+    comments survive an update. Nothing is serialized with a YAML dumper.
+    """
+
+    def __init__(
+        self,
+        head: bytes,
+        entries: list[_Entry],
+        tail: bytes,
+        body_offset: int,
+        newline: bytes,
+        text: Optional[str],
+    ):
+        self._head = head
+        self._entries = entries
+        self._tail = tail
+        self.body_offset = body_offset
+        self._newline = newline
+        self._text = text
+        self._values: Optional[dict] = None
+        self._changed: dict[str, Any] = {}
+
+    @classmethod
+    def parse(cls, data: bytes, max_header_bytes: Optional[int] = None):
+        """
+        Split the header of a note's raw contents into key blocks.
+
+        Args:
+            data (bytes): The raw note file contents
+            max_header_bytes (Optional[int], optional): Upper bound on the
+                header size. Defaults to the OBSIDIAN_MAX_FRONTMATTER_BYTES
+                setting.
+
+        Returns:
+            Frontmatter: The header; empty if the note has none
+        """
+        block = split_frontmatter(data, max_header_bytes)
+        if block.text is None:
+            newline = b"\r\n" if data.find(b"\r\n") != -1 else b"\n"
+            return cls(b"", [], b"", 0, newline, None)
+
+        first_end = data.index(b"\n") + 1
+        close_start = data.rfind(b"\n", 0, block.body_offset - 1) + 1
+        newline = b"\r\n" if data[:first_end].endswith(b"\r\n") else b"\n"
+
+        entries: list[_Entry] = []
+        for line in data[first_end:close_start].splitlines(keepends=True):
+            key = _key_of(line)
+            continuation = line.strip() and line[:1] in (b" ", b"\t", b"-")
+            if (
+                continuation
+                and len(entries) >= 2
+                and entries[-1].key is None
+                and entries[-2].key is not None
+                and not b"".join(entries[-1].lines).strip()
+            ):
+                # Blank lines inside a block scalar or list belong to its key
+                entries[-2].lines.extend(entries.pop().lines)
+            if key is not None:
+                entries.append(_Entry(key, [line]))
+            elif continuation and entries and entries[-1].key is not None:
+                entries[-1].lines.append(line)
+            elif entries and entries[-1].key is None:
+                entries[-1].lines.append(line)
+            else:
+                entries.append(_Entry(None, [line]))
+
+        return cls(
+            data[:first_end],
+            entries,
+            data[close_start : block.body_offset],
+            block.body_offset,
+            newline,
+            block.text,
+        )
+
+    @property
+    def values(self) -> dict:
+        """The parsed header as it was read, before any changes."""
+        if self._values is None:
+            values = None
+            if self._text is not None:
+                try:
+                    values = parse_frontmatter(self._text.strip())
+                except yaml.YAMLError:
+                    values = None
+            self._values = values if isinstance(values, dict) else {}
+        return self._values
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._changed:
+            return self._changed[key] is not None
+        return any(entry.key == key for entry in self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a key's current value, including changes not yet rendered."""
+        if key in self._changed:
+            value = self._changed[key]
+            return default if value is None else value
+        return self.values.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a key, or remove it when value is None."""
+        if (
+            not key.strip()
+            or key != key.strip()
+            or ":" in key
+            or "\n" in key
+            or key[0] in "-#"
+        ):
+            raise ValueError(f"Invalid frontmatter key: {key!r}")
+        self._changed[key] = value
+
+    def update(self, values: dict[str, Any]) -> None:
+        """Set several keys; a value of None removes the key."""
+        for key in values:
+            self.set(key, values[key])
+
+    @property
+    def changed_keys(self) -> list[str]:
+        return list(self._changed)
+
+    def _emit(self, key: str, value: Any, original: Optional[_Entry]) -> list[bytes]:
+        newline = self._newline
+        if isinstance(value, (list, tuple)) and original is not None:
+            first = original.lines[0]
+            rest = first.partition(b":")[2].strip()
+            if not rest and len(original.lines) > 1:
+                # Keep a block-style list in block style, with its indentation
+                match = _BLOCK_ITEM.match(original.lines[1])
+                if match is not None:
+                    prefix = match.group(1).decode("utf-8")
+                    return [f"{key}:".encode("utf-8") + newline] + [
+                        f"{prefix}{format_frontmatter_value(str(item))}".encode("utf-8")
+                        + newline
+                        for item in value
+                    ]
+            if rest.startswith(b"["):
+                items = ", ".join(_flow_item(item) for item in value)
+                return [f"{key}: [{items}]".encode("utf-8") + newline]
+        text = format_frontmatter_value(value)
+        return [f"{key}: {text}".rstrip().encode("utf-8") + newline]
+
+    def render(self) -> bytes:
+        """
+        Render the header, fences included.
+
+        Returns:
+            bytes: The header text; empty for a note without frontmatter that
+            had no keys set
+        """
+        if self._text is None and not any(
+            value is not None for value in self._changed.values()
+        ):
+            return b""
+
+        pending = dict(self._changed)
+        output = []
+        for entry in self._entries:
+            if entry.key is not None and entry.key in pending:
+                value = pending.pop(entry.key)
+                if value is not None:
+                    output.extend(self._emit(entry.key, value, entry))
+            elif entry.key is not None and entry.key in self._changed:
+                # A duplicate of a key that was already re-emitted
+                continue
+            else:
+                output.extend(entry.lines)
+
+        if output and not output[-1].endswith(b"\n"):
+            output[-1] += self._newline
+        for key, value in pending.items():
+            if value is not None:
+                output.extend(self._emit(key, value, None))
+
+        head = self._head or FENCE + self._newline
+        tail = self._tail or FENCE + self._newline
+        return head + b"".join(output) + tail
+
+
+def set_frontmatter_keys(data: bytes, values: dict[str, Any]) -> bytes:
+    """
+    Set or remove individual frontmatter keys, leaving everything else as is.
+
+    Only the lines of the keys being set are rewritten; other keys, their
+    formatting, comments and the body are kept byte for byte. A note without
+    frontmatter gets a new header.
+
+    Args:
+        data (bytes): The raw note file contents
+        values (dict[str, Any]): Keys to set; a value of None removes the key
+
+    Returns:
+        bytes: The new note file contents
+
+    Raises:
+        ValueError: If a key cannot be written as a plain ``key:`` line
+    """
+    frontmatter = Frontmatter.parse(data)
+    frontmatter.update(values)
+    return frontmatter.render() + data[frontmatter.body_offset :]
@@ -1,4 +1,193 @@
 import re
+from bisect import bisect_right
+from collections import deque
+from typing import Iterable, Optional
+
+_WORD_PHRASE = re.compile(r"^\w+$")
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _is_word_char(ch: str) -> bool:
+    return bool(ch) and _WORD_CHAR.match(ch) is not None
+
+
+def _bracket_ends(text: str, token: str) -> list[int]:
+    # End offsets of the non-overlapping occurrences str.count() would find
+    ends = []
+    pos = text.find(token)
+    while pos != -1:
+        ends.append(pos + len(token))
+        pos = text.find(token, pos + len(token))
+    return ends
+
+
+class WikilinkLinker:
+    """
+    Single-pass wikilink inserter for a fixed set of phrases.
+
+    The phrases are compiled once into an Aho–Corasick automaton, so linking a
+    note costs one scan of its text no matter how many phrases there are.
+    Matches are then chosen longest-phrase first, which reproduces the
+    one-``re.sub``-per-phrase behaviour of ``insert_wikilinks_regex``.
+    """
+
+    def __init__(
+        self, phrases: Iterable[str], targets: Optional[dict[str, str]] = None
+    ):
+        """
+        Compile the phrases.
+
+        Args:
+            phrases (Iterable[str]): Phrases to convert into wikilinks.
+            targets (Optional[dict[str, str]]): Link target per phrase; a
+                phrase with a different target is linked as
+                ``[[target|phrase]]``.
+        """
+        self.targets = targets or {}
+        # Filter out empty phrases and order by length (longest first); the
+        # position in this list is the phrase's priority
+        valid = [p for p in dict.fromkeys(phrases) if p and p.strip()]
+        self.phrases = sorted(valid, key=len, reverse=True)
+        self._is_word = [bool(_WORD_PHRASE.match(p)) for p in self.phrases]
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._terminal: list[int] = [-1]
+        self._dict_link: list[int] = [0]
+
+        for priority, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._terminal.append(-1)
+                    self._dict_link.append(0)
+                state = next_state
+            self._terminal[state] = priority
+
+        # Breadth-first pass to fill in failure and dictionary-suffix links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                fail = self._fail[child]
+                self._dict_link[child] = (
+                    fail if self._terminal[fail] >= 0 else self._dict_link[fail]
+                )
+
+    def _candidates(self, text: str, exclude: frozenset):
+        goto, fail = self._goto, self._fail
+        terminal, dict_link = self._terminal, self._dict_link
+        phrases = self.phrases
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            node = state if terminal[state] >= 0 else dict_link[state]
+            while node:
+                priority = terminal[node]
+                if priority not in exclude:
+                    yield priority, end - len(phrases[priority]), end
+                node = dict_link[node]
+
+    def link_with_count(
+        self, content: str, exclude: Optional[Iterable[str]] = None
+    ) -> tuple[str, int]:
+        """
+        Insert wikilinks into the content for every phrase found.
+
+        Args:
+            content (str): The original markdown content.
+            exclude (Optional[Iterable[str]]): Phrases to leave unlinked in
+                this content, e.g. a note's own title.
+
+        Returns:
+            tuple[str, int]: The modified content and the number of links
+            inserted.
+        """
+        exclude = set(exclude or ())
+        excluded = frozenset(
+            priority
+            for priority, phrase in enumerate(self.phrases)
+            if phrase in exclude
+        )
+        candidates = sorted(self._candidates(content, excluded))
+        if not candidates:
+            return content, 0
+
+        # Existing [[ / ]] positions, so the "already inside a wikilink" test
+        # is a pair of binary searches instead of a scan of the prefix
+        opens = _bracket_ends(content, "[[")
+        closes = _bracket_ends(content, "]]")
+
+        occupied = bytearray(len(content))
+        span_starts: dict[int, int] = {}
+        span_ends: dict[int, int] = {}
+        selected = []
+
+        for priority, start, end in candidates:
+            if occupied.find(1, start, end) != -1:
+                continue
+
+            # Characters around the match as they are after the links of
+            # longer phrases have been inserted
+            if span_ends.get(start, priority) != priority:
+                before, before2 = "]", "]]"
+            else:
+                before = content[start - 1] if start else ""
+                before2 = content[max(start - 2, 0) : start]
+            if span_starts.get(end, priority) != priority:
+                after, after2 = "[", "[["
+            else:
+                after = content[end : end + 1]
+                after2 = content[end : end + 2]
+
+            if before2 == "[[" or after2 == "]]":
+                continue
+            if self._is_word[priority] and (
+                _is_word_char(before) or _is_word_char(after)
+            ):
+                continue
+            if bisect_right(opens, start) - bisect_right(closes, start) > 0:
+                continue
+
+            occupied[start:end] = b"\x01" * (end - start)
+            span_starts[start] = priority
+            span_ends[end] = priority
+            selected.append((start, end))
+
+        if not selected:
+            return content, 0
+
+        selected.sort()
+        parts = []
+        position = 0
+        for start, end in selected:
+            phrase = content[start:end]
+            target = self.targets.get(phrase, phrase)
+            parts.append(content[position:start])
+            if target == phrase:
+                parts.append(f"[[{phrase}]]")
+            else:
+                parts.append(f"[[{target}|{phrase}]]")
+            position = end
+        parts.append(content[position:])
+        return "".join(parts), len(selected)
+
+    def link(self, content: str, exclude: Optional[Iterable[str]] = None) -> str:
+        """Insert wikilinks into the content; see ``link_with_count``."""
+        return self.link_with_count(content, exclude)[0]
 
 
 # Utility function to insert wikilinks for given phrases in markdown content
@@ -6,6 +195,22 @@ def insert_wikilinks(content: str, phrases: list[str]) -> str:
     """
     Inserts wikilinks into the content for each phrase found.
 
+    Args:
+        content (str): The original markdown content.
+        phrases (list[str]): List of phrases to convert into wikilinks.
+
+    Returns:
+        str: Modified content with wikilinks inserted.
+    """
+    return WikilinkLinker(phrases).link(content)
+
+
+def insert_wikilinks_regex(content: str, phrases: list[str]) -> str:
+    """
+    Reference implementation of ``insert_wikilinks`` with one regex pass per phrase.
+
+    Kept for differential tests and benchmarks of ``WikilinkLinker``.
+
     Args:
         content (str): The original markdown content.
         phrases (list[str]): List of phrases to convert into wikilinks.
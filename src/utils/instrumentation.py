@@ -0,0 +1,403 @@
+"""
+Per-tool latency and I/O metrics.
+
+Tool handlers are wrapped with ``instrument_tool``, which records call and
+error counts, a latency histogram, and the bytes and files each call reads
+and writes. File access is reported from the places that touch the disk via
+``record_io``; the current call is tracked in a context variable, which
+``asyncio.to_thread`` carries into worker threads and ``in_call_context``
+carries into thread pools.
+
+The metrics are served as a resource and can be dumped in Prometheus text
+format to OBSIDIAN_METRICS_FILE. When OBSIDIAN_PROFILE_SLOW_MS is set, calls
+are profiled with ``cProfile`` and the profile of every call slower than the
+threshold is kept as a ``pstats`` file under the cache dir. The profiler is
+enabled in each worker thread while it runs the call's blocking work (the
+same places that carry the call's context), so concurrent calls and the
+vault watcher never show up in a call's profile. The handler's own time on
+the event loop is not profiled, as the loop also runs every other call.
+"""
+
+import cProfile
+import contextvars
+import functools
+import pstats
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from config.settings import (
+    get_cache_dir,
+    get_metrics_file,
+    get_metrics_interval_ms,
+    get_profile_slow_ms,
+    get_vault_path,
+)
+from utils.async_io import run_blocking
+
+# Histogram bucket upper bounds in seconds, as exported to Prometheus
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Percentiles are computed over each tool's most recent calls
+RECENT_SAMPLES = 2048
+
+MAX_PROFILES = 20
+
+# Set in a thread while it runs profiled work, so nested work is not
+# profiled twice
+_profiling = threading.local()
+
+
+class _CallProfile:
+    """The merged cProfile statistics of one call's worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats: Optional[pstats.Stats] = None
+
+    def run(self, fn: Callable, *args, **kwargs):
+        if getattr(_profiling, "active", False):
+            return fn(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active in this thread
+            return fn(*args, **kwargs)
+        _profiling.active = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.disable()
+            _profiling.active = False
+            profile.create_stats()
+            if profile.stats:
+                with self._lock:
+                    if self.stats is None:
+                        self.stats = pstats.Stats(profile)
+                    else:
+                        self.stats.add(profile)
+
+
+class _CallIO:
+    """Bytes and files read and written by one tool call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.files_read: set[str] = set()
+        self.files_written: set[str] = set()
+        # Set while the call is being profiled
+        self.profile: Optional[_CallProfile] = None
+
+    def add(self, path: Union[str, Path, None], read: int, written: int):
+        with self._lock:
+            self.bytes_read += read
+            self.bytes_written += written
+            if path is not None:
+                if written:
+                    self.files_written.add(str(path))
+                else:
+                    self.files_read.add(str(path))
+
+
+_current_call: contextvars.ContextVar[Optional[_CallIO]] = contextvars.ContextVar(
+    "obsidian_tool_call", default=None
+)
+
+
+def record_io(path: Union[str, Path, None], read: int = 0, written: int = 0) -> None:
+    """
+    Count file I/O against the tool call being served, if any.
+
+    Args:
+        path (Union[str, Path, None]): The file read or written
+        read (int, optional): Bytes read. Defaults to 0.
+        written (int, optional): Bytes written. Defaults to 0.
+    """
+    call = _current_call.get()
+    if call is not None:
+        call.add(path, read, written)
+
+
+def in_call_context(fn: Callable) -> Callable:
+    """
+    Wrap fn so I/O it does on a thread pool counts towards the current call.
+
+    When the call is being profiled, fn also runs under the profiler.
+    """
+    call = _current_call.get()
+    if call is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _current_call.set(call)
+        try:
+            if call.profile is not None:
+                return call.profile.run(fn, *args, **kwargs)
+            return fn(*args, **kwargs)
+        finally:
+            _current_call.reset(token)
+
+    return run
+
+
+class _ToolStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.files_read = 0
+        self.files_written = 0
+
+    def add(self, seconds: float, failed: bool, call: _CallIO):
+        self.calls += 1
+        self.errors += failed
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS) and seconds > LATENCY_BUCKETS[bucket]:
+            bucket += 1
+        self.buckets[bucket] += 1
+        self.recent.append(seconds)
+        self.bytes_read += call.bytes_read
+        self.bytes_written += call.bytes_written
+        self.files_read += len(call.files_read)
+        self.files_written += len(call.files_written)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.recent)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not ordered:
+                return None
+            index = min(len(ordered) - 1, int(len(ordered) * fraction))
+            return round(ordered[index] * 1000, 3)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": (
+                round(self.seconds / self.calls * 1000, 3) if self.calls else None
+            ),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "files_read": self.files_read,
+            "files_written": self.files_written,
+        }
+
+
+class ToolMetrics:
+    """Thread-safe registry of per-tool call statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: dict[str, _ToolStats] = {}
+        self._profiles: deque[dict] = deque(maxlen=MAX_PROFILES)
+        self.started = datetime.now(timezone.utc)
+        self._last_dump = 0.0
+
+    def record(self, tool: str, seconds: float, failed: bool, call: _CallIO):
+        """Add one finished call of a tool."""
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = _ToolStats()
+            stats.add(seconds, failed, call)
+
+    def add_profile(self, tool: str, seconds: float, path: Path):
+        """Remember a profile written for a slow call, dropping the oldest file."""
+        with self._lock:
+            if len(self._profiles) == self._profiles.maxlen:
+                Path(self._profiles[0]["path"]).unlink(missing_ok=True)
+            self._profiles.append(
+                {"tool": tool, "ms": round(seconds * 1000, 3), "path": str(path)}
+            )
+
+    def stats(self) -> dict:
+        """Return per-tool counters, latency percentiles and I/O totals."""
+        with self._lock:
+            return {
+                "since": self.started.isoformat(),
+                "tools": {
+                    tool: stats.summary() for tool, stats in sorted(self._tools.items())
+                },
+                "slow_call_profiles": list(self._profiles),
+            }
+
+    def prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        counters = [
+            ("calls", "Tool calls", lambda s: s.calls),
+            ("errors", "Tool calls that raised an error", lambda s: s.errors),
+            ("bytes_read", "Bytes read from notes", lambda s: s.bytes_read),
+            ("bytes_written", "Bytes written to notes", lambda s: s.bytes_written),
+            ("files_read", "Files read, counted once per call", lambda s: s.files_read),
+            (
+                "files_written",
+                "Files written, counted once per call",
+                lambda s: s.files_written,
+            ),
+        ]
+        with self._lock:
+            tools = sorted(self._tools.items())
+            lines = []
+            for name, help_text, value in counters:
+                lines.append(f"# HELP obsidian_tool_{name}_total {help_text}.")
+                lines.append(f"# TYPE obsidian_tool_{name}_total counter")
+                for tool, stats in tools:
+                    lines.append(
+                        f'obsidian_tool_{name}_total{{tool="{tool}"}} {value(stats)}'
+                    )
+
+            metric = "obsidian_tool_latency_seconds"
+            lines.append(f"# HELP {metric} Tool call latency.")
+            lines.append(f"# TYPE {metric} histogram")
+            for tool, stats in tools:
+                total = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    total += count
+                    lines.append(
+                        f'{metric}_bucket{{tool="{tool}",le="{bound}"}} {total}'
+                    )
+                lines.append(
+                    f'{metric}_bucket{{tool="{tool}",le="+Inf"}} {stats.calls}'
+                )
+                lines.append(f'{metric}_sum{{tool="{tool}"}} {stats.seconds:.6f}')
+                lines.append(f'{metric}_count{{tool="{tool}"}} {stats.calls}')
+        return "\n".join(lines) + "\n"
+
+    def dump_due(self, interval_ms: int) -> bool:
+        """Check whether the metrics file should be written again."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_dump < interval_ms / 1000:
+                return False
+            self._last_dump = now
+            return True
+
+
+_metrics: Optional[ToolMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_tool_metrics() -> ToolMetrics:
+    """Get the process-wide tool metrics."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = ToolMetrics()
+        return _metrics
+
+
+def reset_tool_metrics():
+    """Discard the process-wide tool metrics."""
+    global _metrics
+    with _metrics_lock:
+        _metrics = None
+
+
+def dump_prometheus(path: Path) -> None:
+    """Write the tool metrics in Prometheus text format, replacing the file atomically."""
+    # atomic_write reports its writes here, so it cannot be imported at the top
+    from utils.atomic_write import atomic_write
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(
+        path, get_tool_metrics().prometheus().encode("utf-8"), sync_directory=False
+    )
+
+
+# One profiled call at a time; calls made while it runs are not profiled
+_profiler_lock = threading.Lock()
+
+
+def _write_profile(tool: str, seconds: float, stats: pstats.Stats) -> None:
+    directory = get_cache_dir(get_vault_path()) / "profiles"
+    directory.mkdir(exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    path = directory / f"{tool}-{stamp}-{seconds * 1000:.0f}ms.prof"
+    stats.dump_stats(path)
+    get_tool_metrics().add_profile(tool, seconds, path)
+
+
+def instrument_tool(fn: Callable) -> Callable:
+    """
+    Record the latency, errors and I/O of every call of an async tool handler.
+
+    The handler keeps its name, signature and docstring, so it can be
+    registered with ``mcp.tool`` as before.
+    """
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        call = _CallIO()
+        token = _current_call.set(call)
+        slow_ms = get_profile_slow_ms()
+        if slow_ms and _profiler_lock.acquire(blocking=False):
+            call.profile = _CallProfile()
+        failed = False
+        start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            _current_call.reset(token)
+            profile = call.profile
+            if profile is not None:
+                # The call's blocking work has finished, so its profile is complete
+                call.profile = None
+                _profiler_lock.release()
+            metrics = get_tool_metrics()
+            metrics.record(tool, seconds, failed, call)
+            try:
+                if (
+                    profile is not None
+                    and profile.stats is not None
+                    and seconds * 1000 >= slow_ms
+                ):
+                    await run_blocking(_write_profile, tool, seconds, profile.stats)
+                metrics_file = get_metrics_file()
+                if metrics_file is not None and metrics.dump_due(
+                    get_metrics_interval_ms()
+                ):
+                    await run_blocking(dump_prometheus, metrics_file)
+            except Exception:
+                # Metrics must never fail a tool call
+                pass
+
+    return wrapper
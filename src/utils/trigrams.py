@@ -0,0 +1,161 @@
+"""
+Character-trigram index for typo-tolerant lookups of short strings.
+
+Similarity is the Jaccard index of the two strings' trigram sets, as in
+PostgreSQL's ``pg_trgm``: ``common / (|a| + |b| - common)``. A string is
+padded with two spaces in front and one behind, so prefixes weigh a little
+more than the rest of the string.
+"""
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Optional
+
+# Candidates re-scored per query, best partial matches first
+MAX_CANDIDATES = 2000
+# Share of the strings above which a trigram counts as common
+COMMON_SHARE = 0.05
+
+_SPACES = re.compile(r"\s+")
+
+
+def _pad(text: str) -> str:
+    text = _SPACES.sub(" ", text).strip()
+    return f"  {text} " if text else ""
+
+
+def trigrams(text: str) -> set[str]:
+    """Return the set of character trigrams of a string."""
+    padded = _pad(text)
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigrams to strings.
+
+    Postings are ``array('i')`` lists of string IDs; the padded strings are
+    kept so a candidate's shared trigrams can be counted with substring
+    tests instead of building its trigram set. Removed strings are left
+    in the postings and skipped at query time until enough of them pile up to
+    rebuild the postings. Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._texts: list[Optional[str]] = []
+        self._padded: list[str] = []
+        self._sizes = array("i")
+        self._postings: dict[str, array] = {}
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._ids
+
+    def add(self, text: str) -> None:
+        """Index a string; adding it again is a no-op."""
+        if text in self._ids:
+            return
+        text_id = len(self._texts)
+        padded = _pad(text)
+        grams = {padded[i : i + 3] for i in range(len(padded) - 2)}
+        self._ids[text] = text_id
+        self._texts.append(text)
+        self._padded.append(padded)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("i")
+            postings.append(text_id)
+
+    def discard(self, text: str) -> None:
+        """Remove a string from the index, if it is there."""
+        text_id = self._ids.pop(text, None)
+        if text_id is None:
+            return
+        self._texts[text_id] = None
+        self._padded[text_id] = ""
+        self._removed += 1
+        if self._removed > 1024 and self._removed > len(self._ids):
+            self._compact()
+
+    def _compact(self) -> None:
+        texts = [text for text in self._texts if text is not None]
+        self._ids.clear()
+        self._texts.clear()
+        self._padded.clear()
+        self._sizes = array("i")
+        self._postings.clear()
+        self._removed = 0
+        for text in texts:
+            self.add(text)
+
+    def search(self, query: str, min_score: float = 0.3) -> list[tuple[str, float]]:
+        """
+        Find the indexed strings most similar to a query.
+
+        Only the query's rarest trigrams are looked up: a string that scores
+        at least ``min_score`` must share at least ``ceil(min_score * n)`` of
+        the query's ``n`` trigrams, so it shares one of the ``n - that + 1``
+        rarest. Common trigrams (in more than ``COMMON_SHARE`` of the
+        strings) are skipped once a rarer one has found candidates, so the
+        results are approximate. The best ``MAX_CANDIDATES`` candidates are
+        then scored exactly.
+
+        Args:
+            query (str): The string to look up
+            min_score (float, optional): Lowest similarity to return.
+                Defaults to 0.3.
+
+        Returns:
+            list[tuple[str, float]]: ``(string, similarity)`` pairs, most
+            similar first
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        needed = max(1, math.ceil(min_score * len(grams)))
+        if needed > len(grams):
+            return []
+        ordered = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        common_postings = max(MAX_CANDIDATES, int(len(self._ids) * COMMON_SHARE))
+        counts = Counter()
+        unseen = set(grams)
+        for gram in ordered[: len(grams) - needed + 1]:
+            postings = self._postings.get(gram)
+            if postings is None:
+                unseen.discard(gram)
+                continue
+            if counts and len(postings) > common_postings:
+                break
+            counts.update(postings)
+            unseen.discard(gram)
+
+        if len(counts) > MAX_CANDIDATES:
+            candidates = heapq.nlargest(MAX_CANDIDATES, counts, key=counts.__getitem__)
+        else:
+            candidates = counts
+
+        results = []
+        for text_id in candidates:
+            text = self._texts[text_id]
+            if text is None:
+                continue
+            # Shared trigrams that were not looked up are found in the text
+            shared = counts[text_id]
+            padded = self._padded[text_id]
+            for gram in unseen:
+                if gram in padded:
+                    shared += 1
+            score = shared / (len(grams) + self._sizes[text_id] - shared)
+            if score >= min_score:
+                results.append((text, score))
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results
@@ -1,7 +1,7 @@
 import os
-import yaml
 from datetime import datetime
 from typing import Optional
+from utils.frontmatter import parse_frontmatter, read_frontmatter
 
 
 def get_creation_time_from_frontmatter(file_path: str) -> Optional[str]:
@@ -15,14 +15,11 @@ def get_creation_time_from_frontmatter(file_path: str) -> Optional[str]:
         Optional[str]: ISO format datetime string if found in frontmatter, None otherwise
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        if not content.startswith("---"):
+        frontmatter = read_frontmatter(file_path).text
+        if frontmatter is None:
             return None
 
-        _, frontmatter, _ = content.split("---", 2)
-        frontmatter_dict = yaml.safe_load(frontmatter.strip())
+        frontmatter_dict = parse_frontmatter(frontmatter.strip())
         return frontmatter_dict.get("created")
     except Exception:
         return None
@@ -0,0 +1,38 @@
+from vault.metadata_index import (
+    MetadataIndex,
+    close_metadata_indexes,
+    get_metadata_index,
+)
+from vault.changes import add_change_listener, forward_changes, notify_changes
+from vault.file_index import FileIndex
+from vault.link_graph import LinkGraph, get_link_graph, reset_link_graphs
+from vault.name_index import NameIndex, get_name_index, reset_name_indexes
+from vault.note_cache import NoteCache, get_note_cache, reset_note_cache
+from vault.outline import OutlineCache, get_outline_cache, reset_outline_cache
+from vault.watcher import VaultWatcher, get_watcher, start_watcher, stop_watcher
+
+__all__ = [
+    "MetadataIndex",
+    "close_metadata_indexes",
+    "get_metadata_index",
+    "add_change_listener",
+    "forward_changes",
+    "notify_changes",
+    "FileIndex",
+    "LinkGraph",
+    "get_link_graph",
+    "reset_link_graphs",
+    "NameIndex",
+    "get_name_index",
+    "reset_name_indexes",
+    "NoteCache",
+    "get_note_cache",
+    "reset_note_cache",
+    "OutlineCache",
+    "get_outline_cache",
+    "reset_outline_cache",
+    "VaultWatcher",
+    "get_watcher",
+    "start_watcher",
+    "stop_watcher",
+]
@@ -0,0 +1,134 @@
+"""
+Fan-out of note changes to the server's indexes.
+
+Every write made through the server, and every outside edit applied by the
+vault watcher, is reported here once. The metadata index is always updated;
+other indexes (search, links, ...) subscribe with ``add_change_listener`` and
+only need to act if they are open for that vault.
+
+By the time listeners are told, the change is already on disk, so a listener
+that fails must not fail the write: the failure is logged, the other
+listeners still run, and the failing index marks itself stale so that its
+next refresh catches up.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from vault.metadata_index import get_metadata_index
+
+# listener(vault_path, notes, removed_folders, rescan)
+ChangeListener = Callable[[Path, list[Path], list[Path], bool], None]
+
+logger = logging.getLogger(__name__)
+
+_listeners: list[ChangeListener] = []
+_watch_generations: dict[Path, int] = {}
+_lock = threading.Lock()
+_next_generation = 0
+
+
+def add_change_listener(listener: ChangeListener) -> None:
+    """
+    Subscribe to note changes.
+
+    The listener is called with the vault path, the notes that were written,
+    modified or deleted, the folders that were removed, and whether changes
+    may have been missed (so that a full re-scan is needed). A listener that
+    raises is logged and skipped; it should mark its index stale first.
+    """
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def forward_changes(
+    index,
+    vault_path: Path,
+    notes: list[Path],
+    removed_folders: list[Path],
+    rescan: bool,
+) -> None:
+    """
+    Pass a change notification on to an index, for a change listener.
+
+    The index needs ``mark_stale``, ``forget_folder`` (taking a folder
+    relative to the vault) and ``record_changes`` (taking note paths). If any
+    of them fails, the index is marked stale before the error is re-raised.
+    """
+    try:
+        if rescan:
+            index.mark_stale()
+        for folder in removed_folders:
+            index.forget_folder(folder.relative_to(vault_path).as_posix())
+        if notes:
+            index.record_changes(notes)
+    except Exception:
+        index.mark_stale()
+        raise
+
+
+def notify_changes(
+    vault_path: Path,
+    notes: Iterable[Path] = (),
+    removed_folders: Iterable[Path] = (),
+    rescan: bool = False,
+) -> None:
+    """
+    Report changed notes to the metadata index and every change listener.
+
+    Args:
+        vault_path (Path): The vault the notes belong to
+        notes (Iterable[Path]): Notes that were created, modified or deleted
+        removed_folders (Iterable[Path]): Folders that were deleted or moved
+            away, with everything in them
+        rescan (bool, optional): Changes may have been missed; indexes must
+            re-scan the vault. Defaults to False.
+    """
+    notes = list(notes)
+    removed_folders = list(removed_folders)
+
+    index = get_metadata_index(vault_path)
+    if rescan:
+        index.scan()
+    for folder in removed_folders:
+        index.forget_folder(folder.relative_to(vault_path).as_posix())
+    index.record_changes(notes)
+
+    with _lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(vault_path, notes, removed_folders, rescan)
+        except Exception:
+            logger.exception(
+                "Change listener %s failed for %s",
+                getattr(listener, "__module__", listener),
+                vault_path,
+            )
+
+
+def set_watched(vault_path: Path, watched: bool) -> None:
+    """
+    Mark whether a watcher reports every change to the vault.
+
+    Each start of a watcher (or re-scan) begins a new watch generation; an
+    index that has walked the vault during the current generation can rely on
+    change notifications instead of walking it again.
+    """
+    global _next_generation
+    with _lock:
+        if watched:
+            _next_generation += 1
+            _watch_generations[vault_path] = _next_generation
+        else:
+            _watch_generations.pop(vault_path, None)
+    get_metadata_index(vault_path).watched = watched
+
+
+def watch_generation(vault_path: Path) -> Optional[int]:
+    """Get the current watch generation of a vault, or None if it is not watched."""
+    with _lock:
+        return _watch_generations.get(vault_path)
@@ -0,0 +1,210 @@
+"""
+Base class for indexes that keep a derived entry per note.
+
+A ``FileIndex`` tracks notes by ``(mtime_ns, size, inode)`` fingerprint and
+brings itself up to date by walking the vault, re-reading only notes whose
+fingerprint changed. Writes made through the server only mark their notes
+dirty (``record_changes``, ``forget_folder``); the next refresh re-reads
+them, so a write never waits for the index. While the vault is watched, or
+within ``max_age`` seconds of the last walk, a refresh re-reads only those
+notes instead of walking the vault.
+
+Subclasses hold ``_notes`` (rel_path -> entry whose first item is the
+fingerprint) and implement ``_read``, ``_unreadable`` and ``_store``.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from config.settings import get_scan_threads
+from utils.instrumentation import in_call_context
+from vault.changes import watch_generation
+from vault.metadata_index import (
+    Fingerprint,
+    RefreshMode,
+    fingerprint_from_stat,
+    in_folder,
+    iter_markdown_files,
+    normalize_folder,
+)
+
+# Notes read and stored together during a refresh
+NOTE_BATCH = 256
+
+
+class FileIndex:
+    """
+    Per-note entries kept in step with a vault by fingerprint.
+
+    ``_lock`` guards ``_notes`` and whatever the subclass stores alongside;
+    ``_store`` is always called with it held.
+    """
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = vault_path
+        self._lock = threading.RLock()
+        # rel_path -> (fingerprint, ...)
+        self._notes: dict[str, tuple] = {}
+        # Watch generation during which the vault was last walked
+        self._scanned_generation: Optional[int] = None
+        # Monotonic time at which the last full walk started
+        self._walked_at: Optional[float] = None
+        # Notes and folders reported changed since the last refresh
+        self._dirty_lock = threading.Lock()
+        self._dirty_notes: set[str] = set()
+        self._dirty_folders: set[str] = set()
+
+    def _read(self, file_path: Path, rel_path: str, fingerprint: Fingerprint) -> tuple:
+        """Read a note into the entry passed to ``_store``; may run in a thread."""
+        raise NotImplementedError
+
+    def _unreadable(self, fingerprint: Fingerprint) -> tuple:
+        """Entry stored for a note that could not be read."""
+        raise NotImplementedError
+
+    def _store(self, updates: dict, deletions: list[str]) -> None:
+        """Store entries returned by ``_read`` and remove deleted notes."""
+        raise NotImplementedError
+
+    def _update(self, changed: list, threads: int) -> None:
+        """Read and store ``(file_path, rel_path, fingerprint)`` in batches."""
+
+        def read(item):
+            try:
+                return self._read(*item)
+            except Exception:
+                # Remembered by fingerprint and skipped until the note changes
+                return self._unreadable(item[2])
+
+        read = in_call_context(read)
+        pool = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+        try:
+            for start in range(0, len(changed), NOTE_BATCH):
+                batch = changed[start : start + NOTE_BATCH]
+                if pool is not None and len(batch) > 1:
+                    parsed = list(pool.map(read, batch))
+                else:
+                    parsed = [read(item) for item in batch]
+                self._store(
+                    {rel_path: entry for (_, rel_path, _), entry in zip(batch, parsed)},
+                    [],
+                )
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def refresh(
+        self,
+        mode: RefreshMode = "warm",
+        threads: Optional[int] = None,
+        max_age: float = 0,
+    ) -> None:
+        """
+        Bring the index up to date with the vault.
+
+        Notes reported changed by writes are re-read here. While the vault is
+        watched and has been walked once since the watcher started, a warm
+        refresh re-reads only those notes and does not walk the vault; so does
+        one within ``max_age`` seconds of the last walk.
+
+        Args:
+            mode (RefreshMode): ``"warm"`` re-reads only notes whose
+                fingerprint changed; ``"rebuild"`` re-reads every note.
+            threads (Optional[int]): Reader threads. Defaults to the
+                OBSIDIAN_SCAN_THREADS setting.
+            max_age (float): Without a watcher, skip the walk of a warm
+                refresh that comes within this many seconds of the last one;
+                writes made through the server are applied from their change
+                notifications anyway.
+        """
+        generation = watch_generation(self.vault_path)
+        walked_at = self._walked_at
+        trusted = mode == "warm" and (
+            (generation is not None and generation == self._scanned_generation)
+            or (walked_at is not None and time.monotonic() - walked_at < max_age)
+        )
+        with self._dirty_lock:
+            if trusted and not self._dirty_notes and not self._dirty_folders:
+                return
+        if threads is None:
+            threads = get_scan_threads()
+
+        with self._lock:
+            started = time.monotonic()
+            with self._dirty_lock:
+                dirty_notes, self._dirty_notes = self._dirty_notes, set()
+                dirty_folders, self._dirty_folders = self._dirty_folders, set()
+            try:
+                for folder in dirty_folders:
+                    self._store(
+                        {}, [key for key in self._notes if in_folder(key, folder)]
+                    )
+                if trusted:
+                    self._apply_dirty(dirty_notes, threads)
+                    return
+                if mode == "rebuild":
+                    self._store({}, list(self._notes))
+
+                seen = set()
+                changed = []
+                for file_path, stat in iter_markdown_files(self.vault_path):
+                    rel_path = file_path.relative_to(self.vault_path).as_posix()
+                    seen.add(rel_path)
+                    fingerprint = fingerprint_from_stat(stat)
+                    entry = self._notes.get(rel_path)
+                    if (
+                        entry is not None
+                        and entry[0] == fingerprint
+                        and rel_path not in dirty_notes
+                    ):
+                        continue
+                    changed.append((file_path, rel_path, fingerprint))
+
+                self._store(
+                    {}, [rel_path for rel_path in self._notes if rel_path not in seen]
+                )
+                self._update(changed, threads)
+                self._scanned_generation = generation
+                self._walked_at = started
+            except Exception:
+                # Changes taken from the dirty sets are found again by a walk
+                self.mark_stale()
+                raise
+
+    def _apply_dirty(self, rel_paths: set[str], threads: int) -> None:
+        """Re-read notes reported changed; missing notes are removed."""
+        changed = []
+        deletions = []
+        for rel_path in sorted(rel_paths):
+            file_path = self.vault_path / rel_path
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
+                if rel_path in self._notes:
+                    deletions.append(rel_path)
+                continue
+            changed.append((file_path, rel_path, fingerprint_from_stat(stat)))
+        self._store({}, deletions)
+        self._update(changed, threads)
+
+    def record_changes(self, file_paths: list[Path]) -> None:
+        """Note that notes were created, modified or deleted; nothing is read."""
+        rel_paths = [
+            file_path.relative_to(self.vault_path).as_posix()
+            for file_path in file_paths
+        ]
+        with self._dirty_lock:
+            self._dirty_notes.update(rel_paths)
+
+    def forget_folder(self, folder: str) -> None:
+        """Note that a folder was deleted or moved away, with every note in it."""
+        with self._dirty_lock:
+            self._dirty_folders.add(normalize_folder(folder))
+
+    def mark_stale(self) -> None:
+        """Make the next warm refresh walk the vault again."""
+        self._scanned_generation = None
+        self._walked_at = None
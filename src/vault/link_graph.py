@@ -0,0 +1,664 @@
+"""
+In-memory graph of the links between notes.
+
+The graph is built in one streaming pass over the vault (each note is read,
+its links extracted and its text dropped) and then kept current from change
+notifications. Notes and link targets are interned to integer IDs and the
+adjacency is stored in ``array('i')`` buckets, so a vault with hundreds of
+thousands of links costs a few megabytes and every query is a handful of
+lookups.
+
+Link targets are resolved the way Obsidian resolves them: by vault-relative
+path, then by note name (``[[Note]]`` or ``[[folder/Note]]`` for a note at
+any depth whose path ends that way), then by frontmatter alias; matching is
+case-insensitive. When several notes qualify, the one with the shortest path
+wins, then the alphabetically first.
+"""
+
+import posixpath
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Literal, Optional
+from urllib.parse import unquote
+
+from config.settings import get_scan_threads
+from utils.frontmatter import parse_frontmatter, read_note_file
+from utils.instrumentation import in_call_context
+from vault.changes import add_change_listener, forward_changes, watch_generation
+from vault.metadata_index import (
+    Fingerprint,
+    RefreshMode,
+    build_note_metadata,
+    fingerprint_from_stat,
+    in_folder,
+    iter_markdown_files,
+    normalize_folder,
+)
+
+Direction = Literal["out", "in", "both"]
+
+# [[target]], [[target#heading]], [[target^block]], [[target|label]], ![[embed]]
+_WIKILINK = re.compile(
+    r"(!?)\[\[([^\[\]|#^\n]*)(?:[#^][^\[\]|\n]*)?(?:\|[^\[\]\n]*)?\]\]"
+)
+# [label](relative/path.md) and ![label](path.md), with an optional #fragment
+_MARKDOWN_LINK = re.compile(
+    r"(!?)\[[^\]\n]*\]\(<?([^)<>\s]+?\.md)(?:#[^)\s]*)?>?\)", re.IGNORECASE
+)
+# Links inside code are not links
+_FENCED_CODE = re.compile(
+    r"^(`{3,}|~{3,})[^\n]*\n.*?^\1[^\n]*$", re.MULTILINE | re.DOTALL
+)
+_INLINE_CODE = re.compile(r"`[^`\n]+`")
+
+# Embeds of these are attachments, not notes
+ATTACHMENT_EXTENSIONS = frozenset(
+    (
+        ".png .jpg .jpeg .gif .bmp .svg .webp .avif .pdf .mp3 .wav .m4a .ogg "
+        ".flac .webm .mp4 .mov .mkv .ogv .canvas .excalidraw .base"
+    ).split()
+)
+
+EMBED = 1
+
+
+def normalize_link_target(target: str) -> str:
+    """
+    Turn link text into the key used to resolve it.
+
+    Keys are NFC-normalized and casefolded vault-relative paths without the
+    ``.md`` extension.
+    """
+    target = unicodedata.normalize("NFC", target.strip().replace("\\", "/"))
+    target = target.lstrip("/")
+    while target.startswith("./"):
+        target = target[2:]
+    key = target.casefold()
+    if key.endswith(".md"):
+        key = key[:-3]
+    return key
+
+
+def extract_links(body: str, rel_path: str) -> list[tuple[str, str, bool]]:
+    """
+    Find the note links in a note body.
+
+    Args:
+        body (str): The note body, without frontmatter
+        rel_path (str): The note's vault-relative POSIX path, used to resolve
+            relative markdown links
+
+    Returns:
+        list[tuple[str, str, bool]]: ``(key, link text, is_embed)`` per link,
+        in order of appearance; links to attachments are left out
+    """
+    if "`" in body:
+        body = _INLINE_CODE.sub("", _FENCED_CODE.sub("", body))
+
+    links = []
+    for match in _WIKILINK.finditer(body):
+        text = match.group(2).strip()
+        if not text or posixpath.splitext(text)[1].lower() in ATTACHMENT_EXTENSIONS:
+            continue
+        links.append((normalize_link_target(text), text, bool(match.group(1))))
+
+    if "](" in body:
+        folder = posixpath.dirname(rel_path)
+        for match in _MARKDOWN_LINK.finditer(body):
+            text = unquote(match.group(2))
+            if "://" in text:
+                continue
+            # Markdown links are relative to the linking note
+            path = posixpath.normpath(posixpath.join(folder, text))
+            if path.startswith("../"):
+                continue
+            links.append((normalize_link_target(path), text, bool(match.group(1))))
+    return links
+
+
+def _read_links(file_path: Path, rel_path: str):
+    header, body = read_note_file(file_path)
+    frontmatter = {}
+    if header is not None:
+        try:
+            frontmatter = parse_frontmatter(header)
+        except Exception:
+            # Links in the body still count when the header is broken
+            pass
+    if not isinstance(frontmatter, dict):
+        frontmatter = {}
+    aliases = build_note_metadata(frontmatter, file_path, Path(rel_path))["aliases"]
+    return extract_links(body, rel_path), [str(a) for a in aliases if str(a).strip()]
+
+
+def _path_key(rel_path: str) -> str:
+    return normalize_link_target(rel_path)
+
+
+def _last_component(key: str) -> str:
+    return key.rsplit("/", 1)[-1]
+
+
+class LinkGraph:
+    """Interned, array-backed link graph of one vault."""
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = vault_path
+        self._lock = threading.RLock()
+        self._scanned_generation: Optional[int] = None
+        self._scanned = False
+        # When the vault was last walked, or None if a walk is due
+        self._walked_at: Optional[float] = None
+
+        # Notes: id -> path/fingerprint/aliases/outgoing links; ids are reused
+        self._note_ids: dict[str, int] = {}
+        self._paths: list[Optional[str]] = []
+        self._fingerprints: list[Optional[Fingerprint]] = []
+        self._aliases: list[tuple[str, ...]] = []
+        # Outgoing links as (key id << 1 | EMBED) codes, in document order
+        self._out: list[array] = []
+        self._free_ids: list[int] = []
+
+        # Name tables used to resolve keys
+        self._by_path: dict[str, set[int]] = {}
+        self._by_name: dict[str, set[int]] = {}
+        self._by_alias: dict[str, set[int]] = {}
+
+        # Link keys: id -> text/resolved note/linking notes
+        self._key_ids: dict[str, int] = {}
+        self._keys: list[str] = []
+        self._key_text: list[str] = []
+        self._resolved = array("i")
+        self._key_sources: list[array] = []
+        self._keys_by_last: dict[str, set[int]] = {}
+        # Reverse adjacency: note id -> ids of keys resolving to it
+        self._keys_by_target: dict[int, set[int]] = {}
+
+    # -- resolution ---------------------------------------------------------
+
+    def _intern_key(self, key: str, text: str) -> int:
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = len(self._keys)
+            self._key_ids[key] = key_id
+            self._keys.append(key)
+            self._key_text.append(text)
+            self._resolved.append(-1)
+            self._key_sources.append(array("i"))
+            self._keys_by_last.setdefault(_last_component(key), set()).add(key_id)
+            self._set_resolution(key_id, self._resolve_key(key))
+        return key_id
+
+    def _best(self, candidates) -> Optional[int]:
+        if not candidates:
+            return None
+        return min(
+            candidates,
+            key=lambda note_id: (self._paths[note_id].count("/"), self._paths[note_id]),
+        )
+
+    def _resolve_key(self, key: str) -> int:
+        # Paths that differ only by case share a key
+        note_id = self._best(self._by_path.get(key, ()))
+        if note_id is not None:
+            return note_id
+        candidates = self._by_name.get(_last_component(key), ())
+        if "/" in key:
+            suffix = "/" + key
+            candidates = [
+                note_id
+                for note_id in candidates
+                if _path_key(self._paths[note_id]).endswith(suffix)
+            ]
+        best = self._best(candidates)
+        if best is None:
+            best = self._best(self._by_alias.get(key, ()))
+        return -1 if best is None else best
+
+    def _set_resolution(self, key_id: int, target: int) -> None:
+        previous = self._resolved[key_id]
+        if previous == target:
+            return
+        if previous >= 0:
+            self._keys_by_target[previous].discard(key_id)
+        if target >= 0:
+            self._keys_by_target.setdefault(target, set()).add(key_id)
+        self._resolved[key_id] = target
+
+    def _re_resolve(self, names: set[str], aliases: set[str]) -> None:
+        affected = set()
+        for name in names:
+            affected |= self._keys_by_last.get(name, set())
+        for alias in aliases:
+            key_id = self._key_ids.get(alias)
+            if key_id is not None:
+                affected.add(key_id)
+        for key_id in affected:
+            self._set_resolution(key_id, self._resolve_key(self._keys[key_id]))
+
+    # -- updates ------------------------------------------------------------
+
+    def _unlink_outgoing(self, note_id: int) -> None:
+        for code in set(self._out[note_id]):
+            sources = self._key_sources[code >> 1]
+            while note_id in sources:
+                sources.remove(note_id)
+        self._out[note_id] = array("i")
+
+    def _remove(self, rel_path: str) -> tuple[set[str], set[str]]:
+        note_id = self._note_ids.pop(rel_path)
+        self._unlink_outgoing(note_id)
+        path_key = _path_key(rel_path)
+        name = _last_component(path_key)
+        self._by_path[path_key].discard(note_id)
+        if not self._by_path[path_key]:
+            del self._by_path[path_key]
+        self._by_name[name].discard(note_id)
+        for alias in self._aliases[note_id]:
+            self._by_alias[alias].discard(note_id)
+        aliases = set(self._aliases[note_id])
+        self._paths[note_id] = None
+        self._fingerprints[note_id] = None
+        self._aliases[note_id] = ()
+        self._free_ids.append(note_id)
+        # Keys resolving here are re-resolved by the caller through its name
+        self._keys_by_target.pop(note_id, None)
+        for key_id in self._keys_by_last.get(name, set()):
+            if self._resolved[key_id] == note_id:
+                self._resolved[key_id] = -1
+        for alias in aliases:
+            key_id = self._key_ids.get(alias)
+            if key_id is not None and self._resolved[key_id] == note_id:
+                self._resolved[key_id] = -1
+        return {name}, aliases
+
+    def _update(self, rel_path: str, fingerprint: Fingerprint, parsed) -> tuple:
+        links, aliases = parsed
+        alias_keys = tuple(dict.fromkeys(normalize_link_target(a) for a in aliases))
+        names: set[str] = set()
+        changed_aliases: set[str] = set()
+
+        note_id = self._note_ids.get(rel_path)
+        if note_id is None:
+            note_id = self._free_ids.pop() if self._free_ids else len(self._paths)
+            if note_id == len(self._paths):
+                self._paths.append(None)
+                self._fingerprints.append(None)
+                self._aliases.append(())
+                self._out.append(array("i"))
+            self._note_ids[rel_path] = note_id
+            self._paths[note_id] = rel_path
+            path_key = _path_key(rel_path)
+            self._by_path.setdefault(path_key, set()).add(note_id)
+            name = _last_component(path_key)
+            self._by_name.setdefault(name, set()).add(note_id)
+            names.add(name)
+        else:
+            self._unlink_outgoing(note_id)
+
+        old_aliases = set(self._aliases[note_id])
+        for alias in old_aliases - set(alias_keys):
+            self._by_alias[alias].discard(note_id)
+        for alias in set(alias_keys) - old_aliases:
+            self._by_alias.setdefault(alias, set()).add(note_id)
+        changed_aliases |= old_aliases ^ set(alias_keys)
+        self._aliases[note_id] = alias_keys
+        self._fingerprints[note_id] = fingerprint
+
+        codes = array("i")
+        for key, text, is_embed in links:
+            if not key:
+                continue
+            key_id = self._intern_key(key, text)
+            codes.append(key_id << 1 | (EMBED if is_embed else 0))
+            sources = self._key_sources[key_id]
+            if note_id not in sources:
+                sources.append(note_id)
+        self._out[note_id] = codes
+        return names, changed_aliases
+
+    def _apply(self, updates: dict, deletions: list[str]) -> None:
+        names: set[str] = set()
+        aliases: set[str] = set()
+        for rel_path in deletions:
+            if rel_path in self._note_ids:
+                removed_names, removed_aliases = self._remove(rel_path)
+                names |= removed_names
+                aliases |= removed_aliases
+        for rel_path, (fingerprint, parsed) in updates.items():
+            if parsed is None:
+                parsed = ([], [])
+            added_names, changed_aliases = self._update(rel_path, fingerprint, parsed)
+            names |= added_names
+            aliases |= changed_aliases
+        self._re_resolve(names, aliases)
+
+    def _parse_many(self, changed: list[tuple[Path, str]]) -> list:
+        def parse(item):
+            try:
+                return _read_links(*item)
+            except Exception:
+                return None
+
+        threads = get_scan_threads()
+        if threads > 1 and len(changed) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                return list(pool.map(in_call_context(parse), changed))
+        return [parse(item) for item in changed]
+
+    def refresh(self, mode: RefreshMode = "warm", max_age: float = 0) -> None:
+        """
+        Bring the graph up to date with the vault.
+
+        The first call reads every note; later calls only re-read notes whose
+        fingerprint changed, and are no-ops while a watcher reports changes.
+
+        Args:
+            mode (RefreshMode): ``"warm"`` re-reads changed notes only;
+                ``"rebuild"`` re-reads every note.
+            max_age (float): Without a watcher, skip a warm refresh that comes
+                within this many seconds of the last walk; writes made through
+                the server are applied from their change notifications anyway.
+        """
+        generation = watch_generation(self.vault_path)
+        if mode == "warm" and self._scanned:
+            if generation is not None and generation == self._scanned_generation:
+                return
+            walked_at = self._walked_at
+            if walked_at is not None and time.monotonic() - walked_at < max_age:
+                return
+
+        with self._lock:
+            started = time.monotonic()
+            if mode == "rebuild":
+                self._apply({}, list(self._note_ids))
+
+            seen = set()
+            changed = []
+            fingerprints = []
+            for file_path, stat in iter_markdown_files(self.vault_path):
+                rel_path = file_path.relative_to(self.vault_path).as_posix()
+                seen.add(rel_path)
+                fingerprint = fingerprint_from_stat(stat)
+                note_id = self._note_ids.get(rel_path)
+                if note_id is not None and self._fingerprints[note_id] == fingerprint:
+                    continue
+                changed.append((file_path, rel_path))
+                fingerprints.append((rel_path, fingerprint))
+
+            parsed = self._parse_many(changed)
+            updates = {
+                rel_path: (fingerprint, links)
+                for (rel_path, fingerprint), links in zip(fingerprints, parsed)
+            }
+            deletions = [
+                rel_path for rel_path in self._note_ids if rel_path not in seen
+            ]
+            self._apply(updates, deletions)
+            self._scanned = True
+            self._scanned_generation = generation
+            self._walked_at = started
+
+    def record_changes(self, file_paths: list[Path]) -> None:
+        """Re-read notes known to have changed; missing notes are removed."""
+        with self._lock:
+            changed = []
+            fingerprints = []
+            deletions = []
+            for file_path in file_paths:
+                rel_path = file_path.relative_to(self.vault_path).as_posix()
+                try:
+                    stat = file_path.stat()
+                except FileNotFoundError:
+                    deletions.append(rel_path)
+                    continue
+                changed.append((file_path, rel_path))
+                fingerprints.append((rel_path, fingerprint_from_stat(stat)))
+
+            parsed = self._parse_many(changed)
+            updates = {
+                rel_path: (fingerprint, links)
+                for (rel_path, fingerprint), links in zip(fingerprints, parsed)
+            }
+            self._apply(updates, deletions)
+
+    def forget_folder(self, folder: str) -> None:
+        """Remove every note under a folder that was deleted or moved away."""
+        folder = normalize_folder(folder)
+        with self._lock:
+            self._apply(
+                {}, [path for path in self._note_ids if in_folder(path, folder)]
+            )
+
+    def mark_stale(self) -> None:
+        """Make the next warm refresh walk the vault again."""
+        self._scanned_generation = None
+        self._walked_at = None
+
+    # -- queries ------------------------------------------------------------
+
+    def resolve(self, target: str) -> Optional[str]:
+        """Resolve link text (a path, note name or alias) to a note path."""
+        key = normalize_link_target(target)
+        with self._lock:
+            if key in self._key_ids:
+                note_id = self._resolved[self._key_ids[key]]
+            else:
+                note_id = self._resolve_key(key)
+            return self._paths[note_id] if note_id >= 0 else None
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self._note_ids
+
+    def _id(self, rel_path: str) -> int:
+        note_id = self._note_ids.get(rel_path)
+        if note_id is None:
+            raise KeyError(rel_path)
+        return note_id
+
+    def _backlink_ids(self, note_id: int) -> set[int]:
+        sources = set()
+        for key_id in self._keys_by_target.get(note_id, ()):
+            sources.update(self._key_sources[key_id])
+        sources.discard(note_id)
+        return sources
+
+    def _outgoing_ids(self, note_id: int) -> set[int]:
+        targets = {self._resolved[code >> 1] for code in self._out[note_id]}
+        targets.discard(-1)
+        targets.discard(note_id)
+        return targets
+
+    def backlinks(self, rel_path: str) -> list[dict]:
+        """
+        List the notes linking to a note.
+
+        Returns:
+            list[dict]: ``path`` of each linking note, with the number of
+            ``links`` and ``embeds`` it contains to the target
+        """
+        with self._lock:
+            note_id = self._id(rel_path)
+            keys = self._keys_by_target.get(note_id, set())
+            results = []
+            for source in self._backlink_ids(note_id):
+                codes = [code for code in self._out[source] if code >> 1 in keys]
+                embeds = sum(code & EMBED for code in codes)
+                results.append(
+                    {
+                        "path": self._paths[source],
+                        "links": len(codes) - embeds,
+                        "embeds": embeds,
+                    }
+                )
+        return sorted(results, key=lambda result: result["path"])
+
+    def outgoing(self, rel_path: str) -> list[dict]:
+        """
+        List the links in a note, in document order.
+
+        Returns:
+            list[dict]: The link ``target`` as written, the ``path`` it
+            resolves to (None if unresolved) and whether it is an ``embed``
+        """
+        with self._lock:
+            note_id = self._id(rel_path)
+            results = []
+            for code in self._out[note_id]:
+                target = self._resolved[code >> 1]
+                results.append(
+                    {
+                        "target": self._key_text[code >> 1],
+                        "path": self._paths[target] if target >= 0 else None,
+                        "embed": bool(code & EMBED),
+                    }
+                )
+        return results
+
+    def orphans(self, include_linking: bool = True) -> list[str]:
+        """
+        List notes no other note links to.
+
+        Args:
+            include_linking (bool): Also list orphans that link to other
+                notes themselves; otherwise only fully unconnected notes.
+        """
+        with self._lock:
+            results = []
+            for rel_path, note_id in self._note_ids.items():
+                if self._backlink_ids(note_id):
+                    continue
+                if not include_linking and self._outgoing_ids(note_id):
+                    continue
+                results.append(rel_path)
+        return sorted(results)
+
+    def unresolved(self) -> list[dict]:
+        """
+        List link targets that do not resolve to any note.
+
+        Returns:
+            list[dict]: Each ``target`` with the ``sources`` linking to it,
+            most-linked first
+        """
+        with self._lock:
+            results = [
+                {
+                    "target": self._key_text[key_id],
+                    "sources": sorted(self._paths[source] for source in sources),
+                }
+                for key_id, sources in enumerate(self._key_sources)
+                if sources and self._resolved[key_id] < 0
+            ]
+        return sorted(results, key=lambda r: (-len(r["sources"]), r["target"]))
+
+    def neighborhood(
+        self,
+        rel_path: str,
+        depth: int = 1,
+        direction: Direction = "both",
+        max_nodes: int = 500,
+    ) -> dict:
+        """
+        Collect the notes within ``depth`` links of a note (breadth-first).
+
+        Args:
+            rel_path (str): The starting note
+            depth (int): Maximum number of hops
+            direction (Direction): Follow outgoing links, backlinks or both
+            max_nodes (int): Stop after this many notes
+
+        Returns:
+            dict: ``nodes`` with their ``distance`` (nearest first), the
+            links between them as ``edges`` of ``[source, target]`` indexes
+            into ``nodes``, and whether the result was ``truncated``
+        """
+        with self._lock:
+            start = self._id(rel_path)
+            distances = {start: 0}
+            queue = deque([start])
+            truncated = False
+            while queue:
+                note_id = queue.popleft()
+                if distances[note_id] == depth:
+                    continue
+                neighbors = set()
+                if direction in ("out", "both"):
+                    neighbors |= self._outgoing_ids(note_id)
+                if direction in ("in", "both"):
+                    neighbors |= self._backlink_ids(note_id)
+                for neighbor in sorted(neighbors, key=lambda i: self._paths[i]):
+                    if neighbor in distances:
+                        continue
+                    if len(distances) >= max_nodes:
+                        truncated = True
+                        break
+                    distances[neighbor] = distances[note_id] + 1
+                    queue.append(neighbor)
+
+            ordered = sorted(distances, key=lambda i: (distances[i], self._paths[i]))
+            position = {note_id: i for i, note_id in enumerate(ordered)}
+            nodes = [
+                {"path": self._paths[note_id], "distance": distances[note_id]}
+                for note_id in ordered
+            ]
+            edges = sorted(
+                [position[source], position[target]]
+                for source in ordered
+                for target in self._outgoing_ids(source)
+                if target in position
+            )
+        return {"nodes": nodes, "edges": edges, "truncated": truncated}
+
+    def stats(self) -> dict:
+        """Return node, edge and unresolved-target counts."""
+        with self._lock:
+            return {
+                "notes": len(self._note_ids),
+                "links": sum(len(codes) for codes in self._out),
+                "link_targets": sum(1 for sources in self._key_sources if sources),
+                "unresolved_targets": sum(
+                    1
+                    for key_id, sources in enumerate(self._key_sources)
+                    if sources and self._resolved[key_id] < 0
+                ),
+            }
+
+
+_graphs: dict[Path, LinkGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_link_graph(vault_path: Path) -> LinkGraph:
+    """Get the process-wide link graph for a vault, creating it on first use."""
+    with _graphs_lock:
+        graph = _graphs.get(vault_path)
+        if graph is None:
+            graph = LinkGraph(vault_path)
+            _graphs[vault_path] = graph
+        return graph
+
+
+def reset_link_graphs() -> None:
+    """Drop every link graph, e.g. when the vault path changes."""
+    with _graphs_lock:
+        _graphs.clear()
+
+
+def _apply_changes(
+    vault_path: Path, notes: list[Path], removed_folders: list[Path], rescan: bool
+) -> None:
+    # Graphs that do not exist yet are built from scratch on first use
+    with _graphs_lock:
+        graph = _graphs.get(vault_path)
+    if graph is not None and graph._scanned:
+        forward_changes(graph, vault_path, notes, removed_folders, rescan)
+
+
+add_change_listener(_apply_changes)
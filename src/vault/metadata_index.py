@@ -0,0 +1,488 @@
+"""
+Persistent, incrementally refreshed index of note metadata.
+
+The index lives in a SQLite database in the vault cache directory and is keyed
+by the note's path relative to the vault root. Every entry carries a
+``(mtime_ns, size, inode)`` fingerprint so a refresh only re-parses notes whose
+fingerprint changed and answers everything else straight from the index.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Literal, Optional
+
+from config.settings import get_cache_dir, get_scan_processes, get_scan_threads
+from utils.frontmatter import frontmatter_list, parse_frontmatter, read_frontmatter
+from utils.instrumentation import in_call_context
+
+# Bump whenever the stored metadata layout changes; older indexes are rebuilt.
+SCHEMA_VERSION = "1"
+
+INDEX_FILENAME = "metadata.sqlite"
+
+RefreshMode = Literal["warm", "rebuild"]
+
+Fingerprint = tuple[int, int, int]
+
+# Spawning YAML worker processes only pays off for large batches of changes
+PROCESS_POOL_MIN_NOTES = 1000
+
+_PROCESS_BATCH_SIZE = 256
+
+_UNREADABLE = object()
+
+
+def fingerprint_from_stat(stat: os.stat_result) -> Fingerprint:
+    """Build the change-detection fingerprint for a note from its stat result."""
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def iter_markdown_files(root: Path):
+    """
+    Walk a directory tree and yield ``(path, stat)`` for every ``.md`` file.
+
+    Uses ``os.scandir`` so the stat information comes from the directory walk
+    itself wherever the platform provides it. Symlinked directories are not
+    followed, matching ``Path.rglob``.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.name.endswith(".md") and entry.is_file():
+                            yield Path(entry.path), entry.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def normalize_folder(folder: str) -> str:
+    """Turn a user-supplied folder into a vault-relative POSIX path ("" for the root)."""
+    parts = [part for part in Path(folder.strip()).parts if part not in ("/", ".")]
+    if ".." in parts:
+        raise ValueError(f"Folder must be inside the vault: {folder}")
+    return "/".join(parts)
+
+
+def in_folder(rel_path: str, folder: str) -> bool:
+    """Whether a vault-relative note path lies in a normalized folder."""
+    return not folder or rel_path.startswith(folder + "/")
+
+
+def _normalize_timestamp(value):
+    # YAML turns ISO timestamps into datetime objects; store them as strings so
+    # the cached and freshly parsed metadata are indistinguishable.
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _load_frontmatter(text: Optional[str]):
+    # Missing or invalid frontmatter yields an empty dict; an empty header
+    # yields None, which makes the note unusable just like before.
+    if text is None:
+        return {}
+    try:
+        return parse_frontmatter(text.strip())
+    except Exception:
+        return {}
+
+
+def _load_frontmatter_batch(texts: list[Optional[str]]) -> list:
+    """Parse a batch of headers; runs inside the YAML process pool."""
+    return [_load_frontmatter(text) for text in texts]
+
+
+def build_note_metadata(frontmatter, file_path: Path, rel_path: Path) -> dict:
+    """
+    Build a note's metadata dictionary from its parsed frontmatter.
+
+    Args:
+        frontmatter: The parsed YAML header
+        file_path (Path): Absolute path to the note
+        rel_path (Path): Path of the note relative to the vault root
+
+    Returns:
+        dict: The note metadata, without the absolute ``path`` key
+
+    Raises:
+        Exception: If the frontmatter is unusable
+    """
+    folder = str(rel_path.parent) if rel_path.parent != Path(".") else ""
+
+    return {
+        "title": frontmatter.get("title", file_path.stem),
+        "folder": folder,
+        "tags": frontmatter_list(frontmatter.get("tags")),
+        "category": frontmatter.get("category", ""),
+        "summary": frontmatter.get("summary", ""),
+        "type": frontmatter.get("type", "note"),
+        "aliases": frontmatter_list(frontmatter.get("aliases")),
+        "related": frontmatter_list(frontmatter.get("related")),
+        "created": _normalize_timestamp(frontmatter.get("created", "")),
+        "modified": _normalize_timestamp(frontmatter.get("modified", "")),
+    }
+
+
+def parse_note_metadata(file_path: Path, rel_path: Path) -> dict:
+    """
+    Read a note's frontmatter and build its metadata dictionary.
+
+    Args:
+        file_path (Path): Absolute path to the note
+        rel_path (Path): Path of the note relative to the vault root
+
+    Returns:
+        dict: The note metadata, without the absolute ``path`` key
+
+    Raises:
+        Exception: If the note cannot be read or its frontmatter is unusable
+    """
+    # Only the header is read; note bodies are never loaded here
+    block = read_frontmatter(file_path)
+    return build_note_metadata(_load_frontmatter(block.text), file_path, rel_path)
+
+
+def _read_header(file_path: Path):
+    try:
+        return read_frontmatter(file_path).text
+    except Exception:
+        return _UNREADABLE
+
+
+class MetadataIndex:
+    """
+    On-disk metadata index for a single vault.
+
+    The full index is mirrored in memory after the first load, so a warm
+    refresh costs one directory walk plus a parse of each changed note.
+    Notes that cannot be parsed are remembered as such and skipped until
+    their fingerprint changes.
+    """
+
+    def __init__(self, vault_path: Path, db_path: Path):
+        self.vault_path = vault_path
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._entries: dict[str, tuple[Fingerprint, Optional[dict]]] = {}
+        # Set while a VaultWatcher pushes every change into the index, so
+        # warm refreshes can skip walking the vault
+        self.watched = False
+        self._setup()
+        self._load()
+
+    def _setup(self) -> None:
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            row = self._conn.execute(
+                "SELECT value FROM info WHERE key = 'schema_version'"
+            ).fetchone()
+            if row is None or row[0] != SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS notes")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO info (key, value) VALUES ('schema_version', ?)",
+                    (SCHEMA_VERSION,),
+                )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS notes (
+                    rel_path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    metadata TEXT
+                )
+                """)
+
+    def _load(self) -> None:
+        rows = self._conn.execute(
+            "SELECT rel_path, mtime_ns, size, inode, metadata FROM notes"
+        )
+        for rel_path, mtime_ns, size, inode, metadata in rows:
+            self._entries[rel_path] = (
+                (mtime_ns, size, inode),
+                json.loads(metadata) if metadata is not None else None,
+            )
+
+    def _parse(self, file_path: Path, rel_path: Path) -> Optional[dict]:
+        try:
+            return parse_note_metadata(file_path, rel_path)
+        except Exception:
+            # Unreadable notes are indexed as "skip" until they change
+            return None
+
+    def _store(self, updates: dict, deletions: list[str]) -> None:
+        with self._conn:
+            if deletions:
+                self._conn.executemany(
+                    "DELETE FROM notes WHERE rel_path = ?",
+                    [(rel_path,) for rel_path in deletions],
+                )
+            if updates:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO notes (rel_path, mtime_ns, size, inode, metadata) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            rel_path,
+                            *fingerprint,
+                            (
+                                json.dumps(metadata, default=_json_default)
+                                if metadata is not None
+                                else None
+                            ),
+                        )
+                        for rel_path, (fingerprint, metadata) in updates.items()
+                    ],
+                )
+        for rel_path in deletions:
+            self._entries.pop(rel_path, None)
+        self._entries.update(updates)
+
+    def _parse_many(self, changed: list, threads: int, processes: int) -> list:
+        """Parse ``(file_path, rel_path)`` pairs, fanning out over worker pools."""
+        if processes > 0 and len(changed) >= PROCESS_POOL_MIN_NOTES:
+            # Threads fetch the headers, processes do the CPU-bound YAML work
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                texts = list(
+                    pool.map(
+                        in_call_context(_read_header), [path for path, _ in changed]
+                    )
+                )
+
+            parseable = [i for i, text in enumerate(texts) if text is not _UNREADABLE]
+            batches = [
+                [texts[i] for i in parseable[start : start + _PROCESS_BATCH_SIZE]]
+                for start in range(0, len(parseable), _PROCESS_BATCH_SIZE)
+            ]
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                parsed = [
+                    fm
+                    for batch in pool.map(_load_frontmatter_batch, batches)
+                    for fm in batch
+                ]
+
+            results = [None] * len(changed)
+            for i, frontmatter in zip(parseable, parsed):
+                file_path, rel_path = changed[i]
+                try:
+                    results[i] = build_note_metadata(frontmatter, file_path, rel_path)
+                except Exception:
+                    pass
+            return results
+
+        if threads > 1 and len(changed) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                return list(
+                    pool.map(in_call_context(lambda item: self._parse(*item)), changed)
+                )
+
+        return [self._parse(file_path, rel_path) for file_path, rel_path in changed]
+
+    def refresh(
+        self,
+        mode: RefreshMode = "warm",
+        threads: Optional[int] = None,
+        processes: Optional[int] = None,
+        folder: str = "",
+    ) -> None:
+        """
+        Bring the index up to date with the vault.
+
+        While the index is watched, a warm refresh is a no-op: the watcher has
+        already applied every change it saw.
+
+        Args:
+            mode (RefreshMode): ``"warm"`` re-parses only notes whose
+                fingerprint changed (on an empty index this is a cold build);
+                ``"rebuild"`` discards the index and re-parses every note.
+            threads (Optional[int]): Reader threads. Defaults to the
+                OBSIDIAN_SCAN_THREADS setting.
+            processes (Optional[int]): YAML parser processes, 0 to parse in
+                the reader threads. Defaults to the OBSIDIAN_SCAN_PROCESSES
+                setting.
+            folder (str): Only walk and refresh this folder (relative to the
+                vault root); the rest of the index is left untouched.
+        """
+        if mode == "warm" and self.watched:
+            return
+        self.scan(mode, threads, processes, folder)
+
+    def scan(
+        self,
+        mode: RefreshMode = "warm",
+        threads: Optional[int] = None,
+        processes: Optional[int] = None,
+        folder: str = "",
+    ) -> None:
+        """Walk the vault and update the index; see ``refresh`` for arguments."""
+        if threads is None:
+            threads = get_scan_threads()
+        if processes is None:
+            processes = get_scan_processes()
+
+        folder = normalize_folder(folder)
+        with self._lock:
+            if mode == "rebuild":
+                self._store(
+                    {}, [key for key in self._entries if in_folder(key, folder)]
+                )
+
+            seen = set()
+            changed = []
+            fingerprints = []
+            for file_path, stat in iter_markdown_files(self.vault_path / folder):
+                rel_path = file_path.relative_to(self.vault_path)
+                key = rel_path.as_posix()
+                seen.add(key)
+                fingerprint = fingerprint_from_stat(stat)
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == fingerprint:
+                    continue
+                changed.append((file_path, rel_path))
+                fingerprints.append((key, fingerprint))
+
+            parsed = self._parse_many(changed, threads, processes)
+            updates = {
+                key: (fingerprint, metadata)
+                for (key, fingerprint), metadata in zip(fingerprints, parsed)
+            }
+            deletions = [
+                key
+                for key in self._entries
+                if key not in seen and in_folder(key, folder)
+            ]
+            self._store(updates, deletions)
+
+    def record_write(self, file_path: Path) -> None:
+        """Re-index a single note after it was written through this server."""
+        self.record_changes([file_path])
+
+    def record_changes(self, file_paths: list[Path]) -> None:
+        """
+        Re-index notes known to have changed, without walking the vault.
+
+        Notes that no longer exist are removed from the index.
+        """
+        with self._lock:
+            changed = []
+            fingerprints = []
+            deletions = []
+            for file_path in file_paths:
+                rel_path = file_path.relative_to(self.vault_path)
+                key = rel_path.as_posix()
+                try:
+                    stat = file_path.stat()
+                except FileNotFoundError:
+                    deletions.append(key)
+                    continue
+                changed.append((file_path, rel_path))
+                fingerprints.append((key, fingerprint_from_stat(stat)))
+
+            parsed = self._parse_many(changed, get_scan_threads(), 0)
+            updates = {
+                key: (fingerprint, metadata)
+                for (key, fingerprint), metadata in zip(fingerprints, parsed)
+            }
+            self._store(updates, deletions)
+
+    def forget_folder(self, folder: str) -> None:
+        """Remove every note under a folder that was deleted or moved away."""
+        folder = normalize_folder(folder)
+        with self._lock:
+            self._store({}, [key for key in self._entries if in_folder(key, folder)])
+
+    def entries(self, folder: str = "") -> list[tuple[str, Fingerprint, dict]]:
+        """
+        Return ``(rel_path, fingerprint, metadata)`` for indexed notes.
+
+        Args:
+            folder (str): Only include notes in this folder or its subfolders
+
+        Returns:
+            list[tuple[str, Fingerprint, dict]]: Entries ordered by relative
+            path, excluding notes that could not be parsed
+        """
+        folder = normalize_folder(folder)
+        with self._lock:
+            return [
+                (key, fingerprint, metadata)
+                for key, (fingerprint, metadata) in sorted(self._entries.items())
+                if metadata is not None and in_folder(key, folder)
+            ]
+
+    def get(self, rel_path: str) -> Optional[tuple[Fingerprint, Optional[dict]]]:
+        """
+        Return a note's ``(fingerprint, metadata)``, or None if it is not indexed.
+
+        The metadata is None for a note that could not be parsed.
+        """
+        with self._lock:
+            return self._entries.get(rel_path)
+
+    def snapshot(self) -> dict[str, tuple[Fingerprint, Optional[dict]]]:
+        """Return every indexed note by relative path, including unparsed ones."""
+        with self._lock:
+            return dict(self._entries)
+
+    def notes(self, folder: str = "") -> list[dict]:
+        """Return the metadata of indexed notes, ordered by relative path."""
+        return [
+            {**metadata, "path": str(self.vault_path / key)}
+            for key, _, metadata in self.entries(folder)
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: dict[Path, MetadataIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_metadata_index(vault_path: Path) -> MetadataIndex:
+    """Get the process-wide metadata index for a vault, opening it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+        if index is not None and not index.db_path.exists():
+            # The cache directory was removed underneath us; start over
+            index.close()
+            index = None
+        if index is None:
+            db_path = get_cache_dir(vault_path) / INDEX_FILENAME
+            index = MetadataIndex(vault_path, db_path)
+            _indexes[vault_path] = index
+        return index
+
+
+def close_metadata_indexes() -> None:
+    """Close every open metadata index, e.g. when the vault path changes."""
+    with _indexes_lock:
+        for index in _indexes.values():
+            index.close()
+        _indexes.clear()
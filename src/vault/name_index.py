@@ -0,0 +1,339 @@
+"""
+In-memory index from note names to note paths.
+
+Lets tools find a note from its title alone. Every note is reachable by its
+vault-relative path, its file name, its frontmatter ``title`` and each of its
+frontmatter ``aliases``; names are matched NFC-normalized and casefolded,
+like link targets. When several notes share a name, the one with the
+shortest path wins, then the alphabetically first, as in the link graph.
+
+The index is built on first use from the metadata index (no note is read to
+build it) and kept current from change notifications, so a lookup is a few
+dictionary probes. For typo-tolerant lookups, file names, titles and
+aliases are also indexed by character trigrams, from the first such lookup
+on.
+"""
+
+import posixpath
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+from utils.trigrams import TrigramIndex
+from vault.changes import add_change_listener, forward_changes
+from vault.link_graph import normalize_link_target
+from vault.metadata_index import (
+    Fingerprint,
+    get_metadata_index,
+    in_folder,
+    normalize_folder,
+)
+
+# A name's notes: a single path, or paths in order of preference
+Candidates = Union[str, tuple[str, ...]]
+
+
+def _rank(rel_path: str) -> tuple[int, str]:
+    return rel_path.count("/"), rel_path
+
+
+def _add(table: dict[str, Candidates], key: str, rel_path: str) -> None:
+    current = table.get(key)
+    if current is None:
+        table[key] = rel_path
+        return
+    paths = (current,) if isinstance(current, str) else current
+    if rel_path not in paths:
+        table[key] = tuple(sorted((*paths, rel_path), key=_rank))
+
+
+def _discard(table: dict[str, Candidates], key: str, rel_path: str) -> None:
+    current = table.get(key)
+    if current is None:
+        return
+    if isinstance(current, str):
+        if current == rel_path:
+            del table[key]
+        return
+    paths = tuple(path for path in current if path != rel_path)
+    table[key] = paths[0] if len(paths) == 1 else paths
+
+
+def _all(candidates: Optional[Candidates]) -> tuple[str, ...]:
+    if candidates is None:
+        return ()
+    return (candidates,) if isinstance(candidates, str) else candidates
+
+
+def _first(candidates: Optional[Candidates]) -> Optional[str]:
+    if candidates is None or isinstance(candidates, str):
+        return candidates
+    return candidates[0]
+
+
+def _name_keys(metadata: Optional[dict], name_key: str) -> tuple[str, ...]:
+    """The title and alias keys of a note, other than its file name."""
+    if not metadata:
+        return ()
+    names = [metadata.get("title")] + list(metadata.get("aliases") or ())
+    keys = []
+    for name in names:
+        if name is None or not str(name).strip():
+            continue
+        key = normalize_link_target(str(name))
+        if key and key != name_key and key not in keys:
+            keys.append(key)
+    return tuple(keys)
+
+
+class NameIndex:
+    """Note names of one vault, mapped to vault-relative note paths."""
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = vault_path
+        self._lock = threading.RLock()
+        self._built = False
+        self._stale = False
+
+        # rel_path -> (fingerprint, title and alias keys)
+        self._notes: dict[str, tuple[Fingerprint, tuple[str, ...]]] = {}
+        # Resolution tables, tried in this order
+        self._by_path: dict[str, str] = {}
+        self._by_name: dict[str, Candidates] = {}
+        self._by_title: dict[str, Candidates] = {}
+        # File names, titles and aliases, for fuzzy lookups; built on the
+        # first one
+        self._trigrams: Optional[TrigramIndex] = None
+
+    # -- maintenance --------------------------------------------------------
+
+    def _add_name(self, table: dict[str, Candidates], key: str, rel_path: str):
+        _add(table, key, rel_path)
+        if self._trigrams is not None:
+            self._trigrams.add(key)
+
+    def _discard_name(self, table: dict[str, Candidates], key: str, rel_path: str):
+        _discard(table, key, rel_path)
+        if self._trigrams is not None:
+            if key not in self._by_name and key not in self._by_title:
+                self._trigrams.discard(key)
+
+    def _set(self, rel_path: str, fingerprint: Fingerprint, metadata) -> None:
+        path_key = normalize_link_target(rel_path)
+        name_key = posixpath.basename(path_key)
+        keys = _name_keys(metadata, name_key)
+        previous = self._notes.get(rel_path)
+        if previous is None:
+            self._by_path[path_key] = rel_path
+            self._add_name(self._by_name, name_key, rel_path)
+        else:
+            for key in previous[1]:
+                if key not in keys:
+                    self._discard_name(self._by_title, key, rel_path)
+        for key in keys:
+            self._add_name(self._by_title, key, rel_path)
+        self._notes[rel_path] = (fingerprint, keys)
+
+    def _remove(self, rel_path: str) -> None:
+        previous = self._notes.pop(rel_path, None)
+        if previous is None:
+            return
+        path_key = normalize_link_target(rel_path)
+        if self._by_path.get(path_key) == rel_path:
+            del self._by_path[path_key]
+        self._discard_name(self._by_name, posixpath.basename(path_key), rel_path)
+        for key in previous[1]:
+            self._discard_name(self._by_title, key, rel_path)
+
+    def refresh(self) -> None:
+        """
+        Bring the index up to date with the metadata index.
+
+        The metadata index is refreshed first (a no-op while a watcher keeps
+        it current); only notes whose fingerprint changed are re-indexed.
+        """
+        index = get_metadata_index(self.vault_path)
+        index.refresh()
+        entries = index.snapshot()
+        with self._lock:
+            for rel_path, (fingerprint, metadata) in entries.items():
+                previous = self._notes.get(rel_path)
+                if previous is None or previous[0] != fingerprint:
+                    self._set(rel_path, fingerprint, metadata)
+            for rel_path in [path for path in self._notes if path not in entries]:
+                self._remove(rel_path)
+            self._built = True
+            self._stale = False
+
+    def record_changes(self, file_paths: list[Path]) -> None:
+        """Re-index notes the metadata index has just recorded as changed."""
+        index = get_metadata_index(self.vault_path)
+        with self._lock:
+            for file_path in file_paths:
+                rel_path = file_path.relative_to(self.vault_path).as_posix()
+                entry = index.get(rel_path)
+                if entry is None:
+                    self._remove(rel_path)
+                else:
+                    self._set(rel_path, *entry)
+
+    def forget_folder(self, folder: str) -> None:
+        """Remove every note under a folder that was deleted or moved away."""
+        folder = normalize_folder(folder)
+        with self._lock:
+            for rel_path in [path for path in self._notes if in_folder(path, folder)]:
+                self._remove(rel_path)
+
+    def mark_stale(self) -> None:
+        """Make the next lookup re-sync with the metadata index."""
+        self._stale = True
+
+    # -- queries ------------------------------------------------------------
+
+    def _lookup(self, key: str) -> Optional[str]:
+        rel_path = self._by_path.get(key)
+        if rel_path is not None:
+            return rel_path
+        name_key = posixpath.basename(key)
+        if "/" in key:
+            # A partial path names the notes whose path ends that way
+            suffix = "/" + key
+            candidates = [
+                path
+                for path in _all(self._by_name.get(name_key))
+                if normalize_link_target(path).endswith(suffix)
+            ]
+            rel_path = candidates[0] if candidates else None
+        else:
+            rel_path = _first(self._by_name.get(name_key))
+        if rel_path is None:
+            rel_path = _first(self._by_title.get(key))
+        return rel_path
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Find the note a name refers to.
+
+        Args:
+            name (str): A vault-relative path (with or without ``.md``), a
+                file name, a frontmatter title or an alias
+
+        Returns:
+            Optional[str]: The note's vault-relative POSIX path, or None if
+            no note has that name
+        """
+        key = normalize_link_target(name)
+        if not key:
+            return None
+        if not self._built or self._stale:
+            self.refresh()
+        with self._lock:
+            rel_path = self._lookup(key)
+        if rel_path is not None and (self.vault_path / rel_path).exists():
+            return rel_path
+        if get_metadata_index(self.vault_path).watched:
+            return rel_path
+        # Without a watcher the vault may have changed behind our back
+        self.refresh()
+        with self._lock:
+            return self._lookup(key)
+
+    def find(
+        self,
+        query: str,
+        folder: str = "",
+        min_score: float = 0.3,
+        limit: Optional[int] = None,
+    ) -> list[tuple[str, float, str]]:
+        """
+        Find notes whose file name, title or alias is similar to a query.
+
+        Args:
+            query (str): The name to look up, possibly misspelled
+            folder (str, optional): Only return notes in this folder or its
+                subfolders. Defaults to "".
+            min_score (float, optional): Lowest trigram similarity (0 to 1)
+                to return. Defaults to 0.3.
+            limit (Optional[int], optional): Maximum number of notes to
+                return. Defaults to all matches.
+
+        Returns:
+            list[tuple[str, float, str]]: ``(rel_path, score, matched name)``
+            per note, best match first; a note matched by several names is
+            listed once, with its best one
+        """
+        key = normalize_link_target(query)
+        folder = normalize_folder(folder)
+        if not self._built or self._stale:
+            self.refresh()
+        with self._lock:
+            if self._trigrams is None:
+                self._trigrams = TrigramIndex()
+                for name in (*self._by_name, *self._by_title):
+                    self._trigrams.add(name)
+
+            found: dict[str, tuple[float, str]] = {}
+            last_score = None
+            for name, score in self._trigrams.search(key, min_score):
+                # Finish the names tied with the last note taken
+                if limit is not None and len(found) >= limit and score != last_score:
+                    break
+                for table in (self._by_name, self._by_title):
+                    for rel_path in _all(table.get(name)):
+                        if rel_path not in found and in_folder(rel_path, folder):
+                            found[rel_path] = (score, name)
+                            last_score = score
+
+        results = sorted(
+            ((rel_path, score, name) for rel_path, (score, name) in found.items()),
+            key=lambda result: (-result[1], _rank(result[0])),
+        )
+        return results if limit is None else results[:limit]
+
+    def stats(self) -> dict:
+        """Return note and name counts."""
+        with self._lock:
+            return {
+                "notes": len(self._notes),
+                "names": len(self._by_name),
+                "titles_and_aliases": len(self._by_title),
+                "ambiguous_names": sum(
+                    1
+                    for table in (self._by_name, self._by_title)
+                    for value in table.values()
+                    if not isinstance(value, str)
+                ),
+            }
+
+
+_indexes: dict[Path, NameIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_name_index(vault_path: Path) -> NameIndex:
+    """Get the process-wide name index for a vault, creating it on first use."""
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+        if index is None:
+            index = NameIndex(vault_path)
+            _indexes[vault_path] = index
+        return index
+
+
+def reset_name_indexes() -> None:
+    """Drop every name index, e.g. when the vault path changes."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def _apply_changes(
+    vault_path: Path, notes: list[Path], removed_folders: list[Path], rescan: bool
+) -> None:
+    # Indexes that do not exist yet are built from scratch on first use
+    with _indexes_lock:
+        index = _indexes.get(vault_path)
+    if index is not None and index._built:
+        forward_changes(index, vault_path, notes, removed_folders, rescan)
+
+
+add_change_listener(_apply_changes)
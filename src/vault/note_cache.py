@@ -0,0 +1,178 @@
+"""
+In-memory LRU cache of parsed notes.
+
+Entries are keyed by the note's resolved path and validated against the
+file's ``(st_mtime_ns, st_size)`` on every lookup, so edits made outside the
+server (e.g. in Obsidian) are picked up on the next read. The cache is bounded
+by an approximate memory budget rather than an entry count, since note sizes
+vary by orders of magnitude.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+from config.settings import get_note_cache_bytes
+from models.note_models import ObsidianNote
+
+# (st_mtime_ns, st_size) of the file the cached note was parsed from
+Validator = tuple[int, int]
+
+# Rough per-entry overhead of the note object, its lists and the LRU slot
+_ENTRY_OVERHEAD = 1024
+
+
+def validator_from_stat(stat: os.stat_result) -> Validator:
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _estimate_size(note: ObsidianNote) -> int:
+    size = _ENTRY_OVERHEAD
+    for value in (note.title, note.content, note.folder, note.category, note.summary):
+        size += sys.getsizeof(value)
+    for values in (note.tags, note.aliases, note.related):
+        size += sum(sys.getsizeof(value) for value in values)
+    return size
+
+
+def _cache_key(file_path: Union[str, Path]) -> str:
+    return os.path.realpath(file_path)
+
+
+class NoteCache:
+    """Thread-safe LRU of parsed notes with a memory budget in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Validator, ObsidianNote, int]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def get(
+        self, file_path: Union[str, Path], stat: os.stat_result
+    ) -> Optional[ObsidianNote]:
+        """
+        Look up a note, checking it against the file's current stat.
+
+        Args:
+            file_path (Union[str, Path]): Path to the note
+            stat (os.stat_result): A fresh ``stat`` of the file
+
+        Returns:
+            Optional[ObsidianNote]: A copy of the cached note, or None on a miss
+            or if the file changed since it was cached
+        """
+        key = _cache_key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != validator_from_stat(stat):
+                self._discard(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            note = entry[1]
+        # Callers are free to modify the note they get back
+        return note.model_copy(deep=True)
+
+    def put(
+        self, file_path: Union[str, Path], stat: os.stat_result, note: ObsidianNote
+    ):
+        """
+        Store a note parsed from the file whose stat is given.
+
+        Args:
+            file_path (Union[str, Path]): Path to the note
+            stat (os.stat_result): The stat the note's contents correspond to
+            note (ObsidianNote): The parsed note
+        """
+        if self.max_bytes <= 0:
+            return
+        size = _estimate_size(note)
+        key = _cache_key(file_path)
+        note = note.model_copy(deep=True)
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (validator_from_stat(stat), note, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[2]
+                self.evictions += 1
+
+    def invalidate(self, file_path: Union[str, Path]):
+        """Drop the cached copy of a note, if any."""
+        key = _cache_key(file_path)
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+                self.invalidations += 1
+
+    def invalidate_tree(self, directory: Union[str, Path]):
+        """Drop the cached copies of every note under a directory."""
+        prefix = os.path.join(_cache_key(directory), "")
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._discard(key)
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop every cached note."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Return the cache's size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache: Optional[NoteCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_note_cache() -> NoteCache:
+    """Get the process-wide note cache, sized by OBSIDIAN_NOTE_CACHE_BYTES."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = NoteCache(get_note_cache_bytes())
+        return _cache
+
+
+def reset_note_cache():
+    """Discard the process-wide note cache; the next use re-reads the settings."""
+    global _cache
+    with _cache_lock:
+        _cache = None
@@ -0,0 +1,305 @@
+"""
+Heading outlines of notes, for reading one part of a note at a time.
+
+An outline records the byte offset of every line and every Markdown heading
+of a note file, so a heading section, line range or byte range can be read
+with a single seek instead of re-reading and re-parsing the whole note.
+Outlines are cached per note and validated against the file's
+``(st_mtime_ns, st_size)`` like the note cache.
+"""
+
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, NamedTuple, Optional, Union
+
+from utils.frontmatter import split_frontmatter
+from utils.instrumentation import record_io
+from vault.note_cache import Validator, validator_from_stat
+
+DEFAULT_OUTLINE_CACHE_BYTES = 16 * 1024 * 1024
+
+# Lines that may open a heading or a code fence, for the candidate scan
+_CANDIDATE = re.compile(rb"^ {0,3}(?:#|```|~~~)", re.MULTILINE)
+_HEADING = re.compile(rb" {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*\r?")
+_FENCE = re.compile(rb" {0,3}(`{3,}|~{3,})")
+
+
+class Heading(NamedTuple):
+    """A Markdown heading and the extent of its section in the note file."""
+
+    level: int
+    title: str
+    # 1-based line number of the heading in the file
+    line: int
+    # Byte offset of the heading line
+    offset: int
+    # End of the section including subsections (next heading at the same or
+    # a higher level), and end of the text before the first subsection
+    end: int
+    own_end: int
+    # Index of the enclosing heading in the outline, or -1
+    parent: int
+
+
+class Outline(NamedTuple):
+    """Line and heading offsets of a note file."""
+
+    size: int
+    body_offset: int
+    # Byte offset of the start of every line
+    line_starts: array
+    headings: tuple[Heading, ...]
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_span(self, start: int, end: int) -> tuple[int, int]:
+        """Byte span of lines ``start`` to ``end`` (1-based, inclusive)."""
+        start = max(1, start)
+        end = min(end, self.line_count)
+        if start > end:
+            return self.size, self.size
+        stop = self.line_starts[end] if end < self.line_count else self.size
+        return self.line_starts[start - 1], stop
+
+    def find(self, heading: str) -> Optional[Heading]:
+        """
+        Find a heading by its text, case-insensitively.
+
+        ``Results#Ablations`` finds an ``Ablations`` heading nested under a
+        ``Results`` heading, like the heading part of an Obsidian link. The
+        first match in document order wins.
+        """
+        path = [part.strip().casefold() for part in heading.split("#") if part.strip()]
+        if not path:
+            return None
+        for index, candidate in enumerate(self.headings):
+            if candidate.title.casefold() != path[-1]:
+                continue
+            ancestors = path[:-1]
+            parent = candidate.parent
+            while ancestors and parent >= 0:
+                if self.headings[parent].title.casefold() == ancestors[-1]:
+                    ancestors.pop()
+                parent = self.headings[parent].parent
+            if not ancestors:
+                return candidate
+        return None
+
+    def tree(self) -> list[dict]:
+        """The headings as nested dicts, each with its ``children``."""
+        nodes = []
+        roots = []
+        for heading in self.headings:
+            node = {
+                "level": heading.level,
+                "title": heading.title,
+                "line": heading.line,
+                "offset": heading.offset,
+                "end": heading.end,
+                "children": [],
+            }
+            nodes.append(node)
+            if heading.parent >= 0:
+                nodes[heading.parent]["children"].append(node)
+            else:
+                roots.append(node)
+        return roots
+
+
+def parse_outline(data: bytes) -> Outline:
+    """
+    Build the outline of a note from its raw file contents.
+
+    ATX headings (``#`` to ``######``) in the body count; headings inside
+    fenced code blocks and ``#tags`` do not.
+
+    Args:
+        data (bytes): The raw note file contents
+
+    Returns:
+        Outline: The note's line and heading offsets
+    """
+    body_offset = split_frontmatter(data).body_offset
+
+    line_starts = array("q", [0])
+    position = data.find(b"\n")
+    while position != -1 and position + 1 < len(data):
+        line_starts.append(position + 1)
+        position = data.find(b"\n", position + 1)
+
+    found = []
+    fence = None
+    for match in _CANDIDATE.finditer(data, body_offset):
+        line_start = match.start()
+        line_end = data.find(b"\n", line_start)
+        if line_end == -1:
+            line_end = len(data)
+        line = data[line_start:line_end]
+
+        fence_match = _FENCE.match(line)
+        if fence_match is not None:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif (
+                marker[0] == fence[0]
+                and len(marker) >= len(fence)
+                and not line[fence_match.end() :].strip()
+            ):
+                fence = None
+            continue
+        if fence is not None:
+            continue
+
+        heading_match = _HEADING.fullmatch(line)
+        if heading_match is None:
+            continue
+        title = (heading_match.group(2) or b"").decode("utf-8", errors="replace")
+        line_number = bisect_right(line_starts, line_start)
+        found.append(
+            (len(heading_match.group(1)), title.strip(), line_number, line_start)
+        )
+
+    # A section ends at the next heading of the same or a higher level; the
+    # text before any subsection ends at the very next heading
+    ends = [len(data)] * len(found)
+    parents = [-1] * len(found)
+    stack: list[int] = []
+    for index, (level, _, _, offset) in enumerate(found):
+        while stack and found[stack[-1]][0] >= level:
+            ends[stack.pop()] = offset
+        parents[index] = stack[-1] if stack else -1
+        stack.append(index)
+
+    headings = tuple(
+        Heading(
+            level,
+            title,
+            line_number,
+            offset,
+            ends[index],
+            found[index + 1][3] if index + 1 < len(found) else len(data),
+            parents[index],
+        )
+        for index, (level, title, line_number, offset) in enumerate(found)
+    )
+
+    return Outline(len(data), body_offset, line_starts, headings)
+
+
+def read_span(f: BinaryIO, start: int, end: int) -> str:
+    """
+    Read bytes ``start`` to ``end`` of an open note as text.
+
+    Characters cut in half at either edge of the span are dropped, and line
+    endings are normalized to ``\\n`` as in ``read_note``.
+    """
+    f.seek(start)
+    data = f.read(max(0, end - start))
+    record_io(getattr(f, "name", None), read=len(data))
+    text = data.decode("utf-8", errors="ignore")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _estimate_size(outline: Outline) -> int:
+    size = 256 + outline.line_starts.itemsize * len(outline.line_starts)
+    return size + sum(160 + len(heading.title) for heading in outline.headings)
+
+
+class OutlineCache:
+    """Thread-safe LRU of note outlines with a memory budget in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Validator, Outline, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, file_path: Union[str, Path], stat: os.stat_result
+    ) -> Optional[Outline]:
+        """Look up an outline, checking it against the file's current stat."""
+        key = os.path.realpath(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != validator_from_stat(stat):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, file_path: Union[str, Path], stat: os.stat_result, outline: Outline):
+        """Store the outline parsed from the file whose stat is given."""
+        size = _estimate_size(outline)
+        key = os.path.realpath(file_path)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (validator_from_stat(stat), outline, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[2]
+
+    def stats(self) -> dict:
+        """Return the cache's size and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_cache: Optional[OutlineCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_outline_cache() -> OutlineCache:
+    """Get the process-wide outline cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = OutlineCache(DEFAULT_OUTLINE_CACHE_BYTES)
+        return _cache
+
+
+def reset_outline_cache():
+    """Discard the process-wide outline cache."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+def load_outline(f: BinaryIO, file_path: Union[str, Path]) -> Outline:
+    """
+    Get the outline of an open note, parsing it only if the cache is stale.
+
+    The cache is validated with ``fstat`` on the open file, so the outline
+    always matches the bytes that are read through ``f`` afterwards.
+    """
+    stat = os.fstat(f.fileno())
+    cache = get_outline_cache()
+    outline = cache.get(file_path, stat)
+    if outline is None:
+        f.seek(0)
+        data = f.read()
+        record_io(file_path, read=len(data))
+        outline = parse_outline(data)
+        cache.put(file_path, stat, outline)
+    return outline
@@ -0,0 +1,492 @@
+"""
+Background watcher that keeps the note cache and metadata index in step with
+edits made outside the server, e.g. by the Obsidian app.
+
+On Linux the vault is watched with inotify (through ctypes, so there is no
+extra dependency); elsewhere, or when inotify is unavailable, the vault is
+re-scanned periodically. Events are coalesced per path and only applied once a
+path has been quiet for the debounce interval, so a burst of autosaves costs a
+single re-parse.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from config.settings import (
+    get_watch_debounce_ms,
+    get_watch_mode,
+    get_watch_poll_interval_ms,
+)
+from vault.metadata_index import (
+    fingerprint_from_stat,
+    get_metadata_index,
+    iter_markdown_files,
+)
+from vault.changes import notify_changes, set_watched
+from vault.note_cache import get_note_cache
+
+# inotify event bits, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+
+# struct inotify_event { int wd; uint32_t mask, cookie, len; char name[]; }
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Window over which the event rate is reported
+_RATE_WINDOW_SECONDS = 60.0
+
+# A raw event: the path and whether it names a directory that went away
+RawEvent = tuple[Path, bool]
+
+
+class InotifyBackend:
+    """Recursive inotify watch of a directory tree."""
+
+    name = "inotify"
+
+    def __init__(self, root: Path):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        self._wake_read, self._wake_write = os.pipe()
+        self._watches: dict[int, Path] = {}
+        try:
+            self._add_tree(root)
+        except Exception:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), _WATCH_MASK | IN_ONLYDIR
+        )
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_add_watch failed: {os.strerror(error)}")
+        self._watches[wd] = directory
+
+    def _add_tree(self, root: Path) -> list[Path]:
+        """Watch a directory and its subdirectories; return the notes in them."""
+        notes = []
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                self._add_watch(directory)
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.name.endswith(".md"):
+                            notes.append(Path(entry.path))
+            except (FileNotFoundError, NotADirectoryError):
+                # Removed again before we got to it
+                continue
+        return notes
+
+    def _remove_tree(self, root: Path) -> None:
+        for wd, directory in list(self._watches.items()):
+            if directory == root or root in directory.parents:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def wait(self, timeout: Optional[float]) -> tuple[list[RawEvent], bool]:
+        """
+        Wait for filesystem events.
+
+        Returns:
+            tuple[list[RawEvent], bool]: The events, and whether the kernel
+            queue overflowed so that events were lost
+        """
+        ready, _, _ = select.select([self._fd, self._wake_read], [], [], timeout)
+        if self._wake_read in ready:
+            os.read(self._wake_read, 4096)
+        if self._fd not in ready:
+            return [], False
+
+        chunks = []
+        while True:
+            try:
+                chunks.append(os.read(self._fd, 64 * 1024))
+            except BlockingIOError:
+                break
+        data = b"".join(chunks)
+
+        events = []
+        overflow = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Notes may already be inside a directory moved into the
+                    # vault, or written before its watch was in place
+                    events.extend((note, False) for note in self._add_tree(path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._remove_tree(path)
+                    events.append((path, True))
+            elif path.name.endswith(".md"):
+                events.append((path, False))
+        return events, overflow
+
+    def wake(self) -> None:
+        os.write(self._wake_write, b"\0")
+
+    def close(self) -> None:
+        os.close(self._fd)
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+
+class PollingBackend:
+    """Periodic re-scan of a directory tree, for platforms without inotify."""
+
+    name = "poll"
+
+    def __init__(self, root: Path, interval: float):
+        self._root = root
+        self._interval = interval
+        self._wake = threading.Event()
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> dict[Path, tuple]:
+        return {
+            path: fingerprint_from_stat(stat)
+            for path, stat in iter_markdown_files(self._root)
+        }
+
+    def wait(self, timeout: Optional[float]) -> tuple[list[RawEvent], bool]:
+        """Wait for the next scan (or the timeout) and report what changed."""
+        delay = max(0.0, self._next_scan - time.monotonic())
+        if timeout is not None:
+            delay = min(delay, timeout)
+        if self._wake.wait(delay):
+            self._wake.clear()
+            return [], False
+        if time.monotonic() < self._next_scan:
+            return [], False
+
+        snapshot = self._scan()
+        self._next_scan = time.monotonic() + self._interval
+        previous, self._snapshot = self._snapshot, snapshot
+        events = [
+            (path, False)
+            for path, fingerprint in snapshot.items()
+            if previous.get(path) != fingerprint
+        ]
+        events.extend((path, False) for path in previous if path not in snapshot)
+        return events, False
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def close(self) -> None:
+        pass
+
+
+class VaultWatcher:
+    """
+    Applies outside changes to the note cache and the vault's indexes.
+
+    While running, the vault is marked as watched, so warm refreshes of the
+    indexes no longer walk it.
+    """
+
+    def __init__(
+        self,
+        vault_path: Path,
+        mode: str = "auto",
+        debounce: float = 0.25,
+        poll_interval: float = 2.0,
+    ):
+        """
+        Configure the watcher; call ``start`` to begin watching.
+
+        Args:
+            vault_path (Path): The vault root
+            mode (str): ``"inotify"``, ``"poll"``, or ``"auto"`` to use inotify
+                where available. Defaults to "auto".
+            debounce (float): Seconds a path must be quiet before its changes
+                are applied. Defaults to 0.25.
+            poll_interval (float): Seconds between scans of the polling
+                backend. Defaults to 2.0.
+        """
+        self.vault_path = vault_path
+        self.mode = mode
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._backend = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        # (path, is_deleted_dir) -> (first event time, last event time)
+        self._pending: dict[RawEvent, tuple[float, float]] = {}
+        self._overflow = False
+        self._recent_events: deque[tuple[float, int]] = deque()
+        self._started_at = 0.0
+        self.events_received = 0
+        self.batches_applied = 0
+        self.notes_updated = 0
+        self.folders_removed = 0
+        self.overflows = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_lag = None
+        self.max_lag = 0.0
+        self._total_lag = 0.0
+        self._lag_samples = 0
+
+    def _open_backend(self):
+        if self.mode in ("auto", "inotify"):
+            try:
+                return InotifyBackend(self.vault_path)
+            except (OSError, AttributeError):
+                # No inotify, or out of watches: fall back to polling
+                if self.mode == "inotify":
+                    raise
+        return PollingBackend(self.vault_path, self.poll_interval)
+
+    @property
+    def backend(self) -> Optional[str]:
+        return self._backend.name if self._backend is not None else None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching, after bringing the metadata index up to date."""
+        if self.running:
+            return
+        # Watch first so nothing that happens during the initial scan is lost
+        self._backend = self._open_backend()
+        get_metadata_index(self.vault_path).scan()
+        set_watched(self.vault_path, True)
+        self._started_at = time.monotonic()
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="obsidian-vault-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching; the metadata index goes back to walking the vault."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._backend.wake()
+        self._thread.join()
+        self._thread = None
+        set_watched(self.vault_path, False)
+        self._backend.close()
+        self._backend = None
+
+    def _next_timeout(self) -> Optional[float]:
+        with self._lock:
+            if not self._pending and not self._overflow:
+                return None
+            if self._overflow:
+                return 0.0
+            last = max(last for _, last in self._pending.values())
+        return max(0.0, last + self.debounce - time.monotonic())
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                events, overflow = self._backend.wait(self._next_timeout())
+                if self._stopping.is_set():
+                    break
+                self._record(events, overflow)
+                self._apply_due()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                # Don't spin if the failure is persistent
+                self._stopping.wait(self.debounce or 0.1)
+
+    def _record(self, events: list[RawEvent], overflow: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if overflow:
+                self._overflow = True
+                self.overflows += 1
+            if not events:
+                return
+            self.events_received += len(events)
+            self._recent_events.append((now, len(events)))
+            for event in events:
+                first, _ = self._pending.get(event, (now, now))
+                self._pending[event] = (first, now)
+
+    def _apply_due(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            overflow, self._overflow = self._overflow, False
+            due = [
+                (event, first)
+                for event, (first, last) in self._pending.items()
+                if overflow or now - last >= self.debounce
+            ]
+            for event, _ in due:
+                del self._pending[event]
+        if not due and not overflow:
+            return
+
+        note_cache = get_note_cache()
+        if overflow:
+            # Events were dropped: nothing short of a full re-scan is safe
+            note_cache.clear()
+
+        notes = []
+        removed_folders = []
+        for (path, deleted_dir), _ in due:
+            if deleted_dir:
+                note_cache.invalidate_tree(path)
+                removed_folders.append(path)
+            else:
+                note_cache.invalidate(path)
+                notes.append(path)
+        notify_changes(self.vault_path, notes, removed_folders, rescan=overflow)
+
+        applied = time.monotonic()
+        with self._lock:
+            self.batches_applied += 1
+            self.notes_updated += len(notes)
+            self.folders_removed += len(removed_folders)
+            for _, first in due:
+                lag = applied - first
+                self.last_lag = lag
+                self.max_lag = max(self.max_lag, lag)
+                self._total_lag += lag
+                self._lag_samples += 1
+
+    def stats(self) -> dict:
+        """Return event, lag and throughput counters."""
+        now = time.monotonic()
+        with self._lock:
+            while (
+                self._recent_events
+                and now - self._recent_events[0][0] > _RATE_WINDOW_SECONDS
+            ):
+                self._recent_events.popleft()
+            window = min(_RATE_WINDOW_SECONDS, now - self._started_at) or None
+            recent = sum(count for _, count in self._recent_events)
+            return {
+                "running": self.running,
+                "backend": self.backend,
+                "debounce_ms": round(self.debounce * 1000),
+                "events_received": self.events_received,
+                "events_per_second": round(recent / window, 3) if window else 0.0,
+                "pending": len(self._pending),
+                "batches_applied": self.batches_applied,
+                "notes_updated": self.notes_updated,
+                "folders_removed": self.folders_removed,
+                "overflows": self.overflows,
+                "last_lag_ms": (
+                    round(self.last_lag * 1000, 1)
+                    if self.last_lag is not None
+                    else None
+                ),
+                "max_lag_ms": round(self.max_lag * 1000, 1),
+                "mean_lag_ms": (
+                    round(self._total_lag / self._lag_samples * 1000, 1)
+                    if self._lag_samples
+                    else None
+                ),
+                "errors": self.errors,
+                "last_error": self.last_error,
+            }
+
+
+_watcher: Optional[VaultWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def start_watcher(vault_path: Path, mode: Optional[str] = None) -> VaultWatcher:
+    """
+    Start the process-wide vault watcher, replacing any running one.
+
+    Args:
+        vault_path (Path): The vault root
+        mode (Optional[str]): Backend to use. Defaults to the OBSIDIAN_WATCH
+            setting, with "off" meaning "auto" when called explicitly.
+
+    Returns:
+        VaultWatcher: The running watcher
+    """
+    global _watcher
+    if mode is None:
+        mode = get_watch_mode()
+        if mode == "off":
+            mode = "auto"
+    with _watcher_lock:
+        if _watcher is not None:
+            _watcher.stop()
+        watcher = VaultWatcher(
+            vault_path,
+            mode=mode,
+            debounce=get_watch_debounce_ms() / 1000,
+            poll_interval=get_watch_poll_interval_ms() / 1000,
+        )
+        watcher.start()
+        _watcher = watcher
+        return watcher
+
+
+def stop_watcher() -> None:
+    """Stop the process-wide vault watcher, if one is running."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is not None:
+            _watcher.stop()
+            _watcher = None
+
+
+def get_watcher() -> Optional[VaultWatcher]:
+    """Get the process-wide vault watcher, or None if it is not running."""
+    return _watcher
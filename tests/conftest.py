@@ -7,7 +7,26 @@ import pytest
 import tempfile
 from pathlib import Path
 from fastmcp import FastMCP, Client
-from handlers import register_note_tools
+from handlers import (
+    register_note_tools,
+    register_search_tools,
+    register_link_tools,
+)
+from search import (
+    close_duplicate_indexes,
+    close_search_indexes,
+    close_semantic_indexes,
+)
+from utils.async_io import reset_io_executor
+from utils.instrumentation import reset_tool_metrics
+from vault import (
+    close_metadata_indexes,
+    reset_link_graphs,
+    reset_name_indexes,
+    reset_note_cache,
+    reset_outline_cache,
+    stop_watcher,
+)
 
 
 @pytest.fixture
@@ -17,17 +36,49 @@ def temp_vault():
         old_vault_path = os.getenv("OBSIDIAN_VAULT_PATH")
         os.environ["OBSIDIAN_VAULT_PATH"] = temp_dir
         yield Path(temp_dir)
+        reset_io_executor()
+        stop_watcher()
+        close_metadata_indexes()
+        close_search_indexes()
+        close_semantic_indexes()
+        close_duplicate_indexes()
+        reset_link_graphs()
+        reset_name_indexes()
+        reset_note_cache()
+        reset_outline_cache()
+        reset_tool_metrics()
         if old_vault_path:
             os.environ["OBSIDIAN_VAULT_PATH"] = old_vault_path
         else:
             del os.environ["OBSIDIAN_VAULT_PATH"]
 
 
+@pytest.fixture
+def write_note(temp_vault):
+    """
+    Write a note into the temporary vault and return its path.
+
+    Keyword arguments become frontmatter fields, written as given; without
+    any the note has no frontmatter.
+    """
+
+    def write(rel_path, body="", **frontmatter):
+        path = temp_vault / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = "".join(f"{key}: {value}\n" for key, value in frontmatter.items())
+        path.write_text(f"---\n{header}---\n{body}" if frontmatter else body)
+        return path
+
+    return write
+
+
 @pytest.fixture
 def mcp_server(temp_vault):
     """Create a test instance of the FastMCP server."""
     mcp = FastMCP(name="Test Obsidian FastMCP", dependencies=["pyyaml"])
     register_note_tools(mcp)
+    register_search_tools(mcp)
+    register_link_tools(mcp)
     return mcp
 
 
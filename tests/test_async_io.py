@@ -0,0 +1,124 @@
+"""
+Tests for running the tools' file I/O off the event loop.
+"""
+
+import asyncio
+import importlib
+import time
+
+import pytest
+
+import tools.insert_wikilinks_note as insert_wikilinks_note
+from tools import insert_wikilinks_in_note, read_note
+from utils.async_io import locked_paths, reset_io_executor
+
+# tools re-exports the read_note function under the module's name
+read_note_module = importlib.import_module("tools.read_note")
+
+# Simulated latency of one read from a slow (e.g. network-mounted) vault
+READ_DELAY = 0.2
+
+
+@pytest.fixture
+def slow_vault(temp_vault, monkeypatch):
+    for number in range(8):
+        (temp_vault / f"Note {number}.md").write_text(
+            f"---\ntags: slow\n---\nBody of note {number}\n"
+        )
+    original = read_note_module.read_note_file
+
+    def slow_read(*args, **kwargs):
+        time.sleep(READ_DELAY)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(read_note_module, "read_note_file", slow_read)
+    monkeypatch.setenv("OBSIDIAN_NOTE_CACHE_BYTES", "0")
+    reset_io_executor()
+    return temp_vault
+
+
+async def _timed(*calls) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*calls)
+    return time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_parallel_reads_take_about_one_read(slow_vault, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_IO_THREADS", "8")
+
+    single = await _timed(read_note("Note 0"))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    parallel = await _timed(*(read_note(f"Note {n}") for n in range(8)))
+    ticking.cancel()
+
+    assert single >= READ_DELAY
+    assert parallel < 2 * single
+    # The event loop kept running while the reads were blocked
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_io_threads_bound_concurrency(slow_vault, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_IO_THREADS", "2")
+
+    elapsed = await _timed(*(read_note(f"Note {n}") for n in range(6)))
+
+    assert elapsed >= 3 * READ_DELAY
+
+
+@pytest.fixture
+def slow_linking(temp_vault, monkeypatch):
+    for number in range(5):
+        (temp_vault / f"Topic {number}.md").write_text(
+            "---\ntitle: Topic\n---\n\n" + " ".join(f"term{i}" for i in range(10))
+        )
+    original = insert_wikilinks_note.insert_wikilinks
+
+    def slow_insert(content, phrases):
+        time.sleep(0.05)
+        return original(content, phrases)
+
+    monkeypatch.setattr(insert_wikilinks_note, "insert_wikilinks", slow_insert)
+    monkeypatch.setenv("OBSIDIAN_IO_THREADS", "10")
+    reset_io_executor()
+    return temp_vault
+
+
+@pytest.mark.asyncio
+async def test_concurrent_edits_of_one_note_are_serialized(slow_linking):
+    await asyncio.gather(
+        *(insert_wikilinks_in_note("Topic 0", [f"term{i}"]) for i in range(10))
+    )
+
+    text = (slow_linking / "Topic 0.md").read_text()
+    # Each edit read the note after the previous one wrote it
+    assert all(f"[[term{i}]]" in text for i in range(10))
+
+
+@pytest.mark.asyncio
+async def test_edits_of_different_notes_run_in_parallel(slow_linking):
+    elapsed = await _timed(
+        *(insert_wikilinks_in_note(f"Topic {n}", ["term1"]) for n in range(5))
+    )
+
+    assert elapsed < 5 * 0.05
+    for number in range(5):
+        assert "[[term1]]" in (slow_linking / f"Topic {number}.md").read_text()
+
+
+def test_locked_paths_is_reentrant_and_cleans_up(tmp_path):
+    from utils import async_io
+
+    with locked_paths(tmp_path / "a.md", tmp_path / "b.md"):
+        with locked_paths(tmp_path / "b.md"):
+            assert len(async_io._path_locks) == 2
+    assert not async_io._path_locks
@@ -0,0 +1,79 @@
+"""
+Tests for vault-wide auto-linking.
+"""
+
+import pytest
+
+from tools import autolink_vault
+
+
+@pytest.fixture
+def vault(temp_vault, write_note):
+    write_note(
+        "Python.md", "A language. Python is great.\n", title="Python", extra="kept"
+    )
+    write_note(
+        "concepts/Machine Learning.md",
+        "Learning from data.\n",
+        title="Machine Learning",
+        aliases="ML",
+        extra="kept",
+    )
+    write_note(
+        "notes/Daily.md",
+        "Used Python for Machine Learning and ML today.\n",
+        title="Daily",
+        extra="kept",
+    )
+    return temp_vault
+
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_without_writing(vault):
+    before = (vault / "notes" / "Daily.md").read_bytes()
+
+    result = await autolink_vault(min_phrase_length=2)
+
+    assert result["dry_run"]
+    assert result["notes_scanned"] == 3
+    assert result["notes_changed"] == 1
+    assert result["links_added"] == 3
+    change = result["changes"][0]
+    assert change["path"].endswith("Daily.md")
+    assert (
+        "+Used [[Python]] for [[Machine Learning]] and [[Machine Learning|ML]] today."
+        in change["diff"]
+    )
+    assert (vault / "notes" / "Daily.md").read_bytes() == before
+    assert result["notes_per_second"] > 0
+
+
+@pytest.mark.asyncio
+async def test_apply_writes_only_changed_notes(vault):
+    python_before = (vault / "Python.md").stat().st_mtime_ns
+
+    result = await autolink_vault(dry_run=False, min_phrase_length=2)
+
+    daily = (vault / "notes" / "Daily.md").read_text()
+    assert (
+        "Used [[Python]] for [[Machine Learning]] and [[Machine Learning|ML]] today."
+        in daily
+    )
+    assert "extra: kept" in daily
+    # A note never links to itself
+    assert (vault / "Python.md").stat().st_mtime_ns == python_before
+    assert "diff" not in result["changes"][0]
+
+    again = await autolink_vault(dry_run=False, min_phrase_length=2)
+    assert again["notes_changed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_folder_limits_linked_notes_and_min_length(vault):
+    result = await autolink_vault(folder="concepts")
+    assert result["notes_scanned"] == 1
+    assert result["notes_changed"] == 0
+
+    result = await autolink_vault(folder="notes")
+    # "ML" is shorter than the default minimum phrase length
+    assert result["links_added"] == 2
@@ -0,0 +1,84 @@
+"""
+Tests for the synthetic vault generator and the benchmark result comparison.
+"""
+
+import re
+
+from benchmarks.bench_suite import compare_results, summarize
+from benchmarks.synthetic_vault import generate_vault, note_title
+from utils.frontmatter import parse_frontmatter, split_frontmatter
+
+
+def test_generate_vault_is_deterministic(tmp_path):
+    options = dict(
+        folder_depth=3,
+        body_distribution="lognormal",
+        frontmatter="mixed",
+        link_density=5,
+    )
+    first = generate_vault(tmp_path / "a", 40, seed=7, **options)
+    second = generate_vault(tmp_path / "b", 40, seed=7, **options)
+
+    assert [path.relative_to(tmp_path / "a") for path in first] == [
+        path.relative_to(tmp_path / "b") for path in second
+    ]
+    assert [path.read_bytes() for path in first] == [
+        path.read_bytes() for path in second
+    ]
+
+
+def test_generate_vault_options(tmp_path):
+    vault_path = tmp_path / "vault"
+    paths = generate_vault(
+        vault_path,
+        60,
+        body_bytes=1000,
+        folder_count=3,
+        folder_depth=3,
+        body_distribution="pareto",
+        frontmatter="mixed",
+        link_density=10,
+    )
+
+    assert all(len(path.relative_to(vault_path).parts) == 4 for path in paths)
+    assert len({path.parent for path in paths}) > 3
+    assert len({path.stat().st_size for path in paths}) > 10
+
+    titles = {note_title(number) for number in range(60)}
+    links = []
+    without_frontmatter = 0
+    for path in paths:
+        text = path.read_text(encoding="utf-8")
+        links += re.findall(r"\[\[([^\]]+)\]\]", text)
+        if not text.startswith("---\n"):
+            without_frontmatter += 1
+        else:
+            header = split_frontmatter(path.read_bytes()).text
+            assert isinstance(parse_frontmatter(header), dict)
+    assert links and set(links) <= titles
+    assert without_frontmatter == 15
+
+
+def _results(**timings):
+    return {
+        "results": [
+            summarize(name, 1000, [value / 1000]) for name, value in timings.items()
+        ]
+    }
+
+
+def test_compare_results_flags_regressions():
+    baseline = _results(read_note=1.0, update_note=4.0, create_note=0.01)
+    current = _results(
+        read_note=1.1, update_note=6.0, create_note=0.05, new_benchmark=1.0
+    )
+
+    comparison = {entry["name"]: entry for entry in compare_results(baseline, current)}
+
+    assert set(comparison) == {"read_note", "update_note", "create_note"}
+    assert not comparison["read_note"]["regression"]
+    assert comparison["update_note"]["regression"]
+    assert comparison["update_note"]["ratio"] == 1.5
+    # Five times slower, but within timer noise
+    assert not comparison["create_note"]["regression"]
+    assert not compare_results(baseline, current, threshold=1.0)[1]["regression"]
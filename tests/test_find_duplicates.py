@@ -0,0 +1,192 @@
+"""
+Tests for MinHash signatures, LSH bucketing and the find_duplicates tool.
+"""
+
+import json
+import random
+import shutil
+
+import numpy as np
+import pytest
+
+from models import ObsidianNote
+from search.duplicates import (
+    DuplicateIndex,
+    lsh_bands,
+    minhash_signatures,
+    shingle_hashes,
+    similar_pairs,
+)
+from tools import find_duplicates, update_note
+
+rng = random.Random(0)
+VOCABULARY = [f"word{number}" for number in range(2000)]
+PAPER = " ".join(rng.choice(VOCABULARY) for _ in range(300))
+MEETING = " ".join(rng.choice(VOCABULARY) for _ in range(200))
+OTHER = " ".join(rng.choice(VOCABULARY) for _ in range(200))
+
+
+def reworded(text, count):
+    """Replace ``count`` words spread over the text."""
+    words = text.split()
+    for position in range(0, len(words), len(words) // count)[:count]:
+        words[position] = "changed"
+    return " ".join(words)
+
+
+@pytest.fixture
+def vault(temp_vault, write_note):
+    write_note("papers/Attention.md", PAPER)
+    write_note("imports/Attention (1).md", PAPER, source="import")
+    write_note("imports/Attention (2).md", reworded(PAPER, 3))
+    write_note("meetings/Standup.md", MEETING)
+    write_note("meetings/Standup copy.md", reworded(MEETING, 2))
+    write_note("Other.md", OTHER)
+    write_note("Stub.md", "TODO")
+    write_note("Stub 2.md", "TODO")
+    return temp_vault
+
+
+class TestMinHash:
+    def test_signatures_estimate_jaccard(self):
+        first = shingle_hashes(PAPER)
+        second = shingle_hashes(reworded(PAPER, 10))
+        jaccard = len(np.intersect1d(first, second)) / len(np.union1d(first, second))
+        signatures = minhash_signatures([first, second, shingle_hashes(OTHER)])
+        assert signatures.shape == (3, 128) and signatures.dtype == np.uint32
+        assert abs(np.mean(signatures[0] == signatures[1]) - jaccard) < 0.1
+        assert np.mean(signatures[0] == signatures[2]) < 0.05
+
+    def test_shingles_ignore_case_and_punctuation(self):
+        assert np.array_equal(
+            shingle_hashes("One two, three four five six."),
+            shingle_hashes("one TWO three four five six"),
+        )
+        assert len(shingle_hashes("one two")) == 1
+        assert len(shingle_hashes("  ")) == 0
+
+    def test_bands_follow_the_threshold(self):
+        for threshold in (0.5, 0.8, 0.95):
+            bands, rows = lsh_bands(threshold)
+            assert bands * rows <= 128
+
+            def collision(similarity):
+                return 1 - (1 - similarity**rows) ** bands
+
+            # Duplicates are almost always compared, dissimilar notes rarely
+            assert collision(threshold) > 0.9
+            assert collision(threshold - 0.3) < 0.2
+
+    def test_similar_pairs_match_all_pairs(self):
+        texts = [
+            " ".join(rng.choice(VOCABULARY) for _ in range(100)) for _ in range(60)
+        ]
+        texts += [reworded(text, 2) for text in texts[:10]] + [texts[0]]
+        signatures = minhash_signatures([shingle_hashes(text) for text in texts])
+        similarity = {
+            (left, right): np.mean(signatures[left] == signatures[right])
+            for left in range(len(texts))
+            for right in range(left + 1, len(texts))
+        }
+        found = {(left, right) for left, right, _ in similar_pairs(signatures, 0.7)}
+        expected = {pair for pair, score in similarity.items() if score >= 0.7}
+        # Text 70 is a copy of text 0, so it is only paired with text 0
+        assert found == expected - {(60, 70)}
+        assert {(number, number + 60) for number in range(1, 10)} | {
+            (0, 60),
+            (0, 70),
+        } <= found
+
+
+class TestDuplicateIndex:
+    def test_clusters_and_cached_signatures(self, vault, tmp_path):
+        index = DuplicateIndex(vault, tmp_path / "duplicates.sqlite")
+        index.refresh()
+        clusters = index.find(0.8, min_words=20)
+        assert [[rel_path for rel_path, _ in cluster] for cluster in clusters] == [
+            [
+                "imports/Attention (1).md",
+                "imports/Attention (2).md",
+                "papers/Attention.md",
+            ],
+            ["meetings/Standup copy.md", "meetings/Standup.md"],
+        ]
+        # Frontmatter is not part of the body, so the import is an exact copy
+        assert clusters[0][2][1] == 1.0
+        assert index.find(0.8, folder="meetings", min_words=20) == clusters[1:]
+        assert ["Stub 2.md", "Stub.md"] in [
+            [rel_path for rel_path, _ in cluster] for cluster in index.find(0.8)
+        ]
+        assert index.stats() == {"notes": 8, "signatures": 6}
+        index.close()
+
+        # Signatures are reused after a restart and shared between copies
+        reopened = DuplicateIndex(vault, tmp_path / "duplicates.sqlite")
+        assert reopened.stats() == {"notes": 8, "signatures": 6}
+        (vault / "Other.md").write_text(PAPER)
+        (vault / "imports" / "Attention (2).md").unlink()
+        reopened.refresh()
+        assert reopened.stats() == {"notes": 7, "signatures": 4}
+        assert [rel_path for rel_path, _ in reopened.find(0.8, min_words=20)[0]] == [
+            "Other.md",
+            "imports/Attention (1).md",
+            "papers/Attention.md",
+        ]
+        reopened.close()
+
+    def test_reported_changes_wait_for_refresh(self, vault, tmp_path):
+        index = DuplicateIndex(vault, tmp_path / "duplicates.sqlite")
+        index.refresh()
+        (vault / "Other.md").write_text(MEETING)
+        shutil.rmtree(vault / "imports")
+        index.record_changes([vault / "Other.md"])
+        index.forget_folder("imports")
+        assert index.stats() == {"notes": 8, "signatures": 6}
+
+        index.refresh()
+        assert index.stats() == {"notes": 6, "signatures": 4}
+        assert [rel_path for rel_path, _ in index.find(0.8, min_words=20)[0]] == [
+            "Other.md",
+            "meetings/Standup copy.md",
+            "meetings/Standup.md",
+        ]
+        index.close()
+
+
+async def test_find_duplicates_follows_writes(vault):
+    result = await find_duplicates()
+    assert result["clusters_found"] == 2
+    assert result["duplicate_notes"] == 5
+    assert result["refresh_ms"] >= 0 and result["elapsed_ms"] >= 0
+    first = result["clusters"][0]
+    assert first["size"] == 3
+    assert first["notes"][0] == {
+        "title": "Attention (1)",
+        "folder": "imports",
+        "path": str(vault / "imports" / "Attention (1).md"),
+        "similarity": 1.0,
+    }
+
+    await update_note(
+        ObsidianNote(title="Standup copy", folder="meetings", content=OTHER)
+    )
+    result = await find_duplicates()
+    assert [
+        [note["title"] for note in cluster["notes"]] for cluster in result["clusters"]
+    ] == [["Attention (1)", "Attention (2)", "Attention"], ["Other", "Standup copy"]]
+    result = await find_duplicates(max_clusters=1)
+    assert result["clusters_found"] == 2 and len(result["clusters"]) == 1
+
+    with pytest.raises(Exception, match="threshold must be"):
+        await find_duplicates(threshold=0)
+
+
+async def test_find_duplicates_tool(mcp_client, vault):
+    result = await mcp_client.call_tool(
+        "find_duplicates_tool", {"folder": "meetings", "threshold": 0.7}
+    )
+    data = json.loads(result[0].text)
+    assert [note["title"] for note in data["clusters"][0]["notes"]] == [
+        "Standup copy",
+        "Standup",
+    ]
@@ -0,0 +1,95 @@
+"""
+Tests for the trigram index and typo-tolerant note lookups.
+"""
+
+import json
+
+import pytest
+
+from models import ObsidianNote
+from tools import create_note, find_note, read_note
+from utils.trigrams import TrigramIndex, trigrams
+
+
+@pytest.fixture
+def vault(temp_vault, write_note):
+    write_note("ml/Transformer architecture.md", "Attention.")
+    write_note("ml/Transfer learning.md", "Fine-tuning.")
+    write_note("people/Ada.md", "Ada.", aliases="[Countess of Lovelace]")
+    write_note("Recipes.md", "Soup.")
+    return temp_vault
+
+
+class TestTrigramIndex:
+    def test_trigrams_are_padded(self):
+        assert trigrams("ab") == {"  a", " ab", "ab "}
+        assert trigrams("  ") == set()
+
+    def test_ranks_by_similarity(self):
+        index = TrigramIndex()
+        for text in ("transformer architecture", "transfer learning", "recipes"):
+            index.add(text)
+        results = index.search("transfomer architecture")
+        assert results[0][0] == "transformer architecture"
+        assert 0.5 < results[0][1] < 1
+        assert [text for text, _ in index.search("transfer", min_score=0.2)] == [
+            "transfer learning",
+            "transformer architecture",
+        ]
+        assert index.search("transformer architecture")[0][1] == 1.0
+
+    def test_discarded_strings_are_not_found(self):
+        index = TrigramIndex()
+        for number in range(2000):
+            index.add(f"note {number}")
+        for number in range(1500):
+            index.discard(f"note {number}")
+        assert len(index) == 500
+        assert all(int(text.split()[1]) >= 1500 for text, _ in index.search("note 10"))
+        assert index.search("note 1999")[0] == ("note 1999", 1.0)
+
+
+async def test_find_note_ranks_candidates(vault):
+    result = await find_note("Transfomer architecure")
+    best = result["results"][0]
+    assert (best["title"], best["folder"]) == ("Transformer architecture", "ml")
+    assert best["path"] == str(vault / "ml" / "Transformer architecture.md")
+    assert best["score"] > 0.5
+
+    result = await find_note("countess of lovelase")
+    assert result["results"][0]["title"] == "Ada"
+    assert result["results"][0]["matched"] == "countess of lovelace"
+
+    result = await find_note("transformer", folder="people")
+    assert result["results"] == []
+
+    with pytest.raises(Exception, match="limit must be"):
+        await find_note("x", limit=0)
+
+
+async def test_find_note_follows_writes(vault):
+    await create_note(ObsidianNote(title="Tranformers film", content="Robots."))
+    result = await find_note("transformers film")
+    assert result["results"][0]["title"] == "Tranformers film"
+
+
+async def test_read_note_suggests_close_titles(vault):
+    with pytest.raises(Exception) as error:
+        await read_note("Transfomer architecture")
+    message = str(error.value)
+    assert "Note not found" in message
+    assert 'Did you mean: "Transformer architecture" in folder "ml"' in message
+
+    with pytest.raises(Exception) as error:
+        await read_note("Transfomer architecture", suggest=False)
+    assert "Did you mean" not in str(error.value)
+
+    with pytest.raises(Exception) as error:
+        await read_note("Zzzz")
+    assert "Did you mean" not in str(error.value)
+
+
+async def test_find_note_tool(mcp_client, vault):
+    result = await mcp_client.call_tool("find_note_tool", {"query": "recipies"})
+    data = json.loads(result[0].text)
+    assert data["results"][0]["title"] == "Recipes"
@@ -0,0 +1,60 @@
+"""
+Tests for the streaming frontmatter reader.
+"""
+
+import pytest
+
+from utils.frontmatter import read_frontmatter, read_note_file
+
+NOTE = "---\ntitle: Example\ntags: a, b\n---\n\nBody text\n"
+
+
+def test_reads_header_and_body_offset(tmp_path):
+    path = tmp_path / "note.md"
+    path.write_bytes(NOTE.encode("utf-8"))
+
+    block = read_frontmatter(path)
+
+    assert block.text == "title: Example\ntags: a, b\n"
+    assert path.read_bytes()[block.body_offset :] == b"\nBody text\n"
+
+
+def test_note_without_frontmatter(tmp_path):
+    path = tmp_path / "note.md"
+    path.write_text("Just a body\n---\nwith a rule\n")
+
+    assert read_frontmatter(path) == (None, 0)
+    assert read_note_file(path) == (None, "Just a body\n---\nwith a rule\n")
+
+
+def test_unterminated_header_is_treated_as_body(tmp_path):
+    path = tmp_path / "note.md"
+    path.write_text("---\ntitle: Broken\n")
+
+    assert read_frontmatter(path).text is None
+
+
+def test_read_note_file_returns_body(tmp_path):
+    path = tmp_path / "note.md"
+    path.write_bytes(NOTE.encode("utf-8"))
+
+    assert read_note_file(path) == ("title: Example\ntags: a, b\n", "\nBody text\n")
+
+
+def test_crlf_line_endings_are_normalized(tmp_path):
+    path = tmp_path / "note.md"
+    path.write_bytes(NOTE.replace("\n", "\r\n").encode("utf-8"))
+
+    assert read_note_file(path) == ("title: Example\ntags: a, b\n", "\nBody text\n")
+
+
+def test_header_size_limit(tmp_path, monkeypatch):
+    path = tmp_path / "note.md"
+    path.write_text("---\n" + "summary: " + "x" * 500 + "\n---\nbody\n")
+
+    with pytest.raises(ValueError):
+        read_frontmatter(path, max_header_bytes=100)
+
+    monkeypatch.setenv("OBSIDIAN_MAX_FRONTMATTER_BYTES", "100")
+    with pytest.raises(ValueError):
+        read_frontmatter(path)
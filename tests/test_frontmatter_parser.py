@@ -0,0 +1,153 @@
+"""
+Differential tests for the fast-path frontmatter parser against yaml.safe_load.
+"""
+
+import random
+
+import pytest
+import yaml
+
+from utils.frontmatter import YamlSafeLoader, _NotFlat, _parse_flat, parse_frontmatter
+
+KEYS = [
+    "title",
+    "created",
+    "modified",
+    "tags",
+    "aliases",
+    "related",
+    "category",
+    "type",
+    "summary",
+    "cssclass",
+    "my-key",
+    "_private",
+    "yes",
+    "null",
+    "123",
+    "two words",
+]
+
+SEPARATORS = [": ", ":", ":  ", " : ", ":\t"]
+
+VALUES = [
+    "",
+    " ",
+    "Plain title",
+    "2024-01-01",
+    "2024-01-01T10:00:00.123456",
+    "2024-01-01 10:00:00 +02:00",
+    "2024-13-45",
+    "yes",
+    "No",
+    "on",
+    "~",
+    "null",
+    "12",
+    "1_000",
+    "0x1f",
+    "3.5",
+    ".inf",
+    "-5",
+    "-x",
+    "- x",
+    "?x",
+    ":x",
+    "a, b, c",
+    "C# rocks",
+    "note # one of note, paper, concept, etc.",
+    "a: b",
+    "trailing:",
+    "http://example.com/a#frag",
+    "'quoted'",
+    '"double quoted"',
+    "it's",
+    "[x, y]",
+    "{a: 1}",
+    "&anchor",
+    "*alias",
+    "!!str 5",
+    "|",
+    ">",
+    "%x",
+    "@x",
+    "`x`",
+    "=",
+    "ümlaut ✓",
+    "a\tb",
+    "back\\slash",
+    "semi; colon",
+]
+
+EXTRA_LINES = ["", "# comment", "  continued", "- item", "---", "...", "   "]
+
+
+def random_header(rng):
+    lines = []
+    for _ in range(rng.randint(0, 10)):
+        if rng.random() < 0.1:
+            lines.append(rng.choice(EXTRA_LINES))
+        else:
+            key = rng.choice(KEYS)
+            value = rng.choice(VALUES)
+            separator = rng.choice(SEPARATORS) if rng.random() < 0.2 else ": "
+            lines.append(f"{key}{separator}{value}")
+    return "\n".join(lines)
+
+
+def outcome(parse, text):
+    try:
+        return "ok", parse(text)
+    except (yaml.YAMLError, ValueError) as e:
+        return "error", (
+            type(e).__mro__[1] if isinstance(e, yaml.YAMLError) else ValueError
+        )
+
+
+def load_with_fallback_loader(text):
+    return yaml.load(text, Loader=YamlSafeLoader)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_yaml_loader_on_fuzzed_headers(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        text = random_header(rng).strip()
+        expected = outcome(load_with_fallback_loader, text)
+        actual = outcome(parse_frontmatter, text)
+        assert actual[0] == expected[0], text
+        if expected[0] == "ok":
+            assert actual == expected, text
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fast_path_matches_pure_python_safe_load(seed):
+    # libyaml accepts a few inputs the pure-Python loader rejects (e.g. tabs
+    # inside plain scalars); the fast path must agree with safe_load itself.
+    rng = random.Random(seed)
+    for _ in range(500):
+        text = random_header(rng).strip()
+        try:
+            fast = outcome(_parse_flat, text)
+        except _NotFlat:
+            continue
+        assert fast == outcome(yaml.safe_load, text), text
+
+
+def test_server_written_header():
+    text = """title: Example
+created: 2025-06-25T10:00:00.123456
+modified: 2025-06-26T11:30:00.000001
+tags: python, machine learning
+aliases:
+related: Other Note, Third
+category: research
+type: paper # one of note, paper, concept, etc.
+summary: A short summary, with a comma"""
+
+    assert parse_frontmatter(text) == yaml.safe_load(text)
+
+
+def test_empty_header():
+    assert parse_frontmatter("") is None
+    assert parse_frontmatter("# only a comment") is None
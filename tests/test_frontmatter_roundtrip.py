@@ -0,0 +1,147 @@
+"""
+Round-trip tests for the ordered frontmatter model and update_note.
+
+The corpus mimics headers written by Obsidian itself, Dataview, Templater,
+Zotero imports and this server.
+"""
+
+import pytest
+import yaml
+
+from tools import read_note, update_note
+from utils.frontmatter import Frontmatter
+
+HEADERS = {
+    "server": (
+        "title: Paper\ncreated: 2024-01-02T03:04:05\nmodified: 2024-01-02T03:04:05\n"
+        "tags: ml, nlp\naliases: \nrelated: \ncategory: \n"
+        "type: paper # one of note, paper, concept, etc.\nsummary: A paper\n"
+    ),
+    "obsidian properties": (
+        "tags:\n  - project\n  - active\naliases:\n  - Big Plan\n"
+        "cssclasses:\n  - wide\npublish: true\n"
+    ),
+    "dataview": (
+        "status: in-progress\ndue: 2024-05-01\npriority: 2\n"
+        'rating: 4.5\nproject: "[[Big Plan]]"\n'
+        'people: ["[[Ada]]", "[[Grace]]"]\n'
+    ),
+    "flow lists and comments": (
+        "# Managed by a plugin, do not edit\n"
+        "tags: [reading, books]   # flow style\n"
+        "\n"
+        "author: Someone\n"
+    ),
+    "nested maps": (
+        "zotero:\n  key: ABCD1234\n  collections:\n    - Thesis\n"
+        "  added: 2023-11-11\ncitekey: doe2023\n"
+    ),
+    "block scalars": (
+        "abstract: |\n  First paragraph.\n\n  Second paragraph.\n"
+        "notes: >-\n  folded\n  text\nsource: web\n"
+    ),
+    "quoting and unicode": (
+        "title: 'Colons: and #hashes'\n\"quoted key\": value\n"
+        "city: Zürich\nemoji: 🚀\nempty:\nnull_value: null\n"
+    ),
+    "list items at column zero": "tags:\n- one\n- two\nkind: x\n",
+    "templater": (
+        "created: <% tp.file.creation_date() %>\n"
+        "template: daily\n"
+        'week: "[[2024-W01]]"\n'
+    ),
+}
+
+CORPUS = [
+    pytest.param(f"---\n{header}---\n\nBody\n".encode("utf-8"), id=name)
+    for name, header in HEADERS.items()
+] + [
+    pytest.param(b"---\r\ntitle: Windows\r\ntags: a, b\r\n---\r\nBody\r\n", id="crlf"),
+    pytest.param(b"---\ntitle: No newline\n---", id="no body"),
+    pytest.param(b"Just a body\n", id="no frontmatter"),
+]
+
+
+@pytest.mark.parametrize("data", CORPUS)
+def test_unchanged_header_round_trips(data):
+    frontmatter = Frontmatter.parse(data)
+    assert frontmatter.render() + data[frontmatter.body_offset :] == data
+
+
+@pytest.mark.parametrize("data", CORPUS)
+def test_setting_one_key_keeps_every_other_line(data):
+    frontmatter = Frontmatter.parse(data)
+    before = dict(frontmatter.values)
+    frontmatter.set("reviewed", "done")
+
+    rendered = frontmatter.render()
+    after = yaml.safe_load(rendered.split(b"---")[1])
+    assert after == {**before, "reviewed": "done"}
+    original_lines = data[: frontmatter.body_offset].splitlines()
+    kept = [line for line in rendered.splitlines() if line in original_lines]
+    assert kept == original_lines
+
+
+@pytest.mark.parametrize("data", CORPUS)
+def test_replacing_and_removing_keys(data):
+    frontmatter = Frontmatter.parse(data)
+    keys = list(frontmatter.values)
+    if not keys:
+        pytest.skip("header has no keys")
+    frontmatter.set(keys[0], "changed")
+    if len(keys) > 1:
+        frontmatter.set(keys[-1], None)
+
+    parsed = yaml.safe_load(frontmatter.render().split(b"---")[1])
+    expected = dict(Frontmatter.parse(data).values)
+    expected[keys[0]] = "changed"
+    if len(keys) > 1:
+        del expected[keys[-1]]
+    assert parsed == expected
+
+
+def test_list_style_is_kept():
+    data = b"---\ntags:\n  - a\nflow: [x, y]\nplain: p, q\n---\n"
+    frontmatter = Frontmatter.parse(data)
+    frontmatter.update({"tags": ["a", "b"], "flow": ["x", "y, z"], "plain": ["r"]})
+    assert frontmatter.render() == (
+        b'---\ntags:\n  - a\n  - b\nflow: [x, "y, z"]\nplain: r\n---\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_note_preserves_unknown_keys(temp_vault):
+    header = HEADERS["obsidian properties"] + HEADERS["dataview"]
+    path = temp_vault / "Plan.md"
+    path.write_text(f"---\n{header}---\nOld body\n")
+
+    note = await read_note("Plan")
+    assert note.tags == ["project", "active"]
+    note.content = "New body"
+    note.tags.append("urgent")
+    await update_note(note)
+
+    text = path.read_text()
+    assert text.endswith("---\n\nNew body\n")
+    assert "tags:\n  - project\n  - active\n  - urgent\n" in text
+    for line in header.splitlines()[3:]:
+        assert line + "\n" in text
+    assert "modified: " in text and "created: " in text
+    # Unchanged schema fields are not added to the header
+    assert "related" not in text and "summary" not in text
+
+
+@pytest.mark.asyncio
+async def test_update_note_only_touches_modified(temp_vault):
+    header = HEADERS["server"]
+    path = temp_vault / "Paper.md"
+    path.write_text(f"---\n{header}---\n\nBody\n")
+
+    await update_note(await read_note("Paper"))
+
+    changed = [
+        (old, new)
+        for old, new in zip(header.splitlines(), path.read_text().splitlines()[1:])
+        if old != new
+    ]
+    assert [old.split(":")[0] for old, _ in changed] == ["modified"]
@@ -0,0 +1,113 @@
+"""
+Tests for the per-tool latency and I/O metrics.
+"""
+
+import json
+import pstats
+import threading
+
+import pytest
+
+
+async def _stats(mcp_client) -> dict:
+    contents = await mcp_client.read_resource("obsidian://stats")
+    return json.loads(contents[0].text)
+
+
+def _note(number: int) -> dict:
+    return {
+        "title": f"Note {number}",
+        "folder": "metrics",
+        "content": f"# Heading\n\nBody of note {number}.\n",
+    }
+
+
+@pytest.mark.asyncio
+async def test_counts_calls_errors_and_io(mcp_client):
+    for number in range(3):
+        await mcp_client.call_tool("create_note_tool", {"note": _note(number)})
+    await mcp_client.call_tool(
+        "read_note_section_tool",
+        {"title": "Note 1", "folder": "metrics", "heading": "Heading"},
+    )
+    with pytest.raises(Exception):
+        await mcp_client.call_tool("read_note_tool", {"title": "Missing"})
+
+    stats = await _stats(mcp_client)
+    create = stats["tools"]["create_note_tool"]
+    assert create["calls"] == 3
+    assert create["errors"] == 0
+    assert create["files_written"] == 3
+    assert create["bytes_written"] > 3 * len("Body of note 0.")
+    assert 0 < create["p50_ms"] <= create["p95_ms"] <= create["p99_ms"]
+
+    section = stats["tools"]["read_note_section_tool"]
+    assert section["files_read"] == 1
+    assert section["bytes_read"] > 0
+    assert section["bytes_written"] == 0
+
+    assert stats["tools"]["read_note_tool"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_counts_reads_on_worker_threads(mcp_client, temp_vault, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_SCAN_THREADS", "4")
+    folder = temp_vault / "batch"
+    folder.mkdir()
+    for number in range(8):
+        (folder / f"Note {number}.md").write_text(f"Body {number}\n")
+
+    await mcp_client.call_tool(
+        "read_notes_batch_tool", {"folder": "batch", "pattern": "*.md"}
+    )
+
+    batch = (await _stats(mcp_client))["tools"]["read_notes_batch_tool"]
+    assert batch["files_read"] == 8
+    assert batch["bytes_read"] == sum(len(f"Body {n}\n") for n in range(8))
+
+
+@pytest.mark.asyncio
+async def test_dumps_prometheus_metrics(mcp_client, tmp_path, monkeypatch):
+    metrics_file = tmp_path / "metrics" / "obsidian.prom"
+    monkeypatch.setenv("OBSIDIAN_METRICS_FILE", str(metrics_file))
+    monkeypatch.setenv("OBSIDIAN_METRICS_INTERVAL_MS", "0")
+
+    await mcp_client.call_tool("create_note_tool", {"note": _note(0)})
+
+    text = metrics_file.read_text()
+    assert "# TYPE obsidian_tool_latency_seconds histogram" in text
+    assert 'obsidian_tool_calls_total{tool="create_note_tool"} 1' in text
+    assert (
+        'obsidian_tool_latency_seconds_bucket{tool="create_note_tool",le="+Inf"} 1'
+        in text
+    )
+    assert 'obsidian_tool_files_written_total{tool="create_note_tool"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_keeps_profiles_of_slow_calls(mcp_client, monkeypatch):
+    monkeypatch.setenv("OBSIDIAN_PROFILE_SLOW_MS", "1")
+
+    done = threading.Event()
+
+    def unrelated_work():
+        while not done.is_set():
+            sum(range(1000))
+
+    # A thread that is busy while the call runs must not show up in its profile
+    thread = threading.Thread(target=unrelated_work)
+    thread.start()
+    try:
+        writes = [{"action": "create", "note": _note(number)} for number in range(40)]
+        await mcp_client.call_tool("write_notes_batch_tool", {"writes": writes})
+    finally:
+        done.set()
+        thread.join()
+
+    profiles = (await _stats(mcp_client))["slow_call_profiles"]
+    assert [profile["tool"] for profile in profiles] == ["write_notes_batch_tool"]
+    functions = pstats.Stats(profiles[0]["path"]).stats
+    assert any(
+        filename.endswith("write_notes_batch.py") for filename, _, _ in functions
+    )
+    assert not any(name == "unrelated_work" for _, _, name in functions)
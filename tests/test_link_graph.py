@@ -0,0 +1,231 @@
+"""
+Tests for the link graph and the link tools.
+"""
+
+import json
+
+import pytest
+
+from models import ObsidianNote
+from tools import (
+    create_note,
+    find_backlinks,
+    find_orphan_notes,
+    find_unresolved_links,
+    get_note_neighborhood,
+    get_outgoing_links,
+)
+from vault.link_graph import LinkGraph, extract_links, get_link_graph
+
+
+@pytest.fixture
+def vault(temp_vault, write_note):
+    write_note("Hub.md", "See [[Alpha]], [[beta]] and ![[Alpha]].", aliases="Center")
+    write_note("notes/Alpha.md", "Back to [[Hub]]. Also [[Nowhere]].")
+    write_note("notes/deep/Beta.md", "Mentions [[center|the hub]].")
+    write_note("Loner.md", "No links, only `[[in code]]`.")
+    write_note("Leaf.md", "Links out to [[Hub#Section]] only.")
+    return temp_vault
+
+
+@pytest.fixture
+def graph(vault):
+    graph = LinkGraph(vault)
+    graph.refresh()
+    return graph
+
+
+def paths(results):
+    return [result["path"] for result in results]
+
+
+class TestExtractLinks:
+    def test_wikilink_forms(self):
+        body = "[[A]] [[B#h]] [[C^block]] [[D|label]] ![[E]] [[img.png]] [[#local]]"
+        assert [(key, embed) for key, _, embed in extract_links(body, "n.md")] == [
+            ("a", False),
+            ("b", False),
+            ("c", False),
+            ("d", False),
+            ("e", True),
+        ]
+
+    def test_code_is_ignored(self):
+        body = "`[[inline]]`\n```\n[[fenced]]\n```\n[[real]]"
+        assert [key for key, _, _ in extract_links(body, "n.md")] == ["real"]
+
+    def test_markdown_links_are_relative_to_the_note(self):
+        body = "[a](Other.md) [b](../Top%20Note.md#x) [c](https://x.org/y.md)"
+        assert [key for key, _, _ in extract_links(body, "dir/n.md")] == [
+            "dir/other",
+            "top note",
+        ]
+
+
+class TestLinkGraph:
+    def test_backlinks_resolve_names_paths_and_aliases(self, graph):
+        assert graph.backlinks("Hub.md") == [
+            {"path": "Leaf.md", "links": 1, "embeds": 0},
+            {"path": "notes/Alpha.md", "links": 1, "embeds": 0},
+            {"path": "notes/deep/Beta.md", "links": 1, "embeds": 0},
+        ]
+        assert graph.backlinks("notes/Alpha.md") == [
+            {"path": "Hub.md", "links": 1, "embeds": 1}
+        ]
+
+    def test_outgoing_links(self, graph):
+        assert graph.outgoing("Hub.md") == [
+            {"target": "Alpha", "path": "notes/Alpha.md", "embed": False},
+            {"target": "beta", "path": "notes/deep/Beta.md", "embed": False},
+            {"target": "Alpha", "path": "notes/Alpha.md", "embed": True},
+        ]
+
+    def test_orphans_and_unresolved(self, graph):
+        assert graph.orphans() == ["Leaf.md", "Loner.md"]
+        assert graph.orphans(include_linking=False) == ["Loner.md"]
+        assert graph.unresolved() == [
+            {"target": "Nowhere", "sources": ["notes/Alpha.md"]}
+        ]
+
+    def test_shortest_path_wins_for_duplicate_names(self, vault, graph, write_note):
+        write_note("z/Alpha.md", "Another alpha")
+        write_note("Alpha.md", "Top-level alpha")
+        graph.refresh()
+        assert graph.resolve("alpha") == "Alpha.md"
+        assert graph.resolve("z/alpha") == "z/Alpha.md"
+        assert graph.resolve("notes/alpha") == "notes/Alpha.md"
+
+    def test_paths_differing_only_by_case(self, vault, graph, write_note):
+        write_note("hub.md", "Lower-case hub")
+        graph.refresh()
+        assert graph.resolve("HUB") == "Hub.md"
+        assert "hub.md" in graph
+
+        (vault / "Hub.md").unlink()
+        graph.refresh()
+        assert graph.resolve("hub") == "hub.md"
+        assert paths(graph.backlinks("hub.md")) == ["Leaf.md", "notes/Alpha.md"]
+
+        (vault / "hub.md").unlink()
+        graph.refresh()
+        assert graph.resolve("hub") is None
+        assert "Hub.md" not in graph and "hub.md" not in graph
+
+    def test_incremental_updates(self, vault, graph, write_note):
+        write_note("Nowhere.md", "Now it exists")
+        graph.record_changes([vault / "Nowhere.md"])
+        assert graph.unresolved() == []
+        assert paths(graph.backlinks("Nowhere.md")) == ["notes/Alpha.md"]
+
+        (vault / "notes" / "Alpha.md").unlink()
+        graph.record_changes([vault / "notes" / "Alpha.md"])
+        assert graph.outgoing("Hub.md")[0]["path"] is None
+        assert graph.orphans(include_linking=False) == ["Loner.md", "Nowhere.md"]
+
+    def test_alias_changes_re_resolve_links(self, vault, graph, write_note):
+        write_note("Hub.md", "See [[Alpha]], [[beta]] and ![[Alpha]].")
+        graph.record_changes([vault / "Hub.md"])
+        assert paths(graph.backlinks("Hub.md")) == ["Leaf.md", "notes/Alpha.md"]
+        assert {
+            "target": "center",
+            "sources": ["notes/deep/Beta.md"],
+        } in graph.unresolved()
+
+        write_note("Loner.md", "Renamed hub", aliases="Center")
+        graph.record_changes([vault / "Loner.md"])
+        assert paths(graph.backlinks("Loner.md")) == ["notes/deep/Beta.md"]
+
+    def test_recent_walk_is_trusted_for_max_age(self, vault, graph, write_note):
+        write_note("Nowhere.md", "Written outside the server")
+        graph.refresh(max_age=60)
+        assert "Nowhere.md" not in graph
+        graph.refresh()
+        assert "Nowhere.md" in graph
+
+        (vault / "Nowhere.md").unlink()
+        graph.mark_stale()
+        graph.refresh(max_age=60)
+        assert "Nowhere.md" not in graph
+
+    def test_forget_folder(self, graph):
+        graph.forget_folder("notes")
+        assert "notes/Alpha.md" not in graph
+        assert paths(graph.backlinks("Hub.md")) == ["Leaf.md"]
+
+    def test_neighborhood(self, graph):
+        result = graph.neighborhood("Leaf.md", depth=2, direction="out")
+        assert [(node["path"], node["distance"]) for node in result["nodes"]] == [
+            ("Leaf.md", 0),
+            ("Hub.md", 1),
+            ("notes/Alpha.md", 2),
+            ("notes/deep/Beta.md", 2),
+        ]
+        assert [0, 1] in result["edges"]
+        assert [2, 1] in result["edges"]
+
+        truncated = graph.neighborhood("Hub.md", depth=2, max_nodes=2)
+        assert truncated["truncated"] is True
+        assert len(truncated["nodes"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_tools_resolve_titles_like_wikilinks(vault):
+    result = await find_backlinks("Alpha")
+    assert result["path"] == str(vault / "notes" / "Alpha.md")
+    assert result["backlinks"][0]["path"] == str(vault / "Hub.md")
+
+    outgoing = await get_outgoing_links("Beta", "notes/deep")
+    assert outgoing["links"][0]["path"] == str(vault / "Hub.md")
+
+    with pytest.raises(Exception, match="Note not found"):
+        await find_backlinks("Alpha", "elsewhere")
+
+
+@pytest.mark.asyncio
+async def test_tools_report_vault_wide_queries(vault):
+    orphans = await find_orphan_notes(include_linking=False)
+    assert orphans["paths"] == [str(vault / "Loner.md")]
+    assert orphans["total"] == 1
+    assert orphans["refresh_ms"] >= 0 and orphans["elapsed_ms"] >= 0
+    unresolved = await find_unresolved_links()
+    assert unresolved["total"] == 1
+    neighborhood = await get_note_neighborhood("Hub", depth=1)
+    assert len(neighborhood["nodes"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_writes_update_the_graph(vault):
+    await find_backlinks("Hub")
+    await create_note(ObsidianNote(title="Newcomer", content="Links [[Loner]]"))
+    result = await find_backlinks("Loner")
+    assert [link["path"] for link in result["backlinks"]] == [
+        str(vault / "Newcomer.md")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_backlinks_tool(mcp_client, vault):
+    result = await mcp_client.call_tool("find_backlinks_tool", {"title": "Hub"})
+    data = json.loads(result[0].text)
+    assert len(data["backlinks"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_failing_listener_does_not_fail_the_write(vault, monkeypatch, caplog):
+    await find_backlinks("Hub")
+    graph = get_link_graph(vault)
+
+    def broken(file_paths):
+        raise KeyError("broken")
+
+    monkeypatch.setattr(graph, "record_changes", broken)
+    result = await create_note(ObsidianNote(title="Newcomer", content="[[Loner]]"))
+    assert result["path"] == str(vault / "Newcomer.md")
+    assert "Change listener vault.link_graph failed" in caplog.text
+
+    # The graph was marked stale and catches up on the next query
+    monkeypatch.undo()
+    backlinks = await find_backlinks("Loner")
+    assert [link["path"] for link in backlinks["backlinks"]] == [
+        str(vault / "Newcomer.md")
+    ]
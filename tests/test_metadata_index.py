@@ -0,0 +1,268 @@
+"""
+Tests for the persistent metadata index.
+"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from models import ObsidianNote
+from tools import (
+    create_note,
+    read_note,
+    update_note,
+    load_all_notes_metadata,
+    query_notes_metadata,
+)
+from vault import metadata_index
+from vault.metadata_index import MetadataIndex, get_metadata_index
+
+
+@pytest.fixture
+def index(temp_vault):
+    index = MetadataIndex(temp_vault, temp_vault / "index.sqlite")
+    yield index
+    index.close()
+
+
+def test_cold_build_indexes_all_notes(index, temp_vault, write_note):
+    write_note("a.md", title="A", tags="x, y")
+    write_note("sub/b.md", title="B")
+
+    index.refresh()
+    notes = index.notes()
+
+    assert [note["title"] for note in notes] == ["A", "B"]
+    assert notes[0]["tags"] == ["x", "y"]
+    assert notes[1]["folder"] == "sub"
+    assert notes[1]["path"] == str(temp_vault / "sub" / "b.md")
+
+
+def test_warm_refresh_only_reparses_changed_notes(
+    index, temp_vault, monkeypatch, write_note
+):
+    write_note("a.md", title="A")
+    write_note("b.md", title="B")
+    index.refresh()
+
+    parsed = []
+    original_parse = index._parse
+    monkeypatch.setattr(
+        index,
+        "_parse",
+        lambda path, rel: parsed.append(rel) or original_parse(path, rel),
+    )
+
+    write_note("b.md", title="B changed")
+    os.utime(temp_vault / "b.md", ns=(1, 1))
+    index.refresh()
+
+    assert [str(rel) for rel in parsed] == ["b.md"]
+    assert {note["title"] for note in index.notes()} == {"A", "B changed"}
+
+
+def test_refresh_drops_deleted_notes(index, temp_vault, write_note):
+    write_note("a.md", title="A")
+    write_note("b.md", title="B")
+    index.refresh()
+
+    (temp_vault / "b.md").unlink()
+    index.refresh()
+
+    assert [note["title"] for note in index.notes()] == ["A"]
+
+
+def test_index_persists_between_instances(index, temp_vault, monkeypatch, write_note):
+    write_note("a.md", title="A")
+    index.refresh()
+    index.close()
+
+    reopened = MetadataIndex(temp_vault, temp_vault / "index.sqlite")
+    monkeypatch.setattr(reopened, "_parse", lambda path, rel: pytest.fail("reparsed"))
+    reopened.refresh()
+
+    assert [note["title"] for note in reopened.notes()] == ["A"]
+    reopened.close()
+
+
+def test_rebuild_reparses_everything(index, monkeypatch, write_note):
+    write_note("a.md", title="A")
+    write_note("b.md", title="B")
+    index.refresh()
+
+    parsed = []
+    original_parse = index._parse
+    monkeypatch.setattr(
+        index,
+        "_parse",
+        lambda path, rel: parsed.append(rel) or original_parse(path, rel),
+    )
+    index.refresh("rebuild")
+
+    assert sorted(str(rel) for rel in parsed) == ["a.md", "b.md"]
+
+
+def test_unparseable_notes_are_skipped(index, temp_vault, write_note):
+    (temp_vault / "empty.md").write_text("---\n---\nno frontmatter values\n")
+    write_note("a.md", title="A")
+
+    index.refresh()
+
+    assert [note["title"] for note in index.notes()] == ["A"]
+
+
+@pytest.mark.asyncio
+async def test_writes_go_through_to_index(temp_vault):
+    await load_all_notes_metadata()
+    index = get_metadata_index(temp_vault)
+
+    await create_note(ObsidianNote(title="Fresh", content="x", tags=["one"]))
+    assert [note["tags"] for note in index.notes()] == [["one"]]
+
+    await update_note(ObsidianNote(title="Fresh", content="y", tags=["two"]))
+    assert [note["tags"] for note in index.notes()] == [["two"]]
+
+
+def test_cache_dir_override(temp_vault, tmp_path, monkeypatch, write_note):
+    monkeypatch.setenv("OBSIDIAN_CACHE_DIR", str(tmp_path / "cache"))
+    write_note("a.md", title="A")
+
+    index = get_metadata_index(temp_vault)
+    index.refresh()
+
+    assert index.db_path.is_relative_to(tmp_path / "cache")
+    assert not (temp_vault / ".obsidian_fastmcp").exists()
+
+
+def test_parallel_refresh_matches_sequential(temp_vault, write_note):
+    for i in range(50):
+        write_note(f"f{i % 5}/n{i}.md", title=f"N{i}", tags=f"t{i}")
+
+    sequential = MetadataIndex(temp_vault, temp_vault / "seq.sqlite")
+    sequential.refresh(threads=1)
+    parallel = MetadataIndex(temp_vault, temp_vault / "par.sqlite")
+    parallel.refresh(threads=8)
+
+    assert parallel.notes() == sequential.notes()
+    sequential.close()
+    parallel.close()
+
+
+def test_process_pool_refresh_matches_sequential(temp_vault, monkeypatch, write_note):
+    monkeypatch.setattr("vault.metadata_index.PROCESS_POOL_MIN_NOTES", 1)
+    for i in range(20):
+        write_note(f"n{i}.md", title=f"N{i}", tags=f"t{i}")
+    (temp_vault / "empty.md").write_text("---\n---\n")
+
+    sequential = MetadataIndex(temp_vault, temp_vault / "seq.sqlite")
+    sequential.refresh(threads=1)
+    pooled = MetadataIndex(temp_vault, temp_vault / "pool.sqlite")
+    pooled.refresh(threads=4, processes=2)
+
+    assert pooled.notes() == sequential.notes()
+    sequential.close()
+    pooled.close()
+
+
+@pytest.mark.asyncio
+async def test_scan_does_not_block_event_loop(monkeypatch, write_note):
+    write_note("a.md", title="A")
+    release = threading.Event()
+    original_refresh = MetadataIndex.refresh
+
+    def slow_refresh(self, *args, **kwargs):
+        release.wait(timeout=5)
+        return original_refresh(self, *args, **kwargs)
+
+    monkeypatch.setattr(MetadataIndex, "refresh", slow_refresh)
+
+    scan = asyncio.create_task(load_all_notes_metadata())
+    note = await asyncio.wait_for(read_note("a"), timeout=2)
+    release.set()
+
+    assert note.title == "a"
+    assert [n["title"] for n in await scan] == ["A"]
+
+
+@pytest.fixture
+def populated_vault(temp_vault, write_note):
+    write_note("papers/p1.md", title="P1", tags="neuroscience, ml")
+    write_note("papers/deep/p2.md", title="P2", tags="neuroscience")
+    write_note("papers2/p3.md", title="P3", tags="neuroscience")
+    write_note("notes/n1.md", title="N1", tags="ml")
+    write_note("n2.md", title="N2")
+    return temp_vault
+
+
+@pytest.mark.asyncio
+async def test_query_filters_by_folder_and_tag(populated_vault):
+    page = await query_notes_metadata(folder="papers", tag="neuroscience")
+
+    assert [note["title"] for note in page["notes"]] == ["P2", "P1"]
+    assert page["total"] == 2
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_query_folder_prunes_traversal(populated_vault, monkeypatch):
+    walked = []
+    original = metadata_index.iter_markdown_files
+    monkeypatch.setattr(
+        metadata_index,
+        "iter_markdown_files",
+        lambda root: walked.append(root) or original(root),
+    )
+
+    await query_notes_metadata(folder="notes")
+
+    assert walked == [populated_vault / "notes"]
+
+
+@pytest.mark.asyncio
+async def test_query_projects_fields(populated_vault):
+    page = await query_notes_metadata(fields=["title", "tags"], tag="ml")
+
+    assert page["notes"] == [
+        {"title": "N1", "tags": ["ml"]},
+        {"title": "P1", "tags": ["neuroscience", "ml"]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_query_paginates_with_stable_cursor(populated_vault, write_note):
+    seen = []
+    cursor = None
+    while True:
+        page = await query_notes_metadata(
+            sort_by="title", descending=True, limit=2, cursor=cursor
+        )
+        seen.extend(note["title"] for note in page["notes"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        # A note added between pages must not shift the remaining pages
+        write_note("zz.md", title="Z")
+
+    assert seen == ["P3", "P2", "P1", "N2", "N1"]
+
+
+@pytest.mark.asyncio
+async def test_query_rejects_cursor_from_other_query(populated_vault):
+    page = await query_notes_metadata(limit=1)
+
+    with pytest.raises(Exception, match="Cursor"):
+        await query_notes_metadata(limit=1, tag="ml", cursor=page["next_cursor"])
+
+
+@pytest.mark.asyncio
+async def test_query_modified_since_uses_file_mtime(populated_vault):
+    os.utime(populated_vault / "n2.md", (0, 0))
+
+    page = await query_notes_metadata(
+        modified_since="1990-01-01T00:00:00", fields=["title"]
+    )
+
+    assert {"title": "N2"} not in page["notes"]
+    assert page["total"] == 4
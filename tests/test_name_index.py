@@ -0,0 +1,111 @@
+"""
+Tests for the name index and reading notes by title alone.
+"""
+
+import json
+import unicodedata
+
+import pytest
+
+from models import NotePatch, ObsidianNote
+from tools import (
+    create_note,
+    get_note_outline,
+    patch_note,
+    read_note,
+    update_note,
+)
+from vault.name_index import NameIndex, get_name_index
+
+
+@pytest.fixture
+def vault(temp_vault, write_note):
+    write_note("projects/Roadmap.md", "Plans.", aliases="[Plan, Q3]")
+    write_note("archive/old/Roadmap.md", "Old plans.")
+    write_note("people/Ada.md", "Ada.", title="Ada Lovelace")
+    write_note("Café.md", "Coffee.")
+    return temp_vault
+
+
+@pytest.fixture
+def index(vault):
+    return NameIndex(vault)
+
+
+class TestResolve:
+    def test_names_titles_and_aliases(self, index):
+        assert index.resolve("Ada") == "people/Ada.md"
+        assert index.resolve("ada lovelace") == "people/Ada.md"
+        assert index.resolve("PLAN") == "projects/Roadmap.md"
+        assert index.resolve("q3") == "projects/Roadmap.md"
+        assert index.resolve("Nowhere") is None
+
+    def test_paths_and_partial_paths(self, index):
+        assert index.resolve("archive/old/Roadmap") == "archive/old/Roadmap.md"
+        assert index.resolve("old/roadmap.md") == "archive/old/Roadmap.md"
+
+    def test_duplicates_prefer_shortest_then_first_path(self, vault, index, write_note):
+        assert index.resolve("Roadmap") == "projects/Roadmap.md"
+        write_note("ideas/Roadmap.md", "More plans.")
+        index.refresh()
+        assert index.resolve("Roadmap") == "ideas/Roadmap.md"
+
+    def test_file_names_win_over_aliases(self, vault, index, write_note):
+        write_note("Plan.md", "A note named like an alias.")
+        assert index.resolve("plan") == "Plan.md"
+
+    def test_unicode_normalization(self, index):
+        assert index.resolve(unicodedata.normalize("NFD", "CAFÉ")) == "Café.md"
+
+    def test_outside_changes_are_picked_up(self, vault, index, write_note):
+        assert index.resolve("Ada") == "people/Ada.md"
+        (vault / "people" / "Ada.md").rename(vault / "Ada.md")
+        write_note("people/Grace.md", "Grace.")
+        assert index.resolve("Ada") == "Ada.md"
+        assert index.resolve("Grace") == "people/Grace.md"
+
+
+async def test_read_note_by_title_alone(vault):
+    note = await read_note("plan")
+    assert (note.title, note.folder) == ("Roadmap", "projects")
+    assert note.content == "Plans."
+
+    note = await read_note("Ada Lovelace")
+    assert (note.title, note.folder) == ("Ada", "people")
+
+    with pytest.raises(Exception, match="Note not found"):
+        await read_note("Nowhere")
+
+
+async def test_edit_tools_accept_a_title_alone(vault):
+    outline = await get_note_outline("Q3")
+    assert outline["path"] == str(vault / "projects" / "Roadmap.md")
+
+    result = await patch_note("q3", [NotePatch(op="append", text="Ship it.")])
+    assert result["title"] == "Roadmap"
+
+    result = await update_note(ObsidianNote(title="Ada", content="Updated."))
+    assert result["path"] == str(vault / "people" / "Ada.md")
+    note = await read_note("Ada", "people")
+    assert note.content == "Updated."
+    assert (vault / "people" / "Ada.md").read_text().count("title:") == 1
+
+
+async def test_writes_update_the_index(vault):
+    index = get_name_index(vault)
+    assert index.resolve("Ada") == "people/Ada.md"
+
+    await create_note(
+        ObsidianNote(title="Turing", content="...", folder="people", aliases=["Alan"])
+    )
+    assert index.resolve("alan") == "people/Turing.md"
+
+    await update_note(ObsidianNote(title="Turing", content="...", folder="people"))
+    assert index.resolve("alan") is None
+    assert index.stats()["notes"] == 5
+
+
+async def test_read_tool_resolves_titles(mcp_client, vault):
+    result = await mcp_client.call_tool("read_note_tool", {"title": "ada lovelace"})
+    note = json.loads(result[0].text)
+    assert (note["title"], note["folder"]) == ("Ada", "people")
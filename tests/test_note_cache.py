@@ -0,0 +1,136 @@
+"""
+Tests for the in-memory note cache used by read_note.
+"""
+
+import json
+import os
+
+import pytest
+
+from models import ObsidianNote
+from tools import create_note, get_cache_stats, read_note, update_note
+from vault import get_note_cache
+from vault.note_cache import NoteCache
+
+
+def test_get_validates_against_stat(tmp_path):
+    path = tmp_path / "a.md"
+    path.write_text("one")
+    cache = NoteCache(1024 * 1024)
+    note = ObsidianNote(title="a", content="one")
+
+    cache.put(path, path.stat(), note)
+    assert cache.get(path, path.stat()) == note
+
+    path.write_text("changed")
+    assert cache.get(path, path.stat()) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 1, 1)
+    assert stats["entries"] == 0
+
+
+def test_get_returns_independent_copies(tmp_path):
+    path = tmp_path / "a.md"
+    path.write_text("one")
+    cache = NoteCache(1024 * 1024)
+    cache.put(path, path.stat(), ObsidianNote(title="a", content="one", tags=["x"]))
+
+    first = cache.get(path, path.stat())
+    first.content = "mutated"
+    first.tags.append("y")
+
+    second = cache.get(path, path.stat())
+    assert second.content == "one"
+    assert second.tags == ["x"]
+
+
+def test_eviction_respects_byte_budget(tmp_path):
+    cache = NoteCache(20_000)
+    paths = []
+    for i in range(10):
+        path = tmp_path / f"{i}.md"
+        path.write_text(str(i))
+        paths.append(path)
+        cache.put(path, path.stat(), ObsidianNote(title=str(i), content="x" * 4000))
+        # Keep the first note hot so it survives eviction
+        assert cache.get(paths[0], paths[0].stat()) is not None
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 20_000
+    assert stats["evictions"] == 10 - stats["entries"]
+    assert cache.get(paths[-1], paths[-1].stat()) is not None
+    assert cache.get(paths[1], paths[1].stat()) is None
+
+
+def test_zero_budget_disables_cache(tmp_path):
+    path = tmp_path / "a.md"
+    path.write_text("one")
+    cache = NoteCache(0)
+    cache.put(path, path.stat(), ObsidianNote(title="a", content="one"))
+    assert cache.get(path, path.stat()) is None
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_hit_the_cache(temp_vault):
+    (temp_vault / "Note.md").write_text("---\ntitle: Note\ntags: a, b\n---\n\nBody\n")
+
+    first = await read_note("Note")
+    second = await read_note("Note")
+
+    assert first == second
+    assert second.tags == ["a", "b"]
+    stats = get_note_cache().stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_external_edit_is_picked_up(temp_vault):
+    path = temp_vault / "Note.md"
+    path.write_text("---\ntitle: Note\n---\n\nOld body\n")
+    assert (await read_note("Note")).content == "Old body"
+
+    path.write_text("---\ntitle: Note\n---\n\nNew body, edited in Obsidian\n")
+    stat = path.stat()
+    # Guard against coarse timestamps: same size and mtime would look unchanged
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert (await read_note("Note")).content == "New body, edited in Obsidian"
+
+
+@pytest.mark.asyncio
+async def test_writes_update_the_cache_in_place(temp_vault):
+    note = ObsidianNote(
+        title="Cached", content="First", folder="dir", tags=["t1"], type="concept"
+    )
+    await create_note(note)
+    created = await read_note("Cached", "dir")
+    assert get_note_cache().stats()["hits"] == 1
+
+    note.content = "Second"
+    note.aliases = ["Alias"]
+    await update_note(note)
+    updated = await read_note("Cached", "dir")
+
+    stats = get_note_cache().stats()
+    assert (stats["hits"], stats["misses"]) == (2, 0)
+    assert created.content == "First"
+    assert updated.content == "Second"
+    assert updated.aliases == ["Alias"]
+
+    # What the write put in the cache is exactly what a cold read produces
+    get_note_cache().clear()
+    assert await read_note("Cached", "dir") == updated
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_tool(mcp_client, temp_vault):
+    (temp_vault / "Note.md").write_text("Body\n")
+    await read_note("Note")
+    await read_note("Note")
+
+    result = await mcp_client.call_tool("cache_stats_tool", {})
+    stats = json.loads(result[0].text)["note_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats == (await get_cache_stats())["note_cache"]
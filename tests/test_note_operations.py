@@ -125,7 +125,7 @@ async def test_load_notes_metadata(mcp_client, temp_vault):
     result_text = result[0].text
     import json
 
-    metadata = json.loads(result_text)
+    metadata = json.loads(result_text)["notes"]
     assert len(metadata) == 3
 
     # Verify metadata contents
@@ -0,0 +1,185 @@
+"""
+Tests for patch-based note edits.
+"""
+
+import hashlib
+import json
+import os
+
+import pytest
+
+from models import NotePatch
+from tools import append_to_note, patch_note, read_note
+from utils.frontmatter import set_frontmatter_keys
+
+LOG = """---
+title: Log
+authors:
+  - me
+custom: keep   # exactly as written
+---
+# Monday
+Worked.
+
+# Tuesday
+Rested.
+## Notes
+Short.
+
+# Wednesday
+"""
+
+
+@pytest.fixture
+def log(temp_vault):
+    path = temp_vault / "Log.md"
+    path.write_text(LOG)
+    return path
+
+
+class TestSetFrontmatterKeys:
+    def test_untouched_keys_are_kept_verbatim(self):
+        data = set_frontmatter_keys(
+            LOG.encode(), {"status": "done", "authors": ["a", "b"]}
+        )
+        assert data.decode() == LOG.replace(
+            "authors:\n  - me\n", "authors:\n  - a\n  - b\n"
+        ).replace("# exactly as written\n", "# exactly as written\nstatus: done\n")
+
+    def test_remove_and_quote(self):
+        data = set_frontmatter_keys(LOG.encode(), {"custom": None, "note": "a: b"})
+        header = data.decode().split("---")[1]
+        assert "custom" not in header
+        assert 'note: "a: b"' in header
+
+    def test_note_without_frontmatter(self):
+        assert set_frontmatter_keys(b"Body\n", {"type": "paper"}) == (
+            b"---\ntype: paper\n---\nBody\n"
+        )
+
+    def test_invalid_key(self):
+        with pytest.raises(ValueError, match="Invalid frontmatter key"):
+            set_frontmatter_keys(b"", {"a: b": 1})
+
+
+@pytest.mark.asyncio
+async def test_append_writes_in_place(log):
+    inode = log.stat().st_ino
+    result = await append_to_note("Log", "- evening walk")
+    assert result["mode"] == "append"
+    assert result["bytes_written"] == len("- evening walk\n")
+    assert log.read_text() == LOG + "- evening walk\n"
+    # Appending keeps the same file instead of replacing it
+    assert log.stat().st_ino == inode
+    assert result["mtime_ns"] == log.stat().st_mtime_ns
+
+
+@pytest.mark.asyncio
+async def test_append_adds_missing_line_break(temp_vault):
+    path = temp_vault / "Short.md"
+    path.write_text("no newline")
+    await append_to_note("Short", "next")
+    assert path.read_text() == "no newline\nnext\n"
+
+
+@pytest.mark.asyncio
+async def test_insert_under_heading(log):
+    await patch_note(
+        "Log",
+        [
+            NotePatch(op="insert_under_heading", heading="Tuesday", text="- tea"),
+            NotePatch(
+                op="insert_under_heading",
+                heading="monday",
+                position="start",
+                text="Morning.",
+            ),
+            NotePatch(op="insert_under_heading", heading="Wednesday", text="Busy."),
+        ],
+    )
+    text = log.read_text()
+    assert "# Monday\nMorning.\nWorked.\n" in text
+    assert "## Notes\nShort.\n- tea\n\n# Wednesday\nBusy.\n" in text
+
+
+@pytest.mark.asyncio
+async def test_replace_text_and_span(log):
+    result = await patch_note(
+        "Log", [NotePatch(op="replace", find="Rested.", text="Slept in.")]
+    )
+    assert result["mode"] == "rewrite"
+    assert "Slept in." in log.read_text()
+
+    data = log.read_bytes()
+    start = data.index(b"Short.")
+    await patch_note(
+        "Log", [NotePatch(op="replace", start=start, end=start + 5, text="Long")]
+    )
+    assert "Long.\n" in log.read_text()
+
+    with pytest.raises(Exception, match="occurs 3 times"):
+        await patch_note("Log", [NotePatch(op="replace", find="day", text="x")])
+    with pytest.raises(Exception, match="within the note body"):
+        await patch_note("Log", [NotePatch(op="replace", start=0, end=3, text="x")])
+
+
+@pytest.mark.asyncio
+async def test_set_frontmatter_and_read_back(log):
+    assert (await read_note("Log")).category == ""
+    await patch_note(
+        "Log", [NotePatch(op="set_frontmatter", values={"category": "journal"})]
+    )
+    assert (await read_note("Log")).category == "journal"
+    assert "custom: keep   # exactly as written\n" in log.read_text()
+
+
+@pytest.mark.asyncio
+async def test_failed_patch_changes_nothing(log):
+    with pytest.raises(Exception, match="Patch 2 \\(insert_under_heading\\)"):
+        await patch_note(
+            "Log",
+            [
+                NotePatch(op="append", text="never written"),
+                NotePatch(op="insert_under_heading", heading="Friday", text="x"),
+            ],
+        )
+    assert log.read_text() == LOG
+
+
+@pytest.mark.asyncio
+async def test_preconditions(log):
+    mtime_ns = log.stat().st_mtime_ns
+    digest = hashlib.sha256(LOG.encode()).hexdigest()
+
+    result = await append_to_note("Log", "one", expected_sha256=digest)
+    assert result["sha256"] == hashlib.sha256(log.read_bytes()).hexdigest()
+
+    with pytest.raises(Exception, match="changed since it was read"):
+        await append_to_note("Log", "two", expected_sha256=digest)
+
+    os.utime(log, ns=(mtime_ns, mtime_ns))
+    with pytest.raises(Exception, match="changed since it was read"):
+        await patch_note(
+            "Log",
+            [NotePatch(op="replace", find="Worked.", text="x")],
+            expected_mtime_ns=mtime_ns + 1,
+        )
+    result = await patch_note(
+        "Log",
+        [NotePatch(op="replace", find="Worked.", text="x")],
+        expected_mtime_ns=mtime_ns,
+    )
+    assert result["mtime_ns"] == log.stat().st_mtime_ns
+
+
+@pytest.mark.asyncio
+async def test_patch_tool(mcp_client, log):
+    result = await mcp_client.call_tool(
+        "patch_note_tool",
+        {
+            "title": "Log",
+            "patches": [{"op": "set_frontmatter", "values": {"mood": "good"}}],
+        },
+    )
+    assert json.loads(result[0].text)["mode"] == "rewrite"
+    assert "mood: good\n---" in log.read_text()
@@ -0,0 +1,147 @@
+"""
+Tests for note outlines and partial (section, line and byte range) reads.
+"""
+
+import json
+
+import pytest
+
+from tools import (
+    get_note_outline,
+    read_note_bytes,
+    read_note_lines,
+    read_note_section,
+)
+from vault import get_outline_cache
+from vault.outline import parse_outline
+
+PAPER = """---
+title: Paper
+---
+# Abstract
+Short summary.
+
+# Methods
+How it was done.
+```python
+# a comment, not a heading
+```
+## Data
+Café data.
+### Cleaning
+Steps.
+## Training
+Epochs.
+
+# Results #
+It works. #tag
+"""
+
+
+@pytest.fixture
+def paper(temp_vault):
+    (temp_vault / "papers").mkdir()
+    path = temp_vault / "papers" / "Paper.md"
+    path.write_text(PAPER, encoding="utf-8")
+    return path
+
+
+def titles(headings):
+    return [(h["title"], [c["title"] for c in h["children"]]) for h in headings]
+
+
+class TestParseOutline:
+    def test_headings_and_sections(self):
+        outline = parse_outline(PAPER.encode("utf-8"))
+        assert [(h.level, h.title, h.line) for h in outline.headings] == [
+            (1, "Abstract", 4),
+            (1, "Methods", 7),
+            (2, "Data", 12),
+            (3, "Cleaning", 14),
+            (2, "Training", 16),
+            (1, "Results", 19),
+        ]
+        methods = outline.headings[1]
+        data = PAPER.encode("utf-8")
+        assert data[methods.offset : methods.end].startswith(b"# Methods\n")
+        assert data[methods.offset : methods.end].endswith(b"Epochs.\n\n")
+        assert data[methods.offset : methods.own_end].endswith(b"```\n")
+
+    def test_find_nested_heading(self):
+        outline = parse_outline(PAPER.encode("utf-8"))
+        assert outline.find("methods#cleaning").title == "Cleaning"
+        assert outline.find("Methods#Data#Cleaning").title == "Cleaning"
+        assert outline.find("Abstract#Cleaning") is None
+        assert outline.find("#") is None
+
+    def test_line_spans(self):
+        outline = parse_outline(b"one\ntwo\nthree")
+        assert outline.line_count == 3
+        assert outline.line_span(2, 3) == (4, 13)
+        assert outline.line_span(5, 9) == (13, 13)
+
+
+@pytest.mark.asyncio
+async def test_outline(paper):
+    outline = await get_note_outline("Paper", "papers")
+    assert outline["path"] == str(paper)
+    assert outline["line_count"] == 20
+    assert titles(outline["headings"]) == [
+        ("Abstract", []),
+        ("Methods", ["Data", "Training"]),
+        ("Results", []),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_section(paper):
+    section = await read_note_section("Paper", "data", "papers")
+    assert section["heading"] == "Data"
+    assert section["content"] == "## Data\nCafé data.\n### Cleaning\nSteps.\n"
+
+    own = await read_note_section("Paper", "Data", "papers", include_subsections=False)
+    assert own["content"] == "## Data\nCafé data.\n"
+
+    with pytest.raises(Exception, match="Available headings: Abstract, Methods"):
+        await read_note_section("Paper", "Discussion", "papers")
+
+
+@pytest.mark.asyncio
+async def test_read_lines_and_bytes(paper):
+    lines = await read_note_lines("Paper", 12, 13, "papers")
+    assert lines["content"] == "## Data\nCafé data.\n"
+    tail = await read_note_lines("Paper", 19, 99, "papers")
+    assert (tail["end_line"], tail["content"]) == (20, "# Results #\nIt works. #tag\n")
+
+    outline = await get_note_outline("Paper", "papers")
+    results = outline["headings"][2]
+    part = await read_note_bytes("Paper", results["offset"], results["end"], "papers")
+    assert part["content"] == "# Results #\nIt works. #tag\n"
+
+    # A range that starts inside the two-byte "é" drops the broken character
+    start = PAPER.encode("utf-8").index("é".encode("utf-8")) + 1
+    part = await read_note_bytes("Paper", start, start + 6, "papers")
+    assert part["content"] == " data"
+
+    with pytest.raises(Exception, match="start_line must be at least 1"):
+        await read_note_lines("Paper", 0, folder="papers")
+
+
+@pytest.mark.asyncio
+async def test_outline_cache_follows_edits(paper):
+    await read_note_section("Paper", "Abstract", "papers")
+    await read_note_section("Paper", "Results", "papers")
+    assert get_outline_cache().stats()["hits"] == 1
+
+    paper.write_text("# Abstract\nRewritten, and longer than before.\n")
+    section = await read_note_section("Paper", "Abstract", "papers")
+    assert section["content"] == "# Abstract\nRewritten, and longer than before.\n"
+
+
+@pytest.mark.asyncio
+async def test_section_tool(mcp_client, paper):
+    result = await mcp_client.call_tool(
+        "read_note_section_tool",
+        {"title": "Paper", "folder": "papers", "heading": "Methods#Training"},
+    )
+    assert json.loads(result[0].text)["content"] == "## Training\nEpochs.\n\n"
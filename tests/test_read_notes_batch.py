@@ -0,0 +1,117 @@
+"""
+Tests for reading many notes in one call.
+"""
+
+import json
+
+import pytest
+
+from models import NoteRef
+from tools import read_notes_batch
+
+
+@pytest.fixture
+def papers(temp_vault):
+    folder = temp_vault / "papers"
+    (folder / "older").mkdir(parents=True)
+    for number in range(3):
+        (folder / f"Paper {number}.md").write_text(
+            f"---\ntags: paper\n---\nBody of paper {number}"
+        )
+    (folder / "older" / "Archived.md").write_text("Old body")
+    (folder / "figure.png").write_bytes(b"\x89PNG")
+    return temp_vault
+
+
+@pytest.mark.asyncio
+async def test_reads_listed_notes_in_order(papers):
+    result = await read_notes_batch(
+        [
+            NoteRef(title="Paper 2", folder="papers"),
+            NoteRef(title="Archived", folder="papers/older"),
+        ]
+    )
+    assert [item["note"]["content"] for item in result["results"]] == [
+        "Body of paper 2",
+        "Old body",
+    ]
+    assert result["results"][0]["note"]["tags"] == ["paper"]
+    assert result["read"] == 2
+    assert result["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_reported_per_note(papers):
+    result = await read_notes_batch(
+        [
+            NoteRef(title="Missing", folder="papers"),
+            NoteRef(title="Paper 0", folder="papers"),
+            NoteRef(title="Paper 0", folder="nowhere"),
+        ]
+    )
+    first, second, third = result["results"]
+    assert "Note not found" in first["error"]
+    assert second["note"]["content"] == "Body of paper 0"
+    assert "Folder not found" in third["error"]
+    assert (result["read"], result["failed"]) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_selects_notes_with_a_pattern(papers):
+    result = await read_notes_batch(folder="papers", pattern="*.md")
+    assert [item["title"] for item in result["results"]] == [
+        "Paper 0",
+        "Paper 1",
+        "Paper 2",
+    ]
+
+    result = await read_notes_batch(folder="papers", pattern="**/*.md")
+    assert [item["folder"] for item in result["results"]] == [
+        "papers",
+        "papers",
+        "papers",
+        "papers/older",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_byte_budgets_truncate_bodies(papers):
+    result = await read_notes_batch(
+        folder="papers", pattern="*.md", max_body_bytes=7, max_total_bytes=10
+    )
+    assert [item["note"]["content"] for item in result["results"]] == [
+        "Body of",
+        "Bod",
+        "",
+    ]
+    assert all(item["truncated"] for item in result["results"])
+    assert result["total_bytes"] == 10
+
+
+@pytest.mark.asyncio
+async def test_truncation_keeps_characters_whole(temp_vault):
+    (temp_vault / "Accents.md").write_text("ééé")
+    result = await read_notes_batch([NoteRef(title="Accents")], max_body_bytes=3)
+    assert result["results"][0]["note"]["content"] == "é"
+
+
+@pytest.mark.asyncio
+async def test_requires_a_selection(temp_vault):
+    with pytest.raises(Exception, match="Provide notes"):
+        await read_notes_batch()
+    with pytest.raises(Exception, match="Folder not found"):
+        await read_notes_batch(folder="nowhere", pattern="*.md")
+
+
+@pytest.mark.asyncio
+async def test_batch_tool(mcp_client, papers):
+    result = await mcp_client.call_tool(
+        "read_notes_batch_tool",
+        {
+            "notes": [{"title": "Paper 1", "folder": "papers"}],
+            "folder": "papers/older",
+            "pattern": "*.md",
+        },
+    )
+    data = json.loads(result[0].text)
+    assert [item["title"] for item in data["results"]] == ["Paper 1", "Archived"]
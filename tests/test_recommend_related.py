@@ -0,0 +1,132 @@
+"""
+Tests for blocked top-k similarity and related-note recommendations.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from config.settings import get_vault_path
+from search.related import block_rows, top_similar
+from search.semantic import get_semantic_index
+from tools import read_note, recommend_related
+
+
+@pytest.fixture
+def vault(temp_vault, write_note):
+    write_note(
+        "cooking/Soup.md",
+        "Simmer carrots, onions and celery into a vegetable soup.\n",
+    )
+    write_note(
+        "cooking/Stew.md",
+        "A vegetable stew of carrots and onions.\n",
+        related="[Bread]",
+    )
+    write_note(
+        "ml/Transformers.md",
+        "Self-attention lets transformer models weigh every token.\n",
+    )
+    write_note(
+        "ml/Attention.md",
+        "Attention weighs every token in transformer models.\n",
+    )
+    write_note("Empty.md", "")
+    return temp_vault
+
+
+class TestTopSimilar:
+    def test_blocks_match_all_pairs(self):
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((50, 8)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        sources = np.arange(50)
+        expected = matrix @ matrix.T
+        np.fill_diagonal(expected, -np.inf)
+
+        # A cap that fits the matrix and three rows of scores at a time
+        max_bytes = 50 * 8 * 4 + 3 * (50 * 12 + 8 * 4)
+        assert block_rows(50, 8, max_bytes) == 3
+        neighbours = top_similar(matrix, sources, 4, -1.0, max_bytes)
+        for source, related in enumerate(neighbours):
+            assert [row for row, _ in related] == list(
+                np.argsort(-expected[source], kind="stable")[:4]
+            )
+            assert source not in [row for row, _ in related]
+
+        subset = top_similar(matrix, np.array([7, 3]), 4, -1.0, max_bytes)
+        assert subset == [neighbours[7], neighbours[3]]
+        assert all(
+            score >= 0.5
+            for related in top_similar(matrix, sources, 4, 0.5, max_bytes)
+            for _, score in related
+        )
+
+    def test_memory_cap_must_fit_the_matrix(self):
+        with pytest.raises(ValueError, match="at least 2 MiB"):
+            block_rows(1000, 512, 2**20)
+        assert top_similar(
+            np.ones((1, 4), np.float32), np.arange(1), 5, 0, 2**20
+        ) == [[]]
+
+
+async def test_dry_run_reports_without_writing(vault):
+    before = (vault / "cooking" / "Soup.md").read_bytes()
+    result = await recommend_related(limit=1)
+    by_title = {note["path"]: note for note in result["notes"]}
+    soup = by_title[str(vault / "cooking" / "Soup.md")]
+    assert [entry["title"] for entry in soup["recommended"]] == ["Stew"]
+    assert soup["recommended"][0]["folder"] == "cooking"
+    assert soup["related"] == ["Stew"] and soup["changed"]
+    assert by_title[str(vault / "cooking" / "Stew.md")]["related"] == [
+        "Bread",
+        "Soup",
+    ]
+    assert str(vault / "Empty.md") not in by_title
+    assert result["notes_scored"] == 4
+    assert (vault / "cooking" / "Soup.md").read_bytes() == before
+
+
+async def test_writes_related_without_re_embedding(vault, monkeypatch):
+    await recommend_related(limit=1, folder="ml")
+    index = get_semantic_index(get_vault_path())
+    embedded = []
+    encode = index.encoder.encode
+    monkeypatch.setattr(
+        index.encoder, "encode", lambda texts: embedded.extend(texts) or encode(texts)
+    )
+
+    result = await recommend_related(limit=1, dry_run=False)
+    assert result["notes_changed"] == 4
+    assert (await read_note("Stew", "cooking")).related == ["Bread", "Soup"]
+    assert (await read_note("Attention", "ml")).related == ["Transformers"]
+    assert (
+        (vault / "cooking" / "Soup.md")
+        .read_text()
+        .endswith("---\nSimmer carrots, onions and celery into a vegetable soup.\n")
+    )
+    # Only frontmatter changed, so no note was embedded again
+    index.refresh()
+    assert embedded == []
+    assert index.search("vegetable soup")[0]["chunk"]["line"] == 4
+
+    result = await recommend_related(limit=1, dry_run=False)
+    assert result["notes_changed"] == 0
+
+    result = await recommend_related(limit=1, replace=True, dry_run=False)
+    assert (await read_note("Stew", "cooking")).related == ["Soup"]
+
+    with pytest.raises(Exception, match="limit must be"):
+        await recommend_related(limit=0)
+
+
+async def test_recommend_related_tool(mcp_client, vault):
+    result = await mcp_client.call_tool(
+        "recommend_related_tool", {"folder": "ml", "limit": 1}
+    )
+    data = json.loads(result[0].text)
+    assert [note["recommended"][0]["title"] for note in data["notes"]] == [
+        "Transformers",
+        "Attention",
+    ]
@@ -0,0 +1,196 @@
+"""
+Tests for the full-text search index and the search_notes tool.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from models import ObsidianNote
+from search import SearchIndex, to_fts_query
+from tools import create_note, search_notes, update_note
+from vault.watcher import VaultWatcher
+
+
+@pytest.fixture
+def vault(temp_vault, write_note):
+    write_note(
+        "ml/Transformers.md",
+        "The transformer architecture relies on self-attention.",
+        title="Transformers",
+        tags="deep learning, nlp",
+    )
+    write_note(
+        "ml/RNN.md",
+        "Recurrent networks process sequences step by step, unlike transformers.",
+        title="RNN",
+        tags="deep learning",
+    )
+    write_note(
+        "bio/Neurons.md",
+        "Neurons communicate through synapses. Attention in the brain.",
+        title="Neurons",
+        tags="biology",
+    )
+    # Unrelated notes, so that matching terms are rare enough for BM25 to
+    # give them a positive weight
+    for i in range(5):
+        write_note(f"misc/Misc {i}.md", "Groceries.", title=f"Misc {i}")
+    return temp_vault
+
+
+@pytest.fixture
+def index(vault):
+    index = SearchIndex(vault, vault / "search.sqlite")
+    index.refresh()
+    yield index
+    index.close()
+
+
+def titles(results):
+    return [result["title"] for result in results]
+
+
+class TestQueryTranslation:
+    def test_words_and_phrases_are_quoted(self):
+        assert to_fts_query('self-attention "exact phrase"') == (
+            '"self-attention" "exact phrase"'
+        )
+
+    def test_prefix_and_fields(self):
+        assert to_fts_query("title:trans*") == 'title : "trans"*'
+        assert to_fts_query("http://example.com") == '"http://example.com"'
+
+    def test_negation_moves_behind_terms(self):
+        assert to_fts_query("-rnn transformer") == '"transformer" NOT "rnn"'
+        assert to_fts_query("(a OR b) -c") == '("a" OR "b") NOT "c"'
+
+    @pytest.mark.parametrize("query", ["", "   ", "-only", "(a", "a)", '""'])
+    def test_invalid_queries(self, query):
+        with pytest.raises(ValueError):
+            to_fts_query(query)
+
+
+class TestSearchIndex:
+    def test_ranking_prefers_title_matches(self, index):
+        results, total = index.search("transformers")
+        assert total == 2
+        assert titles(results) == ["Transformers", "RNN"]
+        assert results[0]["score"] > results[1]["score"]
+
+    def test_boolean_phrase_and_prefix(self, index):
+        assert titles(index.search("attention -transformer")[0]) == ["Neurons"]
+        assert set(titles(index.search("synapses OR recurrent")[0])) == {
+            "Neurons",
+            "RNN",
+        }
+        assert titles(index.search('"step by step"')[0]) == ["RNN"]
+        assert titles(index.search('"step step"')[0]) == []
+        assert set(titles(index.search("synap*")[0])) == {"Neurons"}
+
+    def test_field_filters(self, index):
+        assert titles(index.search("tags:biology")[0]) == ["Neurons"]
+        assert titles(index.search("title:attention")[0]) == []
+
+    def test_folder_and_tag_filters(self, index):
+        assert titles(index.search("attention", folder="bio")[0]) == ["Neurons"]
+        assert set(titles(index.search("transformers", tag="deep learning")[0])) == {
+            "Transformers",
+            "RNN",
+        }
+        assert titles(index.search("attention", tag="biology")[0]) == ["Neurons"]
+
+    def test_snippet_highlight_offsets(self, index):
+        results, _ = index.search("synapses")
+        snippet = results[0]["snippet"]
+        assert snippet["highlights"]
+        for start, end in snippet["highlights"]:
+            assert snippet["text"][start:end].lower() == "synapses"
+
+    def test_pagination(self, index):
+        first, total = index.search("transformers", limit=1)
+        second, _ = index.search("transformers", limit=1, offset=1)
+        assert total == 2
+        assert titles(first + second) == ["Transformers", "RNN"]
+
+    def test_warm_refresh_only_reindexes_changes(self, index, vault, write_note):
+        write_note("ml/RNN.md", "Now about gating.", title="RNN", tags="deep learning")
+        (vault / "bio" / "Neurons.md").unlink()
+        index.refresh()
+        assert titles(index.search("gating")[0]) == ["RNN"]
+        assert titles(index.search("recurrent")[0]) == []
+        assert titles(index.search("synapses")[0]) == []
+        assert index.stats()["notes"] == 7
+
+    def test_index_persists_across_instances(self, index, vault):
+        index.close()
+        reopened = SearchIndex(vault, vault / "search.sqlite")
+        try:
+            assert titles(reopened.search("synapses")[0]) == ["Neurons"]
+        finally:
+            reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_update_the_index(vault):
+    assert (await search_notes("quantum"))["total"] == 0
+
+    note = ObsidianNote(
+        title="Qubits", content="Quantum computing basics", tags=["physics"]
+    )
+    await create_note(note)
+    result = await search_notes("quantum")
+    assert titles(result["results"]) == ["Qubits"]
+
+    note.content = "Superposition only"
+    await update_note(note)
+    assert (await search_notes("quantum"))["total"] == 0
+    assert (await search_notes("superposition", tag="physics"))["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_outside_edits_show_up_after_revalidate_interval(
+    vault, monkeypatch, write_note
+):
+    first = await search_notes("attention")
+    assert first["refresh_ms"] >= 0 and first["elapsed_ms"] >= 0
+    write_note("New.md", "Mentions zebras.", title="New")
+    assert (await search_notes("zebras"))["total"] == 0
+
+    monkeypatch.setenv("OBSIDIAN_REVALIDATE_MS", "0")
+    assert titles((await search_notes("zebras"))["results"]) == ["New"]
+
+
+@pytest.mark.asyncio
+async def test_watched_vault_is_updated_without_walking(vault, write_note):
+    await search_notes("attention")
+    watcher = VaultWatcher(vault, mode="poll", debounce=0.0, poll_interval=0.02)
+    watcher.start()
+    try:
+        await search_notes("attention")
+        write_note("New.md", "Mentions zebras.", title="New")
+        for _ in range(300):
+            if (await search_notes("zebras"))["total"]:
+                break
+            await asyncio.sleep(0.01)
+        assert titles((await search_notes("zebras"))["results"]) == ["New"]
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_search_notes_tool(mcp_client, vault):
+    result = await mcp_client.call_tool(
+        "search_notes_tool", {"query": "attention", "folder": "ml", "rebuild": True}
+    )
+    data = json.loads(result[0].text)
+    assert data["total"] == 1
+    assert data["results"][0]["title"] == "Transformers"
+    assert data["results"][0]["path"].endswith("Transformers.md")
+
+
+@pytest.mark.asyncio
+async def test_invalid_query_is_reported(vault):
+    with pytest.raises(Exception, match="Failed to search notes"):
+        await search_notes("-only")
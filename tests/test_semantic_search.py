@@ -0,0 +1,201 @@
+"""
+Tests for the semantic index, its encoders and the semantic_search tool.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from models import ObsidianNote
+from search.encoders import HashingEncoder, load_encoder
+import search.semantic
+from search.semantic import SemanticIndex, chunk_note
+from tools import semantic_search, update_note
+from vault import file_index
+from vault.changes import set_watched
+
+
+@pytest.fixture
+def vault(temp_vault, write_note):
+    write_note(
+        "ml/Transformers.md",
+        "# Attention\nSelf-attention lets transformer models weigh every token.\n"
+        "\n## Training\nGradient descent over large corpora.\n",
+        tags="[ml]",
+    )
+    write_note(
+        "cooking/Soup.md",
+        "Simmer carrots, onions and celery into a vegetable soup.\n",
+    )
+    write_note("Garden.md", "Plant carrots and onions in spring, in rows.\n")
+    return temp_vault
+
+
+@pytest.fixture
+def index(vault, tmp_path):
+    index = SemanticIndex(vault, tmp_path, HashingEncoder(128), "float32")
+    index.refresh()
+    yield index
+    index.close()
+
+
+class TestEncoder:
+    def test_unit_vectors_and_similarity(self):
+        encoder = HashingEncoder(256)
+        vectors = encoder.encode(
+            ["vegetable soup with carrots", "carrots in a soup", "stock markets", ""]
+        )
+        assert vectors.shape == (4, 256) and vectors.dtype == np.float32
+        assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1)
+        assert not vectors[3].any()
+        assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+    def test_load_encoder(self, monkeypatch):
+        monkeypatch.setenv("OBSIDIAN_SEMANTIC_DIM", "64")
+        assert load_encoder("hashing").dim == 64
+        assert load_encoder("search.encoders:HashingEncoder").dim == 512
+        with pytest.raises(Exception, match="module:factory"):
+            load_encoder("word2vec")
+
+
+def test_chunks_follow_headings():
+    data = b"---\ntitle: x\n---\nIntro.\n# One\nFirst.\n## Two\nSecond.\n"
+    assert chunk_note(data) == [
+        (4, "", "Intro."),
+        (5, "One", "# One\nFirst."),
+        (7, "Two", "## Two\nSecond."),
+    ]
+    long_section = b"# Long\n" + b"word " * 100 + b"\n" + b"more " * 400 + b"\n"
+    chunks = chunk_note(long_section)
+    assert [line for line, _, _ in chunks] == [1, 3, 3]
+    assert all(heading == "Long" for _, heading, _ in chunks)
+
+
+class TestSemanticIndex:
+    def test_ranks_notes_by_best_chunk(self, index, vault):
+        results = index.search("transformer self-attention")
+        assert results[0]["path"] == str(vault / "ml" / "Transformers.md")
+        assert results[0]["chunk"]["heading"] == "Attention"
+        assert results[0]["chunk"]["line"] == 4
+
+        results = index.search("carrots and onions")
+        assert {result["title"] for result in results[:2]} == {"Soup", "Garden"}
+        assert [r["title"] for r in index.search("carrots", folder="cooking")] == [
+            "Soup"
+        ]
+        assert index.search("zebra") == []
+
+    def test_only_changed_content_is_embedded(self, index, vault, monkeypatch):
+        embedded = []
+        encode = index.encoder.encode
+        monkeypatch.setattr(
+            index.encoder,
+            "encode",
+            lambda texts: embedded.extend(texts) or encode(texts),
+        )
+        garden = vault / "Garden.md"
+        garden.write_text(garden.read_text())  # new mtime, same content
+        index.refresh()
+        assert embedded == []
+
+        garden.write_text("Prune the roses in winter.\n")
+        (vault / "cooking" / "Soup.md").unlink()
+        index.refresh()
+        assert len(embedded) == 1
+        assert index.search("roses")[0]["title"] == "Garden"
+        assert index.search("celery soup") == []
+        assert index.stats()["chunks"] == 3
+
+    def test_reported_changes_wait_for_refresh(
+        self, index, vault, monkeypatch, write_note
+    ):
+        set_watched(vault, True)
+        try:
+            index.refresh()
+            embedded = []
+            encode = index.encoder.encode
+            monkeypatch.setattr(
+                index.encoder,
+                "encode",
+                lambda texts: embedded.extend(texts) or encode(texts),
+            )
+            write_note("Garden.md", "Prune the roses in winter.\n")
+            index.record_changes([vault / "Garden.md"])
+            index.forget_folder("cooking")
+            assert embedded == [] and index.stats()["notes"] == 3
+
+            # A watched vault is not walked; only the reported notes are read
+            monkeypatch.setattr(file_index, "iter_markdown_files", None)
+            index.refresh()
+            assert len(embedded) == 1
+            assert index.search("roses")[0]["title"] == "Garden"
+            assert index.stats()["notes"] == 2
+        finally:
+            set_watched(vault, False)
+
+    def test_recent_walk_is_trusted_for_max_age(self, index, vault, write_note):
+        write_note("Bread.md", "Knead the sourdough.\n")
+        index.refresh(max_age=60)
+        assert index.search("sourdough") == []
+        index.record_changes([vault / "Bread.md"])
+        index.refresh(max_age=60)
+        assert index.search("sourdough")[0]["title"] == "Bread"
+
+        (vault / "Garden.md").unlink()
+        index.mark_stale()
+        index.refresh(max_age=60)
+        assert index.stats()["notes"] == 3
+
+    def test_vectors_persist_and_rows_are_reused(self, index, vault, tmp_path):
+        stats = index.stats()
+        index.close()
+        reopened = SemanticIndex(vault, tmp_path, HashingEncoder(128), "float32")
+        assert reopened.stats() == stats
+        (vault / "Garden.md").write_text("Tomatoes need sun.\n")
+        reopened.refresh()
+        assert reopened.stats()["capacity"] == stats["capacity"]
+        assert reopened.search("tomatoes sun")[0]["title"] == "Garden"
+        reopened.close()
+
+        # Another encoder cannot reuse the vectors
+        other = SemanticIndex(vault, tmp_path, HashingEncoder(64), "float16")
+        assert other.stats()["notes"] == 0
+        other.refresh()
+        assert other.search("tomatoes need sun")[0]["title"] == "Garden"
+        other.close()
+
+    def test_matrix_grows_keeping_vectors(
+        self, vault, tmp_path, monkeypatch, write_note
+    ):
+        monkeypatch.setattr(search.semantic, "MIN_CAPACITY", 2)
+        index = SemanticIndex(vault, tmp_path, HashingEncoder(128), "float32")
+        index.refresh()
+        for number in range(5):
+            write_note(f"more/Note {number}.md", f"Topic {number} {number}.\n")
+        index.refresh()
+        assert index.stats()["capacity"] >= index.stats()["chunks"] == 9
+        assert index.search("transformer self-attention")[0]["title"] == "Transformers"
+        assert index.search("vegetable soup")[0]["title"] == "Soup"
+        index.close()
+
+
+async def test_semantic_search_tool(mcp_client, vault):
+    result = await mcp_client.call_tool(
+        "semantic_search_tool", {"query": "vegetable soup", "limit": 1}
+    )
+    data = json.loads(result[0].text)
+    assert [r["title"] for r in data["results"]] == ["Soup"]
+    assert data["refresh_ms"] >= 0 and data["elapsed_ms"] >= 0
+
+
+async def test_writes_update_the_index(vault):
+    await semantic_search("soup")
+    await update_note(
+        ObsidianNote(title="Soup", folder="cooking", content="Bake sourdough bread.")
+    )
+    result = await semantic_search("sourdough bread")
+    assert result["results"][0]["title"] == "Soup"
+
+    with pytest.raises(Exception, match="limit must be"):
+        await semantic_search("soup", limit=0)
@@ -0,0 +1,66 @@
+"""
+Tests for resolving the vault once per configured path.
+"""
+
+import pytest
+
+from config import get_vault_context, get_vault_path, reload_vault_context
+
+
+@pytest.fixture
+def vault_env(tmp_path, monkeypatch):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(vault))
+    return vault
+
+
+def test_context_is_resolved_once(vault_env):
+    context = get_vault_context()
+    assert get_vault_context() is context
+    assert get_vault_path() == vault_env
+    assert context.real_path == vault_env.resolve()
+
+
+def test_environment_change_re_resolves(vault_env, tmp_path, monkeypatch):
+    first = get_vault_context()
+    other = tmp_path / "other"
+    other.mkdir()
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(other))
+    assert get_vault_path() == other
+    assert first.path == vault_env
+
+
+def test_reload_picks_up_a_replaced_vault(vault_env, tmp_path):
+    context = get_vault_context()
+    target = tmp_path / "target"
+    target.mkdir()
+    vault_env.rmdir()
+    vault_env.symlink_to(target)
+
+    assert get_vault_context() is context
+    reloaded = reload_vault_context()
+    assert reloaded is not context and get_vault_context() is reloaded
+    assert reloaded.real_path == target.resolve()
+
+
+def test_home_is_expanded(tmp_path, monkeypatch):
+    (tmp_path / "notes").mkdir()
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", "~/notes")
+    assert get_vault_path() == tmp_path / "notes"
+
+
+def test_invalid_paths(tmp_path, monkeypatch):
+    monkeypatch.delenv("OBSIDIAN_VAULT_PATH", raising=False)
+    with pytest.raises(Exception, match="not set"):
+        get_vault_path()
+
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(tmp_path / "missing"))
+    with pytest.raises(Exception, match="does not exist"):
+        get_vault_path()
+
+    (tmp_path / "file").write_text("")
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(tmp_path / "file"))
+    with pytest.raises(Exception, match="not a directory"):
+        get_vault_path()
@@ -0,0 +1,141 @@
+"""
+Tests for the background vault watcher.
+"""
+
+import time
+
+import pytest
+
+from models import ObsidianNote
+from tools import read_note, query_notes_metadata
+from vault import get_metadata_index, get_note_cache
+from vault.watcher import InotifyBackend, VaultWatcher
+
+
+def inotify_available(path) -> bool:
+    try:
+        InotifyBackend(path).close()
+        return True
+    except OSError:
+        return False
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def indexed_titles(vault_path):
+    return {note["title"] for note in get_metadata_index(vault_path).notes()}
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def watcher(request, temp_vault):
+    if request.param == "inotify" and not inotify_available(temp_vault):
+        pytest.skip("inotify is not available")
+    watcher = VaultWatcher(
+        temp_vault, mode=request.param, debounce=0.05, poll_interval=0.05
+    )
+    watcher.start()
+    yield watcher
+    watcher.stop()
+
+
+def test_start_indexes_vault_and_marks_index_watched(temp_vault):
+    (temp_vault / "a.md").write_text("---\ntitle: A\n---\n")
+    watcher = VaultWatcher(temp_vault, mode="poll", poll_interval=0.05)
+    watcher.start()
+    try:
+        index = get_metadata_index(temp_vault)
+        assert index.watched
+        assert indexed_titles(temp_vault) == {"A"}
+    finally:
+        watcher.stop()
+    assert not index.watched
+    assert watcher.stats()["running"] is False
+
+
+def test_create_modify_delete_are_applied(watcher, temp_vault):
+    path = temp_vault / "sub" / "note.md"
+    path.parent.mkdir()
+    path.write_text("---\ntitle: First\n---\n")
+    assert wait_for(lambda: indexed_titles(temp_vault) == {"First"})
+
+    path.write_text("---\ntitle: Second title\n---\n")
+    assert wait_for(lambda: indexed_titles(temp_vault) == {"Second title"})
+
+    path.unlink()
+    assert wait_for(lambda: indexed_titles(temp_vault) == set())
+
+
+def test_rename_is_applied(watcher, temp_vault):
+    (temp_vault / "old.md").write_text("---\ntitle: Renamed\n---\n")
+    assert wait_for(lambda: indexed_titles(temp_vault) == {"Renamed"})
+
+    (temp_vault / "old.md").rename(temp_vault / "new.md")
+    index = get_metadata_index(temp_vault)
+    assert wait_for(lambda: [e[0] for e in index.entries()] == ["new.md"])
+
+
+def test_folder_removal_and_move_are_applied(watcher, temp_vault):
+    folder = temp_vault / "folder"
+    (folder / "nested").mkdir(parents=True)
+    (folder / "a.md").write_text("---\ntitle: A\n---\n")
+    (folder / "nested" / "b.md").write_text("---\ntitle: B\n---\n")
+    index = get_metadata_index(temp_vault)
+    assert wait_for(lambda: indexed_titles(temp_vault) == {"A", "B"})
+
+    folder.rename(temp_vault / "moved")
+    assert wait_for(
+        lambda: [e[0] for e in index.entries()] == ["moved/a.md", "moved/nested/b.md"]
+    )
+
+    (temp_vault / "moved" / "nested" / "b.md").unlink()
+    (temp_vault / "moved" / "nested").rmdir()
+    assert wait_for(lambda: [e[0] for e in index.entries()] == ["moved/a.md"])
+
+
+def test_burst_of_saves_is_coalesced(temp_vault):
+    path = temp_vault / "note.md"
+    path.write_text("---\ntitle: Draft\n---\n")
+    if not inotify_available(temp_vault):
+        pytest.skip("inotify is not available")
+    watcher = VaultWatcher(temp_vault, mode="inotify", debounce=0.2)
+    watcher.start()
+    try:
+        for i in range(20):
+            path.write_text(f"---\ntitle: Draft {i}\n---\n")
+        assert wait_for(lambda: indexed_titles(temp_vault) == {"Draft 19"})
+        stats = watcher.stats()
+        assert stats["events_received"] >= 20
+        assert stats["notes_updated"] == 1
+        assert stats["batches_applied"] == 1
+        assert stats["last_lag_ms"] >= 200
+        assert stats["events_per_second"] > 0
+    finally:
+        watcher.stop()
+
+
+def test_outside_edit_invalidates_note_cache(watcher, temp_vault):
+    path = temp_vault / "note.md"
+    path.write_text("Original\n")
+    cache = get_note_cache()
+    cache.put(path, path.stat(), ObsidianNote(title="note", content="Original"))
+    assert cache.stats()["entries"] == 1
+
+    path.write_text("Edited in Obsidian\n")
+    assert wait_for(lambda: cache.stats()["entries"] == 0)
+
+
+@pytest.mark.asyncio
+async def test_tools_see_outside_edits_without_walking(watcher, temp_vault):
+    (temp_vault / "a.md").write_text("---\ntitle: A\ntype: paper\n---\n")
+    assert wait_for(lambda: indexed_titles(temp_vault) == {"A"})
+
+    result = await query_notes_metadata(type="paper")
+    assert [note["title"] for note in result["notes"]] == ["A"]
+    assert (await read_note("a")).type == "paper"
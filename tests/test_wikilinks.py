@@ -2,7 +2,15 @@
 Tests for wikilinks utility function.
 """
 
-from utils.insert_wikilinks import insert_wikilinks
+import random
+
+import pytest
+
+from utils.insert_wikilinks import (
+    WikilinkLinker,
+    insert_wikilinks,
+    insert_wikilinks_regex,
+)
 
 
 class TestInsertWikilinks:
@@ -147,3 +155,91 @@ It's used for [[machine learning]]."""
         result = insert_wikilinks(content, phrases)
         expected = "[[Python]] is awesome and I love [[Python]]"
         assert result == expected
+
+
+class TestWikilinkLinker:
+    """Test cases for the single-pass WikilinkLinker."""
+
+    TOKENS = [
+        "Python",
+        "py",
+        "thon",
+        "machine",
+        "learning",
+        "machine learning",
+        " ",
+        ".",
+        ",",
+        "\n",
+        "C++",
+        "C",
+        "+",
+        "ab",
+        "a",
+        "b",
+        "é",
+        "_",
+        "-",
+        "foo",
+        "bar",
+        "foobar",
+        "bar baz",
+        "[[Python]]",
+        "[[foo|bar]]",
+        "[x]",
+    ]
+
+    PHRASES = [
+        "Python",
+        "machine learning",
+        "learning",
+        "machine",
+        "C++",
+        "C",
+        "ab",
+        "a",
+        "b",
+        "bar baz",
+        "foo",
+        "foobar",
+        "é",
+        "a b",
+        "+",
+        "a-b",
+        "-",
+        "r b",
+        "ar",
+        ", b",
+    ]
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_matches_regex_implementation(self, seed):
+        """Test that the linker agrees with one-regex-pass-per-phrase linking."""
+        rng = random.Random(seed)
+        for _ in range(1000):
+            length = rng.randint(0, 25)
+            content = "".join(rng.choice(self.TOKENS) for _ in range(length))
+            phrases = rng.sample(self.PHRASES, rng.randint(0, 8))
+            assert insert_wikilinks(content, phrases) == insert_wikilinks_regex(
+                content, phrases
+            ), (content, phrases)
+
+    def test_link_count(self):
+        """Test that the number of inserted links is reported."""
+        linker = WikilinkLinker(["Python", "machine learning"])
+        result, count = linker.link_with_count("Python and machine learning, Python")
+        assert result == "[[Python]] and [[machine learning]], [[Python]]"
+        assert count == 3
+
+    def test_excluded_phrases_are_not_linked(self):
+        """Test that excluded phrases are left alone but others still link."""
+        linker = WikilinkLinker(["Python", "machine learning"])
+        result = linker.link("Python and machine learning", exclude=["Python"])
+        assert result == "Python and [[machine learning]]"
+
+    def test_linker_is_reusable(self):
+        """Test that one compiled linker can link many documents."""
+        linker = WikilinkLinker(["Python"])
+        assert linker.link("Python") == "[[Python]]"
+        assert linker.link("no match") == "no match"
+        assert linker.link("[[Python]]") == "[[Python]]"
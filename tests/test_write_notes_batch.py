@@ -0,0 +1,134 @@
+"""
+Tests for atomic note writes and the transactional batch write tool.
+"""
+
+import json
+import os
+
+import pytest
+
+from models import NoteWrite, ObsidianNote
+from tools import read_note, write_notes_batch
+from utils.atomic_write import atomic_write
+
+
+def write_request(action, title, content, folder=""):
+    return NoteWrite(
+        action=action, note=ObsidianNote(title=title, content=content, folder=folder)
+    )
+
+
+def leftovers(vault):
+    return sorted(path.name for path in vault.rglob(".*") if path.is_file())
+
+
+@pytest.fixture
+def existing(temp_vault):
+    (temp_vault / "Old.md").write_text("---\ncreated: 2020-01-01\n---\nOld body")
+    return temp_vault
+
+
+def test_atomic_write_keeps_permissions(tmp_path):
+    file_path = tmp_path / "note.md"
+    file_path.write_text("before")
+    os.chmod(file_path, 0o640)
+    atomic_write(file_path, b"after")
+    assert file_path.read_text() == "after"
+    assert file_path.stat().st_mode & 0o777 == 0o640
+    assert [path.name for path in tmp_path.iterdir()] == ["note.md"]
+
+
+@pytest.mark.asyncio
+async def test_batch_creates_and_updates(existing):
+    result = await write_notes_batch(
+        [
+            write_request("update", "Old", "New body"),
+            write_request("create", "Fresh", "Fresh body", "new/nested"),
+        ]
+    )
+    assert result["committed"] is True
+    assert result["written"] == 2
+    assert [item["status"] for item in result["results"]] == ["updated", "created"]
+    assert result["results"][1]["path"] == str(existing / "new/nested/Fresh.md")
+
+    assert "created: 2020-01-01" in (existing / "Old.md").read_text()
+    note = await read_note("Fresh", "new/nested")
+    assert note.content == "Fresh body"
+    assert leftovers(existing) == []
+
+
+@pytest.mark.asyncio
+async def test_validation_failure_changes_nothing(existing):
+    result = await write_notes_batch(
+        [
+            write_request("create", "Fresh", "Fresh body", "new"),
+            write_request("update", "Missing", "Body"),
+        ]
+    )
+    assert result["committed"] is False
+    assert result["results"][0]["error"].startswith("Not applied")
+    assert "Note not found" in result["results"][1]["error"]
+    assert not (existing / "new").exists()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_notes_are_rejected(existing):
+    result = await write_notes_batch(
+        [write_request("update", "Old", "One"), write_request("create", "Old", "Two")]
+    )
+    assert result["committed"] is False
+    assert "written twice" in result["results"][1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_failed_swap_rolls_back(existing, monkeypatch):
+    real_replace = os.replace
+
+    def failing_replace(source, target):
+        if str(target).endswith("Broken.md"):
+            raise OSError("disk full")
+        return real_replace(source, target)
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    result = await write_notes_batch(
+        [
+            write_request("update", "Old", "Replaced body"),
+            write_request("create", "Fresh", "Fresh body", "new"),
+            write_request("create", "Broken", "Never written"),
+        ]
+    )
+    assert result["committed"] is False
+    assert result["results"][2]["error"] == "disk full"
+    assert (existing / "Old.md").read_text().endswith("Old body")
+    assert not (existing / "new").exists()
+    assert not (existing / "Broken.md").exists()
+    assert leftovers(existing) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_updates_indexes_and_cache(existing):
+    assert (await read_note("Old")).content == "Old body"
+    await write_notes_batch([write_request("update", "Old", "Cached body")])
+    assert (await read_note("Old")).content == "Cached body"
+
+
+@pytest.mark.asyncio
+async def test_batch_limits(temp_vault):
+    with pytest.raises(Exception, match="at least one"):
+        await write_notes_batch([])
+
+
+@pytest.mark.asyncio
+async def test_batch_tool(mcp_client, existing):
+    result = await mcp_client.call_tool(
+        "write_notes_batch_tool",
+        {
+            "writes": [
+                {"action": "update", "note": {"title": "Old", "content": "Via MCP"}},
+                {"action": "create", "note": {"title": "Other", "content": "x"}},
+            ]
+        },
+    )
+    data = json.loads(result[0].text)
+    assert data["committed"] is True
+    assert (existing / "Other.md").exists()